@@ -0,0 +1,186 @@
+// Bitmap facet index: filters become bitwise ANDs over 32-bit words
+import { SDLC_PHASES } from '$lib/types';
+import type { AuditInventoryRow, AutomationLevel, DataShell, SearchFilters } from '$lib/types';
+
+export type Bitmap = Uint32Array;
+
+// facet -> value -> bitmap (bit i = row i)
+export type FacetBitmaps = Record<string, Record<string, Bitmap>>;
+
+// Boolean SearchFilters keys and the inventory flags they test
+const REQUIREMENT_FILTERS: Record<string, string> = {
+  requiresSourceCode: 'requires_source_code',
+  requiresRuntimeData: 'requires_runtime_data',
+  requiresTeamInput: 'requires_team_input',
+  requiresProductionAccess: 'requires_production_access',
+  requiresPhysicalAccess: 'requires_physical_access',
+  requiresHumanEvaluation: 'requires_human_evaluation',
+  requiresInterviews: 'requires_interviews'
+};
+
+const AUTOMATION_LEVELS: AutomationLevel[] = ['fully_automated', 'semi_automated', 'human_required'];
+
+// Value-valued SearchFilters keys, which are also facet names
+const VALUE_FILTERS = ['tier', 'status', 'category', 'subcategory', 'sdlcPhase', 'automationLevel'] as const;
+
+function emptyBitmap(size: number): Bitmap {
+  return new Uint32Array((size + 31) >>> 5);
+}
+
+function fullBitmap(size: number): Bitmap {
+  const bitmap = emptyBitmap(size).fill(0xffffffff);
+  if (size & 31) bitmap[bitmap.length - 1] = (1 << (size & 31)) - 1;
+  return bitmap;
+}
+
+function popcount(word: number): number {
+  word -= (word >>> 1) & 0x55555555;
+  word = (word & 0x33333333) + ((word >>> 2) & 0x33333333);
+  return (((word + (word >>> 4)) & 0x0f0f0f0f) * 0x01010101) >>> 24;
+}
+
+// Decode base64 LEB128 run lengths (clear/set alternating, clear first)
+export function decodeBitmap(encoded: string, size: number): Bitmap {
+  const bitmap = emptyBitmap(size);
+  const bytes = atob(encoded);
+  let position = 0;
+  let set = false;
+  let run = 0;
+  let shift = 0;
+  for (let i = 0; i < bytes.length; i++) {
+    const byte = bytes.charCodeAt(i);
+    run += (byte & 0x7f) * 2 ** shift;
+    if (byte & 0x80) {
+      shift += 7;
+      continue;
+    }
+    if (set) {
+      for (let bit = position; bit < position + run; bit++) {
+        bitmap[bit >>> 5] |= 1 << (bit & 31);
+      }
+    }
+    position += run;
+    set = !set;
+    run = 0;
+    shift = 0;
+  }
+  return bitmap;
+}
+
+export class FacetIndex {
+  readonly size: number;
+  readonly facets: FacetBitmaps;
+
+  constructor(size: number, facets: FacetBitmaps) {
+    this.size = size;
+    this.facets = facets;
+  }
+
+  // Index from the exporter's precomputed bitmaps
+  static fromShell(shell: DataShell): FacetIndex {
+    const size = shell.audits.length;
+    const facets: FacetBitmaps = {};
+    for (const [name, values] of Object.entries(shell.facets)) {
+      facets[name] = {};
+      for (const [value, entry] of Object.entries(values)) {
+        facets[name][value] = decodeBitmap(entry.bits, size);
+      }
+    }
+    return new FacetIndex(size, facets);
+  }
+
+  // Index built directly from inventory rows (server-side, CSV-backed data)
+  static fromRows(audits: AuditInventoryRow[]): FacetIndex {
+    const facets: FacetBitmaps = {
+      tier: {}, status: {}, category: {}, subcategory: {},
+      sdlcPhase: {}, automationLevel: {}, requires: {}
+    };
+    const add = (facet: string, value: string, row: number) => {
+      const bitmap = (facets[facet][value] ??= emptyBitmap(audits.length));
+      bitmap[row >>> 5] |= 1 << (row & 31);
+    };
+    audits.forEach((audit, row) => {
+      add('tier', audit.tier, row);
+      add('status', audit.status, row);
+      add('category', audit.category, row);
+      add('subcategory', audit.subcategory, row);
+      const flags = audit as unknown as Record<string, unknown>;
+      for (const phase of SDLC_PHASES) {
+        if (flags[phase.id] === true) add('sdlcPhase', phase.id, row);
+      }
+      for (const level of AUTOMATION_LEVELS) {
+        if (flags[level] === true) add('automationLevel', level, row);
+      }
+      for (const flag of Object.values(REQUIREMENT_FILTERS)) {
+        if (flags[flag] === true) add('requires', flag, row);
+      }
+    });
+    return new FacetIndex(audits.length, facets);
+  }
+
+  private lookup(facet: string, value: string): Bitmap {
+    return this.facets[facet]?.[value] ?? emptyBitmap(this.size);
+  }
+
+  // Rows matching every active filter, or null when no filter is active.
+  // `except` leaves out one value facet's own selection, for its counts.
+  match(filters: SearchFilters, except?: string): Bitmap | null {
+    const terms: [Bitmap, boolean][] = [];
+    for (const key of VALUE_FILTERS) {
+      const value = filters[key];
+      if (value && key !== except) terms.push([this.lookup(key, value), false]);
+    }
+    for (const [key, flag] of Object.entries(REQUIREMENT_FILTERS)) {
+      const value = filters[key as keyof SearchFilters];
+      if (value !== undefined) terms.push([this.lookup('requires', flag), value === false]);
+    }
+    if (terms.length === 0) return null;
+
+    // The full bitmap's clear tail bits stay clear under negated terms
+    const result = fullBitmap(this.size);
+    for (const [bitmap, negate] of terms) {
+      for (let i = 0; i < result.length; i++) {
+        result[i] &= negate ? ~bitmap[i] : bitmap[i];
+      }
+    }
+    return result;
+  }
+
+  count(bitmap: Bitmap | null): number {
+    if (!bitmap) return this.size;
+    let total = 0;
+    for (let i = 0; i < bitmap.length; i++) total += popcount(bitmap[i]);
+    return total;
+  }
+
+  // Per-value counts of a facet within a result set
+  counts(facet: string, within: Bitmap | null): Record<string, number> {
+    const counts: Record<string, number> = {};
+    for (const [value, bitmap] of Object.entries(this.facets[facet] ?? {})) {
+      let total = 0;
+      for (let i = 0; i < bitmap.length; i++) {
+        total += popcount(within ? bitmap[i] & within[i] : bitmap[i]);
+      }
+      counts[value] = total;
+    }
+    return counts;
+  }
+
+  has(bitmap: Bitmap, row: number): boolean {
+    return (bitmap[row >>> 5] & (1 << (row & 31))) !== 0;
+  }
+
+  select<T>(rows: T[], bitmap: Bitmap | null): T[] {
+    if (!bitmap) return rows;
+    const selected: T[] = [];
+    for (let word = 0; word < bitmap.length; word++) {
+      let bits = bitmap[word];
+      while (bits) {
+        const low = bits & -bits;
+        selected.push(rows[(word << 5) + 31 - Math.clz32(low)]);
+        bits ^= low;
+      }
+    }
+    return selected;
+  }
+}
@@ -0,0 +1,98 @@
+// Decoding of the browser data shell and on-demand detail shards
+import type {
+  AuditDetail,
+  AuditInventoryRow,
+  DataManifest,
+  DataShell,
+  NavCategory
+} from '$lib/types';
+
+const detailCache = new Map<string, Promise<AuditDetail | null>>();
+// YAML file path -> content hash of its detail shard, filled by decodeAudits
+const detailHashes = new Map<string, string>();
+
+// Resolve the content-addressed shell file through the manifest
+export async function loadShell(fetch: typeof globalThis.fetch, base: string): Promise<DataShell> {
+  const manifestResponse = await fetch(`${base}/data/manifest.json`, { cache: 'no-cache' });
+  const manifest: DataManifest = await manifestResponse.json();
+  const response = await fetch(`${base}/data/${manifest.files['audits.json'].path}`);
+  return response.json();
+}
+
+export function decodeAudits(shell: DataShell): AuditInventoryRow[] {
+  return shell.audits.map(([id, name, category, subcategory, tier, status, flags, file, detail]) => {
+    const cat = shell.categories[category];
+    const sub = shell.subcategories[subcategory];
+    const filePath = file || `audits/${cat.directory}/${sub}/${id.split('.').pop()}.yaml`;
+    detailHashes.set(filePath, detail);
+    const row: Record<string, unknown> = {
+      audit_id: id,
+      file_path: filePath,
+      audit_name: name,
+      category: cat.slug,
+      category_number: cat.number,
+      subcategory: sub,
+      tier: shell.tiers[tier],
+      status: shell.statuses[status]
+    };
+    shell.flags.forEach((flag, bit) => {
+      row[flag] = (flags & (1 << bit)) !== 0;
+    });
+    return row as unknown as AuditInventoryRow;
+  });
+}
+
+export function decodeNavigation(shell: DataShell, audits: AuditInventoryRow[]): NavCategory[] {
+  return shell.navigation.map((nav) => {
+    const cat = shell.categories[nav.category];
+    const id = `cat-${cat.number}`;
+    const subcategories = nav.subcategories.map((sub) => ({
+      id: `${id}-${sub.slug}`,
+      slug: sub.slug,
+      title: sub.title,
+      audits: sub.audits.map((index) => {
+        const audit = audits[index];
+        return {
+          id: audit.audit_id,
+          slug: audit.audit_id.split('.').pop() || audit.audit_id,
+          name: audit.audit_name,
+          tier: audit.tier,
+          status: audit.status
+        };
+      })
+    }));
+    return {
+      id,
+      slug: cat.slug,
+      title: cat.title,
+      number: cat.number,
+      subcategories,
+      auditCount: subcategories.reduce((sum, sub) => sum + sub.audits.length, 0)
+    };
+  });
+}
+
+export function detailUrl(base: string, filePath: string): string | null {
+  const hash = detailHashes.get(filePath);
+  if (!hash) return null;
+  return `${base}/data/details/${filePath.replace(/^audits\//, '').replace(/\.yaml$/, '')}.${hash}.json`;
+}
+
+// Fetch an audit's detail shard once; null when the shard does not exist
+export function loadAuditDetail(base: string, filePath: string): Promise<AuditDetail | null> {
+  const url = detailUrl(base, filePath);
+  if (!url) return Promise.resolve(null);
+  let pending = detailCache.get(url);
+  if (!pending) {
+    pending = fetch(url).then((response) => {
+      if (response.status === 404) return null;
+      if (!response.ok) {
+        throw new Error(`Failed to fetch: ${response.status} ${response.statusText}`);
+      }
+      return response.json() as Promise<AuditDetail>;
+    });
+    pending.catch(() => detailCache.delete(url));
+    detailCache.set(url, pending);
+  }
+  return pending;
+}
@@ -1,8 +1,19 @@
 import MiniSearch from 'minisearch';
 import type { AuditInventoryRow, SearchFilters, SearchResult } from '$lib/types';
 import { loadInventory } from './dataLoader';
+import { FacetIndex } from '$lib/data/facets';
 
 let searchIndex: MiniSearch<AuditInventoryRow> | null = null;
+const facetIndexes = new WeakMap<AuditInventoryRow[], FacetIndex>();
+
+function getFacetIndex(audits: AuditInventoryRow[]): FacetIndex {
+  let index = facetIndexes.get(audits);
+  if (!index) {
+    index = FacetIndex.fromRows(audits);
+    facetIndexes.set(audits, index);
+  }
+  return index;
+}
 
 function buildSearchIndex(): MiniSearch<AuditInventoryRow> {
   if (searchIndex) return searchIndex;
@@ -29,20 +40,13 @@ function buildSearchIndex(): MiniSearch<AuditInventoryRow> {
 
 export function searchAudits(query: string, filters?: SearchFilters): SearchResult[] {
   const inventory = loadInventory();
-  let results: AuditInventoryRow[];
+  let results = filters ? applyFilters(inventory, filters) : inventory;
 
   if (query.trim()) {
     const index = buildSearchIndex();
     const searchResults = index.search(query);
     const matchedIds = new Set(searchResults.map(r => inventory[r.id as number].audit_id));
-    results = inventory.filter(a => matchedIds.has(a.audit_id));
-  } else {
-    results = [...inventory];
-  }
-
-  // Apply filters
-  if (filters) {
-    results = applyFilters(results, filters);
+    results = results.filter(a => matchedIds.has(a.audit_id));
   }
 
   return results.map(audit => ({
@@ -51,41 +55,10 @@ export function searchAudits(query: string, filters?: SearchFilters): SearchResu
   }));
 }
 
+// Filters are ANDs of per-facet bitmaps, indexed once per inventory array
 export function applyFilters(audits: AuditInventoryRow[], filters: SearchFilters): AuditInventoryRow[] {
-  return audits.filter(audit => {
-    // Tier filter
-    if (filters.tier && audit.tier !== filters.tier) return false;
-
-    // Status filter
-    if (filters.status && audit.status !== filters.status) return false;
-
-    // Category filter
-    if (filters.category && audit.category !== filters.category) return false;
-
-    // Subcategory filter
-    if (filters.subcategory && audit.subcategory !== filters.subcategory) return false;
-
-    // SDLC Phase filter
-    if (filters.sdlcPhase) {
-      const phase = filters.sdlcPhase as keyof AuditInventoryRow;
-      if (!audit[phase]) return false;
-    }
-
-    // Automation level filter
-    if (filters.automationLevel) {
-      if (filters.automationLevel === 'fully_automated' && !audit.fully_automated) return false;
-      if (filters.automationLevel === 'semi_automated' && !audit.semi_automated) return false;
-      if (filters.automationLevel === 'human_required' && !audit.human_required) return false;
-    }
-
-    // Requirements filters
-    if (filters.requiresSourceCode !== undefined && audit.requires_source_code !== filters.requiresSourceCode) return false;
-    if (filters.requiresRuntimeData !== undefined && audit.requires_runtime_data !== filters.requiresRuntimeData) return false;
-    if (filters.requiresTeamInput !== undefined && audit.requires_team_input !== filters.requiresTeamInput) return false;
-    if (filters.requiresProductionAccess !== undefined && audit.requires_production_access !== filters.requiresProductionAccess) return false;
-
-    return true;
-  });
+  const index = getFacetIndex(audits);
+  return index.select(audits, index.match(filters));
 }
 
 export function getFilterOptions() {
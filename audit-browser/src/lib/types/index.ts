@@ -187,3 +187,73 @@ export const CATEGORY_CLUSTERS = {
   'Economics & Dependencies': { range: [31, 33], color: 'yellow' },
   'Specialized Domains': { range: [34, 43], color: 'red' }
 } as const;
+
+// Browser data shell (static/data/audits.json)
+export interface ShellCategory {
+  slug: string;
+  title: string;
+  number: number;
+  directory: string;
+}
+
+export interface ShellNavCategory {
+  category: number;
+  subcategories: { slug: string; title: string; audits: number[] }[];
+}
+
+// [id, name, category, subcategory, tier, status, flags, file, detail shard hash]
+export type ShellRow = [string, string, number, number, number, number, number, string | 0, string];
+
+// static/data/manifest.json: logical names -> content-addressed files
+export interface DataManifest {
+  version: number;
+  files: Record<string, { path: string; sha256: string; size: number }>;
+  details: { path: string; count: number; size: number };
+}
+
+export interface DataShell {
+  version: number;
+  columns: string[];
+  flags: string[];
+  categories: ShellCategory[];
+  subcategories: string[];
+  tiers: AuditTier[];
+  statuses: AuditStatus[];
+  navigation: ShellNavCategory[];
+  stats: AuditStats;
+  filterOptions: FilterOptions;
+  // facet -> value -> run-length encoded row bitmap and its popcount
+  facets: Record<string, Record<string, { count: number; bits: string }>>;
+  audits: ShellRow[];
+}
+
+export interface AuditStats {
+  total: number;
+  active: number;
+  planned: number;
+  byTier: Record<AuditTier, number>;
+  byAutomation: { fullyAutomated: number; semiAutomated: number; humanRequired: number };
+  categories: number;
+}
+
+export interface FilterOptions {
+  categories: string[];
+  subcategories: string[];
+  tiers: AuditTier[];
+  statuses: AuditStatus[];
+  automationLevels: AutomationLevel[];
+}
+
+// Per-audit detail shard (static/data/details/...)
+export interface AuditDetail {
+  id: string;
+  file_path: string;
+  description: AuditDescription;
+  execution: {
+    automatable: string;
+    severity: string;
+    scope: string;
+    default_profiles: string[];
+  };
+  yaml: string;
+}
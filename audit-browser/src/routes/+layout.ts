@@ -1,13 +1,19 @@
 import type { LayoutLoad } from './$types';
 import { base } from '$app/paths';
+import { decodeAudits, decodeNavigation, loadShell } from '$lib/data';
+import { FacetIndex } from '$lib/data/facets';
 
 export const load: LayoutLoad = async ({ fetch }) => {
-  const response = await fetch(`${base}/data/audits.json`);
-  const data = await response.json();
+  // Only the shell is loaded up front; audit details are fetched per audit
+  const shell = await loadShell(fetch, base);
+  const audits = decodeAudits(shell);
 
   return {
-    navigation: data.navigation,
-    stats: data.stats
+    audits,
+    navigation: decodeNavigation(shell, audits),
+    stats: shell.stats,
+    filterOptions: shell.filterOptions,
+    facetIndex: FacetIndex.fromShell(shell)
   };
 };
 
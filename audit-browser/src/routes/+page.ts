@@ -1,12 +1,11 @@
 import type { PageLoad } from './$types';
-import { base } from '$app/paths';
 
-export const load: PageLoad = async ({ fetch }) => {
-  const response = await fetch(`${base}/data/audits.json`);
-  const data = await response.json();
+export const load: PageLoad = async ({ parent }) => {
+  const { audits, filterOptions, facetIndex } = await parent();
 
   return {
-    audits: data.audits,
-    filterOptions: data.filterOptions
+    audits,
+    filterOptions,
+    facetIndex
   };
 };
@@ -11,6 +11,7 @@ Analyzes all audit files for actionability issues:
 
 import os
 import re
+import sys
 import yaml
 import fnmatch
 import shutil
@@ -21,6 +22,12 @@ from typing import Dict, List, Any, Tuple, Optional
 from dataclasses import dataclass, field
 from collections import defaultdict
 
+SCRIPT_DIR = Path(__file__).parent.resolve()
+BASE_DIR = SCRIPT_DIR.parent
+
+sys.path.insert(0, str(BASE_DIR / "scripts"))
+from instrumentation import timed_run, phase, audit_file  # noqa: E402
+
 @dataclass
 class Issue:
     audit_id: str
@@ -105,7 +112,8 @@ class ActionabilityValidator:
 
         # Try to compile the regex
         try:
-            compiled = re.compile(pattern)
+            with phase('regex-compile'):
+                compiled = re.compile(pattern)
             return True, ""
         except re.error as e:
             return False, f"Invalid regex syntax: {e}"
@@ -147,12 +155,13 @@ class ActionabilityValidator:
             temp_path = f.name
 
         try:
-            result = subprocess.run(
-                ['shellcheck', '-s', 'bash', '-f', 'json', temp_path],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
+            with phase('shellcheck'):
+                result = subprocess.run(
+                    ['shellcheck', '-s', 'bash', '-f', 'json', temp_path],
+                    capture_output=True,
+                    text=True,
+                    timeout=10
+                )
             if result.returncode != 0 and result.stdout:
                 import json
                 try:
@@ -301,7 +310,8 @@ class ActionabilityValidator:
 
             # Parse YAML
             try:
-                data = yaml.safe_load(content)
+                with phase('parse'):
+                    data = yaml.safe_load(content)
             except yaml.YAMLError as e:
                 self.issues.append(Issue(
                     audit_id=str(file_path),
@@ -474,7 +484,8 @@ class ActionabilityValidator:
 
         processed = 0
         for file_path in audit_files:
-            self.process_audit_file(file_path)
+            with audit_file(file_path), phase('analyze'):
+                self.process_audit_file(file_path)
             processed += 1
             if processed % 200 == 0:
                 print(f"Processed {processed}/{len(audit_files)} files...")
@@ -544,9 +555,10 @@ class ActionabilityValidator:
         return report
 
 
+@timed_run(SCRIPT_DIR / "actionability-report.yaml")
 def main():
-    audits_dir = "/mnt/walnut-drive/dev/audits/audits"
-    output_file = "/mnt/walnut-drive/dev/audits/meta-audit/actionability-report.yaml"
+    audits_dir = str(BASE_DIR / "audits")
+    output_file = str(SCRIPT_DIR / "actionability-report.yaml")
 
     print("Starting Actionability Meta-Audit v2...")
     print(f"Audits directory: {audits_dir}")
@@ -555,7 +567,7 @@ def main():
     report = validator.run_validation()
 
     # Write report
-    with open(output_file, 'w', encoding='utf-8') as f:
+    with phase('write-report'), open(output_file, 'w', encoding='utf-8') as f:
         yaml.dump(report, f, default_flow_style=False, sort_keys=False, allow_unicode=True, width=120)
 
     print(f"\nReport written to: {output_file}")
@@ -12,6 +12,14 @@ from pathlib import Path
 from collections import defaultdict
 from typing import Dict, List, Any, Optional
 
+SCRIPT_DIR = Path(__file__).parent.resolve()
+BASE_DIR = SCRIPT_DIR.parent
+
+sys.path.insert(0, str(BASE_DIR / "scripts"))
+from audit_catalog import YamlLoader  # noqa: E402
+from audit_model import Audit  # noqa: E402
+from instrumentation import timed_run, phase, audit_file  # noqa: E402
+
 # Known agent-compatible tools
 KNOWN_TOOLS = {
     # Static analysis
@@ -90,36 +98,40 @@ class AgentReadinessAnalyzer:
         yaml_files = list(self.audits_dir.rglob('*.yaml'))
         self.results['total_files'] = len(yaml_files)
 
-        for yaml_file in yaml_files:
-            self._analyze_file(yaml_file)
+        with phase('analyze'):
+            for yaml_file in yaml_files:
+                with audit_file(yaml_file):
+                    self._analyze_file(yaml_file)
 
-        return self._generate_report()
+        with phase('summarize'):
+            return self._generate_report()
 
     def _analyze_file(self, filepath: Path):
         """Analyze a single audit file for agent-readiness."""
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
+            with phase('parse'), open(filepath, 'r', encoding='utf-8') as f:
                 content = f.read()
-                data = yaml.safe_load(content)
+                data = yaml.load(content, Loader=YamlLoader)
 
-            if not data or 'audit' not in data:
+            if not isinstance(data, dict) or not isinstance(data.get('audit'), dict):
                 return
+            with phase('normalize'):
+                audit = Audit.from_dict(data, filepath)
+            del data
 
             self.results['parsed_files'] += 1
-            audit_id = data.get('audit', {}).get('id', filepath.stem)
-            category = data.get('audit', {}).get('category', 'unknown')
+            category = audit.category or 'unknown'
             self.results['files_by_category'][category] += 1
 
             # Analyze automation level
-            automation = self._check_automation_level(data)
+            automation = self._check_automation_level(audit)
             self.results['automation_distribution'][automation] += 1
 
             # Analyze cognitive mode
-            cognitive_mode = self._check_cognitive_mode(data)
-            self.results['cognitive_modes'][cognitive_mode] += 1
+            self.results['cognitive_modes'][audit.cognitive_mode or 'unspecified'] += 1
 
             # Analyze tooling
-            tools = self._check_tooling(data)
+            tools = self._check_tooling(audit)
             for tool in tools:
                 self.results['tool_usage'][tool] += 1
                 # Check if tool is known
@@ -130,33 +142,33 @@ class AgentReadinessAnalyzer:
                     self.results['tool_availability']['unknown'] += 1
 
             # Analyze procedure steps for commands
-            self._analyze_procedure_steps(data)
+            self._analyze_procedure_steps(audit)
 
             # Analyze closeout checklist
-            self._analyze_closeout_checklist(data)
+            self._analyze_closeout_checklist(audit)
 
             # Analyze automation hooks
-            self._analyze_automation_hooks(data, content)
+            self._analyze_automation_hooks(audit)
 
             # Check for manual blockers
-            blockers = self._check_manual_blockers(data, content)
+            blockers = self._check_manual_blockers(audit, content)
             for blocker_type, details in blockers.items():
                 if details:
                     self.results['manual_blockers'][blocker_type].append({
-                        'audit_id': audit_id,
+                        'audit_id': audit.id,
                         'details': details
                     })
 
             # Calculate readiness score
-            score = self._calculate_readiness_score(data, content, automation, blockers)
+            score = self._calculate_readiness_score(audit, automation, blockers)
             self.results['readiness_scores'][score] += 1
             self.results['category_readiness'][category][score] += 1
 
             if score == 'fully_automatable':
-                self.results['fully_automatable_audits'].append(audit_id)
+                self.results['fully_automatable_audits'].append(audit.id)
 
             # Generate issues for non-ready audits
-            issues = self._generate_issues(audit_id, data, automation, blockers, filepath)
+            issues = self._generate_issues(audit, automation, blockers)
             self.results['issues'].extend(issues)
 
         except yaml.YAMLError as e:
@@ -170,132 +182,71 @@ class AgentReadinessAnalyzer:
                 'error': f"Error: {str(e)[:100]}"
             })
 
-    def _analyze_procedure_steps(self, data: Dict):
+    def _analyze_procedure_steps(self, audit: Audit):
         """Analyze procedure steps for command presence."""
-        procedure = data.get('procedure', {})
-        steps = procedure.get('steps', [])
-
-        if isinstance(steps, list):
-            for step in steps:
-                if isinstance(step, dict):
-                    self.results['total_steps'] += 1
-                    if step.get('commands'):
-                        self.results['steps_with_commands'] += 1
-                    else:
-                        self.results['steps_without_commands'] += 1
-
-    def _analyze_closeout_checklist(self, data: Dict):
+        for step in audit.steps:
+            self.results['total_steps'] += 1
+            if step.commands:
+                self.results['steps_with_commands'] += 1
+            else:
+                self.results['steps_without_commands'] += 1
+
+    def _analyze_closeout_checklist(self, audit: Audit):
         """Analyze closeout checklist for automation."""
-        closeout = data.get('closeout_checklist', [])
-        if isinstance(closeout, list):
-            for item in closeout:
-                if isinstance(item, dict):
-                    self.results['closeout_items']['total'] += 1
-                    verification = item.get('verification', '')
-                    if verification == 'manual':
-                        self.results['closeout_items']['manual'] += 1
-                    else:
-                        self.results['closeout_items']['automated'] += 1
-
-    def _analyze_automation_hooks(self, data: Dict, content: str):
+        for item in audit.closeout:
+            self.results['closeout_items']['total'] += 1
+            if item.manual:
+                self.results['closeout_items']['manual'] += 1
+            else:
+                self.results['closeout_items']['automated'] += 1
+
+    def _analyze_automation_hooks(self, audit: Audit):
         """Analyze presence of automation hooks."""
         # Check for command templates in procedure
-        procedure = data.get('procedure', {})
-        steps = procedure.get('steps', [])
-        if isinstance(steps, list):
-            for step in steps:
-                if isinstance(step, dict) and step.get('commands'):
-                    self.results['automation_hooks']['procedure_commands'] += 1
-                    break
+        if audit.has_commands:
+            self.results['automation_hooks']['procedure_commands'] += 1
 
         # Check for scripts in tooling
-        tooling = data.get('tooling', {})
-        if tooling.get('scripts'):
+        if audit.scripts:
             self.results['automation_hooks']['inline_scripts'] += 1
 
         # Check for discovery patterns
-        discovery = data.get('discovery', {})
-        if discovery.get('file_patterns'):
+        if audit.file_patterns:
             self.results['automation_hooks']['file_patterns'] += 1
-        if discovery.get('code_patterns'):
+        if audit.code_patterns:
             self.results['automation_hooks']['code_patterns'] += 1
 
         # Check for signals with evidence patterns
-        signals = data.get('signals', {})
-        has_evidence = False
-        for severity in ['critical', 'high', 'medium', 'low']:
-            sigs = signals.get(severity, [])
-            if isinstance(sigs, list):
-                for sig in sigs:
-                    if isinstance(sig, dict) and sig.get('evidence_pattern'):
-                        has_evidence = True
-                        break
-        if has_evidence:
+        if any(sig.evidence_pattern for sig in audit.signals if sig.level != 'positive'):
             self.results['automation_hooks']['evidence_patterns'] += 1
 
-    def _check_automation_level(self, data: Dict) -> str:
+    def _check_automation_level(self, audit: Audit) -> str:
         """Check the automation level specified in the audit."""
-        execution = data.get('execution', {})
-        automatable = execution.get('automatable', 'unspecified')
-
-        # Normalize values
-        if automatable in ['yes', 'full', True, 'true']:
+        # The model spells unquoted yes/no booleans as 'yes'/'no'
+        if audit.automatable in ['yes', 'full', 'true']:
             return 'full'
-        elif automatable in ['partial', 'hybrid']:
+        elif audit.automatable in ['partial', 'hybrid']:
             return 'partial'
-        elif automatable in ['no', 'manual', False, 'false']:
+        elif audit.automatable in ['no', 'manual', 'false']:
             return 'manual'
         else:
             return 'unspecified'
 
-    def _check_cognitive_mode(self, data: Dict) -> str:
-        """Check if cognitive mode is specified in procedure context."""
-        procedure = data.get('procedure', {})
-        context = procedure.get('context', {})
-        return context.get('cognitive_mode', 'unspecified')
-
-    def _check_tooling(self, data: Dict) -> List[str]:
+    def _check_tooling(self, audit: Audit) -> List[str]:
         """Extract tools referenced in the audit."""
-        tools = []
-        tooling = data.get('tooling', {})
-
-        # Check static_analysis tools
-        static_tools = tooling.get('static_analysis', [])
-        if isinstance(static_tools, list):
-            for tool_entry in static_tools:
-                if isinstance(tool_entry, dict):
-                    tool_name = tool_entry.get('tool', '')
-                    if tool_name:
-                        tools.append(tool_name.lower())
-                elif isinstance(tool_entry, str):
-                    tools.append(tool_entry.lower())
-
-        # Check scripts
-        scripts = tooling.get('scripts', [])
-        if isinstance(scripts, list):
-            for script in scripts:
-                if isinstance(script, dict):
-                    lang = script.get('language', '')
-                    if lang:
-                        tools.append(f"script:{lang}")
-
+        tools = list(audit.static_tools)
+        tools.extend(f"script:{lang}" for lang in audit.scripts if lang)
         return tools
 
-    def _check_manual_blockers(self, data: Dict, content: str) -> Dict[str, List[str]]:
+    def _check_manual_blockers(self, audit: Audit, content: str) -> Dict[str, List[str]]:
         """Check for elements that block full automation."""
         blockers = defaultdict(list)
         content_lower = content.lower()
 
         # Check closeout_checklist for manual verification
-        closeout = data.get('closeout_checklist', [])
-        if isinstance(closeout, list):
-            for item in closeout:
-                if isinstance(item, dict):
-                    verification = item.get('verification', '')
-                    if verification == 'manual':
-                        blockers['manual_verification'].append(
-                            item.get('item', 'Unknown checklist item')
-                        )
+        for item in audit.closeout:
+            if item.manual:
+                blockers['manual_verification'].append(item.item or 'Unknown checklist item')
 
         # Check for human judgment language
         for blocker_phrase in MANUAL_BLOCKERS:
@@ -303,18 +254,16 @@ class AgentReadinessAnalyzer:
                 blockers['human_language'].append(blocker_phrase)
 
         # Check requires_runtime
-        audit_section = data.get('audit', {})
-        if audit_section.get('requires_runtime', False):
+        if audit.requires_runtime:
             blockers['requires_runtime'].append('Audit requires runtime environment')
 
         # Check for destructive operations
-        if audit_section.get('destructive', False):
+        if audit.destructive:
             blockers['destructive'].append('Audit may be destructive')
 
         return dict(blockers)
 
-    def _calculate_readiness_score(self, data: Dict, content: str,
-                                   automation: str, blockers: Dict) -> str:
+    def _calculate_readiness_score(self, audit: Audit, automation: str, blockers: Dict) -> str:
         """Calculate overall agent-readiness score."""
         # Start with base score from automation level
         if automation == 'full':
@@ -337,15 +286,7 @@ class AgentReadinessAnalyzer:
             score -= 0.5
 
         # Bonus for having commands in procedure
-        procedure = data.get('procedure', {})
-        steps = procedure.get('steps', [])
-        has_commands = False
-        for step in steps if isinstance(steps, list) else []:
-            if isinstance(step, dict) and step.get('commands'):
-                has_commands = True
-                break
-
-        if has_commands:
+        if audit.has_commands:
             score += 0.5
 
         # Map score to category
@@ -358,10 +299,10 @@ class AgentReadinessAnalyzer:
         else:
             return 'requires_human'
 
-    def _generate_issues(self, audit_id: str, data: Dict, automation: str,
-                        blockers: Dict, filepath: Path) -> List[Dict]:
+    def _generate_issues(self, audit: Audit, automation: str, blockers: Dict) -> List[Dict]:
         """Generate issues for problematic audits."""
         issues = []
+        audit_id = audit.id
 
         # Issue for unspecified automation
         if automation == 'unspecified':
@@ -398,9 +339,7 @@ class AgentReadinessAnalyzer:
                 })
 
         # Issue for missing cognitive mode
-        procedure = data.get('procedure', {})
-        context = procedure.get('context', {})
-        if not context.get('cognitive_mode'):
+        if not audit.cognitive_mode:
             issues.append({
                 'audit_id': audit_id,
                 'severity': 'low',
@@ -422,12 +361,7 @@ class AgentReadinessAnalyzer:
             })
 
         # Issue for missing commands in steps
-        steps = procedure.get('steps', [])
-        steps_without_commands = 0
-        for step in steps if isinstance(steps, list) else []:
-            if isinstance(step, dict):
-                if not step.get('commands') and not step.get('verification'):
-                    steps_without_commands += 1
+        steps_without_commands = sum(1 for step in audit.steps if not step.commands and not step.verification)
 
         if steps_without_commands > 0 and automation == 'full':
             issues.append({
@@ -586,9 +520,10 @@ class AgentReadinessAnalyzer:
         return report
 
 
+@timed_run(SCRIPT_DIR / 'agent-readiness-report.yaml')
 def main():
-    audits_dir = '/mnt/walnut-drive/dev/audits/audits'
-    output_file = '/mnt/walnut-drive/dev/audits/meta-audit/agent-readiness-report.yaml'
+    audits_dir = str(BASE_DIR / 'audits')
+    output_file = str(SCRIPT_DIR / 'agent-readiness-report.yaml')
 
     print(f"Analyzing audit files in: {audits_dir}")
 
@@ -596,7 +531,7 @@ def main():
     report = analyzer.analyze_all()
 
     # Write report
-    with open(output_file, 'w', encoding='utf-8') as f:
+    with phase('write-report'), open(output_file, 'w', encoding='utf-8') as f:
         yaml.dump(report, f, default_flow_style=False, sort_keys=False, allow_unicode=True)
 
     print(f"\nReport written to: {output_file}")
@@ -5,6 +5,7 @@ Analyzes all audit files for structural alignment issues.
 """
 
 import os
+import sys
 import yaml
 import re
 from collections import defaultdict
@@ -12,7 +13,11 @@ from pathlib import Path
 from difflib import SequenceMatcher
 import json
 
-AUDIT_DIR = "/mnt/walnut-drive/dev/audits/audits"
+SCRIPT_DIR = Path(__file__).parent.resolve()
+AUDIT_DIR = str(SCRIPT_DIR.parent / "audits")
+
+sys.path.insert(0, str(SCRIPT_DIR.parent / "scripts"))
+from instrumentation import timed_run, phase, audit_file  # noqa: E402
 
 def load_yaml_safe(filepath):
     """Load YAML file with error handling."""
@@ -27,7 +32,7 @@ def load_yaml_safe(filepath):
 
 def extract_path_components(filepath):
     """Extract category, subcategory from file path."""
-    # Path: /mnt/walnut-drive/dev/audits/audits/10-testing-quality-assurance/unit-testing/test.yaml
+    # Path: audits/10-testing-quality-assurance/unit-testing/test.yaml
     # We want: category_dir = "10-testing-quality-assurance", expected_category = "testing-quality-assurance"
     #          expected_subcategory = "unit-testing"
 
@@ -104,16 +109,16 @@ def assess_tier_complexity(audit_data):
     """Assess if tier matches complexity based on signals, steps, knowledge sources."""
     tier = audit_data.get('audit', {}).get('tier', 'unknown')
 
-    signals = audit_data.get('signals', {})
-    signal_count = sum(len(signals.get(k, [])) for k in ['critical', 'high', 'medium', 'low', 'positive'])
+    signals = audit_data.get('signals') or {}
+    signal_count = sum(len(signals.get(k) or []) for k in ['critical', 'high', 'medium', 'low', 'positive'])
 
-    procedure = audit_data.get('procedure', {})
-    step_count = len(procedure.get('steps', []))
+    procedure = audit_data.get('procedure') or {}
+    step_count = len(procedure.get('steps') or [])
 
-    knowledge = audit_data.get('knowledge_sources', {})
-    knowledge_count = (len(knowledge.get('specifications', [])) +
-                       len(knowledge.get('guides', [])) +
-                       len(knowledge.get('learning_resources', [])))
+    knowledge = audit_data.get('knowledge_sources') or {}
+    knowledge_count = (len(knowledge.get('specifications') or []) +
+                       len(knowledge.get('guides') or []) +
+                       len(knowledge.get('learning_resources') or []))
 
     # Scoring: focused (simple), expert (moderate), phd (complex)
     complexity_score = signal_count * 1 + step_count * 2 + knowledge_count * 1.5
@@ -142,6 +147,7 @@ def assess_tier_complexity(audit_data):
         'mismatch': tier_normalized != tier_expected and tier != 'unknown'
     }
 
+@timed_run(SCRIPT_DIR / 'alignment-report.yaml')
 def main():
     issues = []
     duplicates = []
@@ -180,7 +186,8 @@ def main():
             audits_analyzed += 1
 
             # Load YAML
-            data, error = load_yaml_safe(filepath)
+            with audit_file(filepath), phase('parse'):
+                data, error = load_yaml_safe(filepath)
             if error:
                 parse_errors.append({
                     'filepath': filepath,
@@ -279,7 +286,8 @@ def main():
                     })
 
             # Check 4: Tier matches complexity
-            tier_check = assess_tier_complexity(data)
+            with audit_file(filepath), phase('tier-complexity'):
+                tier_check = assess_tier_complexity(data)
             if tier_check['mismatch']:
                 tier_mismatches += 1
                 issues.append({
@@ -325,45 +333,47 @@ def main():
     issues.extend(real_id_mismatches)
 
     # Find duplicates by exact name match
-    for name, occurrences in audit_names.items():
-        if len(occurrences) > 1:
-            # Check if they're in different categories (potential misplacement)
-            categories = set(occ[2] for occ in occurrences)
-            if len(categories) > 1:
-                duplicates.append({
-                    'audit_ids': [occ[0] for occ in occurrences],
-                    'similarity': 'high',
-                    'reason': f"Exact name match '{name}' across categories: {list(categories)}"
-                })
-            else:
-                # Same name in same category - potential duplicate within category
-                duplicates.append({
-                    'audit_ids': [occ[0] for occ in occurrences],
-                    'similarity': 'high',
-                    'reason': f"Exact name match '{name}' within category: {list(categories)[0]}"
-                })
-
-    # Find similar names (potential duplicates) - limit checks for performance
-    audit_id_list = list(audit_descriptions.keys())[:500]  # Sample for performance
-    for i, id1 in enumerate(audit_id_list):
-        for id2 in audit_id_list[i+1:]:
-            # Extract names from IDs
-            name1 = id1.split('.')[-1] if '.' in id1 else id1
-            name2 = id2.split('.')[-1] if '.' in id2 else id2
-
-            similarity = calculate_similarity(name1, name2)
-            if similarity > 0.85 and similarity < 1.0:
-                # Also check description similarity
-                desc_sim = calculate_similarity(
-                    audit_descriptions.get(id1, ''),
-                    audit_descriptions.get(id2, '')
-                )
-                if desc_sim > 0.7:
+    with phase('exact-duplicates'):
+        for name, occurrences in audit_names.items():
+            if len(occurrences) > 1:
+                # Check if they're in different categories (potential misplacement)
+                categories = set(occ[2] for occ in occurrences)
+                if len(categories) > 1:
                     duplicates.append({
-                        'audit_ids': [id1, id2],
-                        'similarity': 'medium',
-                        'reason': f"Similar name ({similarity:.0%}) and description ({desc_sim:.0%})"
+                        'audit_ids': [occ[0] for occ in occurrences],
+                        'similarity': 'high',
+                        'reason': f"Exact name match '{name}' across categories: {list(categories)}"
                     })
+                else:
+                    # Same name in same category - potential duplicate within category
+                    duplicates.append({
+                        'audit_ids': [occ[0] for occ in occurrences],
+                        'similarity': 'high',
+                        'reason': f"Exact name match '{name}' within category: {list(categories)[0]}"
+                    })
+
+    # Find similar names (potential duplicates) - limit checks for performance
+    with phase('similar-names'):
+        audit_id_list = list(audit_descriptions.keys())[:500]  # Sample for performance
+        for i, id1 in enumerate(audit_id_list):
+            for id2 in audit_id_list[i+1:]:
+                # Extract names from IDs
+                name1 = id1.split('.')[-1] if '.' in id1 else id1
+                name2 = id2.split('.')[-1] if '.' in id2 else id2
+
+                similarity = calculate_similarity(name1, name2)
+                if similarity > 0.85 and similarity < 1.0:
+                    # Also check description similarity
+                    desc_sim = calculate_similarity(
+                        audit_descriptions.get(id1, ''),
+                        audit_descriptions.get(id2, '')
+                    )
+                    if desc_sim > 0.7:
+                        duplicates.append({
+                            'audit_ids': [id1, id2],
+                            'similarity': 'medium',
+                            'reason': f"Similar name ({similarity:.0%}) and description ({desc_sim:.0%})"
+                        })
 
     # Categorize issues by severity
     severity_counts = defaultdict(int)
@@ -431,8 +441,8 @@ def main():
     }
 
     # Write report
-    output_path = '/mnt/walnut-drive/dev/audits/meta-audit/alignment-report.yaml'
-    with open(output_path, 'w', encoding='utf-8') as f:
+    output_path = str(SCRIPT_DIR / 'alignment-report.yaml')
+    with phase('write-report'), open(output_path, 'w', encoding='utf-8') as f:
         yaml.dump(report, f, default_flow_style=False, allow_unicode=True, sort_keys=False, width=120)
 
     print(f"Alignment report written to {output_path}")
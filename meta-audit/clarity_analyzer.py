@@ -6,11 +6,18 @@ Analyzes all audit files for clarity issues in descriptions, signals, and remedi
 
 import os
 import re
+import sys
 import yaml
 from pathlib import Path
 from collections import defaultdict
 from typing import Dict, List, Any, Optional, Tuple
 
+SCRIPT_DIR = Path(__file__).parent.resolve()
+BASE_DIR = SCRIPT_DIR.parent
+
+sys.path.insert(0, str(BASE_DIR / "scripts"))
+from instrumentation import timed_run, phase, audit_file  # noqa: E402
+
 # Vague terms to detect
 VAGUE_TERMS = [
     r'\bvarious\b',
@@ -131,7 +138,8 @@ def check_signal_description(signal_text: str) -> List[str]:
 def analyze_audit_file(filepath: Path) -> Dict[str, Any]:
     """Analyze a single audit file for clarity issues."""
     issues = []
-    data = load_yaml_file(filepath)
+    with phase('parse'):
+        data = load_yaml_file(filepath)
 
     if not data:
         return {'issues': [{'severity': 'critical', 'issue': 'Empty file', 'field': 'file'}]}
@@ -291,10 +299,11 @@ def analyze_audit_file(filepath: Path) -> Dict[str, Any]:
     return {'audit_id': audit_id, 'issues': issues}
 
 
+@timed_run(SCRIPT_DIR / 'clarity-report.yaml')
 def main():
     """Main analysis function."""
-    audits_dir = Path('/mnt/walnut-drive/dev/audits/audits')
-    output_file = Path('/mnt/walnut-drive/dev/audits/meta-audit/clarity-report.yaml')
+    audits_dir = BASE_DIR / 'audits'
+    output_file = SCRIPT_DIR / 'clarity-report.yaml'
 
     all_issues = []
     total_files = 0
@@ -305,13 +314,15 @@ def main():
     category_issues = defaultdict(lambda: defaultdict(int))
 
     # Find all YAML files
-    yaml_files = list(audits_dir.rglob('*.yaml'))
+    with phase('discover'):
+        yaml_files = list(audits_dir.rglob('*.yaml'))
     total_files = len(yaml_files)
 
     print(f"Analyzing {total_files} audit files...")
 
     for filepath in yaml_files:
-        result = analyze_audit_file(filepath)
+        with audit_file(filepath), phase('analyze'):
+            result = analyze_audit_file(filepath)
         audit_id = result.get('audit_id', filepath.stem)
 
         if result['issues']:
@@ -403,8 +414,9 @@ def main():
     }
 
     # Write report
-    with open(output_file, 'w', encoding='utf-8') as f:
-        yaml.dump(report, f, default_flow_style=False, allow_unicode=True, sort_keys=False, width=120)
+    with phase('write-report'):
+        with open(output_file, 'w', encoding='utf-8') as f:
+            yaml.dump(report, f, default_flow_style=False, allow_unicode=True, sort_keys=False, width=120)
 
     print(f"\nAnalysis complete!")
     print(f"Total files analyzed: {total_files}")
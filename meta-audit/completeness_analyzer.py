@@ -2,31 +2,45 @@
 """
 Completeness Meta-Audit Analyzer
 Analyzes all audit files for missing required fields.
+
+Field rules come from schema/AUDIT-TEMPLATE-BLANK.yaml via the compiled
+validator in scripts/schema_validator.py, so the analyzer follows the
+template's [REQUIRED] markers instead of keeping its own field list.
+Signals and discovery keep their either/or checks, which the template
+cannot express.
 """
 
 import os
+import sys
 import yaml
 from pathlib import Path
 from collections import defaultdict
 from datetime import datetime
 
-AUDITS_DIR = "/mnt/walnut-drive/dev/audits/audits"
-
-# Define required fields and their severity
-REQUIRED_FIELDS = {
-    "critical": [
-        ("audit.id", ["audit", "id"]),
-        ("audit.name", ["audit", "name"]),
-        ("audit.category", ["audit", "category"]),
-        ("audit.tier", ["audit", "tier"]),
-        ("description.what", ["description", "what"]),
-    ],
-    "high": [
-        ("execution.automatable", ["execution", "automatable"]),
-        ("execution.severity", ["execution", "severity"]),
-        ("description.why_it_matters", ["description", "why_it_matters"]),
-        ("procedure.steps", ["procedure", "steps"]),
-    ]
+SCRIPT_DIR = Path(__file__).parent.resolve()
+BASE_DIR = SCRIPT_DIR.parent
+sys.path.insert(0, str(BASE_DIR / "scripts"))
+
+from schema_validator import (  # noqa: E402
+    MISSING, OK, STATUS_NAMES, compile_validator, describe, issue_severity, load_documents,
+)
+from instrumentation import timed_run, phase  # noqa: E402
+
+AUDITS_DIR = BASE_DIR / "audits"
+OUTPUT_PATH = SCRIPT_DIR / "completeness-report.yaml"
+
+RECOMMENDATIONS = {
+    "missing": "Add required field with appropriate value",
+    "empty": "Populate field with meaningful content",
+    "wrong_type": "Change the value to the type used in the template",
+    "invalid": "Use one of the values allowed by the template",
+}
+
+ISSUE_TEXT = {
+    "missing": "Missing required field",
+    "empty": "Empty required field",
+    "wrong_type": "Field has the wrong type",
+    "invalid": "Field value not allowed by template",
 }
 
 def get_nested_value(data, keys):
@@ -70,93 +84,38 @@ def check_discovery(data):
 
     return has_code or has_file
 
-def is_empty_value(value):
-    """Check if a value is effectively empty."""
-    if value is None:
-        return True
-    if isinstance(value, str) and value.strip() == "":
-        return True
-    if isinstance(value, list) and len(value) == 0:
-        return True
-    if isinstance(value, dict) and len(value) == 0:
-        return True
-    return False
-
-def analyze_audit_file(filepath):
-    """Analyze a single audit file for completeness issues."""
-    issues = []
-
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
-    except yaml.YAMLError as e:
-        return [{
-            "audit_id": os.path.basename(filepath),
-            "severity": "critical",
-            "issue": f"YAML parsing error: {str(e)[:100]}",
-            "field": "file",
-            "recommended": "Fix YAML syntax errors"
-        }]
-    except Exception as e:
-        return [{
-            "audit_id": os.path.basename(filepath),
-            "severity": "critical",
-            "issue": f"File read error: {str(e)[:100]}",
-            "field": "file",
-            "recommended": "Ensure file is readable"
-        }]
-
+def analyze_audit(validator, data, row, fallback_id):
+    """Turn one audit's validator statuses into completeness issues."""
     if not data:
         return [{
-            "audit_id": os.path.basename(filepath),
+            "audit_id": fallback_id,
             "severity": "critical",
-            "issue": "Empty or null YAML content",
+            "issue": "Empty, unparseable or null YAML content",
             "field": "file",
-            "recommended": "Add required audit content"
+            "recommended": "Fix YAML syntax errors and add required audit content"
         }]
 
-    # Get audit ID for reporting
-    audit_id = get_nested_value(data, ["audit", "id"]) or os.path.basename(filepath)
-
-    # Check critical fields
-    for field_name, keys in REQUIRED_FIELDS["critical"]:
-        value = get_nested_value(data, keys)
-        if value is None:
-            issues.append({
-                "audit_id": audit_id,
-                "severity": "critical",
-                "issue": "Missing required field",
-                "field": field_name,
-                "recommended": "Add required field with appropriate value"
-            })
-        elif is_empty_value(value):
-            issues.append({
-                "audit_id": audit_id,
-                "severity": "medium",
-                "issue": "Empty required field",
-                "field": field_name,
-                "recommended": "Populate field with meaningful content"
-            })
-
-    # Check high severity fields
-    for field_name, keys in REQUIRED_FIELDS["high"]:
-        value = get_nested_value(data, keys)
-        if value is None:
-            issues.append({
-                "audit_id": audit_id,
-                "severity": "high",
-                "issue": "Missing required field",
-                "field": field_name,
-                "recommended": "Add required field with appropriate value"
-            })
-        elif is_empty_value(value):
-            issues.append({
-                "audit_id": audit_id,
-                "severity": "medium",
-                "issue": "Empty required field",
-                "field": field_name,
-                "recommended": "Populate field with meaningful content"
-            })
+    issues = []
+    audit_id = get_nested_value(data, ["audit", "id"]) or fallback_id
+
+    for rule, status in zip(validator.rules, row):
+        if status == OK:
+            continue
+        severity = issue_severity(rule, status)
+        if severity is None:
+            continue
+        # Identity fields are critical when absent, as before
+        if status == MISSING and rule.path.startswith("audit."):
+            severity = "critical"
+        name = STATUS_NAMES[status]
+        issues.append({
+            "audit_id": audit_id,
+            "severity": severity,
+            "issue": ISSUE_TEXT[name],
+            "field": rule.path,
+            "expected": describe(rule),
+            "recommended": RECOMMENDATIONS[name]
+        })
 
     # Check signals (at least critical or high required)
     if not check_signals(data):
@@ -180,52 +139,18 @@ def analyze_audit_file(filepath):
 
     return issues
 
-def calculate_field_coverage(all_files_data):
-    """Calculate percentage coverage for each field."""
-    total = len(all_files_data)
+def calculate_field_coverage(validator, documents, matrix):
+    """Calculate percentage coverage for each required template field."""
+    total = len(documents)
     if total == 0:
         return {}
 
-    coverage = {
-        "audit.id": 0,
-        "audit.name": 0,
-        "audit.category": 0,
-        "audit.tier": 0,
-        "execution.automatable": 0,
-        "execution.severity": 0,
-        "description.what": 0,
-        "description.why_it_matters": 0,
-        "signals": 0,
-        "discovery": 0,
-        "procedure.steps": 0,
-    }
-
-    field_mappings = {
-        "audit.id": ["audit", "id"],
-        "audit.name": ["audit", "name"],
-        "audit.category": ["audit", "category"],
-        "audit.tier": ["audit", "tier"],
-        "execution.automatable": ["execution", "automatable"],
-        "execution.severity": ["execution", "severity"],
-        "description.what": ["description", "what"],
-        "description.why_it_matters": ["description", "why_it_matters"],
-        "procedure.steps": ["procedure", "steps"],
-    }
-
-    for data in all_files_data:
-        if not data:
-            continue
-
-        for field_name, keys in field_mappings.items():
-            value = get_nested_value(data, keys)
-            if value is not None and not is_empty_value(value):
-                coverage[field_name] += 1
-
-        if check_signals(data):
-            coverage["signals"] += 1
-
-        if check_discovery(data):
-            coverage["discovery"] += 1
+    coverage = {}
+    for index, rule in enumerate(validator.rules):
+        if rule.level == "REQUIRED":
+            coverage[rule.path] = sum(1 for row in matrix if row[index] == OK)
+    coverage["signals"] = sum(1 for _, data in documents if data and check_signals(data))
+    coverage["discovery"] = sum(1 for _, data in documents if data and check_discovery(data))
 
     # Convert to percentages
     for field in coverage:
@@ -233,37 +158,32 @@ def calculate_field_coverage(all_files_data):
 
     return coverage
 
+@timed_run(OUTPUT_PATH)
 def main():
     print("Starting completeness meta-audit...")
 
-    # Find all YAML files
-    audit_files = []
-    for root, dirs, files in os.walk(AUDITS_DIR):
-        for file in files:
-            if file.endswith('.yaml'):
-                audit_files.append(os.path.join(root, file))
+    with phase('compile-template'):
+        validator = compile_validator()
+    with phase('load'):
+        documents = load_documents(AUDITS_DIR)
+    print(f"Found {len(documents)} audit files ({len(validator.rules)} template rules)")
 
-    print(f"Found {len(audit_files)} audit files")
+    # One validator pass over the whole catalog
+    with phase('validate'):
+        matrix = [validator.check(data) for _, data in documents]
 
     all_issues = []
-    all_files_data = []
     files_with_issues = set()
     fully_complete_count = 0
 
-    for filepath in audit_files:
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
-            all_files_data.append(data)
-        except:
-            all_files_data.append(None)
-
-        issues = analyze_audit_file(filepath)
-        if issues:
-            all_issues.extend(issues)
-            files_with_issues.add(filepath)
-        else:
-            fully_complete_count += 1
+    with phase('analyze'):
+        for (rel_path, data), row in zip(documents, matrix):
+            issues = analyze_audit(validator, data, row, os.path.basename(rel_path))
+            if issues:
+                all_issues.extend(issues)
+                files_with_issues.add(rel_path)
+            else:
+                fully_complete_count += 1
 
     # Count issues by severity
     severity_counts = defaultdict(int)
@@ -271,10 +191,11 @@ def main():
         severity_counts[issue["severity"]] += 1
 
     # Calculate field coverage
-    field_coverage = calculate_field_coverage(all_files_data)
+    with phase('field-coverage'):
+        field_coverage = calculate_field_coverage(validator, documents, matrix)
 
     # Calculate stats
-    total_audits = len(audit_files)
+    total_audits = len(documents)
     needs_remediation = len(files_with_issues)
     partially_complete = needs_remediation  # Files with issues but not fully broken
 
@@ -310,8 +231,8 @@ def main():
     }
 
     # Write report
-    output_path = "/mnt/walnut-drive/dev/audits/meta-audit/completeness-report.yaml"
-    with open(output_path, 'w', encoding='utf-8') as f:
+    output_path = OUTPUT_PATH
+    with phase('write-report'), open(output_path, 'w', encoding='utf-8') as f:
         yaml.dump(report, f, default_flow_style=False, allow_unicode=True, sort_keys=False, width=120)
 
     print(f"\nReport written to: {output_path}")
@@ -17,7 +17,7 @@ def str_representer(dumper, data):
 
 yaml.add_representer(str, str_representer)
 
-AUDITS_DIR = Path("/mnt/walnut-drive/dev/audits/audits")
+AUDITS_DIR = Path(__file__).parent.resolve().parent / "audits"
 
 # Default discovery patterns by category
 CATEGORY_PATTERNS = {
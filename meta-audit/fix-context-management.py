@@ -6,11 +6,15 @@ Fix context management issues:
 3. Standardize non-standard tier values
 """
 
+import sys
 import yaml
 import os
 from pathlib import Path
 from collections import defaultdict
 
+sys.path.insert(0, str(Path(__file__).parent.resolve().parent / "scripts"))
+from instrumentation import timed_run, phase, audit_file  # noqa: E402
+
 # Custom YAML representer to preserve multiline strings
 def str_representer(dumper, data):
     if '\n' in data:
@@ -19,7 +23,8 @@ def str_representer(dumper, data):
 
 yaml.add_representer(str, str_representer)
 
-AUDITS_DIR = Path("/mnt/walnut-drive/dev/audits/audits")
+AUDITS_DIR = Path(__file__).parent.resolve().parent / "audits"
+REPORT_PATH = AUDITS_DIR.parent / 'meta-audit' / 'context-fixes-report.yaml'
 
 # Tier thresholds (lines)
 THRESHOLDS = {
@@ -38,20 +43,21 @@ TIER_MAPPING = {
 
 def count_lines(filepath):
     """Count lines in a file."""
-    with open(filepath, 'r', encoding='utf-8') as f:
+    with audit_file(filepath), phase('count-lines'), open(filepath, 'r', encoding='utf-8') as f:
         return sum(1 for _ in f)
 
 def load_yaml(filepath):
     """Load YAML file."""
-    with open(filepath, 'r', encoding='utf-8') as f:
+    with audit_file(filepath), phase('parse'), open(filepath, 'r', encoding='utf-8') as f:
         return yaml.safe_load(f)
 
 def save_yaml(filepath, data):
     """Save YAML file with proper formatting."""
-    with open(filepath, 'w', encoding='utf-8') as f:
+    with audit_file(filepath), phase('write'), open(filepath, 'w', encoding='utf-8') as f:
         yaml.dump(data, f, default_flow_style=False, allow_unicode=True,
                   sort_keys=False, width=100)
 
+@timed_run(REPORT_PATH)
 def main():
     print("Fixing context management issues...")
 
@@ -132,8 +138,8 @@ def main():
         'fixes': fixes,
     }
 
-    report_path = AUDITS_DIR.parent / 'meta-audit' / 'context-fixes-report.yaml'
-    with open(report_path, 'w') as f:
+    report_path = REPORT_PATH
+    with phase('write-report'), open(report_path, 'w') as f:
         yaml.dump(report, f, default_flow_style=False)
     print(f"\nDetailed report saved to: {report_path}")
 
@@ -1,124 +1,485 @@
 #!/usr/bin/env python3
-"""Regenerate audits.json for the audit browser."""
+"""
+Regenerate the audit browser's data files.
 
+Writes three kinds of output under audit-browser/static/data/:
+
+    manifest.json             Maps logical names to content-addressed files;
+                              the only file clients must revalidate.
+    audits.<hash>.json        Shell loaded on first paint: navigation tree,
+                              stats, filter options and one compact row per
+                              audit (ID, name, category, tier, status and a
+                              bitmask of boolean flags).
+    details/<category>/<subcategory>/<slug>.<hash>.json
+                              Per-audit detail shard (description, execution
+                              summary and full YAML) fetched by the audit
+                              modal on demand. Shards mirror the YAML path
+                              under audits/ since a few audit IDs repeat
+                              across categories.
+
+<hash> is a prefix of the file's SHA-256, and each row carries its shard's
+hash, so every file except the manifest can be cached indefinitely. Output
+is deterministic (no timestamps, sorted inputs): an unchanged catalog
+produces identical bytes and leaves existing files untouched. Files from
+earlier runs that are no longer referenced are removed.
+
+The shell stores rows as arrays described by its `columns` list, with
+categories, subcategories, tiers and statuses as indexes into lookup lists
+and the boolean flags packed into one integer (bit i = `flags[i]`). The
+navigation tree references audits by row index.
+
+`facets` holds a precomputed bitmap and count for every filterable value
+(tier, status, category, subcategory, SDLC phase, automation level and each
+`requires_*` flag), so the browser filters with bitwise ANDs instead of
+scanning rows. Bit i of a bitmap is row i. Bitmaps are run-length encoded:
+alternating runs of clear and set bits, starting with a clear run, each
+length written as an unsigned LEB128 varint, then base64-encoded.
+
+SDLC phases come from AUDIT-INVENTORY.csv (falling back to the YAML
+`sdlc_phases` section); all other fields come from the audit YAML.
+"""
+
+import os
+import csv
+import sys
 import json
-import yaml
+import base64
+import hashlib
+import shutil
 from pathlib import Path
-from datetime import datetime
 
-AUDITS_DIR = Path("/mnt/walnut-drive/dev/audits/audits")
-OUTPUT_PATH = Path("/mnt/walnut-drive/dev/audits/audit-browser/static/data/audits.json")
+SCRIPT_DIR = Path(__file__).parent.resolve()
+BASE_DIR = Path(os.environ.get('AUDITS_BASE_PATH') or SCRIPT_DIR.parent).resolve()
+sys.path.insert(0, str(SCRIPT_DIR.parent / "scripts"))
+
+from audit_catalog import METADATA_SECTIONS, iter_audit_files, parse_audit  # noqa: E402
+
+AUDITS_DIR = BASE_DIR / "audits"
+CSV_PATH = BASE_DIR / "AUDIT-INVENTORY.csv"
+OUTPUT_DIR = SCRIPT_DIR.parent / "audit-browser" / "static" / "data"
+MANIFEST_NAME = "manifest.json"
+SHELL_NAME = "audits.json"
+DETAILS_DIR_NAME = "details"
+
+SHELL_VERSION = 4
+MANIFEST_VERSION = 1
+HASH_LENGTH = 12
+
+SDLC_PHASES = [
+    "discovery", "prd", "task_decomposition", "specification", "tdd",
+    "implementation", "testing", "integration", "deployment", "post_production",
+]
+
+# Boolean fields of AuditInventoryRow, in bit order
+FLAGS = SDLC_PHASES + [
+    "requires_source_code", "requires_runtime_data", "requires_cost_data",
+    "requires_team_input", "requires_production_access",
+    "requires_physical_access", "requires_human_evaluation", "requires_interviews",
+    "fully_automated", "semi_automated", "human_required",
+    "pre_production_only", "production_only", "any_phase",
+]
+
+TIERS = ["focused", "expert", "phd", "standard"]
+STATUSES = ["active", "planned"]
+AUTOMATION_LEVELS = ["fully_automated", "semi_automated", "human_required"]
+
+REQUIREMENT_FLAGS = [name for name in FLAGS if name.startswith('requires_')]
+
+COLUMNS = ["id", "name", "category", "subcategory", "tier", "status", "flags", "file", "detail"]
+
+# execution.automatable values -> automation flag
+AUTOMATION = {
+    "full": "fully_automated", "yes": "fully_automated",
+    "partial": "semi_automated", "minimal": "semi_automated",
+    "manual": "human_required", "none": "human_required", "no": "human_required",
+}
+
+def load_inventory_phases() -> dict[str, dict[str, bool]]:
+    """Read SDLC phase columns from AUDIT-INVENTORY.csv keyed by audit ID."""
+    phases = {}
+    if not CSV_PATH.exists():
+        return phases
+    with open(CSV_PATH, 'r', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            phases[row.get('audit_id', '')] = row_phases(row)
+    return phases
+
+
+def row_phases(row: dict[str, str]) -> dict[str, bool]:
+    """SDLC phase flags of one inventory row."""
+    return {phase: row.get(phase, '').strip().lower() == 'yes' for phase in SDLC_PHASES if phase in row}
+
+
+def format_title(slug: str) -> str:
+    """Format a category/subcategory slug for display."""
+    return ' '.join(word.capitalize() for word in slug.split('-')).replace(' And ', ' & ')
+
+
+def is_true(value) -> bool:
+    return value is True or str(value).strip().lower() in ('true', 'yes')
+
+
+def audit_flags(data: dict, content: str, inventory_phases: dict[str, bool] | None) -> dict[str, bool]:
+    """Compute the boolean flags of one audit."""
+    audit = data.get('audit') or {}
+    execution = data.get('execution') or {}
+    sdlc = data.get('sdlc_phases') or {}
+
+    flags = {name: False for name in FLAGS}
+    for phase in SDLC_PHASES:
+        if inventory_phases and phase in inventory_phases:
+            flags[phase] = inventory_phases[phase]
+        elif isinstance(sdlc, dict) and sdlc:
+            flags[phase] = is_true(sdlc.get(phase, False))
+        else:
+            flags[phase] = True
+    if inventory_phases and 'tdd' not in inventory_phases:
+        flags['tdd'] = flags['testing']
+
+    flags['requires_source_code'] = True  # Most audits need source
+    flags['requires_runtime_data'] = is_true(audit.get('requires_runtime', False))
+    for name in ('requires_physical_access', 'requires_human_evaluation', 'requires_interviews'):
+        flags[name] = is_true(execution.get(name, False)) or f'{name}: true' in content
+
+    automation = AUTOMATION.get(str(execution.get('automatable', '')).strip().lower())
+    if automation:
+        flags[automation] = True
+
+    flags['any_phase'] = True
+    return flags
+
+
+def pack_flags(flags: dict[str, bool]) -> int:
+    return sum(1 << i for i, name in enumerate(FLAGS) if flags.get(name))
+
+
+def build_detail(audit_id: str, file_path: str, data: dict, content: str) -> dict:
+    """Build the on-demand detail shard for one audit."""
+    description = data.get('description') or {}
+    execution = data.get('execution') or {}
+    return {
+        "id": audit_id,
+        "file_path": file_path,
+        "description": {
+            "what": str(description.get('what') or '').strip(),
+            "why_it_matters": str(description.get('why_it_matters') or '').strip(),
+            "when_to_run": description.get('when_to_run') or [],
+        },
+        "execution": {
+            "automatable": str(execution.get('automatable', '')),
+            "severity": str(execution.get('severity', '')),
+            "scope": str(execution.get('scope', '')),
+            "default_profiles": execution.get('default_profiles') or [],
+        },
+        "yaml": content,
+    }
+
+
+def collect_audit(yaml_file: Path,
+                  inventory_phases: dict[str, dict[str, bool]]) -> tuple[dict, dict] | None:
+    """Parse one audit file into its shell record and detail shard."""
+    content = yaml_file.read_text(encoding='utf-8')
+    data = parse_audit(content, yaml_file, METADATA_SECTIONS)
+    if data is None:
+        print(f"  Skipped: {yaml_file.relative_to(BASE_DIR)}")
+        return None
+
+    audit = data['audit']
+    audit_id = str(audit.get('id', ''))
+    if not audit_id:
+        return None
+    rel_path = yaml_file.relative_to(BASE_DIR)
+    category_dir = rel_path.parts[1]
+
+    record = {
+        "id": audit_id,
+        "name": str(audit.get('name', '')),
+        "category": str(audit.get('category', '')),
+        "category_number": int(str(audit.get('category_number') or category_dir[:2]).lstrip('0') or 0),
+        "category_dir": category_dir,
+        "subcategory": str(audit.get('subcategory', '')),
+        "tier": str(audit.get('tier', '')),
+        "status": str(audit.get('status', 'active')),
+        "flags": audit_flags(data, content, inventory_phases.get(audit_id)),
+        "file_path": rel_path.as_posix(),
+    }
+    return record, build_detail(audit_id, rel_path.as_posix(), data, content)
+
+
+def sort_records(records: list[dict]) -> list[dict]:
+    return sorted(records, key=lambda r: (r['category_number'], r['id']))
+
+
+def collect_audits() -> tuple[list[dict], dict[str, dict]]:
+    """Parse the catalog into shell records and detail shards."""
+    inventory_phases = load_inventory_phases()
+    records, details = [], {}
+
+    for yaml_file in iter_audit_files(AUDITS_DIR):
+        collected = collect_audit(yaml_file, inventory_phases)
+        if collected is None:
+            continue
+        record, detail = collected
+        records.append(record)
+        details[record['file_path']] = detail
+
+    return sort_records(records), details
 
-def main():
-    print("=== Regenerating audits.json for browser ===")
 
-    audits = []
+def detail_stem(file_path: str) -> str:
+    """Shard path (without hash and extension) for an audit YAML path."""
+    return file_path.removeprefix('audits/').removesuffix('.yaml')
+
+
+def canonical_file(record: dict) -> str:
+    slug = record['id'].split('.')[-1]
+    return f"audits/{record['category_dir']}/{record['subcategory']}/{slug}.yaml"
+
+
+def build_shell(records: list[dict], detail_hashes: dict[str, str]) -> dict:
+    """Build the compact shell payload."""
     categories = {}
+    for r in records:
+        categories.setdefault(r['category_number'], {
+            "slug": r['category'],
+            "title": format_title(r['category']),
+            "number": r['category_number'],
+            "directory": r['category_dir'],
+        })
+    category_list = [categories[n] for n in sorted(categories)]
+    category_index = {(c['number']): i for i, c in enumerate(category_list)}
+    subcategories = sorted({r['subcategory'] for r in records})
+    subcategory_index = {s: i for i, s in enumerate(subcategories)}
+    tiers = TIERS + sorted({r['tier'] for r in records} - set(TIERS))
+    statuses = STATUSES + sorted({r['status'] for r in records} - set(STATUSES))
+
+    rows = []
+    for r in records:
+        # Only spell out the file path when it is not <category>/<subcategory>/<slug>.yaml
+        file_path = r['file_path'] if r['file_path'] != canonical_file(r) else 0
+        rows.append([
+            r['id'], r['name'], category_index[r['category_number']],
+            subcategory_index[r['subcategory']], tiers.index(r['tier']),
+            statuses.index(r['status']), pack_flags(r['flags']), file_path,
+            detail_hashes[r['file_path']],
+        ])
+
+    # Navigation: categories -> subcategories -> row indexes, sorted for display
+    navigation = []
+    for ci, category in enumerate(category_list):
+        subs = {}
+        for i, r in enumerate(records):
+            if category_index[r['category_number']] == ci:
+                subs.setdefault(r['subcategory'], []).append(i)
+        navigation.append({
+            "category": ci,
+            "subcategories": [
+                {"slug": slug, "title": format_title(slug),
+                 "audits": sorted(indexes, key=lambda i: records[i]['name'])}
+                for slug, indexes in sorted(subs.items(), key=lambda s: format_title(s[0]))
+            ],
+        })
 
-    for yaml_file in sorted(AUDITS_DIR.rglob("*.yaml")):
-        try:
-            with open(yaml_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                data = yaml.safe_load(content)
-
-            if not data or 'audit' not in data:
-                continue
-
-            audit = data.get('audit', {})
-            execution = data.get('execution', {})
-            description = data.get('description', {})
-
-            # Extract category info
-            cat_num = str(audit.get('category_number', '')).zfill(2)
-            cat_name = audit.get('category', '')
-
-            if cat_num not in categories:
-                # Find category directory name
-                rel_path = yaml_file.relative_to(AUDITS_DIR)
-                cat_dir = str(rel_path).split('/')[0]
-                categories[cat_num] = {
-                    "number": cat_num,
-                    "name": cat_name,
-                    "directory": cat_dir,
-                    "audit_count": 0
-                }
-            categories[cat_num]["audit_count"] += 1
-
-            audit_entry = {
-                "id": audit.get('id', ''),
-                "audit_id": audit.get('id', ''),
-                "audit_name": audit.get('name', ''),
-                "name": audit.get('name', ''),
-                "category": cat_name,
-                "category_number": cat_num,
-                "subcategory": audit.get('subcategory', ''),
-                "tier": audit.get('tier', ''),
-                "status": audit.get('status', 'active'),
-                "automatable": execution.get('automatable', ''),
-                "severity": execution.get('severity', ''),
-                "estimated_duration": str(audit.get('estimated_duration', '')),
-                "description": description.get('what', '')[:500] if description.get('what') else '',
-                "why_it_matters": description.get('why_it_matters', '')[:500] if description.get('why_it_matters') else '',
-                "file_path": str(yaml_file.relative_to(AUDITS_DIR.parent)),
-                "requires_runtime": audit.get('requires_runtime', False),
-                "requires_source_code": True,  # Most audits need source
-                "requires_runtime_data": audit.get('requires_runtime', False),
-                "requires_production_access": False,
-                "requires_team_input": False,
-                "requires_cost_data": False,
-                # New metadata fields from meta-audit (check execution section)
-                "requires_physical_access": execution.get('requires_physical_access', False) or 'requires_physical_access: true' in content,
-                "requires_human_evaluation": execution.get('requires_human_evaluation', False) or 'requires_human_evaluation: true' in content,
-                "requires_interviews": execution.get('requires_interviews', False) or 'requires_interviews: true' in content,
-                # SDLC phases (simplified - most apply to all)
-                "discovery": True,
-                "prd": True,
-                "task_decomposition": True,
-                "specification": True,
-                "tdd": True,
-                "implementation": True,
-                "testing": True,
-                "integration": True,
-                "deployment": True,
-                "post_production": True,
-                # Automation levels
-                "fully_automated": execution.get('automatable', '') == 'full',
-                "semi_automated": execution.get('automatable', '') == 'partial',
-                "human_required": execution.get('automatable', '') == 'none',
-                # Phase restrictions
-                "pre_production_only": False,
-                "production_only": False,
-                "any_phase": True,
-            }
-
-            audits.append(audit_entry)
-
-        except Exception as e:
-            print(f"  Error: {yaml_file.name}: {e}")
-
-    # Build output structure
-    output = {
-        "generated": datetime.now().isoformat(),
-        "total_audits": len(audits),
-        "total_categories": len(categories),
-        "categories": list(categories.values()),
-        "audits": audits
+    def count(flag):
+        return sum(1 for r in records if r['flags'][flag])
+
+    stats = {
+        "total": len(records),
+        "active": sum(1 for r in records if r['status'] == 'active'),
+        "planned": sum(1 for r in records if r['status'] == 'planned'),
+        "byTier": {t: sum(1 for r in records if r['tier'] == t) for t in TIERS},
+        "byAutomation": {
+            "fullyAutomated": count('fully_automated'),
+            "semiAutomated": count('semi_automated'),
+            "humanRequired": count('human_required'),
+        },
+        "categories": len({r['category'] for r in records}),
+    }
+
+    filter_options = {
+        "categories": sorted({r['category'] for r in records}),
+        "subcategories": subcategories,
+        "tiers": TIERS,
+        "statuses": STATUSES,
+        "automationLevels": AUTOMATION_LEVELS,
     }
 
-    # Write JSON
-    with open(OUTPUT_PATH, 'w', encoding='utf-8') as f:
-        json.dump(output, f, indent=2)
+    return {
+        "version": SHELL_VERSION,
+        "columns": COLUMNS,
+        "flags": FLAGS,
+        "categories": category_list,
+        "subcategories": subcategories,
+        "tiers": tiers,
+        "statuses": statuses,
+        "navigation": navigation,
+        "stats": stats,
+        "filterOptions": filter_options,
+        "facets": build_facets(records, subcategories),
+        "audits": rows,
+    }
+
+
+def encode_bitmap(members: list[bool]) -> str:
+    """Run-length encode a row bitmap as base64 varints (see module docstring)."""
+    runs, current, length = [], False, 0
+    for bit in members:
+        if bit == current:
+            length += 1
+        else:
+            runs.append(length)
+            current, length = bit, 1
+    if current:
+        runs.append(length)
+
+    out = bytearray()
+    for run in runs:
+        while run >= 0x80:
+            out.append((run & 0x7F) | 0x80)
+            run >>= 7
+        out.append(run)
+    return base64.b64encode(bytes(out)).decode('ascii')
+
+
+def facet(values: dict[str, list[bool]]) -> dict[str, dict]:
+    return {value: {"count": sum(members), "bits": encode_bitmap(members)}
+            for value, members in values.items()}
+
+
+def build_facets(records: list[dict], subcategories: list[str]) -> dict[str, dict]:
+    """Precompute per-value bitmaps and counts for every browser filter."""
+    def by_field(name, values):
+        return facet({v: [r[name] == v for r in records] for v in values})
+
+    def by_flag(names):
+        return facet({n: [r['flags'][n] for r in records] for n in names})
+
+    return {
+        "tier": by_field('tier', TIERS),
+        "status": by_field('status', STATUSES),
+        "category": by_field('category', sorted({r['category'] for r in records})),
+        "subcategory": by_field('subcategory', subcategories),
+        "sdlcPhase": by_flag(SDLC_PHASES),
+        "automationLevel": by_flag(AUTOMATION_LEVELS),
+        "requires": by_flag(REQUIREMENT_FLAGS),
+    }
+
+
+def encode_json(payload) -> bytes:
+    return json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def hashed_name(stem: str, data: bytes) -> str:
+    return f"{stem}.{content_hash(data)}.json"
+
+
+def write_if_changed(path: Path, data: bytes) -> bool:
+    """Write a file unless it already holds these bytes. Returns True if written."""
+    if path.exists() and path.stat().st_size == len(data) and path.read_bytes() == data:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_bytes(data)
+    if path.exists():
+        shutil.copymode(path, tmp)
+    os.replace(tmp, path)
+    return True
+
+
+def remove_stale(output_dir: Path, keep: set[str]) -> int:
+    """Delete generated files not in `keep` (paths relative to output_dir)."""
+    removed = 0
+    candidates = list(output_dir.glob("audits*.json"))
+    details_dir = output_dir / DETAILS_DIR_NAME
+    if details_dir.exists():
+        candidates += details_dir.rglob("*.json")
+    for path in candidates:
+        if path.relative_to(output_dir).as_posix() not in keep:
+            path.unlink()
+            removed += 1
+    if details_dir.exists():
+        for directory in sorted(details_dir.rglob("*"), reverse=True):
+            if directory.is_dir() and not any(directory.iterdir()):
+                directory.rmdir()
+    return removed
+
+
+def encode_detail(file_path: str, detail: dict) -> tuple[str, str, bytes]:
+    """Encode one detail shard. Returns (output name, hash, bytes)."""
+    data = encode_json(detail)
+    digest = content_hash(data)
+    return f"{DETAILS_DIR_NAME}/{detail_stem(file_path)}.{digest}.json", digest, data
+
+
+def build_files(records: list[dict],
+                shards: dict[str, tuple[str, str, bytes]]) -> tuple[dict[str, bytes], dict]:
+    """
+    Encode every output file, keyed by path relative to the output directory.
+
+    `shards` maps each audit's YAML path to its encode_detail() result.
+    """
+    files = {name: data for name, _, data in shards.values()}
+    detail_hashes = {file_path: digest for file_path, (_, digest, _) in shards.items()}
+
+    shell = build_shell(records, detail_hashes)
+    shell_data = encode_json(shell)
+    shell_name = hashed_name(SHELL_NAME.removesuffix('.json'), shell_data)
+    files[shell_name] = shell_data
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "files": {
+            SHELL_NAME: {
+                "path": shell_name,
+                "sha256": hashlib.sha256(shell_data).hexdigest(),
+                "size": len(shell_data),
+            },
+        },
+        "details": {
+            "path": DETAILS_DIR_NAME,
+            "count": len(shards),
+            "size": sum(len(files[name]) for name in files if name.startswith(DETAILS_DIR_NAME + '/')),
+        },
+    }
+    files[MANIFEST_NAME] = encode_json(manifest)
+    return files, shell
+
+
+def write_outputs(output_dir: Path, files: dict[str, bytes]) -> tuple[int, int]:
+    """Write changed files and drop stale ones. Returns (written, removed)."""
+    written = sum(write_if_changed(output_dir / name, data) for name, data in files.items())
+    removed = remove_stale(output_dir, set(files))
+    return written, removed
+
+
+def main():
+    print("=== Regenerating browser data ===")
+    if not AUDITS_DIR.exists():
+        print(f"Error: Audits directory not found: {AUDITS_DIR}", file=sys.stderr)
+        sys.exit(1)
+
+    records, details = collect_audits()
+    files, shell = build_files(records, {path: encode_detail(path, detail) for path, detail in details.items()})
+    manifest = json.loads(files[MANIFEST_NAME])
+    shell_file = manifest['files'][SHELL_NAME]
+
+    written, removed = write_outputs(OUTPUT_DIR, files)
+    print(f"  Generated: {OUTPUT_DIR / shell_file['path']} ({shell_file['size'] / 1024:.0f} KB)")
+    print(f"  Detail shards: {len(details)} ({manifest['details']['size'] / 1024 / 1024:.1f} MB total)")
+    print(f"  Files written: {written}, unchanged: {len(files) - written}, removed: {removed}")
+    print(f"  Audits: {len(records)}")
+    print(f"  Categories: {len(shell['categories'])}")
 
-    print(f"  Generated: {OUTPUT_PATH}")
-    print(f"  Audits: {len(audits)}")
-    print(f"  Categories: {len(categories)}")
+    # Also refresh the build directory if a static build exists
+    build_dir = OUTPUT_DIR.parent.parent / "build" / "data"
+    if build_dir.exists():
+        write_outputs(build_dir, files)
+        print(f"  Also updated: {build_dir}")
 
-    # Also copy to build directory if it exists
-    build_path = OUTPUT_PATH.parent.parent / "build" / "data" / "audits.json"
-    if build_path.parent.exists():
-        with open(build_path, 'w', encoding='utf-8') as f:
-            json.dump(output, f, indent=2)
-        print(f"  Also updated: {build_path}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Stream the files of archives and container images without extracting them.
+
+discovery_scanner.py accepts these as --target besides directories:
+
+- `.tar`, `.tar.gz` and `.tgz` archives of a file tree (release artifacts)
+- OCI image layout directories (with an `oci-layout` file), and `.tar`
+  archives of one, such as `docker save` output from Docker 25 and later
+- older `docker save` archives (a top-level `manifest.json` listing layer
+  tarballs)
+
+iter_archive() yields (path, read) pairs for the files visible in the final
+filesystem; `read()` returns the member's bytes and must be called before the
+next pair is taken, since members are read straight from the (possibly
+compressed) stream. Nothing is written to disk.
+
+Image layers are read top layer first. A path already seen in a higher layer
+shadows the same path below it, and whiteouts apply to the layers under the
+one that holds them: `.wh.<name>` hides `<name>`, `.wh..wh..opq` hides
+everything below its directory. So every visible file is read once, and
+deleted files are never read.
+
+Usage:
+    python scripts/archive_source.py image-layout/       # list visible files
+    python scripts/archive_source.py release.tar.gz
+"""
+
+import sys
+import json
+import tarfile
+import argparse
+from pathlib import Path, PurePosixPath
+from typing import IO, Any, Callable, Iterator
+
+WHITEOUT_PREFIX = '.wh.'
+OPAQUE_WHITEOUT = '.wh..wh..opq'
+
+ARCHIVE_SUFFIXES = ('.tar', '.tar.gz', '.tgz')
+
+INDEX_MEDIA_TYPES = {
+    'application/vnd.oci.image.index.v1+json',
+    'application/vnd.docker.distribution.manifest.list.v2+json',
+}
+
+# Platform picked from a multi-platform index when it offers one
+PREFERRED_PLATFORM = ('linux', 'amd64')
+
+Member = tuple[str, Callable[[], bytes | None]]
+
+
+class ArchiveError(Exception):
+    """An archive or image layout that cannot be read."""
+
+
+def is_archive_target(path: Path) -> bool:
+    """Check whether a scan target is an archive or image layout rather than a source tree."""
+    if path.is_dir():
+        return (path / 'oci-layout').is_file()
+    return path.is_file() and path.name.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def member_path(name: str) -> str:
+    """Normalize a tar member name to a relative POSIX path."""
+    parts = [p for p in PurePosixPath(name.lstrip('/')).parts if p not in ('.', '')]
+    return '/'.join(parts)
+
+
+def reader(tar: tarfile.TarFile, member: tarfile.TarInfo, max_bytes: int) -> Callable[[], bytes | None]:
+    """Read a regular member's bytes, or None if it is larger than max_bytes."""
+    def read() -> bytes | None:
+        if member.size > max_bytes:
+            return None
+        f = tar.extractfile(member)
+        return f.read() if f is not None else None
+    return read
+
+
+def no_content() -> None:
+    return None
+
+
+def iter_tar_tree(fileobj: IO[bytes] | None, path: Path | None, max_bytes: int) -> Iterator[Member]:
+    """Files of a plain (optionally compressed) tarball, streamed in archive order."""
+    try:
+        with tarfile.open(name=path, fileobj=fileobj, mode='r|*') as tar:
+            for member in tar:
+                rel_path = member_path(member.name)
+                if not rel_path or member.isdir():
+                    continue
+                if member.isreg():
+                    yield rel_path, reader(tar, member, max_bytes)
+                elif member.issym() or member.islnk():
+                    yield rel_path, no_content
+    except tarfile.TarError as e:
+        raise ArchiveError(f"{path or 'layer'}: {e}") from e
+
+
+class BlobStore:
+    """Named files of an image layout, in a directory or an uncompressed tar."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.tar = None if path.is_dir() else tarfile.open(path, 'r:')
+        # Archived layouts may name members `./index.json` or `index.json`
+        self.members = {} if self.tar is None else {member_path(m.name): m for m in self.tar.getmembers()}
+
+    def exists(self, name: str) -> bool:
+        if self.tar is None:
+            return (self.path / name).is_file()
+        return name in self.members
+
+    def open(self, name: str) -> IO[bytes]:
+        if self.tar is None:
+            return open(self.path / name, 'rb')
+        if name not in self.members:
+            raise ArchiveError(f"{self.path}: {name} is missing")
+        f = self.tar.extractfile(self.members[name])
+        if f is None:
+            raise ArchiveError(f"{self.path}: {name} is not a file")
+        return f
+
+    def json(self, name: str) -> Any:
+        try:
+            with self.open(name) as f:
+                return json.load(f)
+        except (OSError, KeyError, json.JSONDecodeError) as e:
+            raise ArchiveError(f"{self.path}: cannot read {name}: {e}") from e
+
+    def close(self) -> None:
+        if self.tar is not None:
+            self.tar.close()
+
+
+def blob_name(digest: str) -> str:
+    algorithm, _, encoded = digest.partition(':')
+    return f"blobs/{algorithm}/{encoded}"
+
+
+def pick_manifest(store: BlobStore, index: dict[str, Any]) -> dict[str, Any]:
+    """Follow an image index (possibly nested) down to one image manifest."""
+    manifests = index.get('manifests') or []
+    if not manifests:
+        raise ArchiveError(f"{store.path}: image index lists no manifests")
+    preferred = [m for m in manifests
+                 if (m.get('platform', {}).get('os'), m.get('platform', {}).get('architecture')) == PREFERRED_PLATFORM]
+    descriptor = (preferred or manifests)[0]
+    document = store.json(blob_name(descriptor['digest']))
+    if descriptor.get('mediaType') in INDEX_MEDIA_TYPES or document.get('manifests'):
+        return pick_manifest(store, document)
+    return document
+
+
+def image_layers(store: BlobStore) -> list[str] | None:
+    """Layer blob names of an image, bottom layer first, or None if the store is not an image."""
+    if store.exists('oci-layout') and store.exists('index.json'):
+        manifest = pick_manifest(store, store.json('index.json'))
+        layers = []
+        for layer in manifest.get('layers') or []:
+            if 'zstd' in layer.get('mediaType', ''):
+                raise ArchiveError(f"{store.path}: zstd-compressed layers are not supported")
+            layers.append(blob_name(layer['digest']))
+        return layers
+    if store.exists('manifest.json'):
+        try:
+            manifest = store.json('manifest.json')
+        except ArchiveError:
+            return None  # an ordinary file of a source tarball
+        if isinstance(manifest, list) and manifest and isinstance(manifest[0], dict) \
+                and isinstance(manifest[0].get('Layers'), list):
+            return manifest[0]['Layers']
+    return None
+
+
+def hidden(rel_path: str, removed: set[str], opaque: set[str]) -> bool:
+    """Is a lower-layer path deleted, replaced, or under an opaque directory of a higher layer?"""
+    if rel_path in removed:
+        return True
+    parts = rel_path.split('/')
+    for depth in range(1, len(parts)):
+        ancestor = '/'.join(parts[:depth])
+        if ancestor in removed or ancestor in opaque:
+            return True
+    return False
+
+
+def iter_image(store: BlobStore, layers: list[str], max_bytes: int) -> Iterator[Member]:
+    """Files of an image's final filesystem, read top layer first."""
+    removed: set[str] = set()   # deleted or already provided by a higher layer
+    opaque: set[str] = set()
+    for layer in reversed(layers):
+        layer_removed, layer_opaque = set(), set()
+        with store.open(layer) as blob:
+            for rel_path, read in iter_tar_tree(blob, None, max_bytes):
+                directory, _, name = rel_path.rpartition('/')
+                if name == OPAQUE_WHITEOUT:
+                    layer_opaque.add(directory)
+                    continue
+                if name.startswith(WHITEOUT_PREFIX):
+                    layer_removed.add(f"{directory}/{name[len(WHITEOUT_PREFIX):]}".lstrip('/'))
+                    continue
+                if hidden(rel_path, removed, opaque):
+                    continue
+                layer_removed.add(rel_path)
+                yield rel_path, read
+        # Whiteouts in this layer only hide what lies below it
+        removed |= layer_removed
+        opaque |= layer_opaque
+
+
+def iter_archive(path: Path, max_bytes: int) -> Iterator[Member]:
+    """Files visible in an archive or image, as (relative path, read) pairs."""
+    if path.is_dir() or path.name.lower().endswith('.tar'):
+        store = BlobStore(path) if path.is_dir() or tarfile.is_tarfile(path) else None
+        if store is not None:
+            try:
+                layers = image_layers(store)
+                if layers is not None:
+                    yield from iter_image(store, layers, max_bytes)
+                    return
+            finally:
+                store.close()
+    if path.is_dir():
+        raise ArchiveError(f"{path}: not an image layout")
+    yield from iter_tar_tree(None, path, max_bytes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List the files visible in an archive or container image.")
+    parser.add_argument('archive', help=".tar/.tar.gz archive or OCI image layout directory")
+    args = parser.parse_args()
+
+    path = Path(args.archive)
+    if not is_archive_target(path):
+        print(f"Error: Not an archive or image layout: {path}", file=sys.stderr)
+        sys.exit(1)
+    count = 0
+    try:
+        for rel_path, read in iter_archive(path, max_bytes=0):
+            print(rel_path)
+            count += 1
+    except ArchiveError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"{count} files", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Shared catalog helpers for audit tooling.
+
+Locates audit YAML files, parses them, and selects the audits that belong
+to a profile. Profile membership follows the template: an explicit
+`profiles.membership.<profile>.included` wins, otherwise the audit is in
+every profile listed under `execution.default_profiles`.
+
+Callers that only need some top-level sections can pass `sections=` to
+`load_audit`/`load_catalog`. The file is then split at its column-0 keys
+and only the requested slices are handed to the YAML parser, so metadata
+consumers skip the long `signals`, `procedure` and `knowledge_sources`
+blocks. Files that cannot be split safely (directives, multiple documents,
+complex keys, aliases into skipped sections) fall back to a full parse.
+"""
+
+import re
+import sys
+import yaml
+from pathlib import Path
+from typing import Any, Collection, Iterator
+
+from instrumentation import audit_file, phase
+
+# Determine base directory (script can run from anywhere)
+SCRIPT_DIR = Path(__file__).parent.resolve()
+BASE_DIR = SCRIPT_DIR.parent
+AUDITS_DIR = BASE_DIR / "audits"
+
+# Prefer the libyaml loader when PyYAML was built with it
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# What the inventory and browser exporter read from each audit
+METADATA_SECTIONS = ('audit', 'execution', 'description', 'sdlc_phases')
+
+# A column-0 line is a top-level key, a comment, an item of an indentless
+# sequence under the previous key, or something we do not split
+TOP_LEVEL_LINE = re.compile(r'^(?:([A-Za-z_][\w-]*)[ \t]*:(?:[ \t]|$)|#|-(?:[ \t]|$)|$)')
+
+
+def iter_audit_files(audits_dir: Path = AUDITS_DIR) -> Iterator[Path]:
+    """Yield every audit YAML file in a stable order."""
+    yield from sorted(Path(audits_dir).rglob("*.yaml"))
+
+
+def top_level_spans(text: str) -> dict[str, tuple[int, int]] | None:
+    """
+    Character spans of each top-level section, or None if the text cannot
+    be split at column-0 keys (the caller should parse it whole).
+    """
+    starts = []
+    offset = 0
+    for line in text.splitlines(keepends=True):
+        if line[:1] not in ('', ' ', '\t', '\n', '\r'):
+            match = TOP_LEVEL_LINE.match(line)
+            if match is None:
+                return None
+            if match.group(1):
+                starts.append((match.group(1), offset))
+        offset += len(line)
+
+    spans = {}
+    for i, (key, start) in enumerate(starts):
+        end = starts[i + 1][1] if i + 1 < len(starts) else len(text)
+        if key in spans:
+            return None
+        spans[key] = (start, end)
+    return spans
+
+
+def parse_audit(text: str, source: Path | str,
+                sections: Collection[str] | None = None) -> dict[str, Any] | None:
+    """
+    Parse audit YAML text, returning None for unusable documents.
+
+    With `sections`, only those top-level sections (plus `audit`) are
+    parsed and returned.
+    """
+    data = None
+    if sections is not None:
+        wanted = set(sections) | {'audit'}
+        spans = top_level_spans(text)
+        if spans is not None:
+            chunk = ''.join(text[start:end] for key, (start, end) in spans.items() if key in wanted)
+            try:
+                data = yaml.load(chunk, Loader=YamlLoader) if chunk else {}
+            except yaml.YAMLError:
+                data = None  # e.g. an alias to a skipped section; parse the whole file
+
+    try:
+        if data is None:
+            data = yaml.load(text, Loader=YamlLoader)
+            if sections is not None and isinstance(data, dict):
+                data = {key: value for key, value in data.items() if key in wanted}
+    except yaml.YAMLError as e:
+        print(f"  YAML error in {source}: {e}", file=sys.stderr)
+        return None
+
+    if not isinstance(data, dict) or not isinstance(data.get('audit'), dict):
+        return None
+    return data
+
+
+def load_audit(yaml_path: Path, sections: Collection[str] | None = None) -> dict[str, Any] | None:
+    """Parse a single audit file (optionally only some sections), returning None for unusable files."""
+    try:
+        text = Path(yaml_path).read_text(encoding='utf-8')
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"  Error reading {yaml_path}: {e}", file=sys.stderr)
+        return None
+
+    with audit_file(yaml_path), phase('parse'):
+        return parse_audit(text, yaml_path, sections)
+
+
+def audit_id_of(data: dict[str, Any]) -> str:
+    """Return the audit ID of a parsed audit."""
+    return str(data.get('audit', {}).get('id', ''))
+
+
+def in_profile(data: dict[str, Any], profile: str) -> bool:
+    """Check whether a parsed audit belongs to the given profile."""
+    membership = (data.get('profiles') or {}).get('membership') or {}
+    entry = membership.get(profile) if isinstance(membership, dict) else None
+    if isinstance(entry, dict) and 'included' in entry:
+        return bool(entry['included'])
+
+    default_profiles = (data.get('execution') or {}).get('default_profiles') or []
+    return profile in default_profiles
+
+
+def load_catalog(audits_dir: Path = AUDITS_DIR,
+                 profile: str | None = None,
+                 audit_ids: set[str] | None = None,
+                 sections: Collection[str] | None = None) -> dict[str, dict[str, Any]]:
+    """
+    Load audits keyed by audit ID.
+
+    Optionally restrict to a profile and/or an explicit set of audit IDs,
+    and parse only the given top-level sections. Each parsed audit gets a
+    `_file_path` entry relative to BASE_DIR so callers can report where an
+    audit came from.
+    """
+    if sections is not None and profile:
+        sections = set(sections) | {'profiles', 'execution'}
+
+    catalog = {}
+    for yaml_path in iter_audit_files(audits_dir):
+        data = load_audit(yaml_path, sections)
+        if data is None:
+            continue
+
+        audit_id = audit_id_of(data)
+        if not audit_id:
+            continue
+        if audit_ids is not None and audit_id not in audit_ids:
+            continue
+        if profile and not in_profile(data, profile):
+            continue
+
+        try:
+            data['_file_path'] = str(yaml_path.resolve().relative_to(BASE_DIR))
+        except ValueError:
+            data['_file_path'] = str(yaml_path)
+        catalog[audit_id] = data
+
+    return catalog
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Render AUDIT-MENU.md from AUDIT-INVENTORY.csv.
+
+build-menu.sh runs this module; catalog_watch.py imports it to re-render
+only the categories whose audits changed. Each category section depends
+only on that category's rows, so `render_menu` accepts a cache of
+rendered sections keyed by category number and fills in the missing ones.
+
+Usage:
+    python scripts/audit_menu.py [CSV_FILE] [MD_FILE]
+"""
+
+import sys
+import csv
+from collections import defaultdict
+from datetime import date
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent.resolve()
+BASE_DIR = SCRIPT_DIR.parent
+CSV_PATH = BASE_DIR / "AUDIT-INVENTORY.csv"
+MD_PATH = BASE_DIR / "AUDIT-MENU.md"
+
+# Cluster definitions (category number ranges)
+CLUSTERS = {
+    "Core Technical": (1, 12),
+    "Infrastructure": (13, 16),
+    "Human & Experience": (17, 23),
+    "Process & Governance": (24, 30),
+    "Economics & Dependencies": (31, 33),
+    "Specialized Domains": (34, 43),
+}
+
+# Category display names (slug -> display name)
+CATEGORY_NAMES = {
+    "security-trust": "Security & Trust",
+    "performance-efficiency": "Performance & Efficiency",
+    "reliability-resilience": "Reliability & Resilience",
+    "scalability-capacity": "Scalability & Capacity",
+    "observability-instrumentation": "Observability & Instrumentation",
+    "code-quality": "Code Quality",
+    "architecture-design": "Architecture & Design",
+    "data-state-management": "Data & State Management",
+    "api-integration": "API & Integration",
+    "testing-quality-assurance": "Testing & Quality Assurance",
+    "devops-ci-cd": "DevOps & CI/CD",
+    "cloud-infrastructure": "Cloud Infrastructure",
+    "infrastructure-as-code": "Infrastructure as Code",
+    "usability-interaction": "Usability & Interaction",
+    "accessibility-inclusion": "Accessibility & Inclusion",
+    "seo-discoverability": "SEO & Discoverability",
+    "human-organizational": "Human & Organizational",
+    "ethical-societal": "Ethical & Societal",
+    "compliance-legal": "Compliance & Legal",
+    "vendor-third-party": "Vendor & Third Party",
+    "emotional-design-trust": "Emotional Design & Trust",
+    "gamification-behavioral": "Gamification & Behavioral",
+    "compliance-governance": "Compliance & Governance",
+    "operational-excellence": "Operational Excellence",
+    "documentation-knowledge": "Documentation & Knowledge",
+    "requirements-specification": "Requirements & Specification",
+    "risk-management": "Risk Management",
+    "configuration-management": "Configuration Management",
+    "cost-economics": "Cost & Economics",
+    "dependency-supply-chain": "Dependency & Supply Chain",
+    "legacy-migration": "Legacy & Migration",
+    "business-logic-domain": "Business Logic & Domain",
+    "developer-experience": "Developer Experience",
+    "internationalization-localization": "Internationalization & Localization",
+    "machine-learning-ai": "Machine Learning & AI",
+    "sensors-physical-systems": "Sensors & Physical Systems",
+    "real-time-embedded": "Real-Time & Embedded",
+    "signal-processing-data-acquisition": "Signal Processing & Data Acquisition",
+    "blockchain-distributed-ledger": "Blockchain & Distributed Ledger",
+    "quantum-computing": "Quantum Computing",
+    "metaverse-immersive": "Metaverse & Immersive",
+}
+
+def get_cluster(cat_num):
+    """Get cluster name for a category number."""
+    for cluster, (start, end) in CLUSTERS.items():
+        if start <= cat_num <= end:
+            return cluster
+    return "Other"
+
+def format_subcategory(subcat):
+    """Format subcategory slug to display name."""
+    return subcat.replace("-", " ").title()
+
+def get_category_display(cat_slug):
+    """Get display name for category."""
+    return CATEGORY_NAMES.get(cat_slug, cat_slug.replace("-", " ").title())
+
+def read_rows(csv_path: Path = CSV_PATH) -> list[dict[str, str]]:
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+
+def group_rows(rows: list[dict[str, str]]) -> tuple[dict[int, dict[str, list[str]]], dict[int, str]]:
+    """Audit names by category number and subcategory, plus each category's slug."""
+    audits_by_category = defaultdict(lambda: defaultdict(list))
+    category_info = {}  # category_num -> category_slug
+
+    for row in rows:
+        cat_num = row['category_number']
+        cat_slug = row['category']
+        subcat = row['subcategory']
+        audit_name = row['audit_name']
+
+        # Skip invalid rows
+        if not cat_num or not cat_num.isdigit():
+            continue
+
+        cat_num_int = int(cat_num)
+        audits_by_category[cat_num_int][subcat].append(audit_name)
+
+        if cat_num_int not in category_info:
+            category_info[cat_num_int] = cat_slug
+
+    return audits_by_category, category_info
+
+
+def render_category(cat_num: int, cat_slug: str, subcats: dict[str, list[str]]) -> list[str]:
+    """Markdown lines of one category section."""
+    lines = []
+    cat_display = get_category_display(cat_slug)
+
+    # Count audits in this category
+    cat_audit_count = sum(len(audits) for audits in subcats.values())
+
+    lines.append(f"### Category {cat_num}: {cat_display}")
+    lines.append(f"**File:** `{cat_num:02d}-{cat_slug}.md` | **Audits:** {cat_audit_count}")
+    lines.append("")
+
+    # Sort subcategories and list audits
+    for index, subcat in enumerate(sorted(subcats.keys())):
+        audits = subcats[subcat]
+        subcat_display = format_subcategory(subcat)
+        lines.append(f"#### {cat_num}.{index + 1} {subcat_display}")
+
+        for audit in sorted(audits):
+            lines.append(f"- {audit}")
+
+        lines.append("")
+    return lines
+
+
+def render_menu(audits_by_category: dict[int, dict[str, list[str]]], category_info: dict[int, str],
+                sections: dict[int, list[str]] | None = None) -> str:
+    """
+    Render the whole menu. `sections` caches rendered category sections by
+    category number; missing entries are rendered and stored.
+    """
+    if sections is None:
+        sections = {}
+
+    # Count audits per cluster
+    cluster_counts = defaultdict(int)
+    for cat_num, subcats in audits_by_category.items():
+        cluster = get_cluster(cat_num)
+        for subcat, audits in subcats.items():
+            cluster_counts[cluster] += len(audits)
+
+    lines = []
+
+    # Header
+    total_audits = sum(len(a) for subcats in audits_by_category.values() for a in subcats.values())
+    total_categories = len(category_info)
+
+    lines.append("# Audit Taxonomy - Master Menu")
+    lines.append("")
+    lines.append("> Complete listing of all audits across all categories. Use this file to identify relevant audits for a given task, then pull the specific category file for detailed guidance.")
+    lines.append("")
+    lines.append(f"**Total Categories:** {total_categories}  ")
+    lines.append(f"**Total Audits:** {total_audits:,}  ")
+    lines.append(f"**Last Updated:** {date.today().strftime('%B %Y')}  ")
+    lines.append("**Generated From:** AUDIT-INVENTORY.csv")
+    lines.append("")
+    lines.append("---")
+    lines.append("")
+
+    # Quick Navigation
+    lines.append("## Quick Navigation")
+    lines.append("")
+    lines.append("| Cluster | Categories | Audits |")
+    lines.append("|---------|------------|--------|")
+
+    for cluster, (start, end) in CLUSTERS.items():
+        anchor = cluster.lower().replace(" ", "-").replace("&", "")
+        count = cluster_counts[cluster]
+        lines.append(f"| [{cluster}](#{anchor}-categories-{start}-{end}) | {start}-{end} | {count:,} |")
+
+    lines.append("")
+    lines.append("---")
+    lines.append("")
+
+    # Generate each cluster section
+    for cluster, (start, end) in CLUSTERS.items():
+        lines.append(f"## {cluster} (Categories {start}-{end})")
+        lines.append("")
+
+        # Get categories in this cluster
+        for cat_num in sorted([c for c in category_info.keys() if start <= c <= end]):
+            if cat_num not in sections:
+                sections[cat_num] = render_category(cat_num, category_info[cat_num], audits_by_category[cat_num])
+            lines.extend(sections[cat_num])
+
+        lines.append("---")
+        lines.append("")
+
+    return '\n'.join(lines)
+
+
+def main():
+    csv_path = Path(sys.argv[1]) if len(sys.argv) > 1 else CSV_PATH
+    md_path = Path(sys.argv[2]) if len(sys.argv) > 2 else MD_PATH
+
+    audits_by_category, category_info = group_rows(read_rows(csv_path))
+    with open(md_path, 'w', encoding='utf-8') as f:
+        f.write(render_menu(audits_by_category, category_info))
+
+    total_audits = sum(len(a) for subcats in audits_by_category.values() for a in subcats.values())
+    print(f"Generated {total_audits:,} audits across {len(category_info)} categories")
+
+
+if __name__ == "__main__":
+    main()
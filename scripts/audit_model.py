@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Typed in-memory model of an audit.
+
+Parsed audit YAML is a tree of dicts and lists whose shape varies from
+file to file: sections may be missing, null or the wrong type, and the
+same value is spelled several ways (`automatable: yes` parses as a bool
+while `automatable: 'yes'` stays a string; `cognitive_mode` shows up as
+`Critical`, `"critical"` or `critical `). `Audit.from_dict` walks one
+parsed file once, coerces those variants and returns slotted objects, so
+consumers read `audit.steps` instead of chaining `.get(..., {})` calls
+and `isinstance` checks.
+
+The model keeps the fields the catalog scripts read (metadata, execution,
+description, signals, procedure, closeout, discovery patterns, tooling,
+profiles, relationships). Repeated enum-like strings are interned, so a
+catalog of models is much smaller than the dicts it came from:
+
+    python scripts/audit_model.py --measure
+"""
+
+import gc
+import sys
+import argparse
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from audit_catalog import AUDITS_DIR, BASE_DIR, in_profile, iter_audit_files, load_audit
+
+SIGNAL_LEVELS = ('critical', 'high', 'medium', 'low', 'positive')
+
+
+def _intern(value: Any, default: str = '') -> str:
+    """Interned, stripped string for an enum-like value."""
+    if value is None:
+        return default
+    if isinstance(value, bool):
+        return 'yes' if value else 'no'
+    return sys.intern(str(value).strip())
+
+
+def _keyword(value: Any, default: str = '') -> str:
+    """Enum-like value lowercased with stray quotes removed."""
+    return _intern(_intern(value, default).strip('\'"').strip().lower(), default) or default
+
+
+def _text(value: Any) -> str:
+    if value is None:
+        return ''
+    return value if isinstance(value, str) else str(value)
+
+
+def _flag(value: Any) -> bool:
+    return value is True or str(value).strip().lower() in ('true', 'yes')
+
+
+def _section(data: Any, key: str) -> dict:
+    value = data.get(key) if isinstance(data, dict) else None
+    return value if isinstance(value, dict) else {}
+
+
+def _items(value: Any) -> list:
+    return value if isinstance(value, list) else []
+
+
+def _strings(value: Any) -> tuple[str, ...]:
+    """A list of scalars (or a single scalar) as a tuple of strings."""
+    if value is None:
+        return ()
+    if isinstance(value, list):
+        return tuple(_text(v) for v in value if v is not None and not isinstance(v, (dict, list)))
+    return (_text(value),)
+
+
+@dataclass(slots=True)
+class Signal:
+    id: str
+    level: str
+    signal: str
+    remediation: str = ''
+    explanation: str = ''
+    evidence_pattern: str = ''
+    evidence_indicators: tuple[str, ...] = ()
+    evidence_threshold: str = ''
+    cwe: str = ''
+
+    @classmethod
+    def from_dict(cls, level: str, raw: dict) -> 'Signal':
+        return cls(
+            id=_intern(raw.get('id')),
+            level=level,
+            signal=_text(raw.get('signal')),
+            remediation=_text(raw.get('remediation')),
+            explanation=_text(raw.get('explanation')),
+            evidence_pattern=_text(raw.get('evidence_pattern')),
+            evidence_indicators=_strings(raw.get('evidence_indicators')),
+            evidence_threshold=_text(raw.get('evidence_threshold')),
+            cwe=_intern(raw.get('cwe') or raw.get('cwe_id')),
+        )
+
+
+@dataclass(slots=True)
+class Command:
+    command: str
+    purpose: str = ''
+
+    @classmethod
+    def from_value(cls, raw: Any) -> 'Command':
+        if isinstance(raw, dict):
+            return cls(_text(raw.get('command')), _text(raw.get('purpose')))
+        return cls(_text(raw))
+
+
+@dataclass(slots=True)
+class Step:
+    id: str
+    name: str
+    description: str = ''
+    duration_estimate: str = ''
+    commands: tuple[Command, ...] = ()
+    expected_findings: tuple[str, ...] = ()
+    questions: tuple[str, ...] = ()
+    verification: str = ''
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> 'Step':
+        return cls(
+            id=_intern(raw.get('id')),
+            name=_text(raw.get('name')),
+            description=_text(raw.get('description')),
+            duration_estimate=_intern(raw.get('duration_estimate')),
+            commands=tuple(Command.from_value(c) for c in _items(raw.get('commands')) if c),
+            expected_findings=_strings(raw.get('expected_findings')),
+            questions=_strings(raw.get('questions')),
+            verification=_text(raw.get('verification')),
+        )
+
+
+@dataclass(slots=True)
+class ChecklistItem:
+    id: str
+    item: str
+    level: str = ''
+    verification: str = ''
+    expected: str = ''
+
+    @property
+    def manual(self) -> bool:
+        return self.verification == 'manual'
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> 'ChecklistItem':
+        verification = raw.get('verification')
+        return cls(
+            id=_intern(raw.get('id')),
+            item=_text(raw.get('item')),
+            level=_keyword(raw.get('level')),
+            # Usually a command; `manual` is the keyword for human verification
+            verification='manual' if _keyword(verification) == 'manual' else _text(verification),
+            expected=_text(raw.get('expected')),
+        )
+
+
+@dataclass(slots=True)
+class Pattern:
+    kind: str            # "code" (regex) or "file" (glob)
+    pattern: str
+    purpose: str = ''
+    type: str = ''
+    scope: str = ''
+
+    @classmethod
+    def code(cls, raw: dict) -> 'Pattern':
+        return cls('code', _text(raw.get('pattern')), _text(raw.get('purpose')),
+                   _keyword(raw.get('type')), _keyword(raw.get('scope')))
+
+    @classmethod
+    def file(cls, raw: dict) -> 'Pattern':
+        return cls('file', _text(raw.get('glob')), _text(raw.get('purpose')))
+
+
+@dataclass(slots=True)
+class Audit:
+    id: str
+    name: str
+    file_path: str
+    category: str = ''
+    category_number: int = 0
+    subcategory: str = ''
+    tier: str = ''
+    status: str = 'active'
+    version: str = ''
+    estimated_duration: str = ''
+    requires_runtime: bool = False
+    destructive: bool = False
+
+    automatable: str = ''
+    severity: str = ''
+    scope: str = ''
+    default_profiles: tuple[str, ...] = ()
+    requires_interviews: bool = False
+    requires_physical_access: bool = False
+    requires_human_evaluation: bool = False
+
+    what: str = ''
+    why_it_matters: str = ''
+    when_to_run: tuple[str, ...] = ()
+
+    cognitive_mode: str = ''
+    ensemble_role: str = ''
+    signals: tuple[Signal, ...] = ()
+    steps: tuple[Step, ...] = ()
+    closeout: tuple[ChecklistItem, ...] = ()
+    code_patterns: tuple[Pattern, ...] = ()
+    file_patterns: tuple[Pattern, ...] = ()
+
+    static_tools: tuple[str, ...] = ()
+    scripts: tuple[str, ...] = ()        # language of each tooling script ('' if unset)
+    profiles: tuple[str, ...] = ()
+    related: tuple[str, ...] = ()
+    sdlc_phases: dict[str, bool] = field(default_factory=dict)
+
+    def signals_at(self, level: str) -> tuple[Signal, ...]:
+        return tuple(s for s in self.signals if s.level == level)
+
+    @property
+    def has_commands(self) -> bool:
+        return any(step.commands for step in self.steps)
+
+    @classmethod
+    def from_dict(cls, data: dict, file_path: str | Path = '') -> 'Audit':
+        """Normalize one parsed audit file."""
+        audit = _section(data, 'audit')
+        execution = _section(data, 'execution')
+        description = _section(data, 'description')
+        procedure = _section(data, 'procedure')
+        context = _section(procedure, 'context')
+        discovery = _section(data, 'discovery')
+        tooling = _section(data, 'tooling')
+        signals = _section(data, 'signals')
+
+        static_tools = []
+        for entry in _items(tooling.get('static_analysis')):
+            tool = entry.get('tool') if isinstance(entry, dict) else entry
+            if isinstance(tool, str) and tool:
+                static_tools.append(_intern(tool.lower()))
+
+        membership = _section(_section(data, 'profiles'), 'membership')
+        profiles = [_intern(name) for name, entry in membership.items()
+                    if isinstance(entry, dict) and entry.get('included')]
+        if not membership:
+            profiles = [_intern(p) for p in _strings(execution.get('default_profiles'))]
+
+        number = audit.get('category_number')
+        try:
+            category_number = int(number) if number not in (None, '') else 0
+        except (TypeError, ValueError):
+            category_number = 0
+
+        sdlc = data.get('sdlc_phases') if isinstance(data.get('sdlc_phases'), dict) else {}
+
+        return cls(
+            id=_intern(audit.get('id')) or Path(file_path).stem,
+            name=_text(audit.get('name')),
+            file_path=str(file_path),
+            category=_intern(audit.get('category')),
+            category_number=category_number,
+            subcategory=_intern(audit.get('subcategory')),
+            tier=_keyword(audit.get('tier')),
+            status=_keyword(audit.get('status'), 'active'),
+            version=_intern(audit.get('version')),
+            estimated_duration=_intern(audit.get('estimated_duration')),
+            requires_runtime=_flag(audit.get('requires_runtime')),
+            destructive=_flag(audit.get('destructive')),
+            automatable=_keyword(execution.get('automatable')),
+            severity=_keyword(execution.get('severity')),
+            scope=_keyword(execution.get('scope')),
+            default_profiles=tuple(_intern(p) for p in _strings(execution.get('default_profiles'))),
+            requires_interviews=_flag(execution.get('requires_interviews')),
+            requires_physical_access=_flag(execution.get('requires_physical_access')),
+            requires_human_evaluation=_flag(execution.get('requires_human_evaluation')),
+            what=_text(description.get('what')).strip(),
+            why_it_matters=_text(description.get('why_it_matters')).strip(),
+            when_to_run=_strings(description.get('when_to_run')),
+            cognitive_mode=_keyword(context.get('cognitive_mode')),
+            ensemble_role=_keyword(context.get('ensemble_role')),
+            signals=tuple(Signal.from_dict(level, raw) for level in SIGNAL_LEVELS
+                          for raw in _items(signals.get(level)) if isinstance(raw, dict)),
+            steps=tuple(Step.from_dict(raw) for raw in _items(procedure.get('steps')) if isinstance(raw, dict)),
+            closeout=tuple(ChecklistItem.from_dict(raw) for raw in _items(data.get('closeout_checklist'))
+                           if isinstance(raw, dict)),
+            code_patterns=tuple(Pattern.code(raw) for raw in _items(discovery.get('code_patterns'))
+                                if isinstance(raw, dict)),
+            file_patterns=tuple(Pattern.file(raw) for raw in _items(discovery.get('file_patterns'))
+                                if isinstance(raw, dict)),
+            static_tools=tuple(static_tools),
+            scripts=tuple(_keyword(s.get('language')) for s in _items(tooling.get('scripts'))
+                          if isinstance(s, dict)),
+            profiles=tuple(profiles),
+            related=tuple(_intern(r) for r in _strings(_section(data, 'relationships').get('commonly_combined'))),
+            sdlc_phases={_intern(phase): _flag(value) for phase, value in sdlc.items()},
+        )
+
+
+def load_models(audits_dir: Path = AUDITS_DIR, profile: str | None = None) -> list[Audit]:
+    """Load the catalog as Audit models, in file order."""
+    models = []
+    for yaml_path in iter_audit_files(audits_dir):
+        data = load_audit(yaml_path)
+        if data is None or (profile and not in_profile(data, profile)):
+            continue
+        rel = yaml_path.relative_to(BASE_DIR).as_posix() if yaml_path.is_relative_to(BASE_DIR) else str(yaml_path)
+        models.append(Audit.from_dict(data, rel))
+    return models
+
+
+def measure(audits_dir: Path) -> dict[str, int]:
+    """Bytes held by the catalog as parsed dicts and as models (tracemalloc)."""
+    def held(build) -> int:
+        gc.collect()
+        tracemalloc.start()
+        result = build()
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del result
+        return size
+
+    files = list(iter_audit_files(audits_dir))
+    return {
+        "audits": len(files),
+        "dict_bytes": held(lambda: [load_audit(p) for p in files]),
+        "model_bytes": held(lambda: load_models(audits_dir)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load the catalog as typed audit models.")
+    parser.add_argument('--audits-dir', default=str(AUDITS_DIR), help="Audit catalog directory")
+    parser.add_argument('--measure', action='store_true', help="Compare memory held by dicts and models")
+    args = parser.parse_args()
+
+    if args.measure:
+        sizes = measure(Path(args.audits_dir))
+        print(f"Audits: {sizes['audits']}")
+        print(f"  Parsed dicts: {sizes['dict_bytes'] / 1e6:8.1f} MB")
+        print(f"  Models:       {sizes['model_bytes'] / 1e6:8.1f} MB "
+              f"({1 - sizes['model_bytes'] / sizes['dict_bytes']:.0%} smaller)")
+        return
+
+    models = load_models(Path(args.audits_dir))
+    print(f"Loaded {len(models)} audits: "
+          f"{sum(len(a.signals) for a in models)} signals, {sum(len(a.steps) for a in models)} steps, "
+          f"{sum(len(a.closeout) for a in models)} checklist items, "
+          f"{sum(len(a.code_patterns) + len(a.file_patterns) for a in models)} patterns")
+
+
+if __name__ == "__main__":
+    main()
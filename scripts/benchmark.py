@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Benchmark the catalog tooling and gate on regressions.
+
+Each stage (catalog load, inventory generation, menu build, browser export,
+schema validation, every meta-audit analyzer and the fix scripts) runs as a
+subprocess inside a scratch copy of the repository, so reports, the CSV and
+the fix scripts' in-place edits never touch the working tree. Each run
+records wall time, CPU time and the stage process's peak RSS; a stage is
+run --warmup times unmeasured and then --repeat times measured. Fix stages
+restore the pristine catalog before every run.
+
+Results are JSON documents that double as baselines:
+
+    python scripts/benchmark.py run --output benchmarks/baseline.json
+    python scripts/benchmark.py run --output current.json
+    python scripts/benchmark.py compare benchmarks/baseline.json current.json --threshold 0.15
+
+`compare` exits 1 when any stage's median wall time or peak RSS grows by
+more than the threshold (wall-time changes smaller than --min-delta seconds
+are treated as noise), or when a stage that passed in the baseline fails.
+Pass --audits-dir to benchmark a different catalog, such as a generated one.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+from audit_catalog import AUDITS_DIR, BASE_DIR, iter_audit_files
+
+RESULTS_VERSION = 1
+
+# Copied into the scratch workspace (the catalog itself comes from --audits-dir)
+WORKSPACE_ITEMS = ["schema", "scripts", "meta-audit", "build-menu.sh", "AUDIT-INVENTORY.csv"]
+
+CATALOG_LOAD = "import sys; sys.path.insert(0, 'scripts'); from audit_catalog import load_catalog; load_catalog()"
+
+
+@dataclass
+class Stage:
+    name: str
+    argv: list[str]
+    group: str
+    mutates_catalog: bool = False
+
+
+PY = sys.executable
+
+STAGES = [
+    Stage("catalog-load", [PY, "-c", CATALOG_LOAD], "core"),
+    Stage("inventory", [PY, "scripts/generate-inventory.py"], "core"),
+    Stage("build-menu", ["bash", "build-menu.sh"], "core"),
+    Stage("browser-export", [PY, "meta-audit/regenerate-browser-data.py"], "core"),
+    Stage("schema-validate", [PY, "scripts/schema_validator.py"], "core"),
+    Stage("completeness", [PY, "meta-audit/completeness_analyzer.py"], "analyzer"),
+    Stage("clarity", [PY, "meta-audit/clarity_analyzer.py"], "analyzer"),
+    Stage("alignment", [PY, "meta-audit/alignment_analyzer.py"], "analyzer"),
+    Stage("agent-readiness", [PY, "meta-audit/agent_readiness_analyzer.py"], "analyzer"),
+    Stage("actionability", [PY, "meta-audit/actionability-validator.py"], "analyzer"),
+    Stage("fix-actionability", [PY, "meta-audit/fix-actionability.py"], "fix", True),
+    Stage("fix-completeness", [PY, "meta-audit/fix-completeness.py"], "fix", True),
+    Stage("fix-context-management", [PY, "meta-audit/fix-context-management.py"], "fix", True),
+]
+
+
+class Workspace:
+    """Scratch copy of the repository with a restorable catalog."""
+
+    def __init__(self, audits_dir: Path):
+        self.root = Path(tempfile.mkdtemp(prefix="audit-bench-"))
+        for item in WORKSPACE_ITEMS:
+            source = BASE_DIR / item
+            if source.is_dir():
+                shutil.copytree(source, self.root / item,
+                                ignore=shutil.ignore_patterns('__pycache__', '*-cache', 'node_modules'))
+            elif source.exists():
+                shutil.copy2(source, self.root / item)
+        (self.root / "audit-browser" / "static" / "data").mkdir(parents=True)
+        self.pristine = self.root / ".pristine-audits"
+        shutil.copytree(audits_dir, self.pristine)
+        self.reset()
+
+    @property
+    def audits(self) -> Path:
+        return self.root / "audits"
+
+    def reset(self):
+        if self.audits.exists():
+            shutil.rmtree(self.audits)
+        shutil.copytree(self.pristine, self.audits)
+
+    def cleanup(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+def measure(argv: list[str], cwd: Path) -> dict:
+    """Run one command, returning wall/CPU seconds, peak RSS and exit status."""
+    with tempfile.TemporaryFile() as stderr:
+        start = time.perf_counter()
+        proc = subprocess.Popen(argv, cwd=cwd, stdin=subprocess.DEVNULL,
+                                stdout=subprocess.DEVNULL, stderr=stderr)
+        _, status, usage = os.wait4(proc.pid, 0)
+        wall = time.perf_counter() - start
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        stderr.seek(0)
+        tail = stderr.read()[-2000:].decode('utf-8', 'replace')
+
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss_kb = usage.ru_maxrss // 1024 if sys.platform == 'darwin' else usage.ru_maxrss
+    return {
+        "wall": wall,
+        "cpu": usage.ru_utime + usage.ru_stime,
+        "peak_rss_kb": rss_kb,
+        "returncode": proc.returncode,
+        "stderr": tail,
+    }
+
+
+def run_stage(stage: Stage, workspace: Workspace, warmup: int, repeat: int) -> dict:
+    """Run a stage warmup + repeat times and summarize the measured runs."""
+    runs = []
+    for attempt in range(warmup + repeat):
+        if stage.mutates_catalog:
+            workspace.reset()
+        run = measure(stage.argv, workspace.root)
+        if run["returncode"] != 0:
+            return {"group": stage.group, "status": "failed", "returncode": run["returncode"],
+                    "error": run["stderr"].strip().splitlines()[-1:] or [""]}
+        if attempt >= warmup:
+            runs.append(run)
+
+    walls = [r["wall"] for r in runs]
+    return {
+        "group": stage.group,
+        "status": "ok",
+        "runs": len(runs),
+        "wall_median": round(statistics.median(walls), 4),
+        "wall_min": round(min(walls), 4),
+        "wall_max": round(max(walls), 4),
+        "cpu_median": round(statistics.median(r["cpu"] for r in runs), 4),
+        "peak_rss_kb": max(r["peak_rss_kb"] for r in runs),
+    }
+
+
+def select_stages(names: list[str] | None, groups: list[str] | None) -> list[Stage]:
+    stages = STAGES
+    if names:
+        unknown = set(names) - {s.name for s in STAGES}
+        if unknown:
+            raise SystemExit(f"Error: Unknown stage(s): {', '.join(sorted(unknown))}")
+        stages = [s for s in stages if s.name in names]
+    if groups:
+        stages = [s for s in stages if s.group in groups]
+    return stages
+
+
+def run_benchmarks(stages: list[Stage], audits_dir: Path, warmup: int, repeat: int) -> dict:
+    workspace = Workspace(audits_dir)
+    results = {}
+    try:
+        for stage in stages:
+            print(f"  {stage.name:<24}", end="", flush=True)
+            result = run_stage(stage, workspace, warmup, repeat)
+            results[stage.name] = result
+            if result["status"] == "ok":
+                print(f"{result['wall_median']:8.3f}s  {result['peak_rss_kb'] / 1024:8.1f} MB")
+            else:
+                print(f"  FAILED (exit {result['returncode']}): {result['error'][0]}")
+    finally:
+        workspace.cleanup()
+
+    return {
+        "version": RESULTS_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        "host": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "catalog": {
+            "audits_dir": str(audits_dir),
+            "files": sum(1 for _ in iter_audit_files(audits_dir)),
+        },
+        "warmup": warmup,
+        "repeat": repeat,
+        "stages": results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float, min_delta: float,
+            metrics: set[str]) -> list[str]:
+    """Print a comparison table and return the regressed stage descriptions."""
+    regressions = []
+    print(f"{'stage':<24}{'base s':>10}{'now s':>10}{'Δ%':>8}{'base MB':>10}{'now MB':>10}{'Δ%':>8}")
+    for name, now in current["stages"].items():
+        base = baseline["stages"].get(name)
+        if base is None:
+            print(f"{name:<24}{'(new)':>10}")
+            continue
+        if now["status"] != "ok" or base["status"] != "ok":
+            if base["status"] == "ok":
+                regressions.append(f"{name}: failed (baseline passed)")
+            print(f"{name:<24}{base['status']:>10}{now['status']:>10}")
+            continue
+
+        wall_change = now["wall_median"] / base["wall_median"] - 1 if base["wall_median"] else 0.0
+        rss_change = now["peak_rss_kb"] / base["peak_rss_kb"] - 1 if base["peak_rss_kb"] else 0.0
+        flags = []
+        if ("wall" in metrics and wall_change > threshold
+                and now["wall_median"] - base["wall_median"] > min_delta):
+            flags.append("wall")
+            regressions.append(f"{name}: wall {base['wall_median']:.3f}s -> {now['wall_median']:.3f}s "
+                               f"(+{wall_change:.0%})")
+        if "rss" in metrics and rss_change > threshold:
+            flags.append("rss")
+            regressions.append(f"{name}: peak RSS {base['peak_rss_kb'] / 1024:.1f} MB -> "
+                               f"{now['peak_rss_kb'] / 1024:.1f} MB (+{rss_change:.0%})")
+        print(f"{name:<24}{base['wall_median']:>10.3f}{now['wall_median']:>10.3f}{wall_change:>+8.0%}"
+              f"{base['peak_rss_kb'] / 1024:>10.1f}{now['peak_rss_kb'] / 1024:>10.1f}{rss_change:>+8.0%}"
+              f"{'  REGRESSED (' + ', '.join(flags) + ')' if flags else ''}")
+    return regressions
+
+
+def load_results(path: str) -> dict:
+    with open(path, 'r', encoding='utf-8') as f:
+        results = json.load(f)
+    if results.get("version") != RESULTS_VERSION:
+        raise SystemExit(f"Error: {path} is not a version {RESULTS_VERSION} benchmark result")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark catalog tooling and compare against baselines.")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    sub.add_parser('list', help="List benchmark stages")
+
+    p_run = sub.add_parser('run', help="Run the benchmark suite")
+    p_run.add_argument('--audits-dir', default=str(AUDITS_DIR), help="Catalog to benchmark against")
+    p_run.add_argument('--stage', action='append', dest='stages', help="Only run this stage (repeatable)")
+    p_run.add_argument('--group', action='append', dest='groups', choices=sorted({s.group for s in STAGES}),
+                       help="Only run stages in this group (repeatable)")
+    p_run.add_argument('--repeat', type=int, default=3, help="Measured runs per stage")
+    p_run.add_argument('--warmup', type=int, default=1, help="Unmeasured runs per stage")
+    p_run.add_argument('--output', help="Write results JSON here (usable as a baseline)")
+    p_run.add_argument('--baseline', help="Compare against this baseline after running")
+
+    p_cmp = sub.add_parser('compare', help="Compare two result files")
+    p_cmp.add_argument('baseline', help="Baseline results JSON")
+    p_cmp.add_argument('current', help="Current results JSON")
+
+    for p in (p_run, p_cmp):
+        p.add_argument('--threshold', type=float, default=0.15, help="Allowed relative growth (0.15 = 15%%)")
+        p.add_argument('--min-delta', type=float, default=0.05, help="Ignore wall-time growth below this many seconds")
+        p.add_argument('--metric', action='append', dest='metrics', choices=['wall', 'rss'],
+                       help="Metric(s) to gate on (default: both)")
+
+    args = parser.parse_args()
+
+    if args.command == 'list':
+        for stage in STAGES:
+            print(f"{stage.name:<24}{stage.group:<10}{' '.join(Path(a).name if a == PY else a for a in stage.argv)}")
+        return
+
+    if args.command == 'run':
+        stages = select_stages(args.stages, args.groups)
+        audits_dir = Path(args.audits_dir).resolve()
+        print(f"Benchmarking {len(stages)} stages against {audits_dir} "
+              f"(warmup {args.warmup}, repeat {args.repeat})")
+        current = run_benchmarks(stages, audits_dir, args.warmup, max(1, args.repeat))
+        if args.output:
+            Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(current, f, indent=1)
+            print(f"\nResults written to: {args.output}")
+        if not args.baseline:
+            return
+        baseline = load_results(args.baseline)
+    else:
+        baseline = load_results(args.baseline)
+        current = load_results(args.current)
+
+    print()
+    regressions = compare(baseline, current, args.threshold, args.min_delta, set(args.metrics or ['wall', 'rss']))
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print(f"\nNo regressions beyond {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Merkle content-hash manifest of the audits/ tree.
+
+The manifest records a SHA-256 hash per audit YAML file, and per directory
+a hash over its children's names and hashes, up to one root hash for the
+whole catalog. Two manifests with the same root describe the same catalog;
+when roots differ, only directories whose hashes differ are descended, so
+"what changed since manifest X" costs time proportional to the change, not
+to the catalog.
+
+Updating reuses the hash of every file whose size and mtime match the
+previous manifest, so only edited files are read. Files modified within
+RACY_SECONDS of the previous manifest being written are re-hashed anyway,
+since a same-size edit in the same timestamp tick would otherwise go
+unnoticed.
+
+Consumers (inventory and browser export, analyzers, agents syncing a copy
+of the catalog) keep the manifest they last processed and ask for the
+difference:
+
+    from catalog_manifest import changed_since
+    changes = changed_since(Path("last-sync.json"))   # {'added': [...], 'modified': [...], 'removed': [...]}
+
+Usage:
+    python scripts/catalog_manifest.py update                  # refresh catalog-manifest.json
+    python scripts/catalog_manifest.py diff last-sync.json     # changes since that manifest
+    python scripts/catalog_manifest.py diff old.json new.json --json
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+from pathlib import Path
+from typing import Any
+
+from audit_catalog import AUDITS_DIR, BASE_DIR
+
+MANIFEST_PATH = BASE_DIR / "catalog-manifest.json"
+MANIFEST_VERSION = 1
+RACY_SECONDS = 2
+HASH_CHUNK = 1 << 20
+
+
+def hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while chunk := f.read(HASH_CHUNK):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_directory(children: dict[str, dict[str, Any]]) -> str:
+    """Hash of a directory: one `<kind> <name> <hash>` line per child, sorted by name."""
+    digest = hashlib.sha256()
+    for name in sorted(children):
+        node = children[name]
+        kind = 'dir' if 'children' in node else 'file'
+        digest.update(f"{kind} {name} {node['hash']}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def build_tree(directory: Path, previous: dict[str, Any] | None, trust_before_ns: int,
+               stats: dict[str, int]) -> dict[str, Any] | None:
+    """
+    Manifest node for a directory, reusing hashes from the previous node
+    where size and mtime match. Returns None for a directory with no audits.
+    """
+    previous_children = (previous or {}).get('children', {})
+    children = {}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.startswith('.'):
+                continue
+            old = previous_children.get(entry.name)
+            if entry.is_dir(follow_symlinks=False):
+                node = build_tree(Path(entry.path), old if old and 'children' in old else None,
+                                  trust_before_ns, stats)
+                if node is not None:
+                    children[entry.name] = node
+            elif entry.name.endswith('.yaml') and entry.is_file():
+                st = entry.stat()
+                if (old and 'children' not in old and old['size'] == st.st_size
+                        and old['mtime_ns'] == st.st_mtime_ns and st.st_mtime_ns < trust_before_ns):
+                    children[entry.name] = old
+                    stats['reused'] += 1
+                else:
+                    children[entry.name] = {'hash': hash_file(Path(entry.path)),
+                                            'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+                    stats['hashed'] += 1
+    if not children:
+        return None
+    return {'hash': hash_directory(children), 'children': dict(sorted(children.items()))}
+
+
+def build_manifest(audits_dir: Path = AUDITS_DIR, previous: dict[str, Any] | None = None) -> dict[str, Any]:
+    """Manifest of audits_dir, incrementally from a previous manifest of the same tree."""
+    root = audits_dir.relative_to(BASE_DIR).as_posix() if audits_dir.is_relative_to(BASE_DIR) else str(audits_dir)
+    if previous is not None and (previous.get('version') != MANIFEST_VERSION or previous.get('root') != root):
+        previous = None
+    trust_before_ns = previous['written_ns'] - RACY_SECONDS * 10**9 if previous else 0
+
+    stats = {'hashed': 0, 'reused': 0}
+    tree = build_tree(audits_dir, previous['tree'] if previous else None, trust_before_ns, stats) \
+        or {'hash': hash_directory({}), 'children': {}}
+    return {
+        'version': MANIFEST_VERSION,
+        'root': root,
+        'hash': tree['hash'],
+        'written_ns': time.time_ns(),
+        'stats': stats,
+        'tree': tree,
+    }
+
+
+def load_manifest(path: Path) -> dict[str, Any] | None:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    return manifest if manifest.get('version') == MANIFEST_VERSION else None
+
+
+def save_manifest(manifest: dict[str, Any], path: Path = MANIFEST_PATH) -> None:
+    tmp = path.with_name(path.name + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, separators=(',', ':'))
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+def iter_files(node: dict[str, Any], prefix: str):
+    """Yield the file paths under a manifest node."""
+    for name, child in node.get('children', {}).items():
+        if 'children' in child:
+            yield from iter_files(child, f"{prefix}/{name}")
+        else:
+            yield f"{prefix}/{name}"
+
+
+def diff_nodes(old: dict[str, Any] | None, new: dict[str, Any] | None, prefix: str,
+               changes: dict[str, list[str]]) -> None:
+    if old is not None and new is not None and old['hash'] == new['hash']:
+        return
+    old_is_dir = old is not None and 'children' in old
+    new_is_dir = new is not None and 'children' in new
+    if old_is_dir and new_is_dir:
+        for name in sorted(old['children'].keys() | new['children'].keys()):
+            diff_nodes(old['children'].get(name), new['children'].get(name), f"{prefix}/{name}", changes)
+        return
+    if old is not None and new is not None and not old_is_dir and not new_is_dir:
+        changes['modified'].append(prefix)
+        return
+    if old is not None:
+        changes['removed'].extend(iter_files(old, prefix) if old_is_dir else [prefix])
+    if new is not None:
+        changes['added'].extend(iter_files(new, prefix) if new_is_dir else [prefix])
+
+
+def diff_manifests(old: dict[str, Any], new: dict[str, Any]) -> dict[str, list[str]]:
+    """Files added, modified and removed between two manifests, as paths relative to the repository."""
+    changes: dict[str, list[str]] = {'added': [], 'modified': [], 'removed': []}
+    diff_nodes(old['tree'], new['tree'], new['root'], changes)
+    return {kind: sorted(paths) for kind, paths in changes.items()}
+
+
+def changed_since(manifest_path: Path, audits_dir: Path = AUDITS_DIR) -> dict[str, list[str]] | None:
+    """Changes between a saved manifest and the current tree (None if the manifest is unreadable)."""
+    old = load_manifest(manifest_path)
+    if old is None:
+        return None
+    return diff_manifests(old, build_manifest(audits_dir, old))
+
+
+def print_changes(changes: dict[str, list[str]], as_json: bool) -> None:
+    if as_json:
+        print(json.dumps(changes, indent=2))
+        return
+    for kind, letter in (('added', 'A'), ('modified', 'M'), ('removed', 'D')):
+        for path in changes[kind]:
+            print(f"{letter}\t{path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain a Merkle content-hash manifest of audits/.")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    update = sub.add_parser('update', help="Write an up-to-date manifest, re-hashing only changed files")
+    update.add_argument('--manifest', type=Path, default=MANIFEST_PATH,
+                        help=f"Manifest path (default: {MANIFEST_PATH.relative_to(BASE_DIR)})")
+    update.add_argument('--audits-dir', type=Path, default=AUDITS_DIR, help="Audit catalog directory")
+
+    diff = sub.add_parser('diff', help="List files changed since a manifest")
+    diff.add_argument('since', type=Path, help="Earlier manifest")
+    diff.add_argument('against', type=Path, nargs='?', help="Later manifest (default: the current tree)")
+    diff.add_argument('--audits-dir', type=Path, default=AUDITS_DIR, help="Audit catalog directory")
+    diff.add_argument('--json', action='store_true', help="Print changes as JSON")
+    args = parser.parse_args()
+
+    audits_dir = args.audits_dir.resolve()
+    if not audits_dir.exists():
+        print(f"Error: Audits directory not found: {audits_dir}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.command == 'update':
+        start = time.perf_counter()
+        previous = load_manifest(args.manifest)
+        manifest = build_manifest(audits_dir, previous)
+        save_manifest(manifest, args.manifest)
+        changes = diff_manifests(previous, manifest) if previous else None
+        summary = ', '.join(f"{len(paths)} {kind}" for kind, paths in changes.items()) if changes else "new manifest"
+        print(f"{manifest['hash'][:16]} {args.manifest.name}: {summary} "
+              f"({manifest['stats']['hashed']} hashed, {manifest['stats']['reused']} reused) "
+              f"[{(time.perf_counter() - start) * 1000:.0f} ms]")
+        return
+
+    old = load_manifest(args.since)
+    if old is None:
+        print(f"Error: Not a manifest: {args.since}", file=sys.stderr)
+        sys.exit(1)
+    if args.against:
+        new = load_manifest(args.against)
+        if new is None:
+            print(f"Error: Not a manifest: {args.against}", file=sys.stderr)
+            sys.exit(1)
+    else:
+        new = build_manifest(audits_dir, old)
+    print_changes(diff_manifests(old, new), args.json)
+
+
+if __name__ == "__main__":
+    main()
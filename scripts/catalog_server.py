@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+"""
+Local HTTP query service over the audit catalog.
+
+Loads the catalog once, keeps it in memory with indexes by ID, category,
+subcategory, profile and facet, and serves compact JSON so agents stop
+re-reading AUDIT-INVENTORY.csv and audit YAML on every decision:
+
+    GET /audits                   summaries, filtered by query parameters
+    GET /audits/<id>              full audit body (the parsed YAML)
+    GET /audits/<id>/related      relationship lookups, both directions
+    GET /facets                   value counts for every filter
+    GET /stats                    catalog size and reload generation
+
+/audits accepts category (slug or number), subcategory, profile, tier,
+severity, automatable, scope, cognitive_mode, status, phase (an SDLC phase
+the audit applies to), q (substring of ID or name), limit and offset.
+Comma-separated values within one parameter match any of them; different
+parameters must all match. Results keep catalog file order.
+
+Audit bodies are encoded once at load; list and lookup responses are cached
+per query until the catalog changes. Every response carries a content-hash
+ETag and `If-None-Match` gets a 304, so polling agents transfer nothing when
+nothing changed. Edited, added and removed audit files are reloaded in place
+(inotify, or mtime polling with --poll) without restarting the server.
+
+When several files declare the same audit ID, the first in file path order
+is served; the others are reported at load and under `duplicates` in /stats.
+
+Usage:
+    python scripts/catalog_server.py                    # http://127.0.0.1:8765
+    python scripts/catalog_server.py --port 9000 --poll 2.0
+    curl -s 'http://127.0.0.1:8765/audits?profile=security&tier=focused&limit=20'
+"""
+
+import sys
+import json
+import time
+import asyncio
+import hashlib
+import argparse
+import threading
+import urllib.parse
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from audit_catalog import AUDITS_DIR, BASE_DIR, iter_audit_files, load_audit
+from audit_model import Audit
+from catalog_watch import Inotify, Poller, watch, inventory, DEFAULT_DEBOUNCE_MS
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_LIMIT = 5000
+
+RELATIONSHIP_KINDS = ('commonly_combined', 'depends_on', 'feeds_into')
+# Query parameter -> Audit attribute for single-valued facets
+FACETS = {
+    'category': 'category',
+    'subcategory': 'subcategory',
+    'tier': 'tier',
+    'severity': 'severity',
+    'automatable': 'automatable',
+    'scope': 'scope',
+    'cognitive_mode': 'cognitive_mode',
+    'status': 'status',
+}
+SUMMARY_FIELDS = ('id', 'name', 'category', 'category_number', 'subcategory', 'tier', 'severity',
+                  'automatable', 'scope', 'file_path')
+
+
+def encode(value: Any) -> bytes:
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False, default=str).encode('utf-8')
+
+
+def etag_of(data: bytes) -> str:
+    return '"' + hashlib.sha256(data).hexdigest()[:20] + '"'
+
+
+@dataclass
+class Entry:
+    """One loaded audit: its model, pre-encoded body, SDLC phases and outgoing relationships."""
+    audit: Audit
+    body: bytes
+    etag: str
+    summary: dict[str, Any]
+    phases: tuple[str, ...]
+    relationships: dict[str, tuple[str, ...]]
+
+
+class CatalogIndex:
+    """The catalog in memory with lookup indexes. Mutated only on the event loop thread."""
+
+    def __init__(self, audits_dir: Path):
+        self.audits_dir = audits_dir
+        self.by_path: dict[Path, Entry] = {}
+        self.by_id: dict[str, Entry] = {}
+        # audit ID -> files declaring it; by_id holds the first of them
+        self.paths_by_id: dict[str, set[Path]] = {}
+        self.duplicates: dict[str, list[str]] = {}
+        self.order: dict[str, int] = {}
+        # facet -> value -> audit IDs
+        self.facets: dict[str, dict[str, set[str]]] = {}
+        self.generation = 0
+        self.loaded_at = 0.0
+        self.responses: dict[str, tuple[bytes, str]] = {}
+        self.paths: frozenset[Path] = frozenset()
+        # SDLC phases not declared in the YAML come from the inventory, as in generate-inventory.py
+        self.inventory_rows = inventory.load_existing_csv()
+
+    # -- loading -----------------------------------------------------------
+
+    def parse(self, path: Path) -> Entry | None:
+        data = load_audit(path)
+        if data is None:
+            return None
+        rel = path.relative_to(BASE_DIR).as_posix() if path.is_relative_to(BASE_DIR) else str(path)
+        audit = Audit.from_dict(data, rel)
+        relations = data.get('relationships') if isinstance(data.get('relationships'), dict) else {}
+        relationships = {}
+        for kind in RELATIONSHIP_KINDS:
+            targets = relations.get(kind)
+            if isinstance(targets, list):
+                relationships[kind] = tuple(str(t) for t in targets if isinstance(t, (str, int)))
+        phases = inventory.get_sdlc_phases(data, audit.scope, self.inventory_rows.get(audit.id))
+        body = encode(data)
+        summary = {name: getattr(audit, name) for name in SUMMARY_FIELDS}
+        return Entry(audit, body, etag_of(body), summary,
+                     tuple(phase for phase, applies in phases.items() if applies == "Yes"), relationships)
+
+    @staticmethod
+    def facet_values(entry: Entry) -> dict[str, tuple[str, ...]]:
+        audit = entry.audit
+        values = {param: (getattr(audit, attr),) for param, attr in FACETS.items()}
+        values['category_number'] = (str(audit.category_number),)
+        values['profile'] = audit.profiles
+        values['phase'] = entry.phases
+        return values
+
+    def index(self, entry: Entry) -> None:
+        self.by_id[entry.audit.id] = entry
+        for facet, values in self.facet_values(entry).items():
+            for value in values:
+                self.facets.setdefault(facet, {}).setdefault(value, set()).add(entry.audit.id)
+
+    def unindex(self, entry: Entry) -> None:
+        if self.by_id.get(entry.audit.id) is entry:
+            del self.by_id[entry.audit.id]
+        for facet, values in self.facet_values(entry).items():
+            for value in values:
+                ids = self.facets.get(facet, {}).get(value)
+                if ids is not None:
+                    ids.discard(entry.audit.id)
+                    if not ids:
+                        del self.facets[facet][value]
+
+    def index_first(self, audit_id: str) -> None:
+        """Index the first file (by path) declaring an audit ID, replacing any other."""
+        files = sorted((self.by_path[p] for p in self.paths_by_id.get(audit_id, ())),
+                       key=lambda e: e.audit.file_path)
+        current = self.by_id.get(audit_id)
+        first = files[0] if files else None
+        if current is not first:
+            if current is not None:
+                self.unindex(current)
+            if first is not None:
+                self.index(first)
+        if not files:
+            self.paths_by_id.pop(audit_id, None)
+
+    def report_duplicates(self) -> None:
+        """Record audit IDs declared by more than one file, warning about new ones."""
+        duplicates = {audit_id: sorted(self.by_path[p].audit.file_path for p in paths)
+                      for audit_id, paths in sorted(self.paths_by_id.items()) if len(paths) > 1}
+        for audit_id, files in duplicates.items():
+            if self.duplicates.get(audit_id) != files:
+                print(f"Warning: audit ID {audit_id} is declared by {len(files)} files; serving {files[0]} "
+                      f"and ignoring {', '.join(files[1:])}", file=sys.stderr)
+        self.duplicates = duplicates
+
+    def load(self) -> None:
+        self.apply(set(iter_audit_files(self.audits_dir)))
+
+    def apply(self, paths: set[Path]) -> list[str]:
+        """Reload changed files in place. Returns the relative paths that changed."""
+        changed = []
+        affected = set()
+        for path in paths:
+            old = self.by_path.pop(path, None)
+            if old is not None:
+                self.paths_by_id[old.audit.id].discard(path)
+                affected.add(old.audit.id)
+                if self.by_id.get(old.audit.id) is old:
+                    self.unindex(old)
+            entry = self.parse(path) if path.exists() else None
+            if entry is None and old is not None and path.exists():
+                entry = old  # keep the last good version of a file that no longer parses
+            if entry is not None:
+                self.by_path[path] = entry
+                self.paths_by_id.setdefault(entry.audit.id, set()).add(path)
+                affected.add(entry.audit.id)
+            if entry is not old:
+                changed.append(path.relative_to(BASE_DIR).as_posix() if path.is_relative_to(BASE_DIR) else str(path))
+
+        for audit_id in affected:
+            self.index_first(audit_id)
+
+        if changed or not self.generation:
+            self.order = {e.audit.id: n for n, e in enumerate(
+                sorted(self.by_id.values(), key=lambda e: e.audit.file_path))}
+            self.report_duplicates()
+            self.paths = frozenset(self.by_path)
+            self.responses.clear()
+            self.generation += 1
+            self.loaded_at = time.time()
+        return changed
+
+    # -- queries -----------------------------------------------------------
+
+    def select(self, params: dict[str, list[str]]) -> list[str]:
+        """IDs matching all filter parameters, in catalog order."""
+        selected: set[str] | None = None
+        for param, raw_values in params.items():
+            if param in ('q', 'limit', 'offset'):
+                continue
+            facet = param
+            values = [v.strip() for raw in raw_values for v in raw.split(',') if v.strip()]
+            if param == 'category' and all(v.isdigit() for v in values):
+                facet = 'category_number'
+                values = [str(int(v)) for v in values]
+            elif param not in FACETS and param not in ('profile', 'phase'):
+                raise ValueError(f"Unknown filter: {param}")
+            index = self.facets.get(facet, {})
+            matches = set().union(*(index.get(v, ()) for v in values)) if values else set()
+            selected = matches if selected is None else selected & matches
+
+        ids = list(self.by_id) if selected is None else selected
+        query = ' '.join(params.get('q', [])).strip().lower()
+        if query:
+            ids = [i for i in ids if query in i.lower() or query in self.by_id[i].audit.name.lower()]
+        return sorted(ids, key=self.order.__getitem__)
+
+    def list_audits(self, params: dict[str, list[str]]) -> dict[str, Any]:
+        ids = self.select(params)
+        offset = int(params.get('offset', ['0'])[0])
+        limit = min(int(params.get('limit', [str(MAX_LIMIT)])[0]), MAX_LIMIT)
+        if offset < 0 or limit < 0:
+            raise ValueError("limit and offset must not be negative")
+        page = ids[offset:offset + limit]
+        return {'total': len(ids), 'offset': offset, 'count': len(page),
+                'audits': [self.by_id[i].summary for i in page]}
+
+    def related(self, audit_id: str) -> dict[str, Any]:
+        entry = self.by_id[audit_id]
+        referenced_by: dict[str, list[str]] = {kind: [] for kind in RELATIONSHIP_KINDS}
+        for other in self.by_id.values():
+            for kind, targets in other.relationships.items():
+                if audit_id in targets:
+                    referenced_by[kind].append(other.audit.id)
+
+        def summaries(ids) -> list[dict[str, Any]]:
+            return [self.by_id[i].summary if i in self.by_id else {'id': i, 'missing': True}
+                    for i in sorted(ids, key=lambda i: self.order.get(i, len(self.order)))]
+
+        return {
+            'id': audit_id,
+            'outgoing': {kind: summaries(entry.relationships.get(kind, ())) for kind in RELATIONSHIP_KINDS},
+            'incoming': {kind: summaries(ids) for kind, ids in referenced_by.items()},
+        }
+
+    def facet_counts(self) -> dict[str, dict[str, int]]:
+        return {facet: dict(sorted((value, len(ids)) for value, ids in values.items()))
+                for facet, values in sorted(self.facets.items())}
+
+    def stats(self) -> dict[str, Any]:
+        return {'audits': len(self.by_id), 'files': len(self.by_path), 'generation': self.generation,
+                'loaded_at': time.strftime('%Y-%m-%dT%H:%M:%S%z', time.localtime(self.loaded_at)),
+                'duplicates': [{'id': audit_id, 'files': files} for audit_id, files in self.duplicates.items()]}
+
+    def respond(self, path: str, query: str) -> tuple[int, bytes, str]:
+        """Route a GET request to (status, JSON body, ETag)."""
+        if path.startswith('/audits/'):
+            audit_id, _, tail = urllib.parse.unquote(path[len('/audits/'):]).partition('/')
+            entry = self.by_id.get(audit_id)
+            if entry is None or tail not in ('', 'related'):
+                return self.error(404, f"Unknown audit: {audit_id}" if entry is None else "Not found")
+            if not tail:
+                return 200, entry.body, entry.etag
+
+        key = f"{path}?{query}"
+        cached = self.responses.get(key)
+        if cached is None:
+            try:
+                if path == '/audits':
+                    result = self.list_audits(urllib.parse.parse_qs(query))
+                elif path.startswith('/audits/'):
+                    result = self.related(urllib.parse.unquote(path[len('/audits/'):]).partition('/')[0])
+                elif path == '/facets':
+                    result = self.facet_counts()
+                elif path == '/stats':
+                    return (200, *self.body_with_etag(self.stats()))
+                else:
+                    return self.error(404, "Not found")
+            except ValueError as e:
+                return self.error(400, str(e))
+            cached = self.responses[key] = self.body_with_etag(result)
+        return (200, *cached)
+
+    @staticmethod
+    def body_with_etag(result: Any) -> tuple[bytes, str]:
+        body = encode(result)
+        return body, etag_of(body)
+
+    @staticmethod
+    def error(status: int, message: str) -> tuple[int, bytes, str]:
+        return status, encode({'error': message}), ''
+
+
+# ============================================================================
+# HTTP
+# ============================================================================
+
+REASONS = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed'}
+
+
+class CatalogServer:
+    """Minimal HTTP/1.1 server (GET/HEAD, keep-alive) in front of a CatalogIndex."""
+
+    def __init__(self, catalog: CatalogIndex):
+        self.catalog = catalog
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                if headers.get('content-length', '0').isdigit():
+                    await reader.readexactly(int(headers.get('content-length', '0')))
+
+                parts = request_line.decode('latin-1').split()
+                if len(parts) != 3:
+                    self.send(writer, *self.catalog.error(400, "Malformed request line"), keep_alive=False)
+                    break
+                method, target, version = parts
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+
+                if method not in ('GET', 'HEAD'):
+                    status, body, etag = self.catalog.error(405, f"Method not allowed: {method}")
+                else:
+                    url = urllib.parse.urlsplit(target)
+                    status, body, etag = self.catalog.respond(url.path.rstrip('/') or '/', url.query)
+                    if status == 200 and etag and etag in headers.get('if-none-match', ''):
+                        status, body = 304, b''
+                self.send(writer, status, body, etag, keep_alive, head=method == 'HEAD')
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def send(writer: asyncio.StreamWriter, status: int, body: bytes, etag: str,
+             keep_alive: bool, head: bool = False) -> None:
+        lines = [f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+                 "Content-Type: application/json; charset=utf-8",
+                 f"Content-Length: {len(body)}",
+                 "Cache-Control: no-cache",
+                 f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        if etag:
+            lines.append(f"ETag: {etag}")
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+        if not head:
+            writer.write(body)
+
+
+class Reloader:
+    """Runs catalog_watch's debounced change loop in a thread and applies batches on the event loop."""
+
+    def __init__(self, catalog: CatalogIndex, loop: asyncio.AbstractEventLoop):
+        self.catalog = catalog
+        self.loop = loop
+        self.audits_dir = catalog.audits_dir
+
+    @property
+    def entries(self) -> frozenset[Path]:
+        return self.catalog.paths
+
+    def apply(self, paths: set[Path]) -> None:
+        self.loop.call_soon_threadsafe(self.reload, paths)
+
+    def reload(self, paths: set[Path]) -> None:
+        start = time.perf_counter()
+        changed = self.catalog.apply(paths)
+        if changed:
+            print(f"{time.strftime('%H:%M:%S')} Reloaded {', '.join(sorted(changed))} "
+                  f"(generation {self.catalog.generation}) [{(time.perf_counter() - start) * 1000:.0f} ms]")
+
+    def start(self, poll: float | None, debounce: float) -> str:
+        if poll is None and Inotify.available():
+            source, mode = Inotify(self.audits_dir), "inotify"
+        else:
+            source = Poller(self.audits_dir, poll or 1.0)
+            mode = f"polling every {source.interval:g}s"
+        threading.Thread(target=watch, args=(self, source, debounce), daemon=True, name="catalog-reload").start()
+        return mode
+
+
+async def serve(args: argparse.Namespace) -> None:
+    catalog = CatalogIndex(Path(args.audits_dir).resolve())
+    start = time.perf_counter()
+    catalog.load()
+    print(f"Loaded {len(catalog.by_id)} audits in {time.perf_counter() - start:.1f}s")
+
+    server = await asyncio.start_server(CatalogServer(catalog).handle, args.host, args.port)
+    reload_mode = "reload disabled"
+    if not args.no_reload:
+        reload_mode = Reloader(catalog, asyncio.get_running_loop()).start(args.poll, args.debounce / 1000)
+    print(f"Serving on http://{args.host}:{args.port} ({reload_mode}). Press Ctrl-C to stop.")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the audit catalog as JSON over local HTTP.")
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f"Bind address (default: {DEFAULT_HOST})")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f"Port (default: {DEFAULT_PORT})")
+    parser.add_argument('--audits-dir', default=str(AUDITS_DIR), help="Audit catalog directory")
+    parser.add_argument('--poll', type=float, metavar='SECONDS', help="Poll for changes instead of using inotify")
+    parser.add_argument('--debounce', type=int, default=DEFAULT_DEBOUNCE_MS,
+                        help=f"Quiet period before reloading, in ms (default: {DEFAULT_DEBOUNCE_MS})")
+    parser.add_argument('--no-reload', action='store_true', help="Do not watch for changed audit files")
+    args = parser.parse_args()
+
+    if not Path(args.audits_dir).exists():
+        print(f"Error: Audits directory not found: {args.audits_dir}", file=sys.stderr)
+        sys.exit(1)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        print()
+
+
+if __name__ == "__main__":
+    main()
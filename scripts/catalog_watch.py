@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Keep the generated catalog artifacts up to date while audits are edited.
+
+Watches audits/ and, when audit files change, regenerates what depends on
+them: the rows of AUDIT-INVENTORY.csv (generate-inventory.py), the
+affected category sections of AUDIT-MENU.md (build-menu.sh) and the
+browser data (regenerate-browser-data.py): the touched detail shards plus
+the shell and manifest.
+
+The parsed catalog stays in memory. On each change only the touched files
+are re-read (metadata sections only), bursts of events are debounced into
+one update, and unchanged outputs are not rewritten. A file that fails to
+parse keeps its last good version until it is fixed.
+
+Changes are picked up with inotify on Linux (through libc, no extra
+dependency) and by polling file mtimes elsewhere or with --poll.
+
+Usage:
+    python scripts/catalog_watch.py                  # watch until Ctrl-C
+    python scripts/catalog_watch.py --poll 1.0       # poll every second instead of inotify
+    python scripts/catalog_watch.py --once           # sync all artifacts once and exit
+"""
+
+import os
+import sys
+import time
+import ctypes
+import ctypes.util
+import select
+import struct
+import argparse
+import importlib.util
+from dataclasses import dataclass
+from pathlib import Path
+
+import audit_menu
+from audit_catalog import BASE_DIR, iter_audit_files
+
+SCRIPT_DIR = Path(__file__).parent.resolve()
+
+DEFAULT_DEBOUNCE_MS = 150
+# Flush a continuous burst after this many debounce windows
+MAX_DEBOUNCE_WINDOWS = 10
+
+
+def load_script(path: Path, name: str):
+    """Import a script whose file name is not a valid module name."""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+inventory = load_script(SCRIPT_DIR / "generate-inventory.py", "generate_inventory")
+browser = load_script(BASE_DIR / "meta-audit" / "regenerate-browser-data.py", "regenerate_browser_data")
+
+
+# ============================================================================
+# Change sources
+# ============================================================================
+
+class Inotify:
+    """Recursive inotify watch over a directory tree, via libc."""
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ISDIR = 0x40000000
+    MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+
+    EVENT = struct.Struct('iIII')
+
+    def __init__(self, root: Path):
+        libc_name = ctypes.util.find_library('c')
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.root = root
+        self.dirs: dict[int, Path] = {}
+        self.add_tree(root)
+
+    @classmethod
+    def available(cls) -> bool:
+        if not sys.platform.startswith('linux'):
+            return False
+        libc_name = ctypes.util.find_library('c')
+        return bool(libc_name) and hasattr(ctypes.CDLL(libc_name), 'inotify_init1')
+
+    def add_tree(self, directory: Path) -> set[Path]:
+        """Watch a directory and its subdirectories; returns the audit files inside."""
+        found = set()
+        for current, subdirs, files in os.walk(directory):
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(current), self.MASK)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {current}")
+            self.dirs[wd] = Path(current)
+            found.update(Path(current) / name for name in files if name.endswith('.yaml'))
+        return found
+
+    def wait(self, timeout: float | None) -> tuple[set[Path], bool]:
+        """Changed audit paths (and whether a full rescan is needed) after up to `timeout` seconds."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set(), False
+
+        changed, rescan = set(), False
+        data = os.read(self.fd, 1 << 16)
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = self.EVENT.unpack_from(data, offset)
+            raw_name = data[offset + self.EVENT.size:offset + self.EVENT.size + length].rstrip(b'\0')
+            offset += self.EVENT.size + length
+
+            if mask & self.IN_Q_OVERFLOW:
+                rescan = True
+                continue
+            if mask & self.IN_IGNORED:
+                self.dirs.pop(wd, None)
+                continue
+            directory = self.dirs.get(wd)
+            if directory is None or not raw_name:
+                continue
+            path = directory / os.fsdecode(raw_name)
+            if mask & self.IN_ISDIR:
+                if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                    changed |= self.add_tree(path)
+                else:
+                    rescan = True  # a directory of audits went away
+            elif path.suffix == '.yaml':
+                changed.add(path)
+        return changed, rescan
+
+
+class Poller:
+    """Fallback change source comparing file mtimes and sizes."""
+
+    def __init__(self, root: Path, interval: float):
+        self.root = root
+        self.interval = interval
+        self.snapshot = self.scan()
+
+    def scan(self) -> dict[Path, tuple[int, int]]:
+        snapshot = {}
+        for path in iter_audit_files(self.root):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def wait(self, timeout: float | None) -> tuple[set[Path], bool]:
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        current = self.scan()
+        changed = {path for path in current.keys() | self.snapshot.keys()
+                   if current.get(path) != self.snapshot.get(path)}
+        self.snapshot = current
+        return changed, False
+
+
+# ============================================================================
+# In-memory catalog
+# ============================================================================
+
+@dataclass
+class Entry:
+    row: dict[str, str]                   # inventory CSV row
+    record: dict                          # browser shell record
+    shard: tuple[str, str, bytes]         # (output name, hash, bytes) of the detail shard
+
+
+class CatalogState:
+    """Parsed catalog plus the artifacts derived from it."""
+
+    def __init__(self, audits_dir: Path):
+        self.audits_dir = audits_dir
+        self.entries: dict[Path, Entry] = {}
+        self.existing_csv = inventory.load_existing_csv()
+        self.menu_sections: dict[int, list[str]] = {}
+        self.output_dirs = [browser.OUTPUT_DIR]
+        build_dir = browser.OUTPUT_DIR.parent.parent / "build" / "data"
+        if build_dir.exists():
+            self.output_dirs.append(build_dir)
+        self.browser_files: set[str] = set()
+
+    def parse(self, path: Path) -> Entry | None:
+        row = inventory.parse_yaml_file(path, self.existing_csv)
+        if row is None:
+            return None
+        collected = browser.collect_audit(path, {row['audit_id']: browser.row_phases(row)})
+        if collected is None:
+            return None
+        record, detail = collected
+        return Entry(row, record, browser.encode_detail(record['file_path'], detail))
+
+    def update(self, paths: set[Path]) -> tuple[list[str], list[str]]:
+        """Re-read changed paths. Returns (updated, removed) relative paths."""
+        updated, removed = [], []
+        for path in sorted(paths):
+            rel = path.relative_to(BASE_DIR).as_posix() if path.is_relative_to(BASE_DIR) else str(path)
+            old = self.entries.get(path)
+            if not path.exists():
+                if old is not None:
+                    del self.entries[path]
+                    self.invalidate(old)
+                    removed.append(rel)
+                continue
+
+            entry = self.parse(path)
+            if entry is None:
+                print(f"  Keeping last good version of {rel}" if old else f"  Skipped: {rel}")
+                continue
+            if old is not None:
+                self.invalidate(old)
+            self.entries[path] = entry
+            self.existing_csv[entry.row['audit_id']] = entry.row
+            self.invalidate(entry)
+            updated.append(rel)
+        return updated, removed
+
+    def invalidate(self, entry: Entry) -> None:
+        number = entry.row.get('category_number', '')
+        if number.isdigit():
+            self.menu_sections.pop(int(number), None)
+
+    def write(self, shards: set[str] | None = None) -> list[str]:
+        """
+        Regenerate the artifacts. `shards` limits which detail shards are
+        written (None writes all). Returns the names of artifacts that changed.
+        """
+        changed = []
+        rows = [entry.row for entry in self.entries.values()]
+
+        if browser.write_if_changed(inventory.CSV_PATH, inventory.inventory_csv(rows).encode('utf-8')):
+            changed.append(inventory.CSV_PATH.name)
+
+        audits_by_category, category_info = audit_menu.group_rows(rows)
+        menu = audit_menu.render_menu(audits_by_category, category_info, self.menu_sections)
+        if browser.write_if_changed(audit_menu.MD_PATH, menu.encode('utf-8')):
+            changed.append(audit_menu.MD_PATH.name)
+
+        records = browser.sort_records(entry.record for entry in self.entries.values())
+        files, _ = browser.build_files(records, {e.record['file_path']: e.shard for e in self.entries.values()})
+        stale = self.browser_files - files.keys()
+        written = 0
+        for output_dir in self.output_dirs:
+            for name, data in files.items():
+                if (shards is None or not name.startswith(browser.DETAILS_DIR_NAME + '/') or name in shards) \
+                        and browser.write_if_changed(output_dir / name, data):
+                    written += 1
+            for name in stale:
+                (output_dir / name).unlink(missing_ok=True)
+        self.browser_files = set(files)
+        if written or stale:
+            changed.append(f"browser data ({written} written, {len(stale)} removed)")
+        return changed
+
+    def sync(self) -> list[str]:
+        """Load the whole catalog and write every artifact."""
+        self.entries.clear()
+        self.menu_sections.clear()
+        self.update(set(iter_audit_files(self.audits_dir)))
+        changed = self.write()
+        browser.remove_stale(browser.OUTPUT_DIR, self.browser_files)
+        return changed
+
+    def apply(self, paths: set[Path]) -> None:
+        start = time.perf_counter()
+        updated, removed = self.update(paths)
+        if not updated and not removed:
+            return
+        shards = {self.entries[BASE_DIR / rel].shard[0] for rel in updated if BASE_DIR / rel in self.entries}
+        changed = self.write(shards)
+        elapsed = (time.perf_counter() - start) * 1000
+        touched = ', '.join(updated + [f"{rel} (removed)" for rel in removed])
+        print(f"{time.strftime('%H:%M:%S')} {touched}: "
+              f"{', '.join(changed) or 'no artifact changes'} [{elapsed:.0f} ms]")
+
+
+def watch(state: CatalogState, source, debounce: float) -> None:
+    pending: set[Path] = set()
+    rescan = False
+    windows = 0
+    while True:
+        changed, overflow = source.wait(debounce if pending or rescan else None)
+        pending |= changed
+        rescan |= overflow
+        windows += 1
+        if (changed or overflow) and windows < MAX_DEBOUNCE_WINDOWS:
+            continue  # still bursting; wait for a quiet window
+
+        if rescan:
+            print(f"{time.strftime('%H:%M:%S')} Rescanning catalog")
+            pending |= set(iter_audit_files(state.audits_dir)) | set(state.entries)
+        if pending:
+            state.apply(pending)
+        pending, rescan, windows = set(), False, 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keep the inventory, menu and browser data in sync with audits/.")
+    parser.add_argument('--poll', type=float, metavar='SECONDS', help="Poll for changes instead of using inotify")
+    parser.add_argument('--debounce', type=int, default=DEFAULT_DEBOUNCE_MS,
+                        help=f"Quiet period before regenerating, in ms (default: {DEFAULT_DEBOUNCE_MS})")
+    parser.add_argument('--once', action='store_true', help="Sync all artifacts once and exit")
+    args = parser.parse_args()
+
+    audits_dir = inventory.AUDITS_DIR
+    if not audits_dir.exists():
+        print(f"Error: Audits directory not found: {audits_dir}", file=sys.stderr)
+        sys.exit(1)
+
+    state = CatalogState(audits_dir)
+    start = time.perf_counter()
+    changed = state.sync()
+    print(f"Loaded {len(state.entries)} audits in {time.perf_counter() - start:.1f}s"
+          f"{': updated ' + ', '.join(changed) if changed else ' (artifacts up to date)'}")
+    if args.once:
+        return
+
+    if args.poll is None and Inotify.available():
+        source = Inotify(audits_dir)
+        print(f"Watching {audits_dir} (inotify). Press Ctrl-C to stop.")
+    else:
+        source = Poller(audits_dir, args.poll or 1.0)
+        print(f"Watching {audits_dir} (polling every {source.interval:g}s). Press Ctrl-C to stop.")
+
+    try:
+        watch(state, source, args.debounce / 1000)
+    except KeyboardInterrupt:
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,671 @@
+#!/usr/bin/env python3
+"""
+Structured queries over parsed config files.
+
+Line regexes see a config file as text: they miss a setting whose key and
+value sit on different lines, match keys in the wrong section, and cannot
+say that a key is absent. A `type: query` code pattern instead selects
+values from the parsed document, next to the regexes of the same audit:
+
+    - pattern: "..containers[?!resources.limits]"
+      type: query
+      scope: config
+      purpose: Containers without resource limits
+
+parse_config() reads YAML (every document of a stream), JSON, TOML and INI
+into plain dicts, lists and scalars, recording the line of each value. The
+scanner parses a file once, when the first query that applies to it runs,
+and evaluates every query against the same tree; the scan result cache keys
+the hits by file content, as for regex patterns.
+
+Query syntax (a JMESPath-like subset):
+
+    a.b.c              mapping keys; quote keys holding dots: metadata."app.kubernetes.io/name"
+    a[0]  a[-1]        list items
+    a[*]  a.*          every item of a list, every value of a mapping
+    ..b  a..b          key b at any depth (below a)
+    a[?cond]           the items of list a (or a itself, if not a list) for which cond holds
+    path OP value      OP is ==, !=, <, <=, >, >=, =~ (regex search) or in
+    !path              documents in which path selects nothing
+
+A condition is a query relative to the item (`@` is the item itself);
+conditions combine with &&, || and parentheses, and `!` negates one. A
+bare path in a condition holds when it selects a value other than null,
+false or an empty string, list or mapping. Values are 'strings',
+"strings", numbers, true, false, null and [lists]. Numeric strings compare
+as numbers, since INI files and environment-style settings quote them.
+
+A query hits once per value it selects (once per document for !path), at
+the line of the value's key, or of the value itself for list items.
+
+Usage:
+    python scripts/config_query.py --check                         # compile every catalog query and graph query
+    python scripts/config_query.py '..securityContext.privileged == true' k8s/*.yaml
+"""
+
+import io
+import re
+import sys
+import json
+import argparse
+import datetime
+import configparser
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+from typing import Any, Callable, Iterator
+
+import yaml
+
+try:
+    import tomllib  # Python 3.11+
+except ImportError:  # pragma: no cover
+    tomllib = None
+
+YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+STR_TAG = 'tag:yaml.org,2002:str'
+NULL_TAG = 'tag:yaml.org,2002:null'
+BOOL_TAG = 'tag:yaml.org,2002:bool'
+
+# File suffix -> config format; the format is also the file's path class
+CONFIG_FORMATS = {
+    '.yaml': 'yaml', '.yml': 'yaml',
+    '.json': 'json',
+    '.toml': 'toml',
+    '.ini': 'ini', '.cfg': 'ini',
+}
+
+CONFIG_FILE_FORMATS = {'pipfile': 'toml', 'composer.lock': 'json'}
+
+QUERY_FORMATS = frozenset(CONFIG_FORMATS.values())
+
+# Keys and list indexes from a document's root to a value
+KeyPath = tuple
+
+
+class QueryError(ValueError):
+    """A query that does not parse."""
+
+
+def config_format(rel_path: str) -> str | None:
+    """The format a config file is parsed as, or None for files queries do not read."""
+    path = PurePosixPath(rel_path)
+    name = path.name.lower()
+    return CONFIG_FILE_FORMATS.get(name) or CONFIG_FORMATS.get(path.suffix.lower())
+
+
+# ---------------------------------------------------------------------------
+# Parsing
+# ---------------------------------------------------------------------------
+
+@dataclass
+class Document:
+    """One parsed config document, with the line each located value starts on."""
+    value: Any
+    lines: dict[KeyPath, int] = field(default_factory=dict)
+    start: int = 1
+
+    def line(self, path: KeyPath) -> int:
+        """Line of a value, or of its nearest located ancestor."""
+        for depth in range(len(path), -1, -1):
+            line = self.lines.get(path[:depth])
+            if line is not None:
+                return line
+        return self.start
+
+
+def plain(value: Any) -> Any:
+    """Map scalar types without a JSON counterpart (dates, bytes) to strings."""
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, bytes):
+        return value.decode('utf-8', errors='replace')
+    return value
+
+
+class YamlTree:
+    """Build plain values from a YAML node graph, recording each value's line."""
+
+    def __init__(self, json_scalars: bool = False):
+        self.constructor = yaml.constructor.SafeConstructor()
+        self.json_scalars = json_scalars
+
+    def scalar(self, node: yaml.ScalarNode) -> Any:
+        if self.json_scalars:
+            if node.style:  # quoted
+                return node.value
+            try:
+                return json.loads(node.value)
+            except ValueError:
+                return node.value
+        # Most scalars are strings: skip the constructor for them and the other trivial tags
+        if node.tag == STR_TAG:
+            return node.value
+        if node.tag == NULL_TAG:
+            return None
+        if node.tag == BOOL_TAG:
+            return node.value.lower() in ('yes', 'true', 'on')
+        try:
+            return plain(self.constructor.construct_object(node))
+        except yaml.YAMLError:
+            return node.value
+
+    def build(self, node: yaml.Node, path: KeyPath, lines: dict[KeyPath, int], active: set[int]) -> Any:
+        lines[path] = node.start_mark.line + 1
+        if isinstance(node, yaml.ScalarNode):
+            return self.scalar(node)
+        if id(node) in active:
+            return None  # a recursive alias
+        active.add(id(node))
+        try:
+            if isinstance(node, yaml.SequenceNode):
+                return [self.build(item, path + (i,), lines, active) for i, item in enumerate(node.value)]
+            mapping = {}
+            merged = []
+            for key_node, value_node in node.value:
+                if key_node.tag == 'tag:yaml.org,2002:merge':
+                    merged.extend(value_node.value if isinstance(value_node, yaml.SequenceNode) else [value_node])
+                    continue
+                if not isinstance(key_node, yaml.ScalarNode):
+                    continue  # complex keys have no path
+                key = self.scalar(key_node)
+                mapping[key] = self.build(value_node, path + (key,), lines, active)
+                lines[path + (key,)] = key_node.start_mark.line + 1  # the key's line, not the value's
+            for source in merged:  # `<<: *defaults` fills keys the mapping does not set
+                if isinstance(source, yaml.MappingNode):
+                    for key, value in self.build(source, path, {}, active).items():
+                        mapping.setdefault(key, value)
+            return mapping
+        finally:
+            active.discard(id(node))
+
+
+def parse_yaml(text: str, json_scalars: bool = False) -> list[Document]:
+    tree = YamlTree(json_scalars)
+    documents = []
+    for node in yaml.compose_all(text, Loader=YamlLoader):
+        if node is None:
+            continue
+        lines: dict[KeyPath, int] = {}
+        value = tree.build(node, (), lines, set())
+        documents.append(Document(value, lines, lines[()]))
+    return documents
+
+
+def parse_json(text: str) -> list[Document]:
+    # The YAML composer reads JSON with positions; json.loads settles the rest
+    try:
+        return parse_yaml(text, json_scalars=True)
+    except yaml.YAMLError:
+        return [Document(json.loads(text))]
+
+
+TOML_TABLE = re.compile(r'^\s*(\[\[?)\s*([^\]]+?)\s*\]\]?\s*(?:#.*)?$')
+TOML_KEY = re.compile(r'^\s*((?:"[^"]*"|\'[^\']*\'|[A-Za-z0-9_-]+)(?:\s*\.\s*(?:"[^"]*"|\'[^\']*\'|[A-Za-z0-9_-]+))*)\s*=')
+TOML_KEY_PART = re.compile(r'"([^"]*)"|\'([^\']*)\'|([A-Za-z0-9_-]+)')
+
+
+def toml_keys(dotted: str) -> KeyPath:
+    return tuple(next(g for g in m.groups() if g is not None) for m in TOML_KEY_PART.finditer(dotted))
+
+
+def parse_toml(text: str) -> list[Document]:
+    if tomllib is None:
+        return []
+    value = tomllib.loads(text)
+    # tomllib keeps no positions: locate table headers and keys line by line
+    lines: dict[KeyPath, int] = {}
+    table: KeyPath = ()
+    arrays: dict[KeyPath, int] = {}
+    in_string = False
+    for number, line in enumerate(text.splitlines(), 1):
+        was_in_string = in_string
+        if line.count('"""') % 2 or line.count("'''") % 2:
+            in_string = not in_string  # a multi-line string opens or closes here
+        if was_in_string:
+            continue
+        m = TOML_TABLE.match(line)
+        if m:
+            keys = toml_keys(m.group(2))
+            if m.group(1) == '[[':
+                arrays[keys] = arrays.get(keys, -1) + 1
+                keys += (arrays[keys],)
+            table = keys
+            lines.setdefault(table, number)
+            continue
+        m = TOML_KEY.match(line)
+        if m:
+            lines.setdefault(table + toml_keys(m.group(1)), number)
+    return [Document(value, lines)]
+
+
+INI_SECTION = re.compile(r'^\s*\[([^\]]+)\]')
+INI_KEY = re.compile(r'^([^\s=:;#\[][^=:]*?)\s*[=:]')
+
+
+def parse_ini(text: str) -> list[Document]:
+    parser = configparser.ConfigParser(interpolation=None, strict=False, allow_no_value=True)
+    parser.optionxform = str  # keep key case
+    parser.read_file(io.StringIO(text))
+    value = {name: dict(parser.items(name, raw=True)) for name in parser.sections()}
+    if parser.defaults():
+        value[parser.default_section] = dict(parser.defaults())
+    lines: dict[KeyPath, int] = {}
+    section = parser.default_section
+    for number, line in enumerate(text.splitlines(), 1):
+        m = INI_SECTION.match(line)
+        if m:
+            section = m.group(1).strip()
+            lines.setdefault((section,), number)
+            continue
+        m = INI_KEY.match(line)
+        if m:
+            lines.setdefault((section, m.group(1).strip()), number)
+    return [Document(value, lines)]
+
+
+PARSERS: dict[str, Callable[[str], list[Document]]] = {
+    'yaml': parse_yaml,
+    'json': parse_json,
+    'toml': parse_toml,
+    'ini': parse_ini,
+}
+
+
+def parse_config(fmt: str, text: str) -> list[Document]:
+    """Parse a config file's documents; a file that does not parse has none."""
+    try:
+        return PARSERS[fmt](text)
+    except (yaml.YAMLError, ValueError, configparser.Error, RecursionError):
+        # json.JSONDecodeError and tomllib.TOMLDecodeError are ValueErrors
+        return []
+
+
+# ---------------------------------------------------------------------------
+# Queries
+# ---------------------------------------------------------------------------
+
+TOKEN = re.compile(r'''
+    \s*(?:
+      (?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+    | (?P<number>-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)
+    | (?P<op>==|!=|<=|>=|=~|&&|\|\||\.\.|[.\[\]*?!()<>,@])
+    | (?P<name>[A-Za-z_$][\w$/:-]*)
+    )''', re.VERBOSE)
+
+COMPARISONS = {'==', '!=', '<', '<=', '>', '>=', '=~', 'in'}
+
+KEYWORDS = {'true': True, 'false': False, 'null': None}
+
+Node = tuple[Any, KeyPath]
+Step = tuple  # ('key', name) | ('index', n) | ('all',) | ('descend', name | None) | ('filter', cond)
+Condition = Callable[[Node], bool]
+
+
+def tokenize(query: str) -> list[tuple[str, str]]:
+    tokens, pos = [], 0
+    query = query.rstrip()
+    while pos < len(query):
+        m = TOKEN.match(query, pos)
+        if not m or m.end() == pos:
+            raise QueryError(f"unexpected {query[pos:].strip()[:20]!r}")
+        kind = m.lastgroup
+        text = m.group(kind)
+        if kind == 'name' and text == 'in':
+            kind = 'op'
+        tokens.append((kind, text))
+        pos = m.end()
+    return tokens
+
+
+def unquote(text: str) -> str:
+    return re.sub(r'\\(.)', r'\1', text[1:-1])
+
+
+def is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def as_number(value: Any) -> float | None:
+    if is_number(value):
+        return value
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return None
+
+
+def scalar_text(value: Any) -> str:
+    if isinstance(value, bool) or value is None:
+        return json.dumps(value)
+    return str(value)
+
+
+def equal(left: Any, right: Any) -> bool:
+    if is_number(left) or is_number(right):
+        a, b = as_number(left), as_number(right)
+        return a is not None and b is not None and a == b
+    return type(left) is type(right) and left == right
+
+
+def truthy(value: Any) -> bool:
+    # Identity checks, since 0 == False and numeric zero is a present value
+    return not (value is None or value is False or value in ('', [], {}))
+
+
+def compare(op: str, left: Any, right: Any) -> bool:
+    if op == '==':
+        return equal(left, right)
+    if op == '!=':
+        return not equal(left, right)
+    if op == 'in':
+        return any(equal(left, item) for item in right)
+    if op == '=~':
+        return not isinstance(left, (list, dict)) and right.search(scalar_text(left)) is not None
+    a, b = as_number(left), as_number(right)
+    if a is None or b is None:
+        # Strings order as strings only when either side is not numeric
+        if not (isinstance(left, str) and isinstance(right, str)):
+            return False
+        a, b = left, right
+    return {'<': a < b, '<=': a <= b, '>': a > b, '>=': a >= b}[op]
+
+
+def descendants(node: Node, leaves: bool = True) -> Iterator[Node]:
+    """A node and everything below it, depth first; only mappings and lists unless leaves."""
+    stack = [node]
+    while stack:
+        value, path = stack.pop()
+        yield value, path
+        if isinstance(value, dict):
+            items = value.items()
+        elif isinstance(value, list):
+            items = enumerate(value)
+        else:
+            continue
+        stack.extend(reversed([(v, path + (k,)) for k, v in items if leaves or isinstance(v, (dict, list))]))
+
+
+def apply_step(step: Step, node: Node) -> Iterator[Node]:
+    value, path = node
+    kind = step[0]
+    if kind == 'key':
+        if isinstance(value, dict) and step[1] in value:
+            yield value[step[1]], path + (step[1],)
+    elif kind == 'index':
+        if isinstance(value, list) and -len(value) <= step[1] < len(value):
+            index = step[1] % len(value)
+            yield value[index], path + (index,)
+    elif kind == 'all':
+        if isinstance(value, dict):
+            yield from ((v, path + (k,)) for k, v in value.items())
+        elif isinstance(value, list):
+            yield from ((v, path + (i,)) for i, v in enumerate(value))
+    elif kind == 'descend':
+        for inner in descendants(node, leaves=step[1] is None):
+            if step[1] is None:
+                if inner is not node:
+                    yield inner
+            elif isinstance(inner[0], dict) and step[1] in inner[0]:
+                yield inner[0][step[1]], inner[1] + (step[1],)
+    elif kind == 'filter':
+        items = ((v, path + (i,)) for i, v in enumerate(value)) if isinstance(value, list) else [node]
+        yield from (item for item in items if step[1](item))
+
+
+def select(steps: list[Step], node: Node, depth: int = 0) -> Iterator[Node]:
+    """Values the steps lead to from a node, lazily, in document order."""
+    if depth == len(steps):
+        yield node
+        return
+    for out in apply_step(steps[depth], node):
+        yield from select(steps, out, depth + 1)
+
+
+class Parser:
+    """Recursive-descent parser from query tokens to steps and conditions."""
+
+    def __init__(self, query: str):
+        self.query = query
+        self.tokens = tokenize(query)
+        self.pos = 0
+
+    def peek(self, offset: int = 0) -> tuple[str, str] | None:
+        index = self.pos + offset
+        return self.tokens[index] if index < len(self.tokens) else None
+
+    def at(self, *texts: str) -> bool:
+        token = self.peek()
+        return token is not None and token[0] in ('op', 'name') and token[1] in texts
+
+    def take(self, *texts: str) -> str:
+        token = self.peek()
+        if token is None or (texts and token[1] not in texts):
+            expected = ' or '.join(repr(t) for t in texts) or 'more'
+            raise QueryError(f"expected {expected} at {self.rest()!r}")
+        self.pos += 1
+        return token[1]
+
+    def rest(self) -> str:
+        return ' '.join(text for _, text in self.tokens[self.pos:]) or 'end of query'
+
+    def key(self) -> str | None:
+        """A key name, quoted key or `*` after `.` or `..`; None for `*`."""
+        token = self.peek()
+        if token is None:
+            raise QueryError("query ends after '.'")
+        kind, text = token
+        self.pos += 1
+        if kind == 'name':
+            return text
+        if kind == 'string':
+            return unquote(text)
+        if text == '*':
+            return None
+        raise QueryError(f"expected a key at {text!r}")
+
+    def path(self) -> list[Step]:
+        steps: list[Step] = []
+        if self.at('@'):
+            self.take()
+        elif self.peek() and self.peek()[0] in ('name', 'string') or self.at('*'):
+            name = self.key()
+            steps.append(('key', name) if name is not None else ('all',))
+        while True:
+            if self.at('.'):
+                self.take()
+                name = self.key()
+                steps.append(('key', name) if name is not None else ('all',))
+            elif self.at('..'):
+                self.take()
+                steps.append(('descend', self.key()))
+            elif self.at('['):
+                self.take()
+                steps.append(self.bracket())
+                self.take(']')
+            else:
+                return steps
+
+    def bracket(self) -> Step:
+        kind, text = self.peek() or ('', '')
+        if text == '*':
+            self.take()
+            return ('all',)
+        if text == '?':
+            self.take()
+            return ('filter', self.condition())
+        if kind == 'number' and re.fullmatch(r'-?\d+', text):
+            self.take()
+            return ('index', int(text))
+        if kind == 'string':
+            self.take()
+            return ('key', unquote(text))
+        raise QueryError(f"expected an index, '*', '?' or a quoted key at {self.rest()!r}")
+
+    def value(self) -> Any:
+        kind, text = self.peek() or ('', '')
+        if kind == 'string':
+            self.take()
+            return unquote(text)
+        if kind == 'number':
+            self.take()
+            return json.loads(text)
+        if kind == 'name' and text in KEYWORDS:
+            self.take()
+            return KEYWORDS[text]
+        if text == '[':
+            self.take()
+            items = []
+            while not self.at(']'):
+                items.append(self.value())
+                if not self.at(']'):
+                    self.take(',')
+            self.take(']')
+            return items
+        raise QueryError(f"expected a value at {self.rest()!r}")
+
+    def comparison(self) -> tuple[str, Any] | None:
+        if not self.at(*COMPARISONS):
+            return None
+        op = self.take()
+        right = self.value()
+        if op == '=~':
+            if not isinstance(right, str):
+                raise QueryError("=~ needs a regex string")
+            try:
+                right = re.compile(right)
+            except re.error as e:
+                raise QueryError(f"bad regex {right!r}: {e}") from e
+        elif op == 'in' and not isinstance(right, list):
+            raise QueryError("in needs a [list]")
+        return op, right
+
+    def condition(self) -> Condition:
+        terms = [self.conjunction()]
+        while self.at('||'):
+            self.take()
+            terms.append(self.conjunction())
+        return terms[0] if len(terms) == 1 else (lambda node: any(term(node) for term in terms))
+
+    def conjunction(self) -> Condition:
+        terms = [self.unary()]
+        while self.at('&&'):
+            self.take()
+            terms.append(self.unary())
+        return terms[0] if len(terms) == 1 else (lambda node: all(term(node) for term in terms))
+
+    def unary(self) -> Condition:
+        if self.at('!'):
+            self.take()
+            inner = self.unary()
+            return lambda node: not inner(node)
+        if self.at('('):
+            self.take()
+            inner = self.condition()
+            self.take(')')
+            return inner
+        steps = self.path()
+        test = self.comparison()
+        if test is None:
+            return lambda node: any(truthy(value) for value, _ in select(steps, node))
+        op, right = test
+        return lambda node: any(compare(op, value, right) for value, _ in select(steps, node))
+
+
+@dataclass
+class ConfigQuery:
+    """A compiled query: a path, optionally a comparison, optionally negated."""
+    text: str
+    steps: list[Step]
+    test: tuple[str, Any] | None = None
+    negated: bool = False
+
+    def required_keys(self) -> set[str]:
+        """Keys every document the query can hit must contain (none for !path)."""
+        if self.negated:
+            return set()
+        return {step[1] for step in self.steps if step[0] in ('key', 'descend') and step[1] is not None}
+
+    def hits(self, value: Any) -> Iterator[KeyPath]:
+        """Paths of every hit in one document's value (the root path for a !path hit)."""
+        selected = select(self.steps, (value, ()))
+        if self.negated:
+            if next(selected, None) is None:
+                yield ()
+            return
+        for found, path in selected:
+            if self.test is None or compare(self.test[0], found, self.test[1]):
+                yield path
+
+    def evaluate(self, documents: list[Document]) -> Iterator[int]:
+        """Lines of every hit in the documents, in document order."""
+        for document in documents:
+            for path in self.hits(document.value):
+                yield document.line(path)
+
+
+def compile_query(query: str) -> ConfigQuery:
+    """Compile a query, raising QueryError if it does not parse."""
+    parser = Parser(query)
+    negated = parser.at('!')
+    if negated:
+        parser.take()
+    steps = parser.path()
+    if not steps:
+        raise QueryError(f"expected a path at {parser.rest()!r}")
+    test = None if negated else parser.comparison()
+    if parser.peek() is not None:
+        raise QueryError(f"unexpected {parser.rest()!r}")
+    return ConfigQuery(query, steps, test, negated)
+
+
+def main():
+    from audit_catalog import AUDITS_DIR, load_catalog
+
+    parser = argparse.ArgumentParser(description="Check catalog config queries, or run one against config files.")
+    parser.add_argument('query', nargs='?', help="Query to run")
+    parser.add_argument('files', nargs='*', help="Config files to run the query against")
+    parser.add_argument('--check', action='store_true', help="Compile every `type: query` and `type: graph` pattern in the catalog")
+    parser.add_argument('--audits-dir', default=str(AUDITS_DIR), help="Audit catalog directory")
+    args = parser.parse_args()
+
+    if args.check:
+        catalog = load_catalog(Path(args.audits_dir), sections=('audit', 'discovery'))
+        total = failed = 0
+        for audit_id, data in sorted(catalog.items()):
+            discovery = data.get('discovery') if isinstance(data.get('discovery'), dict) else {}
+            for i, entry in enumerate(discovery.get('code_patterns') or []):
+                if not isinstance(entry, dict) or entry.get('type') not in ('query', 'graph'):
+                    continue
+                total += 1
+                try:
+                    compile_query(str(entry.get('pattern') or ''))
+                except QueryError as e:
+                    failed += 1
+                    print(f"  {audit_id} discovery.code_patterns[{i}]: {e}")
+        print(f"Config queries: {total - failed}/{total} compile")
+        sys.exit(1 if failed else 0)
+
+    if not args.query:
+        parser.error("give a query and files, or --check")
+    try:
+        query = compile_query(args.query)
+    except QueryError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    for name in args.files:
+        fmt = config_format(name)
+        if fmt is None:
+            print(f"  {name}: not a YAML, JSON, TOML or INI file", file=sys.stderr)
+            continue
+        text = Path(name).read_text(encoding='utf-8', errors='replace')
+        lines = text.splitlines()
+        for line_no in query.evaluate(parse_config(fmt, text)):
+            excerpt = lines[line_no - 1].strip() if line_no <= len(lines) else ''
+            print(f"{name}:{line_no}: {excerpt}")
+
+
+if __name__ == "__main__":
+    main()
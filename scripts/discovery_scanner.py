@@ -0,0 +1,800 @@
+#!/usr/bin/env python3
+"""
+Run audit discovery patterns against a target repository.
+
+For every selected audit, `discovery.file_patterns` globs are matched
+against the target's file paths and `discovery.code_patterns` regexes are
+matched against the contents of files in each pattern's scope. Results are
+written as JSON, keyed by audit ID and then by target file path.
+
+Each regex runs only where it can match: literal_prefilter.py extracts the
+literals it requires, one pass per file finds the lines holding them, and
+the regex then searches only those lines (or the whole file, for patterns
+that can span lines). Files holding none of its literals are skipped.
+
+Code patterns of `type: query` select values from parsed YAML, JSON, TOML
+and INI files instead (see config_query.py). A config file is parsed once
+for all the queries that apply to it, and only if it holds the longest key
+one of them requires. Code patterns of `type: graph` query the resource
+graph of the target's Terraform and Kubernetes files (see iac_graph.py),
+built during the same pass and queried once per target.
+
+The target can also be a `.tar`/`.tar.gz` archive or a container image (OCI
+layout directory or `docker save` tarball): files are streamed from the
+archive, image layers are merged with their whiteouts applied, and nothing
+is extracted (see archive_source.py).
+
+Incremental mode (--previous/--since) reuses a previous results file: only
+files changed since the previous run's git revision are rescanned, and only
+for the audits whose file globs or pattern scopes cover those files. Files
+that were modified or untracked at the previous run are rescanned too, so
+findings in a file since deleted or reverted do not linger. Every other
+audit's findings are carried over unchanged.
+
+Usage:
+    python scripts/discovery_scanner.py --target ../service --profile security \\
+        --output results.json
+    python scripts/discovery_scanner.py --target ../service --profile security \\
+        --previous results.json --output results.json
+"""
+
+import os
+import re
+import sys
+import json
+import bisect
+import hashlib
+import argparse
+import subprocess
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import partial
+from itertools import chain, islice
+from pathlib import Path, PurePosixPath
+from typing import Any, Callable, Iterable, Iterator
+
+from archive_source import ArchiveError, is_archive_target, iter_archive
+from audit_catalog import AUDITS_DIR, load_catalog
+from config_query import QUERY_FORMATS, ConfigQuery, Document, QueryError, compile_query, config_format, parse_config
+from iac_graph import ResourceGraph, is_iac_path
+from literal_prefilter import MIN_LITERAL_CHARS, LiteralHits, LiteralIndex, Prefilter, prefilter_for
+from scan_cache import CACHE_DIR, DEFAULT_MAX_MB, ScanCache, git_blob_id
+
+RESULTS_VERSION = 1
+
+# Files larger than this are skipped (minified bundles, data dumps)
+MAX_FILE_BYTES = 2 * 1024 * 1024
+
+# Cap on recorded hits per pattern per file
+MAX_HITS_PER_PATTERN = 20
+
+# Longest excerpt stored for a hit
+MAX_EXCERPT_CHARS = 200
+
+# Part of every scan cache key; covers the settings that shape cached hits
+SCAN_CACHE_FORMAT = f"{RESULTS_VERSION}:{MAX_HITS_PER_PATTERN}:{MAX_EXCERPT_CHARS}"
+
+# Directories skipped when the target is not a git checkout
+SKIP_DIRS = {'.git', '.hg', '.svn', 'node_modules', '__pycache__', '.venv', 'venv', '.tox'}
+
+SOURCE_EXTENSIONS = {
+    '.py', '.js', '.jsx', '.mjs', '.cjs', '.ts', '.tsx', '.java', '.kt', '.kts',
+    '.scala', '.go', '.rs', '.rb', '.php', '.cs', '.c', '.h', '.cc', '.cpp',
+    '.hpp', '.m', '.mm', '.swift', '.dart', '.lua', '.pl', '.ex', '.exs',
+    '.erl', '.clj', '.fs', '.vue', '.svelte', '.sol', '.r', '.jl', '.sql',
+    '.sh', '.bash', '.zsh', '.ps1', '.groovy', '.html', '.css', '.scss',
+}
+
+CONFIG_EXTENSIONS = {
+    '.yaml', '.yml', '.json', '.toml', '.ini', '.cfg', '.conf', '.properties',
+    '.xml', '.env', '.tf', '.tfvars', '.hcl', '.gradle', '.lock',
+}
+
+CONFIG_FILENAMES = {
+    'dockerfile', 'makefile', 'jenkinsfile', 'procfile', 'vagrantfile',
+    'gemfile', 'pipfile', 'codeowners', '.gitignore', '.dockerignore',
+    '.editorconfig', '.npmrc', '.env',
+}
+
+DOCS_EXTENSIONS = {'.md', '.markdown', '.rst', '.txt', '.adoc', '.org'}
+
+SCRIPT_EXTENSIONS = {'.sh', '.bash', '.zsh', '.ps1', '.bat', '.cmd'}
+
+# Pattern scope -> path classes it applies to. Unknown scopes apply to all files.
+SCOPE_CLASSES = {
+    'source': {'source'},
+    'code': {'source'},
+    'comments': {'source'},
+    'strings': {'source'},
+    'identifiers': {'source'},
+    'config': {'config'},
+    'configuration': {'config'},
+    'env_vars': {'config', 'source'},
+    'alert_rules': {'config'},
+    'alerting_rules': {'config'},
+    'alertmanager_config': {'config'},
+    'templates': {'config', 'source'},
+    'docs': {'docs'},
+    'documentation': {'docs'},
+    'test': {'test'},
+    'testing': {'test'},
+    'scripts': {'script'},
+}
+
+TEST_DIR_NAMES = {'test', 'tests', '__tests__', 'spec', 'specs', 'e2e', 'testing'}
+
+
+def classify_path(rel_path: str) -> frozenset[str]:
+    """Return the path classes ('source', 'config', ...) a file belongs to."""
+    path = PurePosixPath(rel_path)
+    name = path.name.lower()
+    suffix = path.suffix.lower()
+    classes = set()
+
+    if suffix in SOURCE_EXTENSIONS:
+        classes.add('source')
+    if suffix in CONFIG_EXTENSIONS or name in CONFIG_FILENAMES or name.startswith('.env') \
+            or name.startswith('dockerfile'):
+        classes.add('config')
+    if suffix in DOCS_EXTENSIONS or 'docs' in path.parts[:-1] or name.startswith('readme'):
+        classes.add('docs')
+    if suffix in SCRIPT_EXTENSIONS:
+        classes.add('script')
+    if 'config' in classes:
+        fmt = config_format(rel_path)
+        if fmt:
+            classes.add(fmt)  # the format config queries parse the file as
+    if classes & {'source', 'config'}:
+        dirs = {part.lower() for part in path.parts[:-1]}
+        stem = name.split('.')[0]
+        if dirs & TEST_DIR_NAMES or stem.startswith('test_') or stem.endswith(('_test', '_spec')) \
+                or '.test.' in name or '.spec.' in name:
+            classes.add('test')
+
+    return frozenset(classes)
+
+
+def glob_to_regex(glob: str) -> re.Pattern:
+    """
+    Translate a discovery glob into a regex over POSIX relative paths.
+
+    Supports `**` (any number of directories), `*`, `?`, `[...]` and
+    `{a,b}` alternation. Globs without a slash match the basename anywhere,
+    mirroring how authors write patterns such as `*.tf`.
+    """
+    glob = glob.strip()
+    if glob.startswith('./'):
+        glob = glob[2:]
+    if '/' not in glob:
+        glob = '**/' + glob
+
+    out = []
+    i = 0
+    depth = 0
+    while i < len(glob):
+        c = glob[i]
+        if c == '*':
+            if glob[i:i + 3] == '**/':
+                out.append('(?:.*/)?')
+                i += 3
+                continue
+            if glob[i:i + 2] == '**':
+                out.append('.*')
+                i += 2
+                continue
+            out.append('[^/]*')
+        elif c == '?':
+            out.append('[^/]')
+        elif c == '[':
+            end = glob.find(']', i + 1)
+            if end == -1:
+                out.append(re.escape(c))
+            else:
+                body = glob[i + 1:end]
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                out.append('[' + body.replace('\\', '\\\\') + ']')
+                i = end
+        elif c == '{':
+            depth += 1
+            out.append('(?:')
+        elif c == '}' and depth:
+            depth -= 1
+            out.append(')')
+        elif c == ',' and depth:
+            out.append('|')
+        else:
+            out.append(re.escape(c))
+        i += 1
+
+    out.append(')' * depth)
+    return re.compile('(?:' + ''.join(out) + ')$')
+
+
+@dataclass
+class CodePattern:
+    index: int
+    pattern: str
+    scope: str
+    regex: re.Pattern | None
+    prefilter: Prefilter | None = None
+    query: ConfigQuery | None = None
+    graph: bool = False
+
+    def applies_to(self, classes: frozenset[str]) -> bool:
+        """Check whether this pattern's scope covers a file of the given classes."""
+        if self.graph:
+            return False  # evaluated once per target, over the resource graph
+        if self.query is not None and not QUERY_FORMATS & classes:
+            return False
+        wanted = SCOPE_CLASSES.get(self.scope)
+        if wanted is None:
+            return True
+        return bool(wanted & classes)
+
+
+@dataclass
+class FileGlob:
+    index: int
+    glob: str
+    regex: re.Pattern
+
+
+@dataclass
+class AuditMatcher:
+    audit_id: str
+    file_path: str
+    code_patterns: list[CodePattern] = field(default_factory=list)
+    file_globs: list[FileGlob] = field(default_factory=list)
+    pattern_hash: str = ''
+
+    @property
+    def graph_patterns(self) -> list[CodePattern]:
+        return [p for p in self.code_patterns if p.graph]
+
+    def covers(self, rel_path: str, classes: frozenset[str] | None = None) -> bool:
+        """Check whether a change to rel_path can affect this audit's results."""
+        if classes is None:
+            classes = classify_path(rel_path)
+        if any(g.regex.match(rel_path) for g in self.file_globs):
+            return True
+        return any(p.applies_to(classes) for p in self.code_patterns)
+
+
+def compile_pattern(pattern: str) -> re.Pattern | None:
+    """Compile a catalog regex, returning None if it is not valid Python regex."""
+    try:
+        return re.compile(pattern, re.MULTILINE)
+    except re.error:
+        return None
+
+
+def query_prefilter(query: ConfigQuery) -> Prefilter | None:
+    """Screen a config query by the longest key it requires, so most files are never parsed."""
+    keys = [key for key in query.required_keys() if len(key) >= MIN_LITERAL_CHARS]
+    if not keys:
+        return None
+    return Prefilter(frozenset({max(keys, key=len)}), ignorecase=False, single_line=False)
+
+
+def compile_audit(audit_id: str, data: dict[str, Any]) -> AuditMatcher:
+    """Compile one audit's discovery section into a matcher."""
+    discovery = data.get('discovery') or {}
+    matcher = AuditMatcher(audit_id=audit_id, file_path=data.get('_file_path', ''))
+
+    for index, entry in enumerate(discovery.get('code_patterns') or []):
+        if not isinstance(entry, dict) or entry.get('type', 'regex') not in ('regex', 'keyword', 'query', 'graph'):
+            continue
+        pattern = str(entry.get('pattern') or '')
+        if not pattern.strip():
+            continue
+        scope = str(entry.get('scope') or 'all')
+        if entry.get('type') in ('query', 'graph'):
+            try:
+                query = compile_query(pattern)
+            except QueryError:
+                continue
+            if entry['type'] == 'graph':
+                matcher.code_patterns.append(CodePattern(index, pattern, scope, None, query=query, graph=True))
+            else:
+                matcher.code_patterns.append(CodePattern(index, pattern, scope, None, query_prefilter(query), query))
+            continue
+        regex = compile_pattern(pattern)
+        if regex is None:
+            continue
+        matcher.code_patterns.append(CodePattern(index, pattern, scope, regex, prefilter_for(pattern)))
+
+    for index, entry in enumerate(discovery.get('file_patterns') or []):
+        glob = entry.get('glob') if isinstance(entry, dict) else entry
+        if not isinstance(glob, str) or not glob.strip():
+            continue
+        try:
+            regex = glob_to_regex(glob)
+        except re.error:
+            continue
+        matcher.file_globs.append(FileGlob(index, glob, regex))
+
+    digest = hashlib.sha256()
+    for p in matcher.code_patterns:
+        kind = 'g' if p.graph else 'q' if p.query is not None else 'c'
+        digest.update(f"{kind}\0{p.index}\0{p.scope}\0{p.pattern}\n".encode())
+    for g in matcher.file_globs:
+        digest.update(f"g\0{g.index}\0{g.glob}\n".encode())
+    matcher.pattern_hash = digest.hexdigest()[:16]
+    return matcher
+
+
+def literal_index(matchers: Iterable[AuditMatcher]) -> LiteralIndex:
+    """Index the required literals of every code pattern of the given audits."""
+    return LiteralIndex(p.prefilter for m in matchers for p in m.code_patterns)
+
+
+def compile_catalog(catalog: dict[str, dict[str, Any]]) -> list[AuditMatcher]:
+    """Compile matchers for every audit that has discovery patterns."""
+    matchers = []
+    for audit_id, data in catalog.items():
+        matcher = compile_audit(audit_id, data)
+        if matcher.code_patterns or matcher.file_globs:
+            matchers.append(matcher)
+    return matchers
+
+
+def run_git(root: Path, *args: str) -> str | None:
+    """Run a git command in the target, returning stdout or None on failure."""
+    try:
+        proc = subprocess.run(['git', '-C', str(root), *args], capture_output=True,
+                              text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return proc.stdout
+
+
+def git_revision(root: Path) -> str | None:
+    """Return the HEAD commit of the target, or None if it is not a git checkout."""
+    out = run_git(root, 'rev-parse', 'HEAD')
+    return out.strip() if out else None
+
+
+def git_changed_paths(root: Path, since: str) -> set[str] | None:
+    """
+    Return paths changed between `since` and the working tree.
+
+    Includes committed, staged and unstaged changes, deletions, and
+    untracked files. Returns None if git cannot answer.
+    """
+    diff = run_git(root, 'diff', '--name-only', '--no-renames', '-z', since, '--')
+    if diff is None:
+        return None
+    untracked = run_git(root, 'ls-files', '--others', '--exclude-standard', '-z') or ''
+    return {p for p in (diff + untracked).split('\0') if p}
+
+
+def git_dirty_paths(root: Path, revision: str | None) -> list[str] | None:
+    """Modified, deleted and untracked paths of a checkout at `revision`, or None if unknown."""
+    changed = git_changed_paths(root, revision) if revision else None
+    return None if changed is None else sorted(changed)
+
+
+def iter_target_files(root: Path) -> Iterator[str]:
+    """Yield POSIX relative paths of files to scan in the target."""
+    listing = run_git(root, 'ls-files', '--cached', '--others', '--exclude-standard', '-z')
+    if listing is not None:
+        for rel_path in sorted(set(listing.split('\0'))):
+            if rel_path and (root / rel_path).is_file():
+                yield rel_path
+        return
+
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+        for name in sorted(filenames):
+            yield Path(dirpath, name).relative_to(root).as_posix()
+
+
+def is_binary(raw: bytes) -> bool:
+    return b'\0' in raw[:8192]
+
+
+def read_blob(path: Path) -> bytes | None:
+    """Read a target file's bytes, skipping large and binary files."""
+    try:
+        if path.stat().st_size > MAX_FILE_BYTES:
+            return None
+        raw = path.read_bytes()
+    except OSError:
+        return None
+    if is_binary(raw):
+        return None
+    return raw
+
+
+def read_text(path: Path) -> str | None:
+    """Read a target file as text, skipping large and binary files."""
+    raw = read_blob(path)
+    return None if raw is None else raw.decode('utf-8', errors='replace')
+
+
+def scan_hits(classes: frozenset[str], text: str | None, matchers: Iterable[AuditMatcher],
+              index: LiteralIndex) -> dict[str, list]:
+    """
+    Match one file's contents against the code patterns that apply to its classes.
+
+    Returns {audit_id: [[pattern index, line number, excerpt], ...]} for
+    audits with at least one hit.
+    """
+    if not text:
+        return {}
+    screen: LiteralHits | None = None
+    newlines = None
+    documents: list[Document] | None = None
+    results = {}
+
+    def excerpt(line_no: int) -> str:
+        line_start = newlines[line_no - 2] + 1 if line_no > 1 else 0
+        line_end = newlines[line_no - 1] if line_no - 1 < len(newlines) else len(text)
+        return text[line_start:line_end].strip()[:MAX_EXCERPT_CHARS]
+
+    for matcher in matchers:
+        hits = []
+        for pattern in matcher.code_patterns:
+            if not pattern.applies_to(classes):
+                continue
+            if pattern.query is not None:
+                if pattern.prefilter is not None:
+                    if screen is None:
+                        screen = index.scan(text)
+                    if not screen.spans(pattern.prefilter):
+                        continue
+                if documents is None:
+                    documents = parse_config(next(iter(QUERY_FORMATS & classes)), text)
+                if not documents:
+                    continue
+                if newlines is None:
+                    newlines = screen.newlines if screen else [n.start() for n in re.finditer('\n', text)]
+                for line_no in islice(pattern.query.evaluate(documents), MAX_HITS_PER_PATTERN):
+                    hits.append([pattern.index, line_no, excerpt(line_no)])
+                continue
+            if pattern.prefilter is None:
+                spans = [(0, len(text))]
+            else:
+                if screen is None:
+                    screen = index.scan(text)
+                spans = screen.spans(pattern.prefilter)
+            count = 0
+            for m in chain.from_iterable(pattern.regex.finditer(text, start, end) for start, end in spans):
+                if m.start() == m.end():
+                    continue
+                if newlines is None:
+                    newlines = screen.newlines if screen else [n.start() for n in re.finditer('\n', text)]
+                line_no = bisect.bisect_left(newlines, m.start()) + 1
+                hits.append([pattern.index, line_no, excerpt(line_no)])
+                count += 1
+                if count >= MAX_HITS_PER_PATTERN:
+                    break
+        if hits:
+            results[matcher.audit_id] = hits
+
+    return results
+
+
+def file_matches(rel_path: str, matchers: Iterable[AuditMatcher],
+                 hits: dict[str, list]) -> dict[str, dict[str, list]]:
+    """Combine a file's glob matches with its code-pattern hits, per audit."""
+    results = {}
+    for matcher in matchers:
+        globs = [g.index for g in matcher.file_globs if g.regex.match(rel_path)]
+        found = hits.get(matcher.audit_id, [])
+        if globs or found:
+            results[matcher.audit_id] = {"globs": globs, "hits": found}
+    return results
+
+
+def scan_text(rel_path: str, text: str | None, matchers: Iterable[AuditMatcher],
+              index: LiteralIndex | None = None) -> dict[str, dict[str, list]]:
+    """
+    Match one file against the given audits.
+
+    `index` must cover the matchers' patterns; pass literal_index() of all
+    matchers when scanning many files. Returns {audit_id: {"globs": [glob
+    indexes], "hits": [[pattern index, line number, excerpt], ...]}} for
+    audits with at least one match.
+    """
+    matchers = list(matchers)
+    if index is None:
+        index = literal_index(matchers)
+    hits = scan_hits(classify_path(rel_path), text, matchers, index)
+    return file_matches(rel_path, matchers, hits)
+
+
+def pattern_set_hash(classes: frozenset[str], matchers: Iterable[AuditMatcher]) -> str:
+    """Identify everything besides file content that decides a file's code-pattern hits."""
+    digest = hashlib.sha256(f"{SCAN_CACHE_FORMAT}\0{','.join(sorted(classes))}\n".encode())
+    for matcher in sorted(matchers, key=lambda m: m.audit_id):
+        digest.update(f"{matcher.audit_id}\0{matcher.pattern_hash}\n".encode())
+    return digest.hexdigest()[:16]
+
+
+def scan_members(members: Iterable[tuple[str, Callable[[], bytes | None]]], matchers: list[AuditMatcher],
+                 index: LiteralIndex | None = None, cache: ScanCache | None = None,
+                 graph: bool = True) -> tuple[dict[str, dict[str, dict]], int]:
+    """
+    Scan files given as (relative path, read) pairs with the given audits.
+
+    `read()` returns the file's bytes (None to skip its contents) and is
+    only called for files some code pattern applies to. With a cache,
+    code-pattern hits are looked up by file content and the applicable
+    pattern set before any file is decoded or matched.
+
+    When some audit has graph patterns (and `graph` is set, i.e. the members
+    are the whole target), Terraform and YAML files are also read into a
+    resource graph, which those patterns query once all files are read.
+
+    Returns ({audit_id: {rel_path: match entry}}, files scanned).
+    """
+    results = {m.audit_id: {} for m in matchers}
+    if index is None:
+        index = literal_index(matchers)
+    pattern_sets: dict[tuple, str] = {}
+    scanned = 0
+    graph_matchers = [m for m in matchers if m.graph_patterns] if graph else []
+    resources = ResourceGraph() if graph_matchers else None
+
+    for rel_path, read in members:
+        classes = classify_path(rel_path)
+        relevant = [m for m in matchers if m.covers(rel_path, classes)]
+        iac = resources is not None and is_iac_path(rel_path)
+        if not relevant and not iac:
+            continue
+        scanned += 1
+        scoped = [m for m in relevant if any(p.applies_to(classes) for p in m.code_patterns)]
+        raw = read() if scoped or iac else None
+        if raw is not None and is_binary(raw):
+            raw = None
+        if iac and raw is not None:
+            resources.add_file(rel_path, raw.decode('utf-8', errors='replace'))
+        if not scoped or raw is None:
+            hits = {}
+        elif cache is None:
+            hits = scan_hits(classes, raw.decode('utf-8', errors='replace'), scoped, index)
+        else:
+            scope_key = (classes, tuple(m.audit_id for m in scoped))
+            if scope_key not in pattern_sets:
+                pattern_sets[scope_key] = pattern_set_hash(classes, scoped)
+            key = cache.key(git_blob_id(raw), pattern_sets[scope_key])
+            hits = cache.get(key)
+            if hits is None:
+                hits = scan_hits(classes, raw.decode('utf-8', errors='replace'), scoped, index)
+                cache.put(key, hits)
+        for audit_id, entry in file_matches(rel_path, relevant, hits).items():
+            results[audit_id][rel_path] = entry
+
+    if resources is not None:
+        resources.link()
+        for matcher in graph_matchers:
+            graph_hits(matcher, resources, results[matcher.audit_id])
+
+    return results, scanned
+
+
+def graph_hits(matcher: AuditMatcher, resources: ResourceGraph, matches: dict[str, dict]) -> None:
+    """Add an audit's graph-pattern hits to its per-file match entries."""
+    touched = set()
+    for pattern in matcher.graph_patterns:
+        counts: dict[str, int] = {}
+        for rel_path, line_no, excerpt in resources.query(pattern.query):
+            if counts.get(rel_path, 0) >= MAX_HITS_PER_PATTERN:
+                continue
+            counts[rel_path] = counts.get(rel_path, 0) + 1
+            entry = matches.get(rel_path)
+            if entry is None:
+                globs = [g.index for g in matcher.file_globs if g.regex.match(rel_path)]
+                entry = matches[rel_path] = {"globs": globs, "hits": []}
+            entry["hits"].append([pattern.index, line_no, excerpt[:MAX_EXCERPT_CHARS]])
+            touched.add(rel_path)
+    for rel_path in touched:
+        matches[rel_path]["hits"].sort(key=lambda hit: hit[0])
+
+
+def scan_paths(root: Path, rel_paths: Iterable[str], matchers: list[AuditMatcher],
+               index: LiteralIndex | None = None, cache: ScanCache | None = None,
+               graph: bool = True) -> tuple[dict[str, dict[str, dict]], int]:
+    """
+    Scan the given target files with the given audits.
+
+    Returns ({audit_id: {rel_path: match entry}}, files scanned).
+    """
+    members = ((rel_path, partial(read_blob, root / rel_path)) for rel_path in rel_paths)
+    return scan_members(members, matchers, index, cache, graph)
+
+
+def audit_result(matcher: AuditMatcher, matches: dict[str, dict]) -> dict[str, Any]:
+    """Build the per-audit section of the results file."""
+    return {
+        "file_path": matcher.file_path,
+        "pattern_hash": matcher.pattern_hash,
+        "matched_files": len(matches),
+        "hit_count": sum(len(e["hits"]) for e in matches.values()),
+        "matches": dict(sorted(matches.items())),
+    }
+
+
+def run_full(root: Path, matchers: list[AuditMatcher], index: LiteralIndex | None = None,
+             cache: ScanCache | None = None) -> tuple[dict[str, Any], dict[str, int]]:
+    """Scan the whole target with every matcher."""
+    matches, scanned = scan_paths(root, iter_target_files(root), matchers, index, cache)
+    audits = {m.audit_id: audit_result(m, matches[m.audit_id]) for m in matchers}
+    stats = {"files_scanned": scanned, "audits_rescanned": len(matchers), "audits_reused": 0}
+    return audits, stats
+
+
+def run_archive(path: Path, matchers: list[AuditMatcher], index: LiteralIndex | None = None,
+                cache: ScanCache | None = None) -> tuple[dict[str, Any], dict[str, int]]:
+    """Scan the files of an archive or container image, streamed without extraction."""
+    members = ((rel_path, read) for rel_path, read in iter_archive(path, MAX_FILE_BYTES)
+               if SKIP_DIRS.isdisjoint(rel_path.split('/')[:-1]))
+    matches, scanned = scan_members(members, matchers, index, cache)
+    audits = {m.audit_id: audit_result(m, matches[m.audit_id]) for m in matchers}
+    stats = {"files_scanned": scanned, "audits_rescanned": len(matchers), "audits_reused": 0}
+    return audits, stats
+
+
+def run_incremental(root: Path, matchers: list[AuditMatcher], previous: dict[str, Any],
+                    changed: set[str], index: LiteralIndex | None = None,
+                    cache: ScanCache | None = None) -> tuple[dict[str, Any], dict[str, int]]:
+    """
+    Rescan only what a set of changed paths can affect.
+
+    Audits that are new or whose patterns changed since the previous run get
+    a full scan, as do audits with graph patterns when a Terraform or YAML
+    file changed. Audits whose globs or scopes cover a changed path get that
+    path rescanned and its old entry replaced (or dropped if deleted). All
+    other audits are copied from the previous results.
+    """
+    prev_audits = previous.get('audits', {})
+    full, partial, reused = [], [], []
+
+    for matcher in matchers:
+        prev = prev_audits.get(matcher.audit_id)
+        if prev is None or prev.get('pattern_hash') != matcher.pattern_hash:
+            full.append(matcher)
+        elif matcher.graph_patterns and any(is_iac_path(p) for p in changed):
+            full.append(matcher)  # graph queries depend on every Terraform and YAML file
+        elif any(matcher.covers(p) for p in changed):
+            partial.append(matcher)
+        else:
+            reused.append(matcher)
+
+    audits = {}
+    files_scanned = 0
+
+    if full:
+        matches, scanned = scan_paths(root, iter_target_files(root), full, index, cache)
+        files_scanned += scanned
+        for m in full:
+            audits[m.audit_id] = audit_result(m, matches[m.audit_id])
+
+    if partial:
+        existing = sorted(p for p in changed if (root / p).is_file())
+        matches, scanned = scan_paths(root, existing, partial, index, cache, graph=False)
+        files_scanned += scanned
+        for m in partial:
+            merged = {p: e for p, e in prev_audits[m.audit_id]['matches'].items() if p not in changed}
+            merged.update(matches[m.audit_id])
+            audits[m.audit_id] = audit_result(m, merged)
+
+    for m in reused:
+        audits[m.audit_id] = prev_audits[m.audit_id]
+
+    stats = {
+        "files_scanned": files_scanned,
+        "changed_paths": len(changed),
+        "audits_rescanned": len(full) + len(partial),
+        "audits_reused": len(reused),
+    }
+    return dict(sorted(audits.items())), stats
+
+
+def scan_target(root: Path, matchers: list[AuditMatcher], previous: dict[str, Any] | None = None,
+                since: str | None = None, profile: str | None = None, index: LiteralIndex | None = None,
+                cache: ScanCache | None = None, log: Callable[[str], None] = print) -> dict[str, Any]:
+    """Scan a target, incrementally when previous results allow it, returning the results document."""
+    archive = is_archive_target(root)
+    revision = None if archive else git_revision(root)
+    cache_before = (cache.hits, cache.misses) if cache else None
+    changed = None
+    if archive:
+        if previous is not None:
+            log("  Archive targets are always scanned in full")
+    elif previous is not None:
+        since = since or previous.get('revision')
+        if previous.get('version') != RESULTS_VERSION:
+            log("  Previous results use another format; running a full scan")
+        elif not since:
+            log("  Previous results have no git revision; running a full scan")
+        elif previous.get('dirty_paths') is None:
+            log("  Previous results do not record uncommitted paths; running a full scan")
+        else:
+            changed = git_changed_paths(root, since)
+            if changed is None:
+                log(f"  Could not diff target against {since}; running a full scan")
+            else:
+                # Uncommitted at the previous run: maybe since deleted or reverted
+                changed |= set(previous['dirty_paths'])
+
+    if archive:
+        audits, stats = run_archive(root, matchers, index, cache)
+    elif changed is not None:
+        log(f"  {len(changed)} paths changed since {since[:12]}")
+        audits, stats = run_incremental(root, matchers, previous, changed, index, cache)
+    else:
+        audits, stats = run_full(root, matchers, index, cache)
+    if cache_before is not None:
+        stats["cache_hits"] = cache.hits - cache_before[0]
+        stats["cache_misses"] = cache.misses - cache_before[1]
+
+    return {
+        "version": RESULTS_VERSION,
+        "generated": datetime.now().isoformat(),
+        "target": str(root),
+        "revision": revision,
+        # Paths the revision does not describe, rescanned by the next incremental run
+        "dirty_paths": git_dirty_paths(root, revision),
+        "profile": profile,
+        "stats": stats,
+        "audits": audits,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run audit discovery patterns against a target repository.")
+    parser.add_argument('--target', required=True,
+                        help="Target repository, .tar/.tar.gz archive or OCI image layout to scan")
+    parser.add_argument('--profile', help="Only run audits in this profile (e.g. quick, security)")
+    parser.add_argument('--audit', action='append', dest='audit_ids', help="Only run this audit ID (repeatable)")
+    parser.add_argument('--audits-dir', default=str(AUDITS_DIR), help="Audit catalog directory")
+    parser.add_argument('--output', required=True, help="Results JSON file to write")
+    parser.add_argument('--previous', help="Previous results file to update incrementally")
+    parser.add_argument('--since', help="Git revision to diff against (default: previous run's revision)")
+    parser.add_argument('--cache-dir', default=str(CACHE_DIR), help="Scan result cache directory")
+    parser.add_argument('--cache-max-mb', type=int, default=DEFAULT_MAX_MB, help="Scan result cache size limit")
+    parser.add_argument('--no-cache', action='store_true', help="Scan every file without the result cache")
+    args = parser.parse_args()
+
+    root = Path(args.target).resolve()
+    if not root.is_dir() and not is_archive_target(root):
+        print(f"Error: Target directory or archive not found: {root}", file=sys.stderr)
+        sys.exit(1)
+
+    audit_ids = set(args.audit_ids) if args.audit_ids else None
+    catalog = load_catalog(Path(args.audits_dir), profile=args.profile, audit_ids=audit_ids)
+    matchers = compile_catalog(catalog)
+    print(f"Compiled discovery patterns for {len(matchers)} audits")
+
+    previous = None
+    if args.previous and Path(args.previous).exists():
+        with open(args.previous, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+
+    cache = None if args.no_cache else ScanCache(Path(args.cache_dir), args.cache_max_mb << 20)
+    try:
+        output = scan_target(root, matchers, previous, args.since, args.profile, cache=cache)
+    except ArchiveError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    if cache is not None:
+        cache.close()
+    stats, audits = output['stats'], output['audits']
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(output, f, indent=1)
+
+    print(f"Scanned {stats['files_scanned']} files; "
+          f"{stats['audits_rescanned']} audits rescanned, {stats['audits_reused']} reused")
+    if cache is not None:
+        looked_up = stats['cache_hits'] + stats['cache_misses']
+        print(f"  Cache: {stats['cache_hits']}/{looked_up} files reused"
+              + (f" ({100 * stats['cache_hits'] / looked_up:.1f}% hit ratio)" if looked_up else ""))
+    print(f"  Audits with matches: {sum(1 for a in audits.values() if a['matched_files'])}")
+    print(f"  Results: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
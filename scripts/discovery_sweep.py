@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Run discovery patterns against many repositories in one sweep.
+
+The selected audits are loaded and compiled once, together with the literal
+prefilter index, before worker processes are forked, so every repository is
+scanned with the same in-memory matchers. Repositories go through a shared
+queue one at a time: a worker that finishes a small repository immediately
+takes the next one, and the repositories that took longest in the previous
+sweep are queued first so that large ones do not finish last.
+
+Each worker writes its repository's results to `<output-dir>/shards/` as
+soon as it is done (the same format as discovery_scanner.py --output) and
+hands back only per-audit counts, so memory stays bounded by the largest
+single repository rather than by the sweep. Workers are replaced after a
+fixed number of repositories to return memory to the system. When a shard
+from an earlier sweep exists, the repository is rescanned incrementally from
+the revision recorded in it. Per-file hits are shared through the scan
+result cache (scan_cache.py), so a vendored file or an unchanged blob seen in
+one repository is not rescanned in the next, nor in the next sweep.
+
+`<output-dir>/summary.json` merges the counts per audit across all
+repositories (repositories, files and hits matched) and records per
+repository timing, revision and errors.
+
+Usage:
+    python scripts/discovery_sweep.py --root ~/src --profile security --output-dir sweep/
+    python scripts/discovery_sweep.py --repos-file repos.txt --output-dir sweep/ --jobs 16
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import hashlib
+import argparse
+import multiprocessing
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from archive_source import is_archive_target
+from audit_catalog import AUDITS_DIR, load_catalog
+from discovery_scanner import (
+    RESULTS_VERSION, AuditMatcher, compile_catalog, literal_index, scan_target,
+)
+from literal_prefilter import LiteralIndex
+from scan_cache import CACHE_DIR, DEFAULT_MAX_MB, ScanCache
+
+SUMMARY_VERSION = 1
+
+# Repositories a worker scans before it is replaced
+REPOS_PER_WORKER = 20
+
+# Set in the parent before the pool forks
+_MATCHERS: list[AuditMatcher] = []
+_INDEX: LiteralIndex | None = None
+_SHARD_DIR: Path = Path()
+_PROFILE: str | None = None
+_INCREMENTAL = True
+_CACHE: ScanCache | None = None
+
+
+def repo_slug(root: Path) -> str:
+    """Stable shard name for a repository: its directory name plus a hash of its path."""
+    name = re.sub(r'[^A-Za-z0-9._-]+', '-', root.name).strip('-') or 'repo'
+    return f"{name}-{hashlib.sha256(str(root).encode()).hexdigest()[:8]}"
+
+
+def read_json(path: Path) -> dict[str, Any] | None:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def write_json(path: Path, data: dict[str, Any], indent: int | None = 1) -> None:
+    tmp = path.with_name(path.name + f'.{os.getpid()}.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=indent)
+    os.replace(tmp, path)
+
+
+def sweep_repo(task: tuple[str, str]) -> dict[str, Any]:
+    """Scan one repository, write its shard and return its per-audit counts."""
+    slug, target = task
+    result: dict[str, Any] = {"slug": slug, "target": target}
+    root = Path(target)
+    if not root.is_dir() and not is_archive_target(root):
+        return {**result, "error": "not a directory or archive"}
+
+    shard_path = _SHARD_DIR / f"{slug}.json"
+    previous = read_json(shard_path) if _INCREMENTAL else None
+    notes: list[str] = []
+    start = time.perf_counter()
+    try:
+        output = scan_target(root, _MATCHERS, previous, profile=_PROFILE, index=_INDEX,
+                             cache=_CACHE, log=notes.append)
+        write_json(shard_path, output)
+        if _CACHE is not None:
+            _CACHE.flush()  # a recycled worker exits without closing its cache
+    except Exception as e:  # one unreadable repository must not stop the sweep
+        return {**result, "error": f"{type(e).__name__}: {e}"}
+
+    return {
+        **result,
+        "revision": output['revision'],
+        "seconds": round(time.perf_counter() - start, 3),
+        "incremental": previous is not None and 'changed_paths' in output['stats'],
+        "stats": output['stats'],
+        "notes": [note.strip() for note in notes],
+        "audits": {audit_id: [a['matched_files'], a['hit_count']]
+                   for audit_id, a in output['audits'].items() if a['matched_files']},
+    }
+
+
+def collect_repos(args) -> list[Path]:
+    """Repositories named on the command line, in a list file, or under --root."""
+    repos = [Path(p) for p in args.repos]
+    if args.repos_file:
+        with open(args.repos_file, 'r', encoding='utf-8') as f:
+            repos += [Path(line.strip()) for line in f if line.strip() and not line.startswith('#')]
+    if args.root:
+        repos += sorted(p for p in Path(args.root).iterdir() if p.is_dir() and not p.name.startswith('.'))
+    unique = {}
+    for repo in repos:
+        unique.setdefault(repo.expanduser().resolve(), None)
+    return list(unique)
+
+
+def schedule(repos: list[Path], previous: dict[str, Any] | None) -> list[tuple[str, str]]:
+    """Order repositories longest-first by their previous sweep time; unseen ones go first."""
+    seconds = {}
+    if previous:
+        seconds = {slug: r.get('seconds', 0.0) for slug, r in previous.get('repos', {}).items()}
+    tasks = [(repo_slug(root), str(root)) for root in repos]
+    return sorted(tasks, key=lambda t: -seconds.get(t[0], float('inf')))
+
+
+def merge(matchers: list[AuditMatcher], results: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    """Per-audit totals across all repositories."""
+    audits = {m.audit_id: {"file_path": m.file_path, "pattern_hash": m.pattern_hash,
+                           "repos_matched": 0, "matched_files": 0, "hit_count": 0, "repos": []}
+              for m in matchers}
+    for result in sorted(results, key=lambda r: r['slug']):
+        for audit_id, (files, hits) in result.get('audits', {}).items():
+            entry = audits.get(audit_id)
+            if entry is None:
+                continue
+            entry['repos_matched'] += 1
+            entry['matched_files'] += files
+            entry['hit_count'] += hits
+            entry['repos'].append(result['slug'])
+    return dict(sorted(audits.items()))
+
+
+def main():
+    global _MATCHERS, _INDEX, _SHARD_DIR, _PROFILE, _INCREMENTAL, _CACHE
+
+    parser = argparse.ArgumentParser(description="Run discovery patterns against many repositories.")
+    parser.add_argument('repos', nargs='*', help="Repository directories (or archives / image layouts)")
+    parser.add_argument('--repos-file', help="File listing repository directories or archives, one per line")
+    parser.add_argument('--root', help="Sweep every top-level directory under this directory")
+    parser.add_argument('--output-dir', required=True, help="Directory for shards/ and summary.json")
+    parser.add_argument('--profile', help="Only run audits in this profile (e.g. quick, security)")
+    parser.add_argument('--audit', action='append', dest='audit_ids', help="Only run this audit ID (repeatable)")
+    parser.add_argument('--audits-dir', default=str(AUDITS_DIR), help="Audit catalog directory")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument('--full', action='store_true', help="Ignore shards from earlier sweeps")
+    parser.add_argument('--cache-dir', default=str(CACHE_DIR), help="Scan result cache directory")
+    parser.add_argument('--cache-max-mb', type=int, default=DEFAULT_MAX_MB, help="Scan result cache size limit")
+    parser.add_argument('--no-cache', action='store_true', help="Scan every file without the result cache")
+    args = parser.parse_args()
+
+    repos = collect_repos(args)
+    if not repos:
+        print("Error: No repositories given (use paths, --repos-file or --root)", file=sys.stderr)
+        sys.exit(1)
+
+    output_dir = Path(args.output_dir)
+    shard_dir = output_dir / 'shards'
+    shard_dir.mkdir(parents=True, exist_ok=True)
+    summary_path = output_dir / 'summary.json'
+    previous = read_json(summary_path)
+
+    audit_ids = set(args.audit_ids) if args.audit_ids else None
+    catalog = load_catalog(Path(args.audits_dir), profile=args.profile, audit_ids=audit_ids,
+                           sections=('audit', 'discovery'))
+    _MATCHERS = compile_catalog(catalog)
+    del catalog
+    _INDEX = literal_index(_MATCHERS)
+    _SHARD_DIR, _PROFILE, _INCREMENTAL = shard_dir, args.profile, not args.full
+    # Not opened here: each worker connects on first use
+    _CACHE = None if args.no_cache else ScanCache(Path(args.cache_dir), args.cache_max_mb << 20)
+    print(f"Compiled discovery patterns for {len(_MATCHERS)} audits; sweeping {len(repos)} repositories")
+
+    tasks = schedule(repos, previous)
+    results = []
+    start = time.perf_counter()
+    jobs = max(1, min(args.jobs, len(tasks)))
+    if jobs > 1:
+        with multiprocessing.get_context('fork').Pool(jobs, maxtasksperchild=REPOS_PER_WORKER) as pool:
+            for result in pool.imap_unordered(sweep_repo, tasks, chunksize=1):
+                results.append(result)
+                print(f"\r  Swept: {len(results)}/{len(tasks)}", end="", flush=True)
+    else:
+        for task in tasks:
+            results.append(sweep_repo(task))
+            print(f"\r  Swept: {len(results)}/{len(tasks)}", end="", flush=True)
+    print()
+    if _CACHE is not None:
+        _CACHE.close()  # workers only flush; the size limit is enforced once, here
+
+    audits = merge(_MATCHERS, results)
+    repos_summary = {
+        r['slug']: {k: v for k, v in r.items() if k not in ('slug', 'audits')}
+        for r in sorted(results, key=lambda r: r['slug'])
+    }
+    failed = [r for r in results if 'error' in r]
+    summary = {
+        "version": SUMMARY_VERSION,
+        "results_version": RESULTS_VERSION,
+        "generated": datetime.now().isoformat(),
+        "profile": args.profile,
+        "seconds": round(time.perf_counter() - start, 3),
+        "totals": {
+            "repos": len(results),
+            "failed": len(failed),
+            "incremental": sum(1 for r in results if r.get('incremental')),
+            "files_scanned": sum(r.get('stats', {}).get('files_scanned', 0) for r in results),
+            "audits_matched": sum(1 for a in audits.values() if a['repos_matched']),
+            "cache_hits": sum(r.get('stats', {}).get('cache_hits', 0) for r in results),
+            "cache_misses": sum(r.get('stats', {}).get('cache_misses', 0) for r in results),
+        },
+        "repos": repos_summary,
+        "audits": audits,
+    }
+    write_json(summary_path, summary)
+
+    totals = summary['totals']
+    print(f"Swept {totals['repos']} repositories in {summary['seconds']:.1f}s "
+          f"({totals['incremental']} incremental, {totals['failed']} failed); "
+          f"{totals['files_scanned']} files scanned")
+    looked_up = totals['cache_hits'] + totals['cache_misses']
+    if looked_up:
+        print(f"  Cache: {totals['cache_hits']}/{looked_up} files reused "
+              f"({100 * totals['cache_hits'] / looked_up:.1f}% hit ratio)")
+    for r in failed:
+        print(f"  Failed: {r['target']}: {r['error']}")
+    widest = sorted(audits.items(), key=lambda kv: (-kv[1]['repos_matched'], -kv[1]['hit_count']))[:10]
+    for audit_id, entry in widest:
+        if entry['repos_matched']:
+            print(f"  {entry['repos_matched']:4d} repos  {entry['hit_count']:6d} hits  {audit_id}")
+    print(f"  Summary: {summary_path}")
+
+
+if __name__ == "__main__":
+    main()
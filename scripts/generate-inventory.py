@@ -8,15 +8,20 @@ and populates the inventory with all relevant fields.
 
 SDLC phases: If an audit YAML has an `sdlc_phases` section, those values
 are used. Otherwise, defaults are applied based on the audit's scope.
+
+Only the metadata sections (`audit`, `execution`, `description`,
+`sdlc_phases`) of each file are parsed.
 """
 
+import io
 import os
 import sys
 import csv
-import yaml
 from pathlib import Path
 from typing import Any
 
+from audit_catalog import METADATA_SECTIONS, parse_audit
+
 # Determine base directory (script can run from anywhere)
 SCRIPT_DIR = Path(__file__).parent.resolve()
 BASE_DIR = SCRIPT_DIR.parent
@@ -211,9 +216,9 @@ def parse_yaml_file(yaml_path: Path, existing_csv: dict[str, dict[str, str]]) ->
     try:
         with open(yaml_path, 'r', encoding='utf-8') as f:
             content = f.read()
-            data = yaml.safe_load(content)
+        data = parse_audit(content, yaml_path, METADATA_SECTIONS)
 
-        if not data or 'audit' not in data:
+        if not data:
             return None
 
         audit = data.get('audit', {})
@@ -258,14 +263,20 @@ def parse_yaml_file(yaml_path: Path, existing_csv: dict[str, dict[str, str]]) ->
 
         return row
 
-    except yaml.YAMLError as e:
-        print(f"  YAML error in {yaml_path}: {e}", file=sys.stderr)
-        return None
     except Exception as e:
         print(f"  Error processing {yaml_path}: {e}", file=sys.stderr)
         return None
 
 
+def inventory_csv(rows: list[dict[str, str]]) -> str:
+    """Render inventory rows as CSV text, sorted by category number, then audit ID."""
+    out = io.StringIO(newline='')
+    writer = csv.DictWriter(out, fieldnames=CSV_HEADERS)
+    writer.writeheader()
+    writer.writerows(sorted(rows, key=lambda r: (r['category_number'], r['audit_id'])))
+    return out.getvalue()
+
+
 def generate_inventory() -> int:
     """Generate the AUDIT-INVENTORY.csv from all YAML files."""
     print(f"Scanning audits in: {AUDITS_DIR}")
@@ -285,14 +296,9 @@ def generate_inventory() -> int:
         else:
             errors += 1
 
-    # Sort by category_number, then by audit_id for consistent ordering
-    rows.sort(key=lambda r: (r['category_number'], r['audit_id']))
-
     # Write CSV
     with open(CSV_PATH, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=CSV_HEADERS)
-        writer.writeheader()
-        writer.writerows(rows)
+        f.write(inventory_csv(rows))
 
     print(f"Generated {CSV_PATH.name} with {len(rows)} audits")
     if errors:
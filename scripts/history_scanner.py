@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Run discovery code patterns against the whole git history of a target.
+
+A secret committed and later deleted is still in every clone. Instead of
+checking out or grepping each commit, this reads the history once with
+`git log --raw` (oldest first) to find every blob any commit introduced, and
+the first commit and path that introduced it. Each distinct blob is then
+read once from the object database (`git cat-file --batch`) and matched in
+a pool of worker processes with the same compiled patterns, literal
+prefilter and scan result cache as discovery_scanner.py; a blob that also
+exists in a working tree scan is a cache hit.
+
+Hits are grouped by (audit, pattern, matched line) and reported with the
+commit, date and path where they first appear, how many blobs contain them,
+and whether they are still present at the scanned revision. By default only
+the security category is loaded.
+
+Usage:
+    python scripts/history_scanner.py --target ../service --output history.json
+    python scripts/history_scanner.py --target ../service --all --category 01-security-trust \\
+        --category 32-dependency-supply-chain --output history.json
+"""
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+import multiprocessing
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator
+
+from audit_catalog import AUDITS_DIR, load_catalog
+from discovery_scanner import (
+    MAX_FILE_BYTES, AuditMatcher, classify_path, compile_catalog, git_revision,
+    literal_index, pattern_set_hash, scan_hits,
+)
+from literal_prefilter import LiteralIndex
+from scan_cache import CACHE_DIR, DEFAULT_MAX_MB, ScanCache
+
+HISTORY_VERSION = 1
+DEFAULT_CATEGORIES = ['01-security-trust']
+
+# Most blob bytes handed to a worker at a time; smaller histories are split
+# into CHUNKS_PER_JOB chunks per worker so the pool stays balanced
+CHUNK_BYTES = 8 * 1024 * 1024
+CHUNKS_PER_JOB = 4
+
+NULL_BLOB = '0' * 40
+# File modes of regular (possibly executable) files; skips symlinks and submodules
+FILE_MODES = {'100644', '100755'}
+
+# Set in the parent before the pool forks
+_MATCHERS: list[AuditMatcher] = []
+_INDEX: LiteralIndex | None = None
+_CACHE: ScanCache | None = None
+_TARGET: Path = Path()
+
+
+def iter_log_tokens(stream, chunk_size: int = 1 << 20) -> Iterator[str]:
+    """NUL-separated tokens of `git log -z` output, read incrementally."""
+    pending = b''
+    while chunk := stream.read(chunk_size):
+        parts = (pending + chunk).split(b'\0')
+        pending = parts.pop()
+        for part in parts:
+            yield part.decode('utf-8', errors='surrogateescape')
+    if pending:
+        yield pending.decode('utf-8', errors='surrogateescape')
+
+
+def introduced_blobs(root: Path, revs: list[str]) -> tuple[dict[tuple[str, frozenset], tuple], int]:
+    """
+    Find the first commit and path introducing each blob, oldest first.
+
+    Returns ({(blob ID, path classes): (order, commit, commit time, path)},
+    commits read). A blob stored under paths of different classes is kept
+    once per class set, since different patterns apply to it.
+    """
+    cmd = ['git', '-C', str(root), 'log', '--reverse', '--topo-order', '--raw', '--no-renames',
+           '--no-abbrev', '-z', '--root', '--diff-merges=first-parent', '--format=%x01%H %ct', *revs, '--']
+    blobs: dict[tuple[str, frozenset], tuple] = {}
+    classes_of: dict[str, frozenset] = {}
+    commit, when, order = '', 0, -1
+    meta = None
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL) as proc:
+        for token in iter_log_tokens(proc.stdout):
+            token = token.lstrip('\n')
+            if meta is not None:
+                path = token
+                _, new_mode, _, new_blob = meta[1:].split(' ')[:4]
+                meta = None
+                if new_mode not in FILE_MODES or new_blob == NULL_BLOB:
+                    continue
+                classes = classes_of.get(path)
+                if classes is None:
+                    classes = classes_of[path] = classify_path(path)
+                blobs.setdefault((new_blob, classes), (order, commit, when, path))
+            elif token.startswith('\x01'):
+                commit, _, stamp = token[1:].partition(' ')
+                when, order = int(stamp or 0), order + 1
+            elif token.startswith(':'):
+                meta = token
+    if proc.returncode:
+        raise RuntimeError(f"git log failed in {root} (exit {proc.returncode})")
+    return blobs, order + 1
+
+
+def blob_sizes(root: Path, blob_ids: list[str]) -> dict[str, int]:
+    """Object sizes for blob IDs, from one `git cat-file --batch-check`."""
+    proc = subprocess.run(['git', '-C', str(root), 'cat-file', '--batch-check=%(objectname) %(objectsize)'],
+                          input='\n'.join(blob_ids) + '\n', capture_output=True, text=True, check=True)
+    sizes = {}
+    for line in proc.stdout.splitlines():
+        name, _, size = line.partition(' ')
+        if size.isdigit():
+            sizes[name] = int(size)
+    return sizes
+
+
+def head_blobs(root: Path, rev: str) -> set[str]:
+    """Blob IDs in the tree of a revision."""
+    try:
+        out = subprocess.run(['git', '-C', str(root), 'ls-tree', '-r', '-z', rev], capture_output=True,
+                             text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return set()
+    return {entry.split(' ', 3)[2].split('\t', 1)[0] for entry in out.split('\0') if entry}
+
+
+def scan_chunk(chunk: list[tuple[str, frozenset]]) -> tuple[list[tuple[str, frozenset, dict[str, list]]], int, int]:
+    """
+    Read and match a chunk of blobs in one `git cat-file --batch` session.
+
+    Returns ([(blob ID, path classes, hits)] for blobs with hits, cache hits, cache misses).
+    """
+    results = []
+    cache_before = (_CACHE.hits, _CACHE.misses) if _CACHE is not None else (0, 0)
+    pattern_sets: dict[frozenset, tuple[list[AuditMatcher], str]] = {}
+    proc = subprocess.Popen(['git', '-C', str(_TARGET), 'cat-file', '--batch'],
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    try:
+        for blob_id, classes in chunk:
+            proc.stdin.write(blob_id.encode() + b'\n')
+            proc.stdin.flush()
+            header = proc.stdout.readline().split()
+            if len(header) < 3 or header[1] != b'blob':
+                continue
+            raw = proc.stdout.read(int(header[2]))
+            proc.stdout.read(1)  # trailing newline
+            if b'\0' in raw[:8192]:
+                continue
+
+            if classes not in pattern_sets:
+                scoped = [m for m in _MATCHERS if any(p.applies_to(classes) for p in m.code_patterns)]
+                pattern_sets[classes] = (scoped, pattern_set_hash(classes, scoped))
+            scoped, pattern_set = pattern_sets[classes]
+            hits = None
+            if _CACHE is not None:
+                key = _CACHE.key(blob_id, pattern_set)  # git blob IDs are the cache's content keys
+                hits = _CACHE.get(key)
+            if hits is None:
+                hits = scan_hits(classes, raw.decode('utf-8', errors='replace'), scoped, _INDEX)
+                if _CACHE is not None:
+                    _CACHE.put(key, hits)
+            if hits:
+                results.append((blob_id, classes, hits))
+    finally:
+        proc.stdin.close()
+        proc.wait()
+        if _CACHE is not None:
+            _CACHE.flush()
+    if _CACHE is None:
+        return results, 0, 0
+    return results, _CACHE.hits - cache_before[0], _CACHE.misses - cache_before[1]
+
+
+def chunked(blobs: list[tuple[str, frozenset]], sizes: dict[str, int],
+            jobs: int) -> list[list[tuple[str, frozenset]]]:
+    total = sum(sizes.get(blob_id, 0) for blob_id, _ in blobs)
+    limit = max(1, min(CHUNK_BYTES, total // (jobs * CHUNKS_PER_JOB)))
+    chunks, current, current_bytes = [], [], 0
+    for blob in blobs:
+        current.append(blob)
+        current_bytes += sizes.get(blob[0], 0)
+        if current_bytes >= limit:
+            chunks.append(current)
+            current, current_bytes = [], 0
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def first_introductions(found: list[tuple[str, frozenset, dict[str, list]]], blobs: dict[tuple, tuple],
+                        at_head: set[str]) -> dict[str, dict[tuple, dict[str, Any]]]:
+    """Per audit, each distinct hit with the earliest commit whose blob contains it."""
+    audits: dict[str, dict[tuple, dict[str, Any]]] = {}
+    for blob_id, classes, hits in found:
+        order, commit, when, path = blobs[(blob_id, classes)]
+        for audit_id, audit_hits in hits.items():
+            seen = audits.setdefault(audit_id, {})
+            for pattern_index, line, excerpt in audit_hits:
+                key = (pattern_index, excerpt)
+                entry = seen.setdefault(key, {"blobs": set(), "present_at_head": False})
+                entry['blobs'].add(blob_id)  # a blob can recur under several class sets
+                entry['present_at_head'] |= blob_id in at_head
+                if 'commit' not in entry or (order, path) < (entry['order'], entry['path']):
+                    entry.update(order=order, commit=commit, path=path, line=line, blob=blob_id,
+                                 date=datetime.fromtimestamp(when, timezone.utc).isoformat())
+    return audits
+
+
+def main():
+    global _MATCHERS, _INDEX, _CACHE, _TARGET
+
+    parser = argparse.ArgumentParser(description="Run discovery code patterns against a target's git history.")
+    parser.add_argument('--target', required=True, help="Target git repository")
+    parser.add_argument('--output', required=True, help="Results JSON file to write")
+    parser.add_argument('--rev', action='append', dest='revs', help="Revision to walk back from (default: HEAD)")
+    parser.add_argument('--all', action='store_true', help="Walk every branch and tag")
+    parser.add_argument('--category', action='append', dest='categories',
+                        help=f"Audit category directory to load (repeatable; default: {DEFAULT_CATEGORIES[0]})")
+    parser.add_argument('--profile', help="Only run audits in this profile")
+    parser.add_argument('--audit', action='append', dest='audit_ids', help="Only run this audit ID (repeatable)")
+    parser.add_argument('--audits-dir', default=str(AUDITS_DIR), help="Audit catalog directory")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument('--cache-dir', default=str(CACHE_DIR), help="Scan result cache directory")
+    parser.add_argument('--cache-max-mb', type=int, default=DEFAULT_MAX_MB, help="Scan result cache size limit")
+    parser.add_argument('--no-cache', action='store_true', help="Scan every blob without the result cache")
+    args = parser.parse_args()
+
+    root = Path(args.target).resolve()
+    revision = git_revision(root)
+    if revision is None:
+        print(f"Error: Not a git repository with commits: {root}", file=sys.stderr)
+        sys.exit(1)
+
+    audit_ids = set(args.audit_ids) if args.audit_ids else None
+    catalog = {}
+    for category in args.categories or DEFAULT_CATEGORIES:
+        catalog.update(load_catalog(Path(args.audits_dir) / category, profile=args.profile,
+                                    audit_ids=audit_ids, sections=('audit', 'discovery')))
+    _MATCHERS = [m for m in compile_catalog(catalog) if m.code_patterns]
+    _INDEX = literal_index(_MATCHERS)
+    _TARGET = root
+    _CACHE = None if args.no_cache else ScanCache(Path(args.cache_dir), args.cache_max_mb << 20)
+    print(f"Compiled code patterns for {len(_MATCHERS)} audits")
+
+    revs = ['--all'] if args.all else (args.revs or ['HEAD'])
+    blobs, commits = introduced_blobs(root, revs)
+    candidates = [key for key in blobs
+                  if any(p.applies_to(key[1]) for m in _MATCHERS for p in m.code_patterns)]
+    sizes = blob_sizes(root, sorted({blob_id for blob_id, _ in candidates}))
+    skipped = [key for key in candidates if sizes.get(key[0], MAX_FILE_BYTES + 1) > MAX_FILE_BYTES]
+    to_scan = [key for key in candidates if sizes.get(key[0], MAX_FILE_BYTES + 1) <= MAX_FILE_BYTES]
+    print(f"  {commits} commits introduce {len({b for b, _ in blobs})} distinct blobs; "
+          f"scanning {len(to_scan)} ({len(skipped)} too large)")
+
+    chunks = chunked(to_scan, sizes, max(1, args.jobs))
+    found = []
+    cache_hits = cache_misses = 0
+    jobs = max(1, min(args.jobs, len(chunks)))
+    with multiprocessing.get_context('fork').Pool(jobs) if jobs > 1 else nullcontext() as pool:
+        results = pool.imap_unordered(scan_chunk, chunks) if pool else map(scan_chunk, chunks)
+        for done, (chunk_found, hits, misses) in enumerate(results, 1):
+            found.extend(chunk_found)
+            cache_hits += hits
+            cache_misses += misses
+            print(f"\r  Scanned chunks: {done}/{len(chunks)}", end="", flush=True)
+    print()
+    if _CACHE is not None:
+        _CACHE.close()
+
+    at_head = head_blobs(root, revision)
+    introductions = first_introductions(found, blobs, at_head)
+    by_id = {m.audit_id: m for m in _MATCHERS}
+    audits = {}
+    for audit_id, seen in sorted(introductions.items()):
+        matcher = by_id[audit_id]
+        patterns = {p.index: p.pattern for p in matcher.code_patterns}
+        hits = sorted(seen.items(), key=lambda kv: (kv[1]['order'], kv[1]['path'], kv[1]['line']))
+        audits[audit_id] = {
+            "file_path": matcher.file_path,
+            "pattern_hash": matcher.pattern_hash,
+            "hit_count": len(hits),
+            "removed_from_head": sum(1 for _, e in hits if not e['present_at_head']),
+            "hits": [{
+                "pattern_index": pattern_index,
+                "pattern": patterns.get(pattern_index),
+                "excerpt": excerpt,
+                "first_commit": e['commit'],
+                "first_date": e['date'],
+                "path": e['path'],
+                "line": e['line'],
+                "blob": e['blob'],
+                "blobs": len(e['blobs']),
+                "present_at_head": e['present_at_head'],
+            } for (pattern_index, excerpt), e in hits],
+        }
+
+    output = {
+        "version": HISTORY_VERSION,
+        "generated": datetime.now().isoformat(),
+        "target": str(root),
+        "revision": revision,
+        "revs": revs,
+        "stats": {
+            "commits": commits,
+            "blobs_introduced": len(blobs),
+            "blobs_scanned": len(to_scan),
+            "blobs_skipped_large": len(skipped),
+            "blobs_with_hits": len(found),
+            **({"cache_hits": cache_hits, "cache_misses": cache_misses} if _CACHE is not None else {}),
+        },
+        "audits": audits,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(output, f, indent=1)
+
+    hit_total = sum(a['hit_count'] for a in audits.values())
+    removed = sum(a['removed_from_head'] for a in audits.values())
+    print(f"Found {hit_total} distinct hits in {len(audits)} audits; {removed} no longer present at "
+          f"{revision[:12]} but still in history")
+    print(f"  Results: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,779 @@
+#!/usr/bin/env python3
+"""
+Resource graph of the Terraform and Kubernetes code in a repository.
+
+Infrastructure checks are mostly about resources and how they relate: every
+S3 bucket has an encryption configuration, every Deployment is covered by a
+PodDisruptionBudget, no provider is left unpinned. Greps over .tf and
+manifest files answer these only line by line. ResourceGraph instead reads
+each `.tf` file (HCL) and each Kubernetes YAML document into one node per
+resource with its typed configuration and its references, indexed by type:
+
+    terraform    resource "T" "N" -> type T          data "T" "N" -> type "data.T"
+                 module, variable, output, provider, terraform, and one
+                 `local` node per local value
+    kubernetes   one node per object, typed by its kind (Deployment, Service, ...)
+
+Each node is a mapping:
+
+    address         aws_s3_bucket.logs, module.vpc, var.region, Deployment/web/api
+    block           resource, data, module, ... or manifest for Kubernetes objects
+    type, name, file, line
+    config          attributes and nested blocks (blocks are always lists, as in
+                    Terraform's JSON syntax); the object itself for Kubernetes
+    refs            [{address, type, resolved}] this node refers to
+    referenced_by   [{address, type, block}] of the nodes referring to it
+
+Terraform references (`aws_kms_key.main.arn`, `var.x`, `module.vpc.id`,
+`data.T.N`) resolve within the node's directory, which is one Terraform
+module. Kubernetes references resolve by kind, namespace and name: service
+accounts, config maps, secrets and claims named by pod specs; workloads
+selected by Services, PodDisruptionBudgets and NetworkPolicies through their
+pod template labels; Ingress backends, HPA targets and role bindings.
+
+Code patterns of `type: graph` are config_query.py queries whose root maps
+each type to its nodes, so cross-resource checks read as one query:
+
+    - pattern: "aws_s3_bucket[?!config.server_side_encryption_configuration &&
+                !referenced_by[?type == 'aws_s3_bucket_server_side_encryption_configuration']]"
+      type: graph
+      scope: config
+      purpose: S3 buckets without server-side encryption
+
+discovery_scanner.py builds the graph in the same pass that scans files and
+evaluates every graph pattern once per target; each hit is reported at the
+file and line of the value it selects.
+
+The HCL reader handles the block structure of Terraform files (blocks,
+attributes, strings with interpolation, heredocs, comments); attribute
+values that are not literals are kept as their expression text.
+
+Usage:
+    python scripts/iac_graph.py ../infra                               # types and edges
+    python scripts/iac_graph.py ../infra --query "module[?!config.version]"
+    python scripts/iac_graph.py ../infra --json graph.json
+    python -m doctest scripts/iac_graph.py                              # literal parser examples
+"""
+
+import re
+import sys
+import json
+import bisect
+import argparse
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+from typing import Any, Iterator
+
+from config_query import ConfigQuery, KeyPath, QueryError, compile_query, config_format, parse_config
+
+# Kubernetes kinds that are not namespaced
+CLUSTER_KINDS = {
+    'Namespace', 'Node', 'PersistentVolume', 'StorageClass', 'ClusterRole', 'ClusterRoleBinding',
+    'CustomResourceDefinition', 'PriorityClass', 'IngressClass', 'ValidatingWebhookConfiguration',
+    'MutatingWebhookConfiguration', 'APIService',
+}
+
+# Kind -> path to its pod spec
+POD_SPECS = {
+    'Pod': ('spec',),
+    'Deployment': ('spec', 'template', 'spec'),
+    'StatefulSet': ('spec', 'template', 'spec'),
+    'DaemonSet': ('spec', 'template', 'spec'),
+    'ReplicaSet': ('spec', 'template', 'spec'),
+    'Job': ('spec', 'template', 'spec'),
+    'CronJob': ('spec', 'jobTemplate', 'spec', 'template', 'spec'),
+}
+
+# Kind -> path to the labels selectors match
+POD_LABELS = {kind: path[:-1] + ('metadata', 'labels') if kind != 'Pod' else ('metadata', 'labels')
+              for kind, path in POD_SPECS.items()}
+
+# Kind -> path to the label selector it applies to pods
+SELECTORS = {
+    'Service': ('spec', 'selector'),
+    'PodDisruptionBudget': ('spec', 'selector', 'matchLabels'),
+    'NetworkPolicy': ('spec', 'podSelector', 'matchLabels'),
+}
+
+# Terraform blocks with one node per block -> number of labels they take
+TERRAFORM_BLOCKS = {
+    'resource': 2, 'data': 2, 'module': 1, 'variable': 1, 'output': 1, 'provider': 1, 'terraform': 0,
+}
+
+REFERENCE = re.compile(r'''
+    (?<![\w.-])
+    (?: data\.[A-Za-z_][\w-]*\.[A-Za-z_][\w-]*
+      | (?:module|var|local)\.[A-Za-z_][\w-]*
+      | [a-z][a-z0-9]*_[A-Za-z0-9_-]+\.[A-Za-z_][\w-]*
+    )''', re.VERBOSE)
+
+REFERENCE_TYPES = {'var': 'variable', 'local': 'local', 'module': 'module'}
+
+IDENT = re.compile(r'[A-Za-z_][\w-]*')
+NUMBER = re.compile(r'-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?(?![\w.])')
+HEREDOC = re.compile(r'<<(-?)([A-Za-z_][\w-]*)[ \t]*\r?\n')
+
+
+class HclError(ValueError):
+    """A Terraform file whose block structure does not parse."""
+
+
+def is_iac_path(rel_path: str) -> bool:
+    """Files the graph reads: Terraform sources and YAML that may hold manifests."""
+    return rel_path.endswith('.tf') or config_format(rel_path) == 'yaml'
+
+
+# ---------------------------------------------------------------------------
+# HCL
+# ---------------------------------------------------------------------------
+
+class HclReader:
+    """Blocks, attributes and literal values of one HCL file."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.pos = 0
+        self.newlines = [m.start() for m in re.finditer('\n', text)]
+        self.lines: dict[KeyPath, int] = {}        # attribute or block path -> line
+        self.refs: dict[KeyPath, list[str]] = {}   # attribute path -> addresses it refers to
+        self.labels: dict[KeyPath, list[str]] = {}  # block path -> its labels
+
+    def line(self, pos: int) -> int:
+        return bisect.bisect_left(self.newlines, pos) + 1
+
+    def error(self, message: str) -> HclError:
+        return HclError(f"line {self.line(self.pos)}: {message}")
+
+    def skip(self, newlines: bool = True) -> None:
+        """Skip blanks and comments, and line breaks if asked to."""
+        text = self.text
+        while self.pos < len(text):
+            c = text[self.pos]
+            if c in ' \t\r' or (c == '\n' and newlines):
+                self.pos += 1
+            elif c == '#' or text.startswith('//', self.pos):
+                end = text.find('\n', self.pos)
+                self.pos = len(text) if end == -1 else end
+            elif text.startswith('/*', self.pos):
+                end = text.find('*/', self.pos + 2)
+                self.pos = len(text) if end == -1 else end + 2
+            else:
+                return
+
+    def skip_string(self, pos: int) -> int:
+        """End of the quoted string starting at pos, past any ${...} templates."""
+        text = self.text
+        pos += 1
+        while pos < len(text):
+            c = text[pos]
+            if c == '\\':
+                pos += 2
+            elif c == '"':
+                return pos + 1
+            elif c in '$%' and text.startswith('{', pos + 1):
+                pos = self.skip_template(pos + 2)
+            elif c == '\n':
+                raise HclError(f"line {self.line(pos)}: unterminated string")
+            else:
+                pos += 1
+        raise HclError("unterminated string at end of file")
+
+    def skip_template(self, pos: int) -> int:
+        """End of a template expression whose opening brace ends just before pos."""
+        text = self.text
+        depth = 1
+        while pos < len(text):
+            c = text[pos]
+            if c == '"':
+                pos = self.skip_string(pos)
+                continue
+            if c == '{':
+                depth += 1
+            elif c == '}':
+                depth -= 1
+                if depth == 0:
+                    return pos + 1
+            pos += 1
+        raise HclError("unterminated template at end of file")
+
+    def skip_heredoc(self, m: re.Match) -> int:
+        """End of the heredoc whose opening marker m matched."""
+        marker = m.group(2)
+        pos = m.end()
+        for line in re.finditer(r'[^\n]*(?:\n|$)', self.text[pos:]):
+            if line.group().strip() == marker:
+                return pos + line.end()
+            if not line.group():
+                break
+        raise HclError(f"heredoc {marker} is not terminated")
+
+    def expression_end(self, pos: int, stop: str = '\n') -> int:
+        """End of an expression: a line break (or one of `stop`) outside brackets."""
+        text = self.text
+        depth = 0
+        while pos < len(text):
+            c = text[pos]
+            if c == '"':
+                pos = self.skip_string(pos)
+                continue
+            if c == '<' and text.startswith('<<', pos):
+                m = HEREDOC.match(text, pos)
+                if m:
+                    pos = self.skip_heredoc(m)
+                    if depth == 0:
+                        return pos
+                    continue
+            if c == '#' or text.startswith('//', pos):
+                if depth == 0:
+                    return pos
+                end = text.find('\n', pos)  # a comment inside brackets
+                pos = len(text) if end == -1 else end
+                continue
+            if c in '([{':
+                depth += 1
+            elif c in ')]}':
+                if depth == 0:
+                    return pos
+                depth -= 1
+            elif depth == 0 and c in stop:
+                return pos
+            elif text.startswith('/*', pos):
+                end = text.find('*/', pos + 2)
+                pos = len(text) if end == -1 else end + 2
+                continue
+            pos += 1
+        return pos
+
+    def body(self, path: KeyPath = (), closing: bool = False) -> dict[str, Any]:
+        """Attributes and nested blocks up to a closing brace (or the end of the file)."""
+        body: dict[str, Any] = {}
+        text = self.text
+        while True:
+            self.skip()
+            if self.pos >= len(text):
+                if closing:
+                    raise self.error("missing '}'")
+                return body
+            if text[self.pos] == '}':
+                if not closing:
+                    raise self.error("unexpected '}'")
+                self.pos += 1
+                return body
+            m = IDENT.match(text, self.pos)
+            if not m:
+                raise self.error(f"unexpected {text[self.pos]!r}")
+            name, line = m.group(), self.line(self.pos)
+            self.pos = m.end()
+            self.skip(newlines=False)
+            if text.startswith('=', self.pos) and not text.startswith('==', self.pos):
+                self.pos += 1
+                start = self.pos
+                self.pos = self.expression_end(self.pos, stop='\n}')
+                raw = text[start:self.pos].strip()
+                body[name] = self.value(raw)
+                self.lines[path + (name,)] = line
+                self.refs[path + (name,)] = expression_refs(raw)
+                continue
+            labels = []
+            while self.pos < len(text) and text[self.pos] != '{':
+                if text[self.pos] == '"':
+                    end = self.skip_string(self.pos)
+                    labels.append(text[self.pos + 1:end - 1])
+                    self.pos = end
+                else:
+                    label = IDENT.match(text, self.pos)
+                    if not label:
+                        raise self.error(f"expected a block label or '{{' after {name}")
+                    labels.append(label.group())
+                    self.pos = label.end()
+                self.skip(newlines=False)
+            if self.pos >= len(text):
+                raise self.error(f"block {name} has no body")
+            self.pos += 1
+            blocks = body.setdefault(name, [])
+            if not isinstance(blocks, list):
+                blocks = body[name] = [blocks]
+            block_path = path + (name, len(blocks))
+            self.lines[block_path] = line
+            self.labels[block_path] = labels
+            if path:
+                # Nested labels nest as keys, as in Terraform's JSON syntax
+                inner_path = block_path + tuple(labels)
+                content = self.body(inner_path, closing=True)
+                for label in reversed(labels):
+                    content = {label: content}
+            else:
+                content = self.body(block_path, closing=True)
+            blocks.append(content)
+
+    def value(self, raw: str) -> Any:
+        """A literal value, or the expression text for anything that is not one."""
+        parsed, end = Literal(raw).parse(0)
+        return parsed if end == len(raw) else raw
+
+
+class Literal:
+    r"""
+    Literal HCL values: strings, numbers, bools, null, tuples and objects of them.
+
+    Comments may sit between the items of multi-line tuples and objects:
+
+    >>> Literal('[\n  "s3:*", # admin\n  "s3:GetObject" // read\n]').parse(0)
+    (['s3:*', 's3:GetObject'], 46)
+    >>> Literal('{\n  # owner\n  Name = "x" /* tag */\n}').parse(0)[0]
+    {'Name': 'x'}
+    """
+
+    def __init__(self, raw: str):
+        self.raw = raw
+
+    def space(self, pos: int) -> int:
+        """Skip blanks, line breaks and comments."""
+        raw = self.raw
+        while pos < len(raw):
+            if raw[pos] in ' \t\r\n':
+                pos += 1
+            elif raw[pos] == '#' or raw.startswith('//', pos):
+                end = raw.find('\n', pos)
+                pos = len(raw) if end == -1 else end
+            elif raw.startswith('/*', pos):
+                end = raw.find('*/', pos + 2)
+                pos = len(raw) if end == -1 else end + 2
+            else:
+                break
+        return pos
+
+    def parse(self, pos: int) -> tuple[Any, int]:
+        raw = self.raw
+        pos = self.space(pos)
+        if pos >= len(raw):
+            return None, -1
+        c = raw[pos]
+        if c == '"':
+            reader = HclReader(raw)
+            try:
+                end = reader.skip_string(pos)
+            except HclError:
+                return None, -1
+            body = raw[pos + 1:end - 1]
+            if '${' in body or '%{' in body:
+                return body, end  # a template: kept as written
+            try:
+                return json.loads(raw[pos:end]), end
+            except ValueError:
+                return body, end
+        m = HEREDOC.match(raw, pos)
+        if m:
+            lines = raw[m.end():].split('\n')
+            content = []
+            for line in lines:
+                if line.strip() == m.group(2):
+                    break
+                content.append(line)
+            if m.group(1):  # <<- strips the common indentation
+                indent = min((len(l) - len(l.lstrip()) for l in content if l.strip()), default=0)
+                content = [l[indent:] for l in content]
+            return '\n'.join(content) + '\n' if content else '', len(raw)
+        m = NUMBER.match(raw, pos)
+        if m:
+            return json.loads(m.group()), m.end()
+        m = IDENT.match(raw, pos)
+        if m and m.group() in ('true', 'false', 'null'):
+            end = m.end()
+            if end == len(raw) or not (raw[end].isalnum() or raw[end] in '._-(['):
+                return {'true': True, 'false': False, 'null': None}[m.group()], end
+            return None, -1
+        if c == '[':
+            items = []
+            pos += 1
+            while True:
+                pos = self.space(pos)
+                if pos < len(raw) and raw[pos] == ']':
+                    return items, pos + 1
+                item, pos = self.parse(pos)
+                if pos < 0:
+                    return None, -1
+                items.append(item)
+                pos = self.space(pos)
+                if pos < len(raw) and raw[pos] == ',':
+                    pos += 1
+                elif pos >= len(raw) or raw[pos] != ']':
+                    return None, -1
+        if c == '{':
+            obj = {}
+            pos += 1
+            while True:
+                pos = self.space(pos)
+                if pos < len(raw) and raw[pos] == '}':
+                    return obj, pos + 1
+                if pos < len(raw) and raw[pos] == '"':
+                    key, pos = self.parse(pos)
+                    if pos < 0 or not isinstance(key, str):
+                        return None, -1
+                else:
+                    m = IDENT.match(raw, pos)
+                    if not m:
+                        return None, -1
+                    key, pos = m.group(), m.end()
+                pos = self.space(pos)
+                if pos >= len(raw) or raw[pos] not in '=:':
+                    return None, -1
+                value, pos = self.parse(pos + 1)
+                if pos < 0:
+                    return None, -1
+                obj[key] = value
+                pos = self.space(pos)
+                if pos < len(raw) and raw[pos] == ',':
+                    pos += 1
+        return None, -1
+
+
+def expression_refs(raw: str) -> list[str]:
+    """Addresses an attribute's expression text refers to, outside plain string contents."""
+    if '.' not in raw:
+        return []
+    code, pos = [], 0
+    reader = HclReader(raw)
+    if HEREDOC.match(raw):  # a heredoc is a template: only its interpolations are code
+        code.extend(m.group(1) for m in re.finditer(r'[$%]\{(.*?)\}', raw))
+        pos = len(raw)
+    while pos < len(raw):
+        if raw[pos] == '"':
+            try:
+                end = reader.skip_string(pos)
+            except HclError:
+                break
+            code.extend(m.group(1) for m in re.finditer(r'[$%]\{(.*?)\}', raw[pos:end]))
+            pos = end
+        else:
+            end = raw.find('"', pos)
+            end = len(raw) if end == -1 else end
+            code.append(raw[pos:end])
+            pos = end
+    refs = []
+    for m in REFERENCE.finditer(' '.join(code)):
+        parts = m.group().split('.')
+        address = '.'.join(parts[:3] if parts[0] == 'data' else parts[:2])
+        if address not in refs:
+            refs.append(address)
+    return refs
+
+
+# ---------------------------------------------------------------------------
+# Graph
+# ---------------------------------------------------------------------------
+
+@dataclass
+class Resource:
+    block: str
+    type: str
+    name: str
+    address: str
+    file: str
+    line: int
+    config: Any
+    lines: dict[KeyPath, int]          # config path -> line
+    scope: str                         # Terraform module directory, or Kubernetes namespace
+    raw_refs: list[tuple[str, str]] = field(default_factory=list)   # (type, address) as written
+    refs: list['Resource'] = field(default_factory=list)
+    unresolved: list[tuple[str, str]] = field(default_factory=list)
+    referenced_by: list['Resource'] = field(default_factory=list)
+
+
+def dig(value: Any, path: KeyPath) -> Any:
+    for key in path:
+        if isinstance(value, dict):
+            value = value.get(key)
+        elif isinstance(value, list) and isinstance(key, int) and key < len(value):
+            value = value[key]
+        else:
+            return None
+    return value
+
+
+def reference_type(address: str) -> str:
+    parts = address.split('.')
+    if parts[0] == 'data':
+        return f"data.{parts[1]}"
+    return REFERENCE_TYPES.get(parts[0], parts[0])
+
+
+def kubernetes_refs(kind: str, obj: dict[str, Any], namespace: str) -> list[tuple[str, str]]:
+    """(kind, address) of the objects a manifest names directly."""
+    refs: list[tuple[str, str]] = []
+
+    def add(ref_kind: str, name: Any, ns: str | None = namespace) -> None:
+        if ref_kind and isinstance(name, str) and name:
+            address = f"{ref_kind}/{name}" if ref_kind in CLUSTER_KINDS or ns is None else f"{ref_kind}/{ns}/{name}"
+            if (ref_kind, address) not in refs:
+                refs.append((ref_kind, address))
+
+    pod = dig(obj, POD_SPECS[kind]) if kind in POD_SPECS else None
+    if isinstance(pod, dict):
+        add('ServiceAccount', pod.get('serviceAccountName'))
+        for volume in pod.get('volumes') or []:
+            if isinstance(volume, dict):
+                add('ConfigMap', dig(volume, ('configMap', 'name')))
+                add('Secret', dig(volume, ('secret', 'secretName')))
+                add('PersistentVolumeClaim', dig(volume, ('persistentVolumeClaim', 'claimName')))
+        for container in (pod.get('containers') or []) + (pod.get('initContainers') or []):
+            if not isinstance(container, dict):
+                continue
+            for env in container.get('env') or []:
+                add('ConfigMap', dig(env, ('valueFrom', 'configMapKeyRef', 'name')))
+                add('Secret', dig(env, ('valueFrom', 'secretKeyRef', 'name')))
+            for source in container.get('envFrom') or []:
+                add('ConfigMap', dig(source, ('configMapRef', 'name')))
+                add('Secret', dig(source, ('secretRef', 'name')))
+        for secret in pod.get('imagePullSecrets') or []:
+            add('Secret', dig(secret, ('name',)))
+    if kind == 'Ingress':
+        for rule in dig(obj, ('spec', 'rules')) or []:
+            for path in dig(rule, ('http', 'paths')) or []:
+                add('Service', dig(path, ('backend', 'service', 'name')) or dig(path, ('backend', 'serviceName')))
+        add('Service', dig(obj, ('spec', 'defaultBackend', 'service', 'name')))
+        for tls in dig(obj, ('spec', 'tls')) or []:
+            add('Secret', dig(tls, ('secretName',)))
+    if kind == 'HorizontalPodAutoscaler':
+        target = dig(obj, ('spec', 'scaleTargetRef')) or {}
+        add(str(target.get('kind', '')), target.get('name'))
+    if kind in ('RoleBinding', 'ClusterRoleBinding'):
+        role = obj.get('roleRef') or {}
+        add(str(role.get('kind', '')), role.get('name'))
+        for subject in obj.get('subjects') or []:
+            if isinstance(subject, dict) and subject.get('kind') == 'ServiceAccount':
+                add('ServiceAccount', subject.get('name'), subject.get('namespace') or namespace)
+    return refs
+
+
+class ResourceGraph:
+    """Resources of a repository's Terraform and Kubernetes files, indexed by type."""
+
+    def __init__(self):
+        self.resources: list[Resource] = []
+        self.by_type: dict[str, list[Resource]] = {}
+        self.file_lines: dict[str, list[str]] = {}
+        self.errors: dict[str, str] = {}
+        self._document: dict[str, list[dict[str, Any]]] | None = None
+
+    # -- building ----------------------------------------------------------
+
+    def add_file(self, rel_path: str, text: str) -> int:
+        """Add the resources of one file; returns how many it holds."""
+        before = len(self.resources)
+        if rel_path.endswith('.tf'):
+            try:
+                self.add_terraform(rel_path, text)
+            except (HclError, RecursionError) as e:
+                self.errors[rel_path] = str(e)
+        elif 'apiVersion' in text and 'kind' in text:
+            for document in parse_config('yaml', text):
+                self.add_manifest(rel_path, document.value, document.lines, ())
+        if len(self.resources) > before:
+            self.file_lines[rel_path] = text.splitlines()
+            self._document = None
+        return len(self.resources) - before
+
+    def add_terraform(self, rel_path: str, text: str) -> None:
+        reader = HclReader(text)
+        body = reader.body()
+        module_dir = str(PurePosixPath(rel_path).parent)
+        for block, instances in body.items():
+            if block not in TERRAFORM_BLOCKS and block != 'locals' or not isinstance(instances, list):
+                continue
+            for i, content in enumerate(instances):
+                base = (block, i)
+                labels = reader.labels.get(base, [])
+                line = reader.lines.get(base, 1)
+                if block == 'locals':
+                    for name, value in content.items():
+                        self.add_terraform_node(reader, 'local', 'local', name, f"local.{name}", rel_path,
+                                                base + (name,), value, module_dir)
+                    continue
+                if len(labels) != TERRAFORM_BLOCKS[block]:
+                    continue
+                if block == 'resource':
+                    node_type, name, address = labels[0], labels[1], f"{labels[0]}.{labels[1]}"
+                elif block == 'data':
+                    node_type, name, address = f"data.{labels[0]}", labels[1], f"data.{labels[0]}.{labels[1]}"
+                elif block == 'terraform':
+                    node_type, name, address = 'terraform', '', 'terraform'
+                else:
+                    prefix = {'variable': 'var'}.get(block, block)
+                    node_type, name, address = block, labels[0], f"{prefix}.{labels[0]}"
+                self.add_terraform_node(reader, block, node_type, name, address, rel_path, base, content,
+                                        module_dir, line)
+
+    def add_terraform_node(self, reader: HclReader, block: str, node_type: str, name: str, address: str,
+                           rel_path: str, base: KeyPath, config: Any, module_dir: str,
+                           line: int | None = None) -> None:
+        depth = len(base)
+        lines = {path[depth:]: n for path, n in reader.lines.items() if path[:depth] == base}
+        node = Resource(block, node_type, name, address, rel_path, line or lines.get((), 1), config, lines,
+                        module_dir)
+        for path, refs in reader.refs.items():
+            if path[:depth] == base:
+                for ref in refs:
+                    if ref != address and (reference_type(ref), ref) not in node.raw_refs:
+                        node.raw_refs.append((reference_type(ref), ref))
+        self.resources.append(node)
+
+    def add_manifest(self, rel_path: str, obj: Any, lines: dict[KeyPath, int], prefix: KeyPath) -> None:
+        if not isinstance(obj, dict) or not isinstance(obj.get('kind'), str) or 'apiVersion' not in obj:
+            return
+        kind = obj['kind']
+        if kind == 'List' or kind.endswith('List') and isinstance(obj.get('items'), list):
+            for i, item in enumerate(obj.get('items') or []):
+                self.add_manifest(rel_path, item, lines, prefix + ('items', i))
+            return
+        name = dig(obj, ('metadata', 'name'))
+        if not isinstance(name, str):
+            return
+        namespace = None if kind in CLUSTER_KINDS else str(dig(obj, ('metadata', 'namespace')) or 'default')
+        address = f"{kind}/{name}" if namespace is None else f"{kind}/{namespace}/{name}"
+        node_lines = {path[len(prefix):]: line for path, line in lines.items() if path[:len(prefix)] == prefix}
+        node = Resource('manifest', kind, name, address, rel_path, node_lines.get((), 1), obj, node_lines,
+                        namespace or '')
+        node.raw_refs = kubernetes_refs(kind, obj, namespace)
+        self.resources.append(node)
+
+    # -- linking -----------------------------------------------------------
+
+    def link(self) -> None:
+        """Resolve references into edges and index resources by type."""
+        by_address: dict[tuple[str, str], list[Resource]] = defaultdict(list)
+        by_type: dict[str, list[Resource]] = defaultdict(list)
+        for node in self.resources:
+            node.refs, node.unresolved, node.referenced_by = [], [], []
+            scope = '' if node.block == 'manifest' else node.scope
+            by_address[(scope, node.address)].append(node)
+            by_type[node.type].append(node)
+
+        for node in self.resources:
+            scope = '' if node.block == 'manifest' else node.scope
+            for ref in node.raw_refs:
+                targets = by_address.get((scope, ref[1]), [])
+                if not targets:
+                    node.unresolved.append(ref)
+                for target in targets:
+                    node.refs.append(target)
+                    target.referenced_by.append(node)
+
+        # Selectors: Services, PDBs and NetworkPolicies point at the workloads they select
+        workloads = [n for n in self.resources if n.block == 'manifest' and n.type in POD_LABELS]
+        for node in self.resources:
+            if node.block != 'manifest' or node.type not in SELECTORS:
+                continue
+            selector = dig(node.config, SELECTORS[node.type])
+            if not isinstance(selector, dict) or not selector:
+                continue
+            for workload in workloads:
+                labels = dig(workload.config, POD_LABELS[workload.type])
+                if workload.scope == node.scope and isinstance(labels, dict) \
+                        and all(labels.get(k) == v for k, v in selector.items()):
+                    node.refs.append(workload)
+                    workload.referenced_by.append(node)
+        self.by_type = dict(sorted(by_type.items()))
+        self._document = None
+
+    # -- querying ----------------------------------------------------------
+
+    def document(self) -> dict[str, list[dict[str, Any]]]:
+        """The query root: each type mapped to its nodes."""
+        if self._document is None:
+            self._document = {
+                node_type: [{
+                    "address": n.address,
+                    "block": n.block,
+                    "type": n.type,
+                    "name": n.name,
+                    "file": n.file,
+                    "line": n.line,
+                    "config": n.config,
+                    "refs": [{"address": r.address, "type": r.type, "resolved": True} for r in n.refs]
+                            + [{"address": address, "type": ref_type, "resolved": False}
+                               for ref_type, address in n.unresolved],
+                    "referenced_by": [{"address": r.address, "type": r.type, "block": r.block}
+                                      for r in n.referenced_by],
+                } for n in nodes]
+                for node_type, nodes in self.by_type.items()
+            }
+        return self._document
+
+    def locate(self, path: KeyPath) -> tuple[str, int]:
+        """File and line of the value at a query path."""
+        node = self.by_type[path[0]][path[1]] if len(path) >= 2 else None
+        if node is None:
+            return '', 0
+        inner = path[3:] if path[2:3] == ('config',) else None
+        if inner is None:
+            return node.file, node.line
+        for depth in range(len(inner), -1, -1):
+            line = node.lines.get(inner[:depth])
+            if line is not None:
+                return node.file, line
+        return node.file, node.line
+
+    def query(self, query: ConfigQuery) -> Iterator[tuple[str, int, str]]:
+        """(file, line, line text) of every hit of a query over the graph."""
+        for path in query.hits(self.document()):
+            if not path:
+                continue  # a !path query over the whole graph has no location
+            rel_path, line_no = self.locate(path)
+            lines = self.file_lines.get(rel_path, [])
+            yield rel_path, line_no, lines[line_no - 1].strip() if 0 < line_no <= len(lines) else ''
+
+
+def build_graph(root: Path) -> ResourceGraph:
+    """Graph of every Terraform and Kubernetes file under a directory."""
+    from discovery_scanner import iter_target_files, read_blob
+
+    graph = ResourceGraph()
+    for rel_path in iter_target_files(root):
+        if is_iac_path(rel_path):
+            raw = read_blob(root / rel_path)
+            if raw is not None:
+                graph.add_file(rel_path, raw.decode('utf-8', errors='replace'))
+    graph.link()
+    return graph
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the Terraform/Kubernetes resource graph of a repository.")
+    parser.add_argument('target', help="Repository directory")
+    parser.add_argument('--query', action='append', default=[], help="Graph query to run (repeatable)")
+    parser.add_argument('--json', help="Write the graph as JSON to this file")
+    args = parser.parse_args()
+
+    root = Path(args.target).resolve()
+    if not root.is_dir():
+        print(f"Error: Target directory not found: {root}", file=sys.stderr)
+        sys.exit(1)
+    try:
+        queries = [compile_query(q) for q in args.query]
+    except QueryError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    graph = build_graph(root)
+    edges = sum(len(n.refs) for n in graph.resources)
+    print(f"{len(graph.resources)} resources of {len(graph.by_type)} types in {len(graph.file_lines)} files; "
+          f"{edges} references resolved")
+    for rel_path, error in sorted(graph.errors.items()):
+        print(f"  Unparsed: {rel_path}: {error}")
+    if not queries:
+        for node_type, nodes in sorted(graph.by_type.items(), key=lambda kv: (-len(kv[1]), kv[0]))[:20]:
+            print(f"  {len(nodes):5d}  {node_type}")
+    for query in queries:
+        print(f"{query.text}:")
+        for rel_path, line_no, excerpt in graph.query(query):
+            print(f"  {rel_path}:{line_no}: {excerpt}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(graph.document(), f, indent=1, default=str)
+        print(f"Graph: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Phase and per-file timing for catalog scripts.
+
+A script wraps its run in `timed_run()` and marks the work it does with
+nested `phase()` blocks and per-audit `audit_file()` blocks:
+
+    from instrumentation import timed_run, phase, audit_file
+
+    with timed_run(OUTPUT_PATH):
+        with phase("load"):
+            files = list(iter_audit_files())
+        with phase("analyze"):
+            for path in files:
+                with audit_file(path):
+                    with phase("parse"):
+                        data = load_audit(path)
+                    with phase("checks"):
+                        ...
+        with phase("write-report"):
+            ...
+
+`timed_run()` also works as a decorator on a script's `main()`.
+
+Phases nest into a tree of wall-clock totals and call counts. Phases
+entered inside an `audit_file()` block are also charged to that file, so
+the timing report can break each slow file down into parse and analysis
+time. `phase()` and `audit_file()` are no-ops outside `timed_run()`, so
+helpers shared between scripts can be instrumented unconditionally.
+
+When the run finishes, a timing JSON is written next to the report
+(`clarity-report.yaml` -> `clarity-timing.json`) with the phase tree and
+the 20 slowest audit files. Set AUDIT_PROFILE=1 to also run the script
+under cProfile and dump `<name>-profile.pstats` beside it (inspect with
+`python -m pstats`). Set AUDIT_TIMING=verbose to print the phase tree and
+slowest files when the run ends.
+
+Timers are not thread-safe; instrument the coordinating thread only.
+"""
+
+import os
+import json
+import time
+import cProfile
+import pstats
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+BASE_DIR = Path(__file__).parent.parent.resolve()
+
+SLOWEST_FILES = 20
+TIMING_VERSION = 1
+
+
+class Phase:
+    """One node in the phase tree."""
+    __slots__ = ('name', 'seconds', 'calls', 'children')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.seconds = 0.0
+        self.calls = 0
+        self.children: dict[str, Phase] = {}
+
+    def child(self, name: str) -> 'Phase':
+        node = self.children.get(name)
+        if node is None:
+            node = self.children[name] = Phase(name)
+        return node
+
+    def to_dict(self) -> dict[str, Any]:
+        result: dict[str, Any] = {"seconds": round(self.seconds, 6), "calls": self.calls}
+        if self.children:
+            result["phases"] = {name: node.to_dict() for name, node in self.children.items()}
+        return result
+
+
+class Timer:
+    """Collects a phase tree and per-file durations for one script run."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.root = Phase(name)
+        self.stack = [self.root]
+        self.files: dict[str, dict[str, float]] = {}
+        self.current_file: Optional[dict[str, float]] = None
+        self.started = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        node = self.stack[-1].child(name)
+        self.stack.append(node)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.stack.pop()
+            node.seconds += elapsed
+            node.calls += 1
+            if self.current_file is not None:
+                self.current_file[name] = self.current_file.get(name, 0.0) + elapsed
+
+    @contextmanager
+    def audit_file(self, path: Path | str) -> Iterator[None]:
+        path = Path(path).resolve()
+        key = str(path.relative_to(BASE_DIR)) if path.is_relative_to(BASE_DIR) else str(path)
+        outer = self.current_file
+        record = self.current_file = self.files.setdefault(key, {})
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            record["total"] = record.get("total", 0.0) + time.perf_counter() - start
+            self.current_file = outer
+
+    def slowest(self, count: int = SLOWEST_FILES) -> list[dict[str, Any]]:
+        ranked = sorted(self.files.items(), key=lambda item: -item[1].get("total", 0.0))[:count]
+        return [{"file": path, **{stage: round(seconds, 6) for stage, seconds in stages.items()}}
+                for path, stages in ranked]
+
+    def to_dict(self) -> dict[str, Any]:
+        self.root.seconds = time.perf_counter() - self.started
+        self.root.calls = 1
+        totals = [stages.get("total", 0.0) for stages in self.files.values()]
+        phased = sum(node.seconds for node in self.root.children.values())
+        return {
+            "version": TIMING_VERSION,
+            "script": self.name,
+            "wall_seconds": round(self.root.seconds, 6),
+            "unphased_seconds": round(max(0.0, self.root.seconds - phased), 6),
+            "phases": self.root.to_dict().get("phases", {}),
+            "files": {
+                "count": len(totals),
+                "total_seconds": round(sum(totals), 6),
+                "mean_seconds": round(sum(totals) / len(totals), 6) if totals else 0.0,
+            },
+            "slowest_files": self.slowest(),
+        }
+
+    def print_summary(self) -> None:
+        report = self.to_dict()
+        print(f"\nTiming ({self.name}): {report['wall_seconds']:.3f}s")
+
+        def walk(phases: dict[str, Any], depth: int) -> None:
+            for name, node in phases.items():
+                print(f"  {'  ' * depth}{name:<{32 - 2 * depth}} {node['seconds']:>9.3f}s  x{node['calls']}")
+                walk(node.get("phases", {}), depth + 1)
+
+        walk(report["phases"], 0)
+        print(f"  {'(outside phases)':<32} {report['unphased_seconds']:>9.3f}s")
+        if report["slowest_files"]:
+            print(f"\nSlowest {len(report['slowest_files'])} audit files:")
+            for entry in report["slowest_files"]:
+                stages = ", ".join(f"{stage} {seconds * 1000:.1f}ms" for stage, seconds in entry.items()
+                                   if stage not in ("file", "total"))
+                print(f"  {entry['total'] * 1000:8.1f}ms  {entry['file']}" + (f"  ({stages})" if stages else ""))
+
+
+_active: Optional[Timer] = None
+
+
+def phase(name: str):
+    """Time a block as a phase of the active run (no-op outside timed_run)."""
+    return _active.phase(name) if _active is not None else nullcontext()
+
+
+def audit_file(path: Path | str):
+    """Charge the phases inside a block to one audit file (no-op outside timed_run)."""
+    return _active.audit_file(path) if _active is not None else nullcontext()
+
+
+def timing_path(report_path: Path | str, suffix: str = "timing.json") -> Path:
+    """Sibling path for timing output: name-report.yaml -> name-timing.json."""
+    report_path = Path(report_path)
+    stem = report_path.stem
+    stem = stem[:-len("-report")] if stem.endswith("-report") else stem
+    return report_path.with_name(f"{stem}-{suffix}")
+
+
+@contextmanager
+def timed_run(report_path: Path | str, name: Optional[str] = None) -> Iterator[Timer]:
+    """Time a script run and write its timing JSON (and profile) next to report_path."""
+    global _active
+    report_path = Path(report_path)
+    timer = Timer(name or timing_path(report_path, "").name.rstrip("-"))
+    profiler = cProfile.Profile() if os.environ.get("AUDIT_PROFILE") not in (None, "", "0") else None
+
+    outer, _active = _active, timer
+    if profiler:
+        profiler.enable()
+    try:
+        yield timer
+    finally:
+        if profiler:
+            profiler.disable()
+        _active = outer
+
+    output = timing_path(report_path)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(timer.to_dict(), f, indent=2)
+        f.write("\n")
+    if profiler:
+        profile_path = timing_path(report_path, "profile.pstats")
+        profiler.dump_stats(profile_path)
+        print(f"Profile written to: {profile_path}")
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(15)
+    if os.environ.get("AUDIT_TIMING") == "verbose":
+        timer.print_summary()
+    print(f"Timing written to: {output}")
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Offline knowledge-source cache for audit runs.
+
+Audits list reference documents under `knowledge_sources.*` (with
+`offline_cache: true` for documents that should be available offline) and
+name the ones a run needs under `offline.cache_manifest.knowledge`. This
+tool keeps those documents in a content-addressed store so runs can read
+them from disk without network access:
+
+    knowledge-cache/
+        index.json              # normalized URL -> object hash and metadata
+        objects/ab/abcdef...    # document bodies, named by SHA-256
+
+URLs shared by many audits are fetched and stored once. Identical bodies
+served from different URLs share one object.
+
+Usage:
+    python scripts/knowledge_cache.py prefetch --profile security --jobs 8
+    python scripts/knowledge_cache.py prefetch --mirror /srv/knowledge-mirror
+    python scripts/knowledge_cache.py verify --profile security
+    python scripts/knowledge_cache.py path owasp-secrets
+"""
+
+import os
+import sys
+import json
+import hashlib
+import posixpath
+import argparse
+import tempfile
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from audit_catalog import AUDITS_DIR, BASE_DIR, load_catalog
+
+CACHE_DIR = BASE_DIR / "knowledge-cache"
+
+FETCH_TIMEOUT = 30
+USER_AGENT = "audit-taxonomy-knowledge-cache/1.0"
+
+# Priority ordering when several audits reference the same URL
+PRIORITY_RANK = {'required': 0, 'recommended': 1, 'conditional': 2, 'optional': 3, None: 4}
+
+
+@dataclass
+class KnowledgeSource:
+    url: str
+    source_ids: set[str] = field(default_factory=set)
+    names: set[str] = field(default_factory=set)
+    audits: set[str] = field(default_factory=set)
+    priority: str | None = None
+
+    def raise_priority(self, priority: str | None):
+        """Keep the strongest priority any audit gives this source."""
+        if PRIORITY_RANK.get(priority, 4) < PRIORITY_RANK.get(self.priority, 4):
+            self.priority = priority
+
+
+def normalize_url(url: str) -> str:
+    """Normalize a URL for deduplication (trim, drop fragment, lowercase host)."""
+    parts = urllib.parse.urlsplit(url.strip())
+    return urllib.parse.urlunsplit((parts.scheme.lower(), parts.netloc.lower(),
+                                    parts.path or '/', parts.query, ''))
+
+
+def iter_knowledge_items(data: dict[str, Any]):
+    """Yield every dict entry under an audit's knowledge_sources sections."""
+    sections = data.get('knowledge_sources') or {}
+    if not isinstance(sections, dict):
+        return
+    for items in sections.values():
+        for item in items or []:
+            if isinstance(item, dict):
+                yield item
+
+
+def collect_sources(catalog: dict[str, dict[str, Any]]) -> dict[str, KnowledgeSource]:
+    """
+    Collect the documents the given audits want cached, keyed by normalized URL.
+
+    A document is wanted when its knowledge_sources entry has
+    `offline_cache: true` or when the audit's `offline.cache_manifest`
+    names its source ID. Manifest priorities take precedence over the
+    entry's own priority.
+    """
+    sources = {}
+
+    for audit_id, data in catalog.items():
+        manifest = ((data.get('offline') or {}).get('cache_manifest') or {}).get('knowledge') or []
+        manifest_priority = {
+            entry.get('source_id'): entry.get('priority')
+            for entry in manifest if isinstance(entry, dict)
+        }
+
+        for item in iter_knowledge_items(data):
+            url = item.get('url')
+            source_id = item.get('id')
+            if not isinstance(url, str) or not url.strip():
+                continue
+            if not item.get('offline_cache') and source_id not in manifest_priority:
+                continue
+
+            key = normalize_url(url)
+            source = sources.setdefault(key, KnowledgeSource(url=url.strip()))
+            if source_id:
+                source.source_ids.add(str(source_id))
+            name = item.get('name') or item.get('title')
+            if name:
+                source.names.add(str(name))
+            source.audits.add(audit_id)
+            source.raise_priority(manifest_priority.get(source_id, item.get('priority')))
+
+    return sources
+
+
+class KnowledgeStore:
+    """Content-addressed document store with a URL index."""
+
+    def __init__(self, cache_dir: Path = CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+        self.objects_dir = self.cache_dir / "objects"
+        self.index_path = self.cache_dir / "index.json"
+        self.index: dict[str, dict[str, Any]] = {}
+        if self.index_path.exists():
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self.index = json.load(f)
+
+    def object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest
+
+    def lookup(self, url: str) -> Path | None:
+        """Return the on-disk path of a cached URL, or None if not cached."""
+        entry = self.index.get(normalize_url(url))
+        if not entry:
+            return None
+        path = self.object_path(entry['sha256'])
+        return path if path.exists() else None
+
+    def read(self, url: str) -> bytes | None:
+        """Return the cached body of a URL without touching the network."""
+        path = self.lookup(url)
+        return path.read_bytes() if path else None
+
+    def add(self, url: str, body: bytes, content_type: str | None) -> str:
+        """Store a document body and index it under its URL. Returns the digest."""
+        digest = hashlib.sha256(body).hexdigest()
+        path = self.object_path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(body)
+            os.replace(tmp, path)
+
+        self.index[normalize_url(url)] = {
+            "url": url,
+            "sha256": digest,
+            "size": len(body),
+            "content_type": content_type,
+            "fetched": datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        }
+        return digest
+
+    def save(self):
+        """Write the URL index atomically."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(dict(sorted(self.index.items())), f, indent=1)
+        os.replace(tmp, self.index_path)
+
+
+def mirror_path(mirror_dir: Path, url: str) -> Path:
+    """Map a URL onto a local mirror laid out as <host>/<path>, never outside the mirror."""
+    parts = urllib.parse.urlsplit(url)
+    host = parts.netloc.lower()
+    if host in ('', '.', '..'):
+        raise ValueError(f"no mirror path for host {parts.netloc!r}")
+    rel = parts.path.lstrip('/')
+    if not rel or rel.endswith('/'):
+        rel += 'index.html'
+    if parts.query:
+        rel += '?' + parts.query
+    local = posixpath.normpath(f"{host}/{rel}")
+    if local.split('/', 1)[0] != host:
+        raise ValueError(f"path escapes the mirror: {rel}")
+    return mirror_dir / local
+
+
+def fetch(url: str, mirror_dir: Path | None = None) -> tuple[bytes, str | None]:
+    """Fetch a document from a local mirror, file:// URL, or the network."""
+    if mirror_dir is not None:
+        return mirror_path(mirror_dir, url).read_bytes(), None
+
+    request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+    with urllib.request.urlopen(request, timeout=FETCH_TIMEOUT) as response:
+        return response.read(), response.headers.get('Content-Type')
+
+
+def prefetch(store: KnowledgeStore, sources: dict[str, KnowledgeSource], jobs: int,
+             mirror_dir: Path | None = None, refresh: bool = False) -> tuple[int, int, list[str]]:
+    """
+    Fetch every source not already cached using a bounded thread pool.
+
+    Returns (fetched, already cached, failure messages).
+    """
+    pending = [s for key, s in sorted(sources.items())
+               if refresh or store.lookup(key) is None]
+    cached = len(sources) - len(pending)
+    fetched = 0
+    failures = []
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        futures = {pool.submit(fetch, s.url, mirror_dir): s for s in pending}
+        for future in as_completed(futures):
+            source = futures[future]
+            try:
+                body, content_type = future.result()
+            except Exception as e:
+                failures.append(f"{source.url}: {e}")
+                continue
+            store.add(source.url, body, content_type)
+            fetched += 1
+
+    store.save()
+    return fetched, cached, sorted(failures)
+
+
+def missing_sources(store: KnowledgeStore, sources: dict[str, KnowledgeSource],
+                    priority: str | None = 'required') -> list[KnowledgeSource]:
+    """Return sources of the given priority (or all if None) absent from the store."""
+    return [s for key, s in sorted(sources.items())
+            if (priority is None or s.priority == priority) and store.lookup(key) is None]
+
+
+def find_by_source_id(sources: dict[str, KnowledgeSource], ref: str) -> list[KnowledgeSource]:
+    """Find sources by source ID or URL."""
+    key = normalize_url(ref)
+    if key in sources:
+        return [sources[key]]
+    return [s for s in sources.values() if ref in s.source_ids]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the offline knowledge-source cache.")
+    parser.add_argument('--audits-dir', default=str(AUDITS_DIR), help="Audit catalog directory")
+    parser.add_argument('--cache-dir', default=str(CACHE_DIR), help="Knowledge cache directory")
+    parser.add_argument('--profile', help="Only consider audits in this profile")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p_fetch = sub.add_parser('prefetch', help="Download uncached documents")
+    p_fetch.add_argument('--jobs', type=int, default=8, help="Concurrent fetches")
+    p_fetch.add_argument('--mirror', help="Read documents from a local <host>/<path> mirror instead of the network")
+    p_fetch.add_argument('--refresh', action='store_true', help="Re-fetch documents already cached")
+
+    p_verify = sub.add_parser('verify', help="Check that required documents are cached")
+    p_verify.add_argument('--all', action='store_true', help="Check every priority, not just required")
+
+    p_path = sub.add_parser('path', help="Print the cached file for a source ID or URL")
+    p_path.add_argument('ref', help="Source ID (e.g. owasp-secrets) or URL")
+
+    args = parser.parse_args()
+
+    catalog = load_catalog(Path(args.audits_dir), profile=args.profile)
+    sources = collect_sources(catalog)
+    store = KnowledgeStore(Path(args.cache_dir))
+
+    if args.command == 'prefetch':
+        mirror = Path(args.mirror) if args.mirror else None
+        print(f"Knowledge sources for {len(catalog)} audits: {len(sources)} unique URLs")
+        fetched, cached, failures = prefetch(store, sources, args.jobs, mirror, args.refresh)
+        print(f"  Fetched: {fetched}")
+        print(f"  Already cached: {cached}")
+        if failures:
+            print(f"  Failed: {len(failures)}")
+            for failure in failures[:20]:
+                print(f"    {failure}")
+
+    elif args.command == 'verify':
+        missing = missing_sources(store, sources, None if args.all else 'required')
+        label = "documents" if args.all else "required documents"
+        if missing:
+            print(f"Missing {len(missing)} {label}:")
+            for source in missing:
+                print(f"  {source.url}  ({', '.join(sorted(source.source_ids))}; "
+                      f"{len(source.audits)} audits)")
+            sys.exit(1)
+        print(f"All {label} are cached ({len(sources)} sources checked)")
+
+    elif args.command == 'path':
+        matches = find_by_source_id(sources, args.ref)
+        if not matches:
+            print(f"Error: Unknown knowledge source: {args.ref}", file=sys.stderr)
+            sys.exit(1)
+        status = 0
+        for source in matches:
+            path = store.lookup(source.url)
+            if path is None:
+                print(f"{source.url}: not cached", file=sys.stderr)
+                status = 1
+            else:
+                print(path)
+        sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
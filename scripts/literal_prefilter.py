@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Required-literal prefilters for catalog regexes.
+
+Most discovery patterns cannot match without one of a few literal strings
+(`kafka`, `ReadStream`, `@Scheduled`). prefilter_for() derives such a set
+from a regex's sre parse tree, so that every match contains at least one of
+the literals, and records whether matches stay within one line.
+
+LiteralIndex compiles the literals of many patterns into one trie-shaped
+regex. One pass over a file finds the lines holding each literal; a pattern
+then runs only on those lines (or on the whole text, if its matches can span
+lines), and not at all when none of its literals occur. Patterns without a
+usable literal set (nullable, or only short or character-class content)
+always run on the whole text.
+
+Usage:
+    python scripts/literal_prefilter.py               # coverage over the catalog
+    python scripts/literal_prefilter.py --profile security --show 20
+"""
+
+import re
+import bisect
+import argparse
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+try:
+    import re._parser as sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover
+    import sre_parse
+
+try:
+    from re._casefix import _EXTRA_CASES  # Python 3.11+
+except ImportError:  # pragma: no cover
+    _EXTRA_CASES = {}
+
+# Literals shorter than this screen out too little to be worth indexing
+MIN_LITERAL_CHARS = 3
+
+# A pattern that needs any one of more alternatives than this runs unscreened
+MAX_ALTERNATIVES = 32
+
+REPEATS = {sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT}
+POSSESSIVE_REPEAT = getattr(sre_parse, 'POSSESSIVE_REPEAT', None)
+ATOMIC_GROUP = getattr(sre_parse, 'ATOMIC_GROUP', None)
+ZERO_WIDTH = {sre_parse.AT, sre_parse.ASSERT, sre_parse.ASSERT_NOT}
+
+# `$` compiles to an end-of-line anchor under MULTILINE; otherwise it and
+# `\Z` depend on where the searched text ends
+
+# Class categories that include '\n'
+NEWLINE_CATEGORIES = {
+    sre_parse.CATEGORY_SPACE, sre_parse.CATEGORY_NOT_DIGIT,
+    sre_parse.CATEGORY_NOT_WORD, sre_parse.CATEGORY_LINEBREAK,
+}
+
+
+# re.IGNORECASE compares characters by their simple lowercase, plus a few
+# extra equivalences (e.g. 'ſ' and 's'); fold() maps each class to one member.
+# str.casefold() is full folding ('ß' -> 'ss') and would miss real matches.
+FOLD_TABLE = {ord('\u0130'): 'i'}  # str.lower() maps 'İ' to two characters
+for _code, _others in _EXTRA_CASES.items():
+    FOLD_TABLE[_code] = chr(min(_code, *_others))
+
+
+def fold(text: str) -> str:
+    """Case-fold text the way re.IGNORECASE compares it."""
+    return text.translate(FOLD_TABLE).lower().translate(FOLD_TABLE)
+
+
+@dataclass(frozen=True)
+class Prefilter:
+    """Literals a regex cannot match without, and whether its matches stay on one line."""
+    literals: frozenset[str]
+    ignorecase: bool
+    single_line: bool
+
+
+def score(literals: frozenset[str]) -> tuple[int, int]:
+    """Longer shortest literal first, then fewer alternatives."""
+    return min(len(lit) for lit in literals), -len(literals)
+
+
+class Extractor:
+    """Required-literal and line-span queries over an sre parse tree."""
+
+    def __init__(self, flags: int):
+        self.ignorecase = bool(flags & re.IGNORECASE)
+        self.dotall = bool(flags & re.DOTALL)
+        self.multiline = bool(flags & re.MULTILINE)
+
+    def exact(self, op, av) -> str | None:
+        """The text a group of plain literals always matches."""
+        if op is not sre_parse.SUBPATTERN or av[1] or av[2]:
+            return None
+        items = list(av[-1])
+        if items and all(o is sre_parse.LITERAL for o, _ in items):
+            return ''.join(chr(a) for _, a in items)
+        return None
+
+    def required(self, seq) -> frozenset[str] | None:
+        """Literals of which every match of the sequence contains at least one."""
+        best, run = None, ''
+
+        def offer(candidate: frozenset[str] | None) -> None:
+            nonlocal best
+            if candidate and (best is None or score(candidate) > score(best)):
+                best = candidate
+
+        for op, av in seq:
+            if op is sre_parse.LITERAL:
+                run += chr(av)
+                continue
+            if op in ZERO_WIDTH:
+                continue  # consumes nothing, so the run stays contiguous
+            text = self.exact(op, av)
+            if text is not None:
+                run += text
+                continue
+            if run:
+                offer(frozenset({run}))
+                run = ''
+            offer(self.item(op, av))
+        if run:
+            offer(frozenset({run}))
+        return best
+
+    def item(self, op, av) -> frozenset[str] | None:
+        if op is sre_parse.SUBPATTERN:
+            if av[1] & re.IGNORECASE:
+                self.ignorecase = True
+            return self.required(av[-1])
+        if op is ATOMIC_GROUP:
+            return self.required(av)
+        if op in REPEATS or op is POSSESSIVE_REPEAT:
+            return self.required(av[2]) if av[0] >= 1 else None
+        if op is sre_parse.BRANCH:
+            union = set()
+            for branch in av[1]:
+                literals = self.required(branch)
+                if not literals:
+                    return None
+                union |= literals
+            return frozenset(union) if len(union) <= MAX_ALTERNATIVES else None
+        return None
+
+    def class_has_newline(self, items) -> bool:
+        negate, has = False, False
+        for op, av in items:
+            if op is sre_parse.NEGATE:
+                negate = True
+            elif op is sre_parse.LITERAL:
+                has = has or av == 10
+            elif op is sre_parse.RANGE:
+                has = has or av[0] <= 10 <= av[1]
+            elif op is sre_parse.CATEGORY:
+                has = has or av in NEWLINE_CATEGORIES
+            else:
+                return True
+        return has != negate
+
+    def spans_lines(self, seq, dotall: bool, multiline: bool) -> bool:
+        """Can a match of the sequence consume '\\n' or depend on where the string ends?"""
+        for op, av in seq:
+            if op is sre_parse.LITERAL:
+                if av == 10:
+                    return True
+            elif op is sre_parse.NOT_LITERAL:
+                if av != 10:
+                    return True
+            elif op is sre_parse.ANY:
+                if dotall:
+                    return True
+            elif op is sre_parse.IN:
+                if self.class_has_newline(av):
+                    return True
+            elif op is sre_parse.AT:
+                if av is sre_parse.AT_END_STRING or (av is sre_parse.AT_END and not multiline):
+                    return True
+            elif op in REPEATS or op is POSSESSIVE_REPEAT:
+                if self.spans_lines(av[2], dotall, multiline):
+                    return True
+            elif op is sre_parse.SUBPATTERN:
+                inner_dotall = (dotall or bool(av[1] & re.DOTALL)) and not av[2] & re.DOTALL
+                inner_multiline = (multiline or bool(av[1] & re.MULTILINE)) and not av[2] & re.MULTILINE
+                if self.spans_lines(av[-1], inner_dotall, inner_multiline):
+                    return True
+            elif op is ATOMIC_GROUP:
+                if self.spans_lines(av, dotall, multiline):
+                    return True
+            elif op is sre_parse.BRANCH:
+                if any(self.spans_lines(b, dotall, multiline) for b in av[1]):
+                    return True
+            elif op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+                if self.spans_lines(av[1], dotall, multiline):
+                    return True
+            elif op is sre_parse.GROUPREF_EXISTS:
+                if any(b is not None and self.spans_lines(b, dotall, multiline) for b in av[1:]):
+                    return True
+            else:
+                return True  # backreferences and anything unexpected: assume the worst
+        return False
+
+
+def prefilter_for(pattern: str, flags: int = re.MULTILINE) -> Prefilter | None:
+    """Prefilter for a regex, or None if it has no usable required literals."""
+    try:
+        tree = sre_parse.parse(pattern, flags)
+    except (re.error, RecursionError, OverflowError):
+        return None
+    extractor = Extractor(tree.state.flags)
+    literals = extractor.required(list(tree))
+    if not literals or min(len(lit) for lit in literals) < MIN_LITERAL_CHARS:
+        return None
+    if extractor.ignorecase:
+        literals = frozenset(fold(lit) for lit in literals)
+    single_line = not extractor.spans_lines(list(tree), extractor.dotall, extractor.multiline)
+    return Prefilter(literals, extractor.ignorecase, single_line)
+
+
+def trie_regex(literals: Iterable[str]) -> str:
+    """One alternation over all literals, factored by common prefixes."""
+    trie: dict = {}
+    for literal in literals:
+        node = trie
+        for ch in literal:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def render(node: dict) -> str:
+        alternatives = [re.escape(ch) + render(child) for ch, child in sorted(node.items()) if ch]
+        if not alternatives:
+            return ''
+        if '' in node:
+            return '(?:' + '|'.join(alternatives) + ')?'
+        if len(alternatives) == 1:
+            return alternatives[0]
+        return '(?:' + '|'.join(alternatives) + ')'
+
+    return render(trie)
+
+
+class LiteralHits:
+    """Lines of one text holding each indexed literal."""
+
+    def __init__(self, text: str, lines: dict[tuple[str, bool], list[int]]):
+        self.text = text
+        self.lines = lines
+        self._newlines = None
+
+    @property
+    def newlines(self) -> list[int]:
+        if self._newlines is None:
+            self._newlines = [m.start() for m in re.finditer('\n', self.text)]
+        return self._newlines
+
+    def spans(self, prefilter: Prefilter) -> list[tuple[int, int]]:
+        """(start, end) ranges of the text where a screened pattern can match."""
+        found = [self.lines[(lit, prefilter.ignorecase)] for lit in prefilter.literals
+                 if (lit, prefilter.ignorecase) in self.lines]
+        if not found:
+            return []
+        if not prefilter.single_line:
+            return [(0, len(self.text))]
+        numbers = sorted(set().union(*found)) if len(found) > 1 else found[0]
+        newlines = self.newlines
+        return [(newlines[n - 1] + 1 if n else 0, newlines[n] if n < len(newlines) else len(self.text))
+                for n in numbers]
+
+
+class LiteralIndex:
+    """All literals of a set of prefilters, searchable in one pass per case mode."""
+
+    def __init__(self, prefilters: Iterable[Prefilter | None]):
+        literals: dict[bool, set[str]] = {False: set(), True: set()}
+        for prefilter in prefilters:
+            if prefilter is not None:
+                literals[prefilter.ignorecase] |= prefilter.literals
+        self.literals = {mode: frozenset(found) for mode, found in literals.items()}
+        self.searches = [
+            (mode, re.compile(trie_regex(found), re.IGNORECASE if mode else 0).search)
+            for mode, found in self.literals.items() if found
+        ]
+
+    def scan(self, text: str) -> LiteralHits:
+        """Find the lines holding each literal in one search per case mode."""
+        hits = LiteralHits(text, {})
+        lines = hits.lines
+        newlines = hits.newlines
+        for ignorecase, search in self.searches:
+            known = self.literals[ignorecase]
+            pos = 0
+            while m := search(text, pos):
+                start = m.start()
+                # Restart one character on, so overlapping literals are found too
+                pos = start + 1
+                found = fold(m.group()) if ignorecase else m.group()
+                line = bisect.bisect_left(newlines, start)
+                # The trie match is the longest literal here; shorter ones are its prefixes
+                for end in range(MIN_LITERAL_CHARS, len(found) + 1):
+                    literal = found[:end]
+                    if literal in known:
+                        numbers = lines.setdefault((literal, ignorecase), [])
+                        if not numbers or numbers[-1] != line:
+                            numbers.append(line)
+        return hits
+
+
+def main():
+    from audit_catalog import AUDITS_DIR, load_catalog
+    from regex_profiler import iter_catalog_patterns
+
+    parser = argparse.ArgumentParser(description="Report required-literal prefilter coverage of catalog regexes.")
+    parser.add_argument('--audits-dir', default=str(AUDITS_DIR), help="Audit catalog directory")
+    parser.add_argument('--profile', help="Only include audits in this profile")
+    parser.add_argument('--show', type=int, default=0, help="Print this many unscreened patterns")
+    args = parser.parse_args()
+
+    catalog = load_catalog(Path(args.audits_dir), args.profile, sections=('audit', 'discovery', 'signals'))
+    fields = Counter()
+    screened = Counter()
+    single_line = 0
+    unscreened = []
+    prefilters = {}
+    for pattern, audit_id, _, field_path in iter_catalog_patterns(catalog):
+        kind = 'evidence_pattern' if field_path.startswith('signals.') else 'code_patterns'
+        if pattern not in prefilters:
+            prefilters[pattern] = prefilter_for(pattern)
+        prefilter = prefilters[pattern]
+        fields[kind] += 1
+        if prefilter is not None:
+            screened[kind] += 1
+            single_line += prefilter.single_line
+        else:
+            unscreened.append((audit_id, field_path, pattern))
+
+    index = LiteralIndex(prefilters.values())
+    for kind, total in sorted(fields.items()):
+        print(f"{kind}: {screened[kind]}/{total} patterns screened by required literals "
+              f"({100 * screened[kind] / max(total, 1):.1f}%)")
+    print(f"Screened patterns confined to one line: {single_line}")
+    print(f"Distinct literals indexed: {sum(len(v) for v in index.literals.values())} "
+          f"({len(index.literals[True])} case-insensitive)")
+    for audit_id, field_path, pattern in unscreened[:args.show]:
+        print(f"  {audit_id} {field_path}: {pattern[:80]!r}")
+
+
+if __name__ == "__main__":
+    main()
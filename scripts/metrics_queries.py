@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Execute audit `discovery.metrics_queries` against a Prometheus endpoint.
+
+Collects the PromQL queries of the selected audits, deduplicates identical
+queries (after whitespace normalization), and evaluates each unique query
+once through the Prometheus HTTP API using a small pool of worker threads,
+each holding a keep-alive connection. Results are cached on disk per
+endpoint and evaluation timestamp, so re-running for the same timestamp
+issues no requests for queries that succeeded; failed queries (timeouts,
+HTTP errors) are not cached and are retried on the next run. The output attaches every result back to the audits
+that declared the query, next to that query's `threshold`.
+
+The evaluation time defaults to now rounded down to --step seconds, which
+lets repeated runs within one step share the cache.
+
+Usage:
+    python scripts/metrics_queries.py --endpoint http://prometheus:9090 \\
+        --profile production --output metrics-results.json
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import hashlib
+import argparse
+import threading
+import http.client
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from audit_catalog import AUDITS_DIR, BASE_DIR, load_catalog
+
+CACHE_DIR = BASE_DIR / "metrics-cache"
+
+REQUEST_TIMEOUT = 30
+
+# `system` values (lowercased prefix) that speak PromQL
+PROMQL_SYSTEMS = ('prometheus', 'thanos', 'cortex', 'mimir', 'victoriametrics')
+
+
+@dataclass
+class QueryUse:
+    audit_id: str
+    index: int
+    purpose: str
+    threshold: str
+
+
+@dataclass
+class MetricsQuery:
+    query: str
+    uses: list[QueryUse] = field(default_factory=list)
+
+
+def normalize_query(query: str) -> str:
+    """Collapse whitespace so formatting differences don't defeat deduplication."""
+    return re.sub(r'\s+', ' ', query).strip()
+
+
+def collect_queries(catalog: dict[str, dict[str, Any]]) -> dict[str, MetricsQuery]:
+    """Collect PromQL queries from the catalog, keyed by normalized query."""
+    queries = {}
+    for audit_id, data in catalog.items():
+        entries = (data.get('discovery') or {}).get('metrics_queries') or []
+        for index, entry in enumerate(entries):
+            if not isinstance(entry, dict):
+                continue
+            system = str(entry.get('system') or '').strip().lower()
+            query = entry.get('query')
+            if not system.startswith(PROMQL_SYSTEMS) or not isinstance(query, str) or not query.strip():
+                continue
+            key = normalize_query(query)
+            queries.setdefault(key, MetricsQuery(query=key)).uses.append(QueryUse(
+                audit_id=audit_id,
+                index=index,
+                purpose=str(entry.get('purpose') or ''),
+                threshold=str(entry.get('threshold') or ''),
+            ))
+    return queries
+
+
+def parse_eval_time(value: str | None, step: int) -> int:
+    """Parse --time (unix seconds or ISO 8601), defaulting to now rounded to step."""
+    if not value:
+        now = int(time.time())
+        return now - now % step if step > 0 else now
+    try:
+        return int(float(value))
+    except ValueError:
+        return int(datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp())
+
+
+class PrometheusClient:
+    """Instant-query client that keeps one HTTP connection per worker thread."""
+
+    def __init__(self, endpoint: str, timeout: int = REQUEST_TIMEOUT):
+        parts = urllib.parse.urlsplit(endpoint)
+        if parts.scheme not in ('http', 'https'):
+            raise ValueError(f"Unsupported endpoint scheme: {endpoint}")
+        self.scheme = parts.scheme
+        self.netloc = parts.netloc
+        self.path = parts.path.rstrip('/') + '/api/v1/query'
+        self.timeout = timeout
+        self.local = threading.local()
+
+    def _connection(self, fresh: bool = False) -> http.client.HTTPConnection:
+        conn = getattr(self.local, 'conn', None)
+        if conn is None or fresh:
+            if conn is not None:
+                conn.close()
+            cls = http.client.HTTPSConnection if self.scheme == 'https' else http.client.HTTPConnection
+            conn = cls(self.netloc, timeout=self.timeout)
+            self.local.conn = conn
+        return conn
+
+    def query(self, promql: str, eval_time: int) -> dict[str, Any]:
+        """Run one instant query, returning the API's `data` or an error dict."""
+        body = urllib.parse.urlencode({'query': promql, 'time': str(eval_time)})
+        headers = {'Content-Type': 'application/x-www-form-urlencoded', 'Connection': 'keep-alive'}
+
+        for attempt in range(2):
+            conn = self._connection(fresh=attempt > 0)
+            try:
+                conn.request('POST', self.path, body=body, headers=headers)
+                response = conn.getresponse()
+                payload = response.read()
+                break
+            except (http.client.HTTPException, OSError) as e:
+                if attempt:
+                    return {"error": f"request failed: {e}"}
+        try:
+            decoded = json.loads(payload)
+        except ValueError:
+            return {"error": f"HTTP {response.status}: non-JSON response"}
+        if decoded.get('status') != 'success':
+            return {"error": decoded.get('error') or f"HTTP {response.status}"}
+        return decoded.get('data') or {}
+
+
+def result_values(data: dict[str, Any]) -> list[dict[str, Any]]:
+    """Flatten an instant-query result into [{"labels": {...}, "value": float}]."""
+    result_type = data.get('resultType')
+    result = data.get('result')
+    if result_type == 'scalar' and isinstance(result, list):
+        return [{"labels": {}, "value": float(result[1])}]
+    if result_type == 'vector':
+        return [{"labels": r.get('metric', {}), "value": float(r['value'][1])} for r in result]
+    if result_type == 'matrix':
+        return [{"labels": r.get('metric', {}), "value": float(r['values'][-1][1])}
+                for r in result if r.get('values')]
+    return []
+
+
+class ResultCache:
+    """Per-endpoint, per-timestamp JSON cache of successful query results."""
+
+    def __init__(self, cache_dir: Path, endpoint: str, eval_time: int):
+        endpoint_key = hashlib.sha256(endpoint.encode()).hexdigest()[:12]
+        self.path = Path(cache_dir) / endpoint_key / f"{eval_time}.json"
+        self.results: dict[str, Any] = {}
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.results = json.load(f)
+
+    def cached(self, promql: str) -> bool:
+        return self.results.get(promql, {}).get('status') == 'success'
+
+    def save(self):
+        """Write the successful results; errors stay in memory for this run's report only."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({q: r for q, r in self.results.items() if r.get('status') == 'success'},
+                      f, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
+
+
+def execute(queries: dict[str, MetricsQuery], client: PrometheusClient, cache: ResultCache,
+            eval_time: int, jobs: int) -> tuple[int, int]:
+    """Evaluate uncached queries concurrently. Returns (executed, cache hits)."""
+    pending = [q for q in sorted(queries) if not cache.cached(q)]
+    hits = len(queries) - len(pending)
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        for promql, data in zip(pending, pool.map(lambda q: client.query(q, eval_time), pending)):
+            if 'error' in data:
+                cache.results[promql] = {"status": "error", "error": data['error']}
+            else:
+                cache.results[promql] = {"status": "success", "values": result_values(data)}
+
+    cache.save()
+    return len(pending), hits
+
+
+def attach_to_audits(queries: dict[str, MetricsQuery], results: dict[str, Any]) -> dict[str, list]:
+    """Group results by owning audit, alongside each query's threshold."""
+    audits = {}
+    for promql, mq in sorted(queries.items()):
+        result = results.get(promql, {"status": "error", "error": "not executed"})
+        for use in mq.uses:
+            audits.setdefault(use.audit_id, []).append({
+                "index": use.index,
+                "query": promql,
+                "purpose": use.purpose,
+                "threshold": use.threshold,
+                **result,
+            })
+    for entries in audits.values():
+        entries.sort(key=lambda e: e['index'])
+    return dict(sorted(audits.items()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Execute audit metrics_queries against Prometheus.")
+    parser.add_argument('--endpoint', default=os.environ.get('PROMETHEUS_URL'),
+                        help="Prometheus base URL (default: $PROMETHEUS_URL)")
+    parser.add_argument('--profile', help="Only run queries from audits in this profile")
+    parser.add_argument('--audit', action='append', dest='audit_ids', help="Only run this audit ID (repeatable)")
+    parser.add_argument('--audits-dir', default=str(AUDITS_DIR), help="Audit catalog directory")
+    parser.add_argument('--cache-dir', default=str(CACHE_DIR), help="Result cache directory")
+    parser.add_argument('--time', help="Evaluation time (unix seconds or ISO 8601)")
+    parser.add_argument('--step', type=int, default=60, help="Round the default evaluation time down to this many seconds")
+    parser.add_argument('--jobs', type=int, default=8, help="Concurrent queries")
+    parser.add_argument('--output', required=True, help="Results JSON file to write")
+    args = parser.parse_args()
+
+    if not args.endpoint:
+        print("Error: --endpoint or PROMETHEUS_URL is required", file=sys.stderr)
+        sys.exit(1)
+
+    audit_ids = set(args.audit_ids) if args.audit_ids else None
+    catalog = load_catalog(Path(args.audits_dir), profile=args.profile, audit_ids=audit_ids)
+    queries = collect_queries(catalog)
+    total_uses = sum(len(q.uses) for q in queries.values())
+    print(f"Collected {total_uses} PromQL queries ({len(queries)} unique) "
+          f"from {len({u.audit_id for q in queries.values() for u in q.uses})} audits")
+
+    eval_time = parse_eval_time(args.time, args.step)
+    client = PrometheusClient(args.endpoint)
+    cache = ResultCache(Path(args.cache_dir), args.endpoint, eval_time)
+    executed, hits = execute(queries, client, cache, eval_time, args.jobs)
+
+    audits = attach_to_audits(queries, cache.results)
+    failed = sum(1 for q in queries if cache.results.get(q, {}).get('status') != 'success')
+    output = {
+        "endpoint": args.endpoint,
+        "time": eval_time,
+        "time_iso": datetime.fromtimestamp(eval_time, timezone.utc).isoformat(),
+        "stats": {"unique_queries": len(queries), "executed": executed,
+                  "cache_hits": hits, "failed": failed},
+        "audits": audits,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(output, f, indent=1)
+
+    print(f"  Executed: {executed}")
+    print(f"  Cache hits: {hits}")
+    print(f"  Failed: {failed}")
+    print(f"  Results: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,660 @@
+#!/usr/bin/env python3
+"""
+Profile the cost of every regex in the catalog.
+
+`discovery.code_patterns` and `signals.*.evidence_pattern` run against
+arbitrary repositories (discovery_scanner.py, agents), where one minified
+line can be hundreds of kilobytes. `forEach.*await` is quadratic on a line
+with many `forEach` and no `await`; nested quantifiers can be exponential.
+ActionabilityValidator.validate_regex only checks that patterns compile.
+
+Each unique pattern is checked two ways:
+
+- Statically, from its sre parse tree: nested unbounded quantifiers whose
+  iterations can match the same text or split the run between two
+  iterations (`( *, *)*`), alternations under an unbounded
+  quantifier whose branches can start with the same character, and chains
+  of unbounded quantifiers over overlapping characters (`.*x.*y`), which
+  give the estimated polynomial degree of a failing search.
+- Dynamically, in worker processes: against a corpus of adversarial lines
+  and real source lines, and against pump inputs that repeat the pattern's
+  own literals (or single characters) without completing a match, at
+  doubling sizes, to measure how run time grows. Inputs are timed against
+  --budget-ms; a pattern still running far past its budget is killed and
+  reported as a timeout.
+
+The report ranks the slowest patterns with every audit and field that uses
+them.
+
+Usage:
+    python scripts/regex_profiler.py --output meta-audit/regex-cost-report.yaml
+    python scripts/regex_profiler.py --corpus ../service/src --budget-ms 50
+    python scripts/regex_profiler.py --static-only
+"""
+
+import os
+import re
+import math
+import time
+import string
+import argparse
+import multiprocessing
+import multiprocessing.connection
+from collections import Counter, deque
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator
+
+try:
+    import re._parser as sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover
+    import sre_parse
+
+import yaml
+
+from audit_catalog import AUDITS_DIR, BASE_DIR, load_catalog
+from instrumentation import phase, timed_run
+
+DEFAULT_BUDGET_MS = 100
+DEFAULT_CORPUS = [BASE_DIR / "audit-browser", BASE_DIR / "scripts"]
+MAX_CORPUS_LINES = 2000
+MAX_CORPUS_FILE_BYTES = 1 << 20
+CORPUS_LINE_CHARS = 4096
+
+PUMP_START = 1024
+PUMP_MAX = 65536
+# Growth is only measured once an input takes at least this long
+MIN_MEASURABLE = 0.0002
+# Super-linear patterns that exceed the budget on inputs this size or smaller are high severity
+PUMP_HIGH_CHARS = 16384
+# A pattern's total work stops growing pumps beyond this many input budgets;
+# a worker still busy after TIMEOUT_BUDGETS is killed
+PATTERN_BUDGETS = 20
+TIMEOUT_BUDGETS = 50
+# Bounded repeats this large backtrack like unbounded ones
+LARGE_REPEAT = 64
+
+SIGNAL_LEVELS = ('critical', 'high', 'medium', 'low', 'positive')
+GENERIC_UNITS = ['a', '0', ' ', '\t', 'a ', '.', '/', '"', '<a ', 'x=1;']
+MINIFIED_JS = 'function(e){return e.forEach(function(t){n.push(t.map(r))}),Promise.resolve(e)};var o=setInterval(i,9);'
+
+MAXREPEAT = sre_parse.MAXREPEAT
+REPEATS = {sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT}
+POSSESSIVE_REPEAT = getattr(sre_parse, 'POSSESSIVE_REPEAT', None)
+ATOMIC_GROUP = getattr(sre_parse, 'ATOMIC_GROUP', None)
+BEGINNINGS = {sre_parse.AT_BEGINNING, sre_parse.AT_BEGINNING_STRING}
+
+PROBE = frozenset(string.printable + 'éß中')
+CATEGORY_TESTS = {
+    sre_parse.CATEGORY_DIGIT: str.isdigit,
+    sre_parse.CATEGORY_NOT_DIGIT: lambda c: not c.isdigit(),
+    sre_parse.CATEGORY_SPACE: str.isspace,
+    sre_parse.CATEGORY_NOT_SPACE: lambda c: not c.isspace(),
+    sre_parse.CATEGORY_WORD: lambda c: c.isalnum() or c == '_',
+    sre_parse.CATEGORY_NOT_WORD: lambda c: not (c.isalnum() or c == '_'),
+}
+
+
+# ============================================================================
+# Static analysis
+# ============================================================================
+
+@dataclass
+class StaticProfile:
+    """What the parse tree says about a pattern's worst case."""
+    risks: list[str] = field(default_factory=list)
+    degree: int = 1                      # estimated polynomial degree of a failing search
+    anchored: bool = False
+    pumps: list[str] = field(default_factory=list)
+
+    @property
+    def exponential(self) -> bool:
+        return bool(self.risks)
+
+
+class TreeWalker:
+    """Character-set and nullability queries over an sre parse tree."""
+
+    def __init__(self, flags: int):
+        self.ignorecase = bool(flags & re.IGNORECASE)
+        self.dotall = bool(flags & re.DOTALL)
+        self.profile = StaticProfile()
+
+    def case(self, chars: set[str] | frozenset[str]) -> frozenset[str]:
+        if not self.ignorecase:
+            return frozenset(chars)
+        return frozenset(chars) | {c.swapcase() for c in chars}
+
+    def class_chars(self, items) -> frozenset[str]:
+        negate, chars = False, set()
+        for op, av in items:
+            if op is sre_parse.NEGATE:
+                negate = True
+            elif op is sre_parse.LITERAL:
+                chars.add(chr(av))
+            elif op is sre_parse.RANGE:
+                chars.update(c for c in PROBE if av[0] <= ord(c) <= av[1])
+            elif op is sre_parse.CATEGORY and av in CATEGORY_TESTS:
+                chars.update(c for c in PROBE if CATEGORY_TESTS[av](c))
+        chars = self.case(chars)
+        return PROBE - chars if negate else chars
+
+    def chars(self, op, av) -> frozenset[str]:
+        """Every character the item can consume."""
+        if op is sre_parse.LITERAL:
+            return self.case({chr(av)})
+        if op is sre_parse.NOT_LITERAL:
+            return PROBE - self.case({chr(av)})
+        if op is sre_parse.ANY:
+            return PROBE if self.dotall else PROBE - {'\n'}
+        if op is sre_parse.IN:
+            return self.class_chars(av)
+        if op in REPEATS or op is POSSESSIVE_REPEAT:
+            return self.seq_chars(av[2])
+        if op is sre_parse.SUBPATTERN:
+            return self.seq_chars(av[-1])
+        if op is ATOMIC_GROUP:
+            return self.seq_chars(av)
+        if op is sre_parse.BRANCH:
+            return frozenset().union(*(self.seq_chars(b) for b in av[1]))
+        return frozenset()
+
+    def seq_chars(self, seq) -> frozenset[str]:
+        return frozenset().union(*(self.chars(op, av) for op, av in seq))
+
+    def nullable(self, op, av) -> bool:
+        if op in REPEATS or op is POSSESSIVE_REPEAT:
+            return av[0] == 0 or self.seq_nullable(av[2])
+        if op is sre_parse.SUBPATTERN:
+            return self.seq_nullable(av[-1])
+        if op is ATOMIC_GROUP:
+            return self.seq_nullable(av)
+        if op is sre_parse.BRANCH:
+            return any(self.seq_nullable(b) for b in av[1])
+        return op in (sre_parse.AT, sre_parse.ASSERT, sre_parse.ASSERT_NOT,
+                      sre_parse.GROUPREF, sre_parse.GROUPREF_EXISTS)
+
+    def seq_nullable(self, seq) -> bool:
+        return all(self.nullable(op, av) for op, av in seq)
+
+    def first(self, seq) -> frozenset[str]:
+        """Characters a match of the sequence can start with."""
+        result = frozenset()
+        for op, av in seq:
+            if op in REPEATS or op is POSSESSIVE_REPEAT:
+                result |= self.first(av[2])
+            elif op is sre_parse.SUBPATTERN:
+                result |= self.first(av[-1])
+            elif op is sre_parse.BRANCH:
+                result |= frozenset().union(*(self.first(b) for b in av[1]))
+            else:
+                result |= self.chars(op, av)
+            if not self.nullable(op, av):
+                break
+        return result
+
+    @staticmethod
+    def unbounded(op, av) -> bool:
+        """A backtracking repeat with no useful upper bound."""
+        return op in REPEATS and (av[1] == MAXREPEAT or av[1] >= LARGE_REPEAT)
+
+    def flatten(self, seq) -> Iterator[tuple]:
+        """Items of a sequence with capturing/non-capturing groups inlined."""
+        for op, av in seq:
+            if op is sre_parse.SUBPATTERN:
+                yield from self.flatten(av[-1])
+            else:
+                yield op, av
+
+    def ambiguous_body(self, body) -> bool:
+        """Can iterations of this repeated body split one run of characters several ways?"""
+        items = list(self.flatten(body))
+        for index, (op, av) in enumerate(items):
+            if not self.unbounded(op, av):
+                continue
+            inner = self.chars(op, av)
+            rest = items[:index] + items[index + 1:]
+            if all(self.nullable(o, a) or self.chars(o, a) & inner for o, a in rest):
+                return True
+        return False
+
+    def ambiguous_boundary(self, body) -> bool:
+        """Can a run between iterations go to the end of one or the start of the next?"""
+        items = list(self.flatten(body))
+        head, tail = frozenset(), frozenset()
+        for op, av in items:
+            if self.unbounded(op, av):
+                head |= self.chars(op, av)
+            if not self.nullable(op, av):
+                break
+        for op, av in reversed(items):
+            if self.unbounded(op, av):
+                tail |= self.chars(op, av)
+            if not self.nullable(op, av):
+                break
+        return bool(head & tail)
+
+    def overlapping_branches(self, body) -> bool:
+        for op, av in self.flatten(body):
+            if op is sre_parse.BRANCH:
+                firsts = [self.first(b) for b in av[1]]
+                for i, a in enumerate(firsts):
+                    if any(a & b for b in firsts[i + 1:]):
+                        return True
+        return False
+
+    def walk(self, seq) -> int:
+        """Record risks under seq; returns its longest chain of overlapping unbounded repeats."""
+        chain, chain_chars, longest = 0, frozenset(), 0
+        for op, av in seq:
+            if self.unbounded(op, av):
+                body = av[2]
+                body_chars = self.seq_chars(body)
+                if chain and body_chars & chain_chars:
+                    chain, chain_chars = chain + 1, chain_chars | body_chars
+                else:
+                    chain, chain_chars = 1, body_chars
+                longest = max(longest, chain)
+                nested = self.ambiguous_body(body) or self.ambiguous_boundary(body)
+                if nested and 'nested_quantifier' not in self.profile.risks:
+                    self.profile.risks.append('nested_quantifier')
+                if self.overlapping_branches(body) and 'overlapping_alternation' not in self.profile.risks:
+                    self.profile.risks.append('overlapping_alternation')
+                longest = max(longest, self.walk(body))
+                continue
+
+            if op in REPEATS and av[1] > 1:
+                # Each bounded iteration extends the inner chain
+                longest = max(longest, self.walk(av[2]) * av[1])
+            elif op in REPEATS or op is POSSESSIVE_REPEAT:
+                longest = max(longest, self.walk(av[2]))
+            elif op is sre_parse.SUBPATTERN:
+                longest = max(longest, self.walk(av[-1]))
+            elif op is ATOMIC_GROUP:
+                longest = max(longest, self.walk(av))
+            elif op is sre_parse.BRANCH:
+                longest = max([longest] + [self.walk(b) for b in av[1]])
+            elif op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+                longest = max(longest, self.walk(av[1]))
+
+            # A required element the chain cannot consume ends the chain
+            if not self.nullable(op, av) and not (self.chars(op, av) & chain_chars):
+                chain, chain_chars = 0, frozenset()
+        return longest
+
+    def literal_runs(self, seq) -> list[str]:
+        """Required literal runs of a sequence, in order."""
+        runs, current = [], ''
+        for op, av in seq:
+            if op is sre_parse.LITERAL:
+                current += chr(av)
+                continue
+            if op is sre_parse.SUBPATTERN and not self.seq_nullable(av[-1]):
+                inner = self.literal_runs(av[-1])
+                if len(inner) == 1 and not current.endswith(' '):
+                    current += inner[0]
+                    continue
+            if current:
+                runs.append(current)
+                current = ''
+        if current:
+            runs.append(current)
+        return runs
+
+
+def pump_unit(runs: list[str]) -> str:
+    """Text repeating the pattern's leading literals without its final one."""
+    if len(runs) >= 2:
+        return ' '.join(runs[:-1]) + ' '
+    if runs and len(runs[0]) > 1:
+        return runs[0][:-1] + ' '
+    return ''
+
+
+def analyze_pattern(pattern: str, flags: int = re.MULTILINE) -> StaticProfile:
+    """Static cost profile of a pattern. Raises re.error if it does not compile."""
+    tree = sre_parse.parse(pattern, flags)
+    walker = TreeWalker(tree.state.flags)
+    items = list(tree)
+    profile = walker.profile
+    profile.anchored = bool(items) and items[0][0] is sre_parse.AT and items[0][1] in BEGINNINGS
+    chain = walker.walk(items)
+    profile.degree = max(1, chain + (0 if profile.anchored or not chain else 1))
+
+    branches = [list(b) for b in items[0][1][1]] if len(items) == 1 and items[0][0] is sre_parse.BRANCH else [items]
+    for branch in branches:
+        unit = pump_unit(walker.literal_runs(branch))
+        if unit and unit not in profile.pumps:
+            profile.pumps.append(unit)
+    return profile
+
+
+# ============================================================================
+# Dynamic profiling (worker processes)
+# ============================================================================
+
+def pumped(unit: str, size: int) -> str:
+    return (unit * (size // len(unit) + 1))[:size]
+
+
+def time_input(regex: re.Pattern, text: str) -> float:
+    """Seconds to run the pattern over text as discovery_scanner does (finditer)."""
+    start = time.perf_counter()
+    for _ in regex.finditer(text):
+        pass
+    elapsed = time.perf_counter() - start
+    if elapsed < 0.005:  # noisy; take the faster of two runs
+        start = time.perf_counter()
+        for _ in regex.finditer(text):
+            pass
+        elapsed = min(elapsed, time.perf_counter() - start)
+    return elapsed
+
+
+def profile_pattern(pattern: str, pumps: list[str], corpus: list[tuple[str, str]], budget: float) -> dict[str, Any]:
+    regex = re.compile(pattern, re.MULTILINE)
+    spent, worst, worst_input = 0.0, 0.0, ''
+    corpus_seconds = 0.0
+    over_budget_lines = 0
+    for name, line in corpus:
+        elapsed = time_input(regex, line)
+        corpus_seconds += elapsed
+        if elapsed > worst:
+            worst, worst_input = elapsed, name
+        if elapsed > budget:
+            over_budget_lines += 1
+        if corpus_seconds > PATTERN_BUDGETS * budget:
+            break
+    spent = corpus_seconds
+
+    exponent, exceeded_at = 0.0, None
+    for unit in pumps + GENERIC_UNITS:
+        previous, size = None, PUMP_START
+        while size <= PUMP_MAX and spent < PATTERN_BUDGETS * budget:
+            elapsed = time_input(regex, pumped(unit, size))
+            spent += elapsed
+            if elapsed > worst:
+                worst, worst_input = elapsed, f"pump {unit!r} x {size} chars"
+            if previous is not None and previous >= MIN_MEASURABLE:
+                exponent = max(exponent, math.log2(elapsed / previous))
+            if elapsed > budget:
+                exceeded_at = size if exceeded_at is None else min(exceeded_at, size)
+                break
+            if size >= 8192 and elapsed < MIN_MEASURABLE:
+                break
+            previous, size = elapsed, size * 2
+
+    return {
+        'worst_ms': round(worst * 1000, 3),
+        'worst_input': worst_input,
+        'corpus_ms': round(corpus_seconds * 1000, 3),
+        'corpus_lines_over_budget': over_budget_lines,
+        'growth_exponent': round(exponent, 2),
+        'budget_exceeded_at_chars': exceeded_at,
+    }
+
+
+def worker(conn, corpus: list[tuple[str, str]], budget: float) -> None:
+    while True:
+        task = conn.recv()
+        if task is None:
+            return
+        index, pattern, pumps = task
+        try:
+            result = profile_pattern(pattern, pumps, corpus, budget)
+        except Exception as e:  # a pattern the worker cannot run is reported, not fatal
+            result = {'error': f"{type(e).__name__}: {e}"}
+        conn.send((index, result))
+
+
+def run_dynamic(tasks: list[tuple[str, list[str]]], corpus: list[tuple[str, str]],
+                budget: float, jobs: int) -> list[dict[str, Any]]:
+    """Profile patterns in a pool of worker processes, killing workers stuck on one pattern."""
+    context = multiprocessing.get_context('fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn')
+    timeout = TIMEOUT_BUDGETS * budget + 1.0
+    results: list[dict[str, Any] | None] = [None] * len(tasks)
+    pending = deque(range(len(tasks)))
+    busy: dict[Any, tuple[Any, int, float]] = {}
+    done = 0
+
+    def start_worker() -> None:
+        parent, child = context.Pipe()
+        process = context.Process(target=worker, args=(child, corpus, budget), daemon=True)
+        process.start()
+        child.close()
+        dispatch(parent, process)
+
+    def dispatch(conn, process) -> None:
+        if pending:
+            index = pending.popleft()
+            conn.send((index, *tasks[index]))
+            busy[conn] = (process, index, time.monotonic())
+        else:
+            conn.send(None)
+            conn.close()
+            process.join()
+
+    for _ in range(min(jobs, len(tasks))):
+        start_worker()
+
+    while busy:
+        for conn in multiprocessing.connection.wait(list(busy), timeout=0.2):
+            process, index, _ = busy.pop(conn)
+            try:
+                _, results[index] = conn.recv()
+            except EOFError:
+                results[index] = {'error': "worker exited"}
+                start_worker()
+                continue
+            done += 1
+            if done % 1000 == 0:
+                print(f"  Profiled {done}/{len(tasks)} patterns")
+            dispatch(conn, process)
+
+        now = time.monotonic()
+        for conn, (process, index, started) in list(busy.items()):
+            if now - started > timeout:
+                process.kill()
+                process.join()
+                conn.close()
+                del busy[conn]
+                results[index] = {'timeout': True, 'worst_ms': round(timeout * 1000, 3),
+                                  'worst_input': "killed after exceeding the pattern time limit"}
+                start_worker()
+    return results
+
+
+# ============================================================================
+# Catalog patterns, corpus and report
+# ============================================================================
+
+def iter_catalog_patterns(catalog: dict[str, dict[str, Any]]) -> Iterator[tuple[str, str, str, str]]:
+    """Yield (pattern, audit_id, audit_file, field) for every catalog regex."""
+    for audit_id, data in catalog.items():
+        audit_file = data.get('_file_path', '')
+        discovery = data.get('discovery') if isinstance(data.get('discovery'), dict) else {}
+        for i, entry in enumerate(discovery.get('code_patterns') or []):
+            if isinstance(entry, dict) and entry.get('type', 'regex') in ('regex', 'keyword') and entry.get('pattern'):
+                yield str(entry['pattern']), audit_id, audit_file, f"discovery.code_patterns[{i}].pattern"
+        signals = data.get('signals') if isinstance(data.get('signals'), dict) else {}
+        for level in SIGNAL_LEVELS:
+            for i, signal in enumerate(signals.get(level) or []):
+                if isinstance(signal, dict) and signal.get('evidence_pattern'):
+                    yield str(signal['evidence_pattern']), audit_id, audit_file, f"signals.{level}[{i}].evidence_pattern"
+
+
+def build_corpus(paths: list[Path]) -> tuple[list[tuple[str, str]], list[str]]:
+    """Adversarial lines plus the longest distinct lines of the given source trees."""
+    corpus = [(f"repeated {unit!r} line", pumped(unit, CORPUS_LINE_CHARS) + '!') for unit in GENERIC_UNITS]
+    corpus.append(("minified JavaScript line", pumped(MINIFIED_JS, CORPUS_LINE_CHARS)))
+
+    lines: dict[str, str] = {}
+    sources = []
+    for root in paths:
+        if not root.exists():
+            continue
+        sources.append(root.relative_to(BASE_DIR).as_posix() if root.is_relative_to(BASE_DIR) else str(root))
+        files = [root] if root.is_file() else sorted(p for p in root.rglob('*') if p.is_file())
+        for path in files:
+            if '.git' in path.parts or path.stat().st_size > MAX_CORPUS_FILE_BYTES:
+                continue
+            raw = path.read_bytes()
+            if b'\0' in raw[:8192]:
+                continue
+            rel = path.relative_to(BASE_DIR).as_posix() if path.is_relative_to(BASE_DIR) else str(path)
+            for number, line in enumerate(raw.decode('utf-8', errors='replace').splitlines(), 1):
+                if line.strip() and line not in lines:
+                    lines[line] = f"{rel}:{number}"
+    longest = sorted(lines, key=len, reverse=True)[:MAX_CORPUS_LINES]
+    corpus.extend((lines[line], line) for line in longest)
+    return corpus, sources
+
+
+def classify(static: StaticProfile, result: dict[str, Any], budget_ms: float) -> str:
+    if result.get('timeout'):
+        return 'critical'
+    exponent = result.get('growth_exponent', 0.0)
+    exceeded_at = result.get('budget_exceeded_at_chars')
+    if exponent >= 2.5 or result.get('corpus_lines_over_budget'):
+        return 'critical'
+    if exponent >= 1.6 and exceeded_at is not None and exceeded_at <= PUMP_HIGH_CHARS:
+        return 'high'
+    if exponent >= 1.6 or exceeded_at is not None or static.exponential:
+        return 'medium'
+    if static.degree >= 3 or result.get('worst_ms', 0.0) > budget_ms / 10:
+        return 'low'
+    return 'ok'
+
+
+def complexity(static: StaticProfile, result: dict[str, Any]) -> str:
+    if result.get('timeout'):
+        return 'catastrophic'
+    exponent = result.get('growth_exponent', 0.0)
+    if exponent >= 2.5:
+        return 'exponential' if static.exponential else 'cubic or worse'
+    if exponent >= 1.6:
+        return 'quadratic'
+    return 'linear'
+
+
+def build_report(occurrences: dict[str, list[dict[str, str]]], invalid: list[dict[str, str]],
+                 statics: dict[str, StaticProfile], results: dict[str, dict[str, Any]],
+                 budget_ms: float, corpus: list[tuple[str, str]], sources: list[str], top: int) -> dict[str, Any]:
+    rows = []
+    for pattern, static in statics.items():
+        result = results.get(pattern, {})
+        rows.append({
+            'pattern': pattern,
+            'severity': classify(static, result, budget_ms),
+            'complexity': complexity(static, result) if results else None,
+            'estimated_degree': static.degree,
+            'static_risks': static.risks,
+            **{k: v for k, v in result.items() if k != 'timeout'},
+            'timeout': bool(result.get('timeout')),
+            'occurrences': len(occurrences[pattern]),
+            'used_by': occurrences[pattern][:5],
+        })
+
+    def rank(row) -> tuple:
+        exceeded = row.get('budget_exceeded_at_chars')
+        return (not row['timeout'], exceeded if exceeded is not None else math.inf,
+                -row.get('worst_ms', 0.0), -row['estimated_degree'], row['pattern'])
+
+    rows.sort(key=rank)
+    severities = Counter(row['severity'] for row in rows)
+    return {
+        'patterns': {
+            'occurrences': sum(len(v) for v in occurrences.values()) + len(invalid),
+            'unique': len(statics),
+            'invalid': len(invalid),
+        },
+        'budget_ms': budget_ms,
+        'corpus': {
+            'lines': len(corpus),
+            'bytes': sum(len(line) for _, line in corpus),
+            'sources': sources,
+        },
+        'findings': {level: severities.get(level, 0) for level in ('critical', 'high', 'medium', 'low')},
+        'static_risks': {
+            'nested_quantifier': sum('nested_quantifier' in s.risks for s in statics.values()),
+            'overlapping_alternation': sum('overlapping_alternation' in s.risks for s in statics.values()),
+            'polynomial_degree': dict(sorted(Counter(s.degree for s in statics.values()).items())),
+        },
+        'measured_complexity': dict(Counter(row['complexity'] for row in rows)) if results else {},
+        'slowest_patterns': [row for row in rows if row['severity'] != 'ok'][:top],
+        'invalid_patterns': invalid[:top],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile catalog regexes for super-linear backtracking.")
+    parser.add_argument('--audits-dir', default=str(AUDITS_DIR), help="Audit catalog directory")
+    parser.add_argument('--profile', help="Only profile audits in this profile")
+    parser.add_argument('--corpus', action='append', type=Path,
+                        help="File or directory of real-world source lines (repeatable; "
+                             "default: audit-browser/ and scripts/)")
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS,
+                        help=f"Time budget per input in ms (default: {DEFAULT_BUDGET_MS})")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument('--static-only', action='store_true', help="Skip running patterns")
+    parser.add_argument('--top', type=int, default=50, help="Patterns listed in the report (default: 50)")
+    parser.add_argument('--output', help="Write the full report (YAML) here")
+    args = parser.parse_args()
+
+    budget = args.budget_ms / 1000
+    # Timing is written next to the report, so only when there is one
+    with timed_run(args.output) if args.output else nullcontext():
+        with phase('load'):
+            catalog = load_catalog(Path(args.audits_dir), args.profile, sections=('audit', 'discovery', 'signals'))
+
+        with phase('static-analysis'):
+            occurrences: dict[str, list[dict[str, str]]] = {}
+            statics: dict[str, StaticProfile] = {}
+            invalid = []
+            for pattern, audit_id, audit_file, field_path in iter_catalog_patterns(catalog):
+                use = {'audit_id': audit_id, 'audit_file': audit_file, 'field': field_path}
+                if pattern not in statics and pattern not in occurrences:
+                    try:
+                        statics[pattern] = analyze_pattern(pattern)
+                    except (re.error, RecursionError, OverflowError) as e:
+                        invalid.append({**use, 'pattern': pattern, 'error': str(e)})
+                        continue
+                if pattern in statics:
+                    occurrences.setdefault(pattern, []).append(use)
+        print(f"Analyzed {len(statics)} unique patterns ({len(invalid)} invalid) from {len(catalog)} audits")
+
+        corpus, sources = build_corpus(args.corpus or DEFAULT_CORPUS)
+        results: dict[str, dict[str, Any]] = {}
+        if not args.static_only:
+            print(f"Profiling against {len(corpus)} corpus lines and pumped inputs "
+                  f"({args.budget_ms:g} ms budget, {args.jobs} workers)")
+            with phase('profile'):
+                patterns = list(statics)
+                measured = run_dynamic([(p, statics[p].pumps) for p in patterns], corpus, budget, args.jobs)
+                results = dict(zip(patterns, measured))
+
+        report = build_report(occurrences, invalid, statics, results, args.budget_ms, corpus, sources, args.top)
+        if args.output:
+            with phase('write-report'), open(args.output, 'w', encoding='utf-8') as f:
+                yaml.dump({"regex_cost_report": report}, f, default_flow_style=False,
+                          allow_unicode=True, sort_keys=False, width=120)
+
+    print("\nFindings: " + ', '.join(f"{level} {count}" for level, count in report['findings'].items()))
+    risks = report['static_risks']
+    print(f"Static risks: nested quantifiers {risks['nested_quantifier']}, "
+          f"overlapping alternations {risks['overlapping_alternation']}, degree {risks['polynomial_degree']}")
+    if report['measured_complexity']:
+        print(f"Measured complexity: {report['measured_complexity']}")
+    print("\nSlowest patterns:")
+    for row in report['slowest_patterns'][:15]:
+        where = row['used_by'][0]
+        print(f"  [{row['severity']}] {row.get('worst_ms', 0.0):9.1f}ms  {row['pattern'][:60]!r}")
+        print(f"      {where['audit_id']} {where['field']}"
+              + (f" (+{row['occurrences'] - 1} more)" if row['occurrences'] > 1 else ""))
+    if args.output:
+        print(f"\nReport written to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Persistent cache of discovery scan results per file content.
+
+Vendored libraries, generated code and unchanged files recur across
+repositories and across runs. Their code-pattern hits depend only on the
+file's bytes, the path classes that decide which patterns apply, and the
+compiled patterns, so the scanner keys them by (git blob ID of the content,
+hash of the applicable pattern set) and scans each distinct blob once.
+
+Entries live in one SQLite database (safe to share between the worker
+processes of a sweep) with their size and last use. When the database grows
+past its size limit, the least recently used entries are evicted down to
+90% of it.
+
+Usage:
+    python scripts/scan_cache.py              # entries, size, limit
+    python scripts/scan_cache.py --clear
+"""
+
+import time
+import zlib
+import json
+import sqlite3
+import hashlib
+import argparse
+from pathlib import Path
+
+from audit_catalog import BASE_DIR
+
+CACHE_DIR = BASE_DIR / "scan-cache"
+DEFAULT_MAX_MB = 512
+
+# Pending writes and last-use updates are committed in batches of this size
+BATCH_SIZE = 1000
+
+# Eviction stops once the cache is back under this fraction of its limit
+EVICT_TO = 0.9
+
+
+def git_blob_id(data: bytes) -> str:
+    """The ID git gives a blob with this content, so scans and history share keys."""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+class ScanCache:
+    """(blob ID, pattern-set hash) -> {audit_id: hits}, evicted least-recently-used by size."""
+
+    def __init__(self, cache_dir: Path = CACHE_DIR, max_bytes: int = DEFAULT_MAX_MB << 20):
+        self.path = Path(cache_dir) / "results.sqlite"
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._db: sqlite3.Connection | None = None
+        self._puts: list[tuple[str, bytes, int, float]] = []
+        self._used: dict[str, float] = {}
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        # Opened on first use, so a cache created before a fork is never shared
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(self.path, timeout=60)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS results ("
+                             "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, used REAL NOT NULL)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS results_used ON results (used)")
+        return self._db
+
+    @staticmethod
+    def key(blob_id: str, pattern_set: str) -> str:
+        return f"{blob_id}:{pattern_set}"
+
+    def get(self, key: str) -> dict[str, list] | None:
+        row = self.db.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._used[key] = time.time()
+        if len(self._used) >= BATCH_SIZE:
+            self.flush()
+        return json.loads(zlib.decompress(row[0]))
+
+    def put(self, key: str, hits: dict[str, list]) -> None:
+        value = zlib.compress(json.dumps(hits, separators=(',', ':')).encode())
+        self._puts.append((key, value, len(key) + len(value), time.time()))
+        if len(self._puts) >= BATCH_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        """Commit pending entries and last-use times."""
+        if not self._puts and not self._used:
+            return
+        with self.db:
+            self.db.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)", self._puts)
+            self.db.executemany("UPDATE results SET used = ? WHERE key = ?",
+                                [(used, key) for key, used in self._used.items()])
+        self._puts.clear()
+        self._used.clear()
+
+    def evict(self) -> int:
+        """Drop least recently used entries while over the size limit. Returns entries dropped."""
+        total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return 0
+        target = total - int(self.max_bytes * EVICT_TO)
+        doomed, freed = [], 0
+        for key, size in self.db.execute("SELECT key, size FROM results ORDER BY used"):
+            doomed.append((key,))
+            freed += size
+            if freed >= target:
+                break
+        with self.db:
+            self.db.executemany("DELETE FROM results WHERE key = ?", doomed)
+        return len(doomed)
+
+    def close(self) -> None:
+        """Flush pending writes and enforce the size limit."""
+        self.flush()
+        self.evict()
+        self.db.close()
+        self._db = None
+
+    def usage(self) -> tuple[int, int]:
+        """(entries, bytes) currently stored."""
+        return self.db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or clear the discovery scan result cache.")
+    parser.add_argument('--cache-dir', default=str(CACHE_DIR), help="Cache directory")
+    parser.add_argument('--max-mb', type=int, default=DEFAULT_MAX_MB, help="Size limit to evict down to")
+    parser.add_argument('--clear', action='store_true', help="Remove every entry")
+    args = parser.parse_args()
+
+    cache = ScanCache(Path(args.cache_dir), args.max_mb << 20)
+    if args.clear:
+        with cache.db:
+            cache.db.execute("DELETE FROM results")
+        cache.db.execute("VACUUM")
+    evicted = cache.evict()
+    entries, size = cache.usage()
+    print(f"Scan cache: {cache.path}")
+    print(f"  Entries: {entries}  Size: {size / (1 << 20):.1f} MB of {args.max_mb} MB"
+          + (f"  (evicted {evicted})" if evicted else ""))
+    cache.close()
+
+
+if __name__ == "__main__":
+    main()
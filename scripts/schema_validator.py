@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+Validate the audit catalog against schema/AUDIT-TEMPLATE-BLANK.yaml.
+
+The template is the schema: every key annotated `# [REQUIRED]`,
+`# [CONDITIONAL]` or `# [OPTIONAL]` becomes a field rule. The text after
+the marker may restrict the value, either to an enumeration
+(`active|draft|deprecated|archived`) or to an integer range (`1-43`). Each
+field's expected shape (scalar, boolean, integer, list or mapping) comes
+from the template's own example value.
+
+The rules are compiled into a specialized Python checker. It is generated
+as straight-line code that resolves each shared path prefix once and returns
+one status code per field. The generated source is cached under
+schema-cache/, keyed by the template's hash, so any template edit produces
+a new checker automatically. The whole catalog is checked in one pass into
+a status matrix, and per-field coverage and issue counts are column
+reductions over that matrix.
+
+Keys under list items (e.g. `procedure.steps[].commands`) are present when
+any item has them, and every item that has them must satisfy the rule.
+
+Most audits keep their SDLC phases in AUDIT-INVENTORY.csv rather than in an
+`sdlc_phases` section. As in generate-inventory.py, a file without the
+section is checked against its inventory row; a file with neither reports
+the phases missing.
+
+Usage:
+    python scripts/schema_validator.py
+    python scripts/schema_validator.py --profile security --output schema-report.yaml
+    python scripts/schema_validator.py --show-source
+"""
+
+import re
+import sys
+import yaml
+import hashlib
+import importlib.util
+import argparse
+from collections import Counter
+from contextlib import nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+from audit_catalog import AUDITS_DIR, BASE_DIR, YamlLoader, in_profile, iter_audit_files
+from instrumentation import audit_file, phase, timed_run
+
+TEMPLATE_PATH = BASE_DIR / "schema" / "AUDIT-TEMPLATE-BLANK.yaml"
+CACHE_DIR = BASE_DIR / "schema-cache"
+INVENTORY_SCRIPT = Path(__file__).resolve().parent / "generate-inventory.py"
+
+GENERATOR_VERSION = 1
+
+# Per-field status codes returned by the compiled checker
+OK, MISSING, EMPTY, WRONG_TYPE, INVALID = range(5)
+STATUS_NAMES = ("ok", "missing", "empty", "wrong_type", "invalid")
+
+MARKER_RE = re.compile(r'#\s*\[(REQUIRED|CONDITIONAL|OPTIONAL)\b[^\]]*\]\s*(.*)$')
+KEY_RE = re.compile(r'^(- +)?([A-Za-z_][\w-]*):(?:\s|$)')
+ENUM_RE = re.compile(r'^[\w-]+(?:\|[\w-]+)+')
+RANGE_RE = re.compile(r'^(\d+)-(\d+)\b')
+
+# Template value type -> rule kind
+KINDS = {bool: "boolean", int: "integer", list: "list", dict: "mapping"}
+
+
+@dataclass
+class FieldRule:
+    path: str                  # dotted path, "[]" marks a list item
+    level: str                 # REQUIRED | CONDITIONAL | OPTIONAL
+    kind: str                  # scalar | boolean | integer | list | mapping
+    choices: tuple[str, ...] = ()
+    bounds: tuple[int, int] | None = None
+    note: str = ""
+
+    @property
+    def segments(self) -> list[str]:
+        return self.path.replace('[]', '.[]').split('.')
+
+
+def template_value(template: Any, segments: list[str]) -> Any:
+    """Follow a rule path through the parsed template (first list item)."""
+    node = template
+    for segment in segments:
+        if segment == '[]':
+            node = node[0] if isinstance(node, list) and node else None
+        else:
+            node = node.get(segment) if isinstance(node, dict) else None
+    return node
+
+
+def parse_template(text: str) -> list[FieldRule]:
+    """Extract field rules from the template's marker comments."""
+    template = yaml.load(text, Loader=YamlLoader)
+    rules = []
+    stack: list[tuple[int, str]] = []   # (indent, segment)
+
+    for line in text.splitlines():
+        stripped = line.lstrip(' ')
+        if not stripped or stripped.startswith('#'):
+            continue
+        match = KEY_RE.match(stripped)
+        if not match:
+            continue
+
+        indent = len(line) - len(stripped)
+        while stack and stack[-1][0] >= indent:
+            stack.pop()
+        if match.group(1):
+            stack.append((indent, '[]'))
+            indent += len(match.group(1))
+        key = match.group(2)
+        stack.append((indent, key))
+
+        marker = MARKER_RE.search(line)
+        if not marker:
+            continue
+        path = '.'.join(segment for _, segment in stack).replace('.[]', '[]')
+        value = template_value(template, [s for _, s in stack])
+        rule = FieldRule(path=path, level=marker.group(1),
+                         kind=KINDS.get(type(value), "scalar"))
+
+        note = marker.group(2).strip()
+        if (m := ENUM_RE.match(note)):
+            rule.choices = tuple(m.group(0).split('|'))
+            note = note[m.end():].strip()
+        elif (m := RANGE_RE.match(note)) and rule.kind == "integer":
+            rule.bounds = (int(m.group(1)), int(m.group(2)))
+            note = note[m.end():].strip()
+        rule.note = note
+        rules.append(rule)
+
+    return rules
+
+
+# ---------------------------------------------------------------------------
+# Code generation
+# ---------------------------------------------------------------------------
+
+KIND_CHECKS = {
+    "scalar": "isinstance({v}, SCALAR)",
+    "boolean": "isinstance({v}, bool)",
+    "integer": "isinstance({v}, int) and not isinstance({v}, bool)",
+    "list": "isinstance({v}, list)",
+    "mapping": "isinstance({v}, dict)",
+}
+
+
+def value_check(rule: FieldRule, var: str) -> str:
+    """Expression that is WRONG_TYPE/INVALID/OK for a present, non-empty value."""
+    expr = f"WRONG_TYPE if not ({KIND_CHECKS[rule.kind].format(v=var)})"
+    if rule.choices:
+        choices = ', '.join(repr(c.lower()) for c in sorted(rule.choices))
+        expr += f" else INVALID if str({var}).strip().lower() not in {{{choices}}}"
+    if rule.bounds:
+        expr += f" else INVALID if not {rule.bounds[0]} <= {var} <= {rule.bounds[1]}"
+    return expr + " else OK"
+
+
+class Generator:
+    """Emit the checker body, resolving each path prefix exactly once."""
+
+    def __init__(self):
+        self.lines: list[str] = []
+        self.vars: dict[tuple[str, ...], str] = {(): 'doc'}
+        self.lists: set[tuple[str, ...]] = set()
+
+    def emit(self, line: str):
+        self.lines.append('    ' + line)
+
+    def resolve(self, segments: tuple[str, ...]) -> str:
+        """Return the variable holding `segments`; list paths hold lists of values."""
+        if segments in self.vars:
+            return self.vars[segments]
+        parent = self.resolve(segments[:-1])
+        var = f"_{len(self.vars)}"
+        self.vars[segments] = var
+        segment = segments[-1]
+        if segment == '[]':
+            # Items of a list (flattened if the parent is itself per-item)
+            source = (f"[i for p in {parent} if isinstance(p, list) for i in p]"
+                      if segments[:-1] in self.lists
+                      else f"({parent} if isinstance({parent}, list) else ())")
+            self.emit(f"{var} = [i for i in {source} if isinstance(i, dict)]")
+            self.lists.add(segments)
+        elif segments[:-1] in self.lists:
+            self.emit(f"{var} = [i[{segment!r}] for i in {parent} if i.get({segment!r}) is not None]")
+            self.lists.add(segments)
+        else:
+            self.emit(f"{var} = {parent}.get({segment!r}) if isinstance({parent}, dict) else None")
+        return var
+
+    def field(self, index: int, rule: FieldRule):
+        segments = tuple(rule.segments)
+        var = self.resolve(segments)
+        result = f"r{index}"
+        if segments in self.lists:
+            self.emit(f"if not {var}: {result} = MISSING")
+            self.emit(f"elif all(empty(v) for v in {var}): {result} = EMPTY")
+            self.emit(f"else: {result} = max(({value_check(rule, 'v')} for v in {var} if not empty(v)), default=OK)")
+        else:
+            self.emit(f"if {var} is None: {result} = MISSING")
+            self.emit(f"elif empty({var}): {result} = EMPTY")
+            self.emit(f"else: {result} = {value_check(rule, var)}")
+
+
+def generate_source(rules: list[FieldRule], template_hash: str) -> str:
+    """Generate the specialized checker module for a rule set."""
+    generator = Generator()
+    for index, rule in enumerate(rules):
+        generator.emit(f"# {rule.path} [{rule.level}]")
+        generator.field(index, rule)
+
+    results = ', '.join(f"r{i}" for i in range(len(rules)))
+    header = [
+        f"# Generated by scripts/schema_validator.py from {TEMPLATE_PATH.name}",
+        f"# template sha256 {template_hash}; do not edit",
+        "from datetime import date",
+        "",
+        f"OK, MISSING, EMPTY, WRONG_TYPE, INVALID = {OK}, {MISSING}, {EMPTY}, {WRONG_TYPE}, {INVALID}",
+        "SCALAR = (str, int, float, bool, date)",
+        "",
+        "",
+        "def empty(value):",
+        "    if isinstance(value, str):",
+        "        return not value.strip()",
+        "    return isinstance(value, (list, dict)) and not value",
+        "",
+        "",
+        "def check(doc):",
+    ]
+    return '\n'.join(header + generator.lines + [f"    return ({results},)", ""])
+
+
+@dataclass
+class CompiledValidator:
+    rules: list[FieldRule]
+    check: Callable[[Any], tuple[int, ...]]
+    source: str
+    source_path: Path | None
+
+
+def compile_validator(template_path: Path = TEMPLATE_PATH,
+                      cache_dir: Path | None = CACHE_DIR) -> CompiledValidator:
+    """Compile the template into a checker, reusing the cached source if current."""
+    text = Path(template_path).read_text(encoding='utf-8')
+    template_hash = hashlib.sha256(f"{GENERATOR_VERSION}\0{text}".encode()).hexdigest()
+    rules = parse_template(text)
+
+    source_path = Path(cache_dir) / f"validator-{template_hash[:16]}.py" if cache_dir else None
+    if source_path and source_path.exists():
+        source = source_path.read_text(encoding='utf-8')
+    else:
+        source = generate_source(rules, template_hash)
+        if source_path:
+            source_path.parent.mkdir(parents=True, exist_ok=True)
+            for stale in source_path.parent.glob("validator-*.py"):
+                stale.unlink()
+            source_path.write_text(source, encoding='utf-8')
+
+    namespace: dict[str, Any] = {}
+    exec(compile(source, str(source_path or '<schema-validator>'), 'exec'), namespace)
+    return CompiledValidator(rules=rules, check=namespace['check'], source=source, source_path=source_path)
+
+
+# ---------------------------------------------------------------------------
+# Catalog validation
+# ---------------------------------------------------------------------------
+
+def inventory_phases() -> dict[str, dict[str, bool]]:
+    """SDLC phases per audit ID from the inventory CSV rows that have them."""
+    spec = importlib.util.spec_from_file_location("generate_inventory", INVENTORY_SCRIPT)
+    inventory = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(inventory)
+    return {
+        audit_id: {phase: row.get(phase) == "Yes" for phase in inventory.SDLC_PHASES}
+        for audit_id, row in inventory.load_existing_csv().items()
+        if all(row.get(phase) in ("Yes", "No") for phase in inventory.SDLC_PHASES)
+    }
+
+
+def load_documents(audits_dir: Path = AUDITS_DIR, profile: str | None = None) -> list[tuple[str, Any]]:
+    """Parse every audit file, keeping files without an audit section.
+
+    Files without an `sdlc_phases` section take it from their inventory row.
+    """
+    phases = inventory_phases()
+    documents = []
+    for yaml_path in iter_audit_files(audits_dir):
+        rel = yaml_path.relative_to(BASE_DIR).as_posix() if yaml_path.is_relative_to(BASE_DIR) else str(yaml_path)
+        try:
+            with audit_file(yaml_path), phase('parse'), open(yaml_path, 'r', encoding='utf-8') as f:
+                data = yaml.load(f, Loader=YamlLoader)
+        except (yaml.YAMLError, OSError) as e:
+            print(f"  Unreadable {rel}: {str(e).splitlines()[0]}", file=sys.stderr)
+            data = None
+        if profile and not (isinstance(data, dict) and in_profile(data, profile)):
+            continue
+        if isinstance(data, dict) and 'sdlc_phases' not in data:
+            audit = data.get('audit') if isinstance(data.get('audit'), dict) else {}
+            if str(audit.get('id')) in phases:
+                data['sdlc_phases'] = phases[str(audit.get('id'))]
+        documents.append((rel, data))
+    return documents
+
+
+def issue_severity(rule: FieldRule, status: int) -> str | None:
+    """Severity of a non-OK status, or None if it is not an issue."""
+    if status in (MISSING, EMPTY):
+        if rule.level != "REQUIRED":
+            return None
+        return "high" if status == MISSING else "medium"
+    return "medium" if rule.level == "REQUIRED" else "low"
+
+
+def validate_catalog(validator: CompiledValidator, documents: list[tuple[str, Any]]) -> dict[str, Any]:
+    """Check all documents in one pass and reduce the status matrix per field."""
+    matrix = [validator.check(data) for _, data in documents]
+    columns = list(zip(*matrix)) if matrix else [() for _ in validator.rules]
+    total = len(documents)
+
+    fields = {}
+    for rule, column in zip(validator.rules, columns):
+        counts = Counter(column)
+        fields[rule.path] = {
+            "level": rule.level.lower(),
+            "coverage": round(100 * counts[OK] / total, 2) if total else 0.0,
+            **{STATUS_NAMES[s]: counts[s] for s in (MISSING, EMPTY, WRONG_TYPE, INVALID) if counts[s]},
+        }
+
+    issues = []
+    for (rel, data), row in zip(documents, matrix):
+        audit = data.get('audit') if isinstance(data, dict) else None
+        audit_id = str(audit.get('id')) if isinstance(audit, dict) and audit.get('id') else rel
+        for rule, status in zip(validator.rules, row):
+            severity = issue_severity(rule, status) if status != OK else None
+            if severity:
+                issues.append({
+                    "audit_id": audit_id,
+                    "file": rel,
+                    "severity": severity,
+                    "field": rule.path,
+                    "issue": STATUS_NAMES[status],
+                    "expected": describe(rule),
+                })
+
+    failing = {issue['file'] for issue in issues if issue['severity'] in ('critical', 'high', 'medium')}
+    return {
+        "audits_analyzed": total,
+        "rules": len(validator.rules),
+        "findings": dict(sorted(Counter(issue['severity'] for issue in issues).items())),
+        "summary": {
+            "valid": total - len(failing),
+            "invalid": len(failing),
+            "pass_rate": round((total - len(failing)) / total, 4) if total else 0.0,
+        },
+        "field_coverage": fields,
+        "issues": issues,
+    }
+
+
+def describe(rule: FieldRule) -> str:
+    if rule.choices:
+        return "one of " + "|".join(rule.choices)
+    if rule.bounds:
+        return f"{rule.kind} in {rule.bounds[0]}-{rule.bounds[1]}"
+    return rule.kind
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate audits against the compiled template schema.")
+    parser.add_argument('--audits-dir', default=str(AUDITS_DIR), help="Audit catalog directory")
+    parser.add_argument('--template', default=str(TEMPLATE_PATH), help="Template to compile")
+    parser.add_argument('--profile', help="Only validate audits in this profile")
+    parser.add_argument('--output', help="Write the full report (YAML) here")
+    parser.add_argument('--show-source', action='store_true', help="Print the generated checker and exit")
+    args = parser.parse_args()
+
+    validator = compile_validator(Path(args.template))
+    if args.show_source:
+        print(validator.source)
+        return
+
+    # Timing is written next to the report, so only when there is one
+    with timed_run(args.output) if args.output else nullcontext():
+        with phase('load'):
+            documents = load_documents(Path(args.audits_dir), args.profile)
+        with phase('validate'):
+            report = validate_catalog(validator, documents)
+        if args.output:
+            with phase('write-report'), open(args.output, 'w', encoding='utf-8') as f:
+                yaml.dump({"schema_validation": report}, f, default_flow_style=False,
+                          allow_unicode=True, sort_keys=False, width=120)
+
+    print(f"Validated {report['audits_analyzed']} audits against {report['rules']} template rules")
+    print(f"  Valid: {report['summary']['valid']}")
+    print(f"  Invalid: {report['summary']['invalid']}")
+    for severity, count in report['findings'].items():
+        print(f"  {severity.capitalize()} issues: {count}")
+    print("\nField coverage:")
+    for path, field in report['field_coverage'].items():
+        problems = ', '.join(f"{k}={v}" for k, v in field.items() if k in STATUS_NAMES)
+        print(f"  {field['coverage']:6.2f}%  {path} [{field['level']}]{'  ' + problems if problems else ''}")
+
+    if args.output:
+        print(f"\nReport written to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Run audit `tooling.scripts` against a target repository.
+
+Executes the inline scripts of the selected audits (bash, python and
+javascript; other languages are reported as skipped) in a thread pool.
+Each script runs:
+
+    - with the target as its working directory, by default a read-only
+      snapshot copy of the target so scripts cannot modify the real tree
+      (for a repository root, the snapshot is also a git checkout that
+      shares the target's objects, so history-reading scripts work)
+    - with its own empty HOME and TMPDIR and a minimal environment
+    - under rlimits (CPU seconds, address space, written file size) set
+      by a small launcher before exec
+    - in its own process group, killed as a whole on timeout
+
+Results are memoized on disk keyed by (script hash, target tree hash, run
+mode and rlimits): an unchanged script on an unchanged target returns its
+previous output
+without running, and the snapshot is only copied when some script still
+has to run. Timed-out runs and runs killed by a signal are not cached.
+
+Usage:
+    python scripts/script_runner.py --target ../service --profile security \\
+        --jobs 8 --timeout 60 --output script-results.json
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import signal
+import hashlib
+import argparse
+import tempfile
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from audit_catalog import AUDITS_DIR, BASE_DIR, load_catalog
+from discovery_scanner import iter_target_files, run_git
+
+CACHE_DIR = BASE_DIR / "script-cache"
+
+# Longest stdout/stderr kept per script
+MAX_OUTPUT_BYTES = 256 * 1024
+
+INTERPRETERS = {
+    'bash': (['bash'], '.sh'),
+    'sh': (['sh'], '.sh'),
+    'python': ([sys.executable], '.py'),
+    'javascript': (['node'], '.js'),
+}
+
+# Applies rlimits, then execs the interpreter. Runs as a separate process so
+# limits are never set from a thread of this (multi-threaded) program.
+LAUNCHER = """
+import os, sys, resource
+cpu, mem, fsize = (int(v) for v in sys.argv[1:4])
+if cpu > 0:
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu + 1))
+if mem > 0:
+    resource.setrlimit(resource.RLIMIT_AS, (mem, mem))
+if fsize > 0:
+    resource.setrlimit(resource.RLIMIT_FSIZE, (fsize, fsize))
+os.execvp(sys.argv[4], sys.argv[4:])
+"""
+
+
+@dataclass
+class AuditScript:
+    audit_id: str
+    script_id: str
+    language: str
+    purpose: str
+    code: str
+
+    @property
+    def script_hash(self) -> str:
+        return hashlib.sha256(f"{self.language}\0{self.code}".encode()).hexdigest()
+
+
+@dataclass
+class Limits:
+    timeout: int
+    cpu_seconds: int
+    memory_mb: int
+    file_size_mb: int
+
+
+def collect_scripts(catalog: dict[str, dict[str, Any]]) -> list[AuditScript]:
+    """Collect inline tooling scripts from the catalog."""
+    scripts = []
+    for audit_id, data in catalog.items():
+        for index, entry in enumerate((data.get('tooling') or {}).get('scripts') or []):
+            if not isinstance(entry, dict) or not isinstance(entry.get('code'), str):
+                continue
+            scripts.append(AuditScript(
+                audit_id=audit_id,
+                script_id=str(entry.get('id') or f"script-{index}"),
+                language=str(entry.get('language') or 'bash').lower(),
+                purpose=str(entry.get('purpose') or ''),
+                code=entry['code'],
+            ))
+    return scripts
+
+
+def file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def tree_hash(root: Path) -> str:
+    """
+    Hash the target's content.
+
+    For git checkouts this is the HEAD tree ID plus the content of every
+    modified or untracked path, so it is cheap on large clean trees. Other
+    directories are hashed file by file.
+    """
+    digest = hashlib.sha256()
+    head_tree = run_git(root, 'rev-parse', 'HEAD^{tree}')
+    status = run_git(root, 'status', '--porcelain', '-z', '--untracked-files=all', '--no-renames')
+
+    if head_tree is not None and status is not None:
+        digest.update(f"git\0{head_tree.strip()}\n".encode())
+        dirty = sorted({entry[3:] for entry in status.split('\0') if len(entry) > 3})
+        for rel_path in dirty:
+            path = root / rel_path
+            state = file_digest(path) if path.is_file() else 'deleted'
+            digest.update(f"{rel_path}\0{state}\n".encode())
+        return digest.hexdigest()
+
+    for rel_path in iter_target_files(root):
+        digest.update(f"{rel_path}\0{file_digest(root / rel_path)}\n".encode())
+    return digest.hexdigest()
+
+
+def make_snapshot(root: Path, dest: Path) -> Path:
+    """
+    Copy the target's files into dest and remove write permission.
+
+    Symlinks that resolve inside the target are recreated as relative links
+    within the snapshot; links that leave the target are not copied. When
+    the target is the root of a git repository, dest starts as a shared,
+    no-checkout clone of it (refs copied, objects read from the target) with
+    an index reset to HEAD, so git sees the same history and changes.
+    """
+    toplevel = run_git(root, 'rev-parse', '--show-toplevel')
+    is_repo = toplevel is not None and Path(toplevel.strip()) == root
+    if is_repo and run_git(root, 'clone', '--quiet', '--shared', '--no-checkout', '.', str(dest)) is None:
+        is_repo = False
+    for rel_path in iter_target_files(root):
+        source = root / rel_path
+        target = dest / rel_path
+        if source.is_symlink():
+            resolved = source.resolve()
+            if not resolved.is_relative_to(root):
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.symlink_to(os.path.relpath(dest / resolved.relative_to(root), target.parent))
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(source, target)
+    if is_repo:
+        run_git(dest, 'reset', '--quiet')  # index from HEAD; fails harmlessly on an unborn branch
+    dest.mkdir(parents=True, exist_ok=True)
+    for dirpath, dirnames, filenames in os.walk(dest):
+        for name in filenames:
+            path = Path(dirpath, name)
+            if not path.is_symlink():
+                path.chmod(path.stat().st_mode & 0o555)
+        Path(dirpath).chmod(0o555)
+    return dest
+
+
+def make_writable(path: Path):
+    """Restore write permission so a snapshot can be deleted."""
+    for dirpath, dirnames, filenames in os.walk(path):
+        Path(dirpath).chmod(0o755)
+
+
+def run_context(tree: str, in_place: bool, limits: Limits) -> str:
+    """What besides the script decides its output: target content, run mode and rlimits."""
+    mode = 'in-place' if in_place else 'snapshot'
+    return f"{tree}\0{mode}\0{limits.cpu_seconds}\0{limits.memory_mb}\0{limits.file_size_mb}"
+
+
+class ResultCache:
+    """On-disk memo of script results keyed by (script hash, run context)."""
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+
+    def _path(self, script_hash: str, context: str) -> Path:
+        key = hashlib.sha256(f"{script_hash}\0{context}".encode()).hexdigest()
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, script_hash: str, context: str) -> dict[str, Any] | None:
+        path = self._path(script_hash, context)
+        if not path.exists():
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def put(self, script_hash: str, context: str, result: dict[str, Any]):
+        path = self._path(script_hash, context)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(result, f)
+        os.replace(tmp, path)
+
+
+def truncate(data: bytes) -> str:
+    text = data[:MAX_OUTPUT_BYTES].decode('utf-8', errors='replace')
+    if len(data) > MAX_OUTPUT_BYTES:
+        text += f"\n[... truncated {len(data) - MAX_OUTPUT_BYTES} bytes]"
+    return text
+
+
+def run_script(script: AuditScript, workdir: Path, limits: Limits) -> dict[str, Any]:
+    """Run one script in a private temp dir with rlimits and a timeout."""
+    interpreter, suffix = INTERPRETERS[script.language]
+    if shutil.which(interpreter[0]) is None:
+        return {"status": "skipped", "reason": f"{interpreter[0]} not installed"}
+
+    with tempfile.TemporaryDirectory(prefix='audit-script-') as private:
+        script_path = Path(private) / f"script{suffix}"
+        script_path.write_text(script.code, encoding='utf-8')
+        home = Path(private) / 'home'
+        home.mkdir()
+        env = {
+            'PATH': os.environ.get('PATH', '/usr/bin:/bin'),
+            'LANG': os.environ.get('LANG', 'C.UTF-8'),
+            'HOME': str(home),
+            'TMPDIR': private,
+            'GIT_OPTIONAL_LOCKS': '0',  # keep `git status` from writing the read-only index
+            'TARGET_DIR': str(workdir),
+        }
+        command = [sys.executable, '-S', '-c', LAUNCHER,
+                   str(limits.cpu_seconds), str(limits.memory_mb * 1024 * 1024),
+                   str(limits.file_size_mb * 1024 * 1024), *interpreter, str(script_path)]
+
+        start = time.monotonic()
+        proc = subprocess.Popen(command, cwd=workdir, env=env, stdin=subprocess.DEVNULL,
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                start_new_session=True)
+        try:
+            stdout, stderr = proc.communicate(timeout=limits.timeout)
+            timed_out = False
+        except subprocess.TimeoutExpired:
+            os.killpg(proc.pid, signal.SIGKILL)
+            stdout, stderr = proc.communicate()
+            timed_out = True
+        duration = time.monotonic() - start
+
+    return {
+        "status": "timeout" if timed_out else "ok" if proc.returncode == 0 else "failed",
+        "exit_code": proc.returncode,
+        "duration": round(duration, 3),
+        "stdout": truncate(stdout),
+        "stderr": truncate(stderr),
+    }
+
+
+def plan_runs(scripts: list[AuditScript], context: str, cache: ResultCache,
+              use_cache: bool = True) -> tuple[dict[str, list[dict[str, Any]]], list[tuple[AuditScript, dict[str, Any]]]]:
+    """Fill in skipped and cached results, returning them grouped by audit with the scripts left to run."""
+    results = {}
+    pending = []
+
+    for script in scripts:
+        entry = {"script_id": script.script_id, "language": script.language,
+                 "purpose": script.purpose, "script_hash": script.script_hash[:16]}
+        results.setdefault(script.audit_id, []).append(entry)
+        if script.language not in INTERPRETERS:
+            entry.update(status="skipped", reason=f"unsupported language: {script.language}")
+            continue
+        cached = cache.get(script.script_hash, context) if use_cache else None
+        if cached is not None:
+            entry.update(cached, cached=True)
+            continue
+        pending.append((script, entry))
+
+    return dict(sorted(results.items())), pending
+
+
+def run_pending(pending: list[tuple[AuditScript, dict[str, Any]]], workdir: Path, context: str,
+                cache: ResultCache, limits: Limits, jobs: int):
+    """Run the scripts plan_runs() left, filling in their result entries."""
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        futures = {pool.submit(run_script, script, workdir, limits): (script, entry)
+                   for script, entry in pending}
+        for future in as_completed(futures):
+            script, entry = futures[future]
+            result = future.result()
+            entry.update(result, cached=False)
+            # Timeouts and signal kills (negative exit codes) may not recur
+            if result['status'] in ('ok', 'failed') and result['exit_code'] >= 0:
+                cache.put(script.script_hash, context, result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run audit tooling scripts against a target repository.")
+    parser.add_argument('--target', required=True, help="Target repository")
+    parser.add_argument('--profile', help="Only run scripts of audits in this profile")
+    parser.add_argument('--audit', action='append', dest='audit_ids', help="Only run this audit ID (repeatable)")
+    parser.add_argument('--audits-dir', default=str(AUDITS_DIR), help="Audit catalog directory")
+    parser.add_argument('--cache-dir', default=str(CACHE_DIR), help="Result cache directory")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 4, help="Concurrent scripts")
+    parser.add_argument('--timeout', type=int, default=120, help="Wall-clock seconds per script")
+    parser.add_argument('--cpu-seconds', type=int, default=120, help="RLIMIT_CPU per script (0 = unlimited)")
+    parser.add_argument('--memory-mb', type=int, default=2048, help="RLIMIT_AS per script (0 = unlimited)")
+    parser.add_argument('--file-size-mb', type=int, default=64, help="RLIMIT_FSIZE per script (0 = unlimited)")
+    parser.add_argument('--in-place', action='store_true', help="Run in the target itself instead of a read-only snapshot")
+    parser.add_argument('--no-cache', action='store_true', help="Ignore cached results")
+    parser.add_argument('--output', required=True, help="Results JSON file to write")
+    args = parser.parse_args()
+
+    root = Path(args.target).resolve()
+    if not root.is_dir():
+        print(f"Error: Target directory not found: {root}", file=sys.stderr)
+        sys.exit(1)
+
+    audit_ids = set(args.audit_ids) if args.audit_ids else None
+    catalog = load_catalog(Path(args.audits_dir), profile=args.profile, audit_ids=audit_ids)
+    scripts = collect_scripts(catalog)
+    print(f"Collected {len(scripts)} scripts from {len({s.audit_id for s in scripts})} audits")
+
+    tree = tree_hash(root)
+    limits = Limits(args.timeout, args.cpu_seconds, args.memory_mb, args.file_size_mb)
+    cache = ResultCache(Path(args.cache_dir))
+
+    context = run_context(tree, args.in_place, limits)
+    results, pending = plan_runs(scripts, context, cache, not args.no_cache)
+
+    # A fully cached run never copies the target
+    snapshot_dir = None
+    workdir = root
+    if pending and not args.in_place:
+        snapshot_dir = Path(tempfile.mkdtemp(prefix='audit-target-'))
+        workdir = make_snapshot(root, snapshot_dir / root.name)
+    try:
+        if pending:
+            run_pending(pending, workdir, context, cache, limits, args.jobs)
+    finally:
+        if snapshot_dir is not None:
+            make_writable(snapshot_dir)
+            shutil.rmtree(snapshot_dir, ignore_errors=True)
+
+    entries = [e for group in results.values() for e in group]
+    counts = {status: sum(1 for e in entries if e.get('status') == status)
+              for status in ('ok', 'failed', 'timeout', 'skipped')}
+    counts['cached'] = sum(1 for e in entries if e.get('cached'))
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({"target": str(root), "tree_hash": tree, "stats": counts, "audits": results}, f, indent=1)
+
+    print(f"  Ran: {len(entries) - counts['cached'] - counts['skipped']}  Cached: {counts['cached']}")
+    print(f"  OK: {counts['ok']}  Failed: {counts['failed']}  "
+          f"Timed out: {counts['timeout']}  Skipped: {counts['skipped']}")
+    print(f"  Results: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
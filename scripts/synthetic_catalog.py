@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Generate a synthetic audit catalog at a multiple of the real catalog's size.
+
+Synthetic audits are built from the real catalog so that text lengths,
+regexes and section shapes stay realistic. Each one starts from a donor
+audit, gets a fresh ID under the donor's category and subcategory, and
+then varies its content:
+
+- signals, procedure steps, code/file patterns and closeout items are
+  resampled from the donor category's pools, with varying counts;
+- `relationships.commonly_combined` points at other synthetic audits;
+- profile membership and `execution.default_profiles` are re-drawn;
+- every [REQUIRED] template section is present, including `sdlc_phases`.
+
+The output directory is laid out like audits/ and can be passed to the
+benchmark (`scripts/benchmark.py run --audits-dir DIR`), to
+`schema_validator.py --audits-dir`, or copied over audits/ in a scratch
+checkout. Generation is deterministic for a given --seed and count, and is
+spread over worker processes.
+
+Usage:
+    python scripts/synthetic_catalog.py --scale 10                # ~20k audits in a temp dir
+    python scripts/synthetic_catalog.py --count 200000 --output /tmp/catalog-200k --jobs 8
+    python scripts/synthetic_catalog.py --scale 10 --validate
+"""
+
+import os
+import sys
+import copy
+import random
+import shutil
+import argparse
+import tempfile
+import multiprocessing
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from audit_catalog import AUDITS_DIR, iter_audit_files, load_audit
+
+YamlDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+SIGNAL_LEVELS = ("critical", "high", "medium", "low", "positive")
+PROFILES = ("quick", "full", "security", "production", "compliance", "performance")
+SDLC_PHASES = ("discovery", "prd", "task_decomposition", "specification", "implementation",
+               "testing", "integration", "deployment", "post_production")
+COGNITIVE_MODES = ("informative", "critical", "evaluative")
+
+# Per-audit count ranges for resampled lists: (minimum, maximum)
+SIGNAL_COUNTS = {"critical": (1, 4), "high": (1, 5), "medium": (1, 5), "low": (0, 4), "positive": (0, 3)}
+STEP_COUNT = (2, 8)
+CODE_PATTERN_COUNT = (0, 12)
+FILE_PATTERN_COUNT = (1, 8)
+CLOSEOUT_COUNT = (2, 6)
+RELATED_COUNT = (0, 5)
+
+CHUNK_SIZE = 500
+
+
+@dataclass
+class CategoryPool:
+    """Reusable content from one real category."""
+    directory: str
+    signals: dict[str, list[dict]] = field(default_factory=lambda: {level: [] for level in SIGNAL_LEVELS})
+    steps: list[dict] = field(default_factory=list)
+    code_patterns: list[dict] = field(default_factory=list)
+    file_patterns: list[dict] = field(default_factory=list)
+    closeout: list[dict] = field(default_factory=list)
+
+
+@dataclass
+class Donor:
+    data: dict[str, Any]
+    category_dir: str
+    subcategory: str
+    slug: str
+
+
+def dicts(value) -> list[dict]:
+    return [item for item in value if isinstance(item, dict)] if isinstance(value, list) else []
+
+
+def build_pools(audits_dir: Path) -> tuple[list[Donor], dict[str, CategoryPool]]:
+    """Load the real catalog as donors and per-category content pools."""
+    donors, pools = [], {}
+    for yaml_path in iter_audit_files(audits_dir):
+        data = load_audit(yaml_path)
+        rel = yaml_path.relative_to(audits_dir)
+        if data is None or len(rel.parts) != 3:
+            continue
+        category_dir, subcategory = rel.parts[0], rel.parts[1]
+        donors.append(Donor(data, category_dir, subcategory, yaml_path.stem))
+
+        pool = pools.setdefault(category_dir, CategoryPool(category_dir))
+        signals = data.get('signals') if isinstance(data.get('signals'), dict) else {}
+        for level in SIGNAL_LEVELS:
+            pool.signals[level] += dicts(signals.get(level))
+        procedure = data.get('procedure') if isinstance(data.get('procedure'), dict) else {}
+        pool.steps += dicts(procedure.get('steps'))
+        discovery = data.get('discovery') if isinstance(data.get('discovery'), dict) else {}
+        pool.code_patterns += dicts(discovery.get('code_patterns'))
+        pool.file_patterns += dicts(discovery.get('file_patterns'))
+        pool.closeout += dicts(data.get('closeout_checklist'))
+    return donors, pools
+
+
+def synthetic_id(donor: Donor, index: int) -> tuple[str, str]:
+    """ID and slug of synthetic audit `index` derived from `donor`."""
+    slug = f"{donor.slug}-s{index:06d}"
+    category = str(donor.data['audit'].get('category') or donor.category_dir[3:])
+    return f"{category}.{donor.subcategory}.{slug}", slug
+
+
+def sample(rng: random.Random, pool: list[dict], bounds: tuple[int, int]) -> list[dict]:
+    count = min(rng.randint(*bounds), len(pool))
+    return copy.deepcopy(rng.sample(pool, count)) if count else []
+
+
+def make_audit(index: int, count: int, donors: list[Donor], pools: dict[str, CategoryPool],
+               seed: int) -> tuple[Path, dict]:
+    """Build synthetic audit `index` of `count`; returns (relative path, document)."""
+    rng = random.Random(f"{seed}:{index}")
+    donor = donors[index % len(donors)]
+    pool = pools[donor.category_dir]
+    audit_id, slug = synthetic_id(donor, index)
+    data = copy.deepcopy(donor.data)
+
+    audit = data['audit']
+    audit.update({
+        "id": audit_id,
+        "name": f"{audit.get('name', slug)} (synthetic {index})",
+        "version": audit.get('version') or "1.0.0",
+        "last_updated": str(audit.get('last_updated') or "2026-01-01"),
+        "status": "active",
+        "category_number": int(donor.category_dir[:2]),
+        "subcategory": donor.subcategory,
+        "tier": rng.choice(("focused", "expert", "expert", "phd")),
+        "completeness": audit.get('completeness') or "complete",
+        "requires_runtime": bool(audit.get('requires_runtime', False)),
+        "destructive": bool(audit.get('destructive', False)),
+    })
+
+    profiles = sorted(rng.sample(PROFILES, rng.randint(1, 3)) + ["full"])
+    profiles = sorted(set(profiles))
+    execution = data.setdefault('execution', {}) if isinstance(data.get('execution'), dict) else {}
+    data['execution'] = execution
+    execution.setdefault('automatable', rng.choice(("yes", "partial", "manual")))
+    execution.setdefault('severity', rng.choice(("critical", "high", "medium", "low")))
+    execution.setdefault('scope', "codebase")
+    execution['default_profiles'] = profiles
+    data['profiles'] = {"membership": {
+        profile: {"included": profile in profiles, "priority": rng.randint(1, 3)}
+        if profile in profiles else {"included": False, "reason": "Not part of this profile"}
+        for profile in PROFILES
+    }}
+
+    data['signals'] = {
+        level: [dict(s, id=f"{slug.upper()}-{level[:4].upper()}-{n + 1:03d}")
+                for n, s in enumerate(sample(rng, pool.signals[level], SIGNAL_COUNTS[level]))]
+        for level in SIGNAL_LEVELS
+    }
+    for level in ("critical", "high", "medium"):
+        if not data['signals'][level]:
+            data['signals'][level] = [{"id": f"{slug.upper()}-{level[:4].upper()}-001",
+                                       "signal": f"Synthetic {level} finding for {slug}"}]
+
+    procedure = data['procedure'] if isinstance(data.get('procedure'), dict) else {}
+    data['procedure'] = procedure
+    context = procedure['context'] if isinstance(procedure.get('context'), dict) else {}
+    context['cognitive_mode'] = rng.choice(COGNITIVE_MODES)
+    context.setdefault('ensemble_role', "auditor")
+    procedure['context'] = context
+    steps = sample(rng, pool.steps, STEP_COUNT) or [{"name": "Review", "description": "Review the target."}]
+    procedure['steps'] = [dict(step, id=str(n + 1)) for n, step in enumerate(steps)]
+
+    discovery = data['discovery'] if isinstance(data.get('discovery'), dict) else {}
+    discovery['code_patterns'] = sample(rng, pool.code_patterns, CODE_PATTERN_COUNT)
+    discovery['file_patterns'] = sample(rng, pool.file_patterns, FILE_PATTERN_COUNT)
+    data['discovery'] = {k: v for k, v in discovery.items() if v}
+
+    closeout = sample(rng, pool.closeout, CLOSEOUT_COUNT)
+    data['closeout_checklist'] = [dict(item, id=f"{slug}-{n + 1:03d}") for n, item in enumerate(closeout)]
+
+    related = []
+    for _ in range(rng.randint(*RELATED_COUNT)):
+        other = rng.randrange(count)
+        if other != index:
+            related.append(synthetic_id(donors[other % len(donors)], other)[0])
+    data['relationships'] = {"commonly_combined": sorted(set(related))}
+
+    output = data['output'] if isinstance(data.get('output'), dict) else {}
+    output.setdefault('deliverables', [{"type": "finding_list", "format": "structured"}])
+    output.setdefault('confidence_guidance', {"high": "Direct evidence", "medium": "Strong indicators",
+                                              "low": "Inference"})
+    data['output'] = output
+    offline = data['offline'] if isinstance(data.get('offline'), dict) else {}
+    if offline.get('capability') not in ("full", "partial", "online_only"):
+        offline['capability'] = rng.choice(("full", "partial", "online_only"))
+    data['offline'] = offline
+    data['sdlc_phases'] = {phase: rng.random() < 0.6 for phase in SDLC_PHASES}
+
+    return Path(donor.category_dir) / donor.subcategory / f"{slug}.yaml", data
+
+
+# Worker state, inherited through fork
+_DONORS: list[Donor] = []
+_POOLS: dict[str, CategoryPool] = {}
+
+
+def write_chunk(args: tuple[int, int, int, int, str]) -> int:
+    start, stop, count, seed, output_dir = args
+    for index in range(start, stop):
+        rel, data = make_audit(index, count, _DONORS, _POOLS, seed)
+        path = Path(output_dir) / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            yaml.dump(data, f, Dumper=YamlDumper, sort_keys=False, allow_unicode=True, width=120)
+    return stop - start
+
+
+def generate(output_dir: Path, count: int, seed: int, jobs: int, audits_dir: Path = AUDITS_DIR) -> int:
+    """Write `count` synthetic audits under output_dir. Returns the number written."""
+    global _DONORS, _POOLS
+    _DONORS, _POOLS = build_pools(audits_dir)
+    if not _DONORS:
+        raise SystemExit(f"Error: No donor audits found in {audits_dir}")
+
+    chunks = [(start, min(start + CHUNK_SIZE, count), count, seed, str(output_dir))
+              for start in range(0, count, CHUNK_SIZE)]
+    written = 0
+    if jobs > 1 and len(chunks) > 1:
+        with multiprocessing.get_context('fork').Pool(jobs) as pool:
+            for done in pool.imap_unordered(write_chunk, chunks):
+                written += done
+                print(f"\r  Written: {written}/{count}", end="", flush=True)
+    else:
+        for chunk in chunks:
+            written += write_chunk(chunk)
+            print(f"\r  Written: {written}/{count}", end="", flush=True)
+    print()
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic audit catalog for scale testing.")
+    size = parser.add_mutually_exclusive_group(required=True)
+    size.add_argument('--count', type=int, help="Number of audits to generate")
+    size.add_argument('--scale', type=float, help="Multiple of the real catalog size (e.g. 10, 100)")
+    parser.add_argument('--output', help="Output directory (default: a new temp directory)")
+    parser.add_argument('--audits-dir', default=str(AUDITS_DIR), help="Real catalog to draw donors from")
+    parser.add_argument('--seed', type=int, default=1, help="Random seed")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument('--force', action='store_true', help="Replace a non-empty output directory")
+    parser.add_argument('--validate', action='store_true', help="Validate the result against the template")
+    args = parser.parse_args()
+
+    audits_dir = Path(args.audits_dir)
+    count = args.count if args.count is not None else round(
+        args.scale * sum(1 for _ in iter_audit_files(audits_dir)))
+
+    if args.output:
+        output_dir = Path(args.output)
+        if output_dir.exists() and any(output_dir.iterdir()):
+            if not args.force:
+                print(f"Error: {output_dir} is not empty (use --force to replace it)", file=sys.stderr)
+                sys.exit(1)
+            shutil.rmtree(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+    else:
+        output_dir = Path(tempfile.mkdtemp(prefix="synthetic-catalog-"))
+
+    print(f"Generating {count} synthetic audits (seed {args.seed}) into {output_dir}")
+    generate(output_dir, count, args.seed, max(1, args.jobs), audits_dir)
+
+    if args.validate:
+        from schema_validator import compile_validator, load_documents, validate_catalog
+        report = validate_catalog(compile_validator(), load_documents(output_dir))
+        print(f"  Schema-valid: {report['summary']['valid']}/{report['audits_analyzed']}")
+        for issue in report['issues'][:10]:
+            print(f"    {issue['file']}: {issue['field']} {issue['issue']}")
+
+    print(output_dir)
+
+
+if __name__ == "__main__":
+    main()
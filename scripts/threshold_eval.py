@@ -0,0 +1,777 @@
+#!/usr/bin/env python3
+"""
+Evaluate audit thresholds against collected metric tables.
+
+Audits express measurable conditions as free-text thresholds:
+
+    signals.<severity>[*].evidence_threshold   "failure_rate > 0.05"
+    closeout_checklist[*].threshold             "< 1.0s", "> X or < Y"
+    discovery.metrics_queries[*].threshold      "< 0.8 normal, > 0.9 warning"
+
+This tool compiles those strings with a small expression language and
+evaluates every compiled threshold column-at-a-time against metric tables,
+raising findings without an agent reading each threshold by hand.
+
+Threshold language:
+    comparisons   >  >=  <  <=  =  ==  !=   (also "above", "below", "at least", ...)
+    logic         AND / OR / but (= AND), parentheses
+    arithmetic    + - * /, "N% of X" (= N/100 * X), "2x"
+    quantities    durations -> seconds (ms, s, min, h, days, weeks, months),
+                  sizes -> bytes (KB, MB, GB, TB, KiB, ...), "N%" -> N/100,
+                  counts (10k, 100M), rates (10/day, $500/month) -> per second
+    variables     metric column names; multi-word subjects are joined with
+                  underscores ("Batch windows" -> batch_windows)
+
+A comparison with no left operand ("< 500ms") tests the implicit subject:
+the column named after the signal/checklist ID, else `value`. Text after a
+complete expression ("... for non-archival data") is treated as prose.
+Thresholds that do not compile, or that use variables missing from a
+table, are reported as not evaluable rather than guessed.
+
+Metric tables are CSV or JSON (a list of row objects, or {"rows": [...]}).
+Numeric columns are variables; string columns are row labels. An optional
+`audit_id` column restricts a row to one audit. Results files written by
+metrics_queries.py are also accepted (--query-results): each query's
+values are tested against that query's own threshold.
+
+Usage:
+    python scripts/threshold_eval.py --table metrics.csv --profile production \\
+        --output threshold-findings.json
+    python scripts/threshold_eval.py --query-results metrics-results.json --output findings.json
+    python scripts/threshold_eval.py --coverage
+"""
+
+import re
+import csv
+import sys
+import json
+import argparse
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+from audit_catalog import AUDITS_DIR, load_catalog
+
+IMPLICIT = '$value'
+
+SECONDS = {
+    'ms': 0.001, 'msec': 0.001, 'millisecond': 0.001, 'milliseconds': 0.001,
+    'us': 1e-6, 'µs': 1e-6, 'ns': 1e-9,
+    's': 1, 'sec': 1, 'secs': 1, 'second': 1, 'seconds': 1,
+    'm': 60, 'min': 60, 'mins': 60, 'minute': 60, 'minutes': 60,
+    'h': 3600, 'hr': 3600, 'hrs': 3600, 'hour': 3600, 'hours': 3600,
+    'd': 86400, 'day': 86400, 'days': 86400,
+    'w': 604800, 'wk': 604800, 'week': 604800, 'weeks': 604800,
+    'mo': 2592000, 'month': 2592000, 'months': 2592000,
+    'y': 31536000, 'yr': 31536000, 'year': 31536000, 'years': 31536000,
+}
+
+BYTES = {
+    'b': 1, 'byte': 1, 'bytes': 1,
+    'kb': 1e3, 'mb': 1e6, 'gb': 1e9, 'tb': 1e12, 'pb': 1e15,
+    'kib': 2**10, 'mib': 2**20, 'gib': 2**30, 'tib': 2**40,
+}
+
+# Case-sensitive count suffixes attached to a number (100M rows, 10k requests)
+COUNTS = {'k': 1e3, 'K': 1e3, 'M': 1e6, 'B': 1e9}
+
+RATE_UNITS = {
+    'sec': 1, 's': 1, 'second': 1, 'min': 60, 'minute': 60,
+    'hour': 3600, 'hr': 3600, 'h': 3600, 'day': 86400, 'd': 86400,
+    'week': 604800, 'month': 2592000, 'year': 31536000,
+    'request': 1, 'req': 1, 'user': 1,
+}
+
+WORD_OPERATORS = [
+    (('greater', 'than', 'or', 'equal', 'to'), '>='),
+    (('less', 'than', 'or', 'equal', 'to'), '<='),
+    (('more', 'than'), '>'), (('greater', 'than'), '>'), (('less', 'than'), '<'),
+    (('fewer', 'than'), '<'), (('at', 'least'), '>='), (('at', 'most'), '<='),
+    (('above',), '>'), (('over',), '>'), (('exceeds',), '>'), (('exceeding',), '>'),
+    (('below',), '<'), (('under',), '<'),
+]
+
+COMPARISONS = {'>', '>=', '<', '<=', '=', '==', '!='}
+
+KEYWORDS = {'and', 'or', 'but', 'of', 'for', 'in', 'on', 'with', 'without',
+            'per', 'than', 'is', 'are', 'should', 'be', 'to'}
+
+# Trailing prose that marks a clause as a problem condition rather than an expectation
+BREACH_WORDS = re.compile(r'\b(indicat\w*|suggest\w*|warning|critical|waste\w*|problem\w*|'
+                          r'concern\w*|investigate|over-provision\w*|under-provision\w*|'
+                          r'unstable|instability)\b', re.IGNORECASE)
+
+TOKEN_RE = re.compile(r"""
+    (?P<num>\$?\d[\d,]*(?:\.\d+)?|\$?\.\d+)
+  | (?P<op>>=|<=|==|!=|=>|=<|[<>=+\-*/()%])
+  | (?P<word>[A-Za-z_µ][\w.\[\]]*)
+  | (?P<sep>[,;])
+  | (?P<other>\S)
+""", re.VERBOSE)
+
+
+class ThresholdSyntaxError(ValueError):
+    pass
+
+
+@dataclass
+class Token:
+    kind: str
+    text: str
+    glued: bool = False  # no whitespace before this token
+
+
+def tokenize(text: str) -> list[Token]:
+    tokens = []
+    end = 0
+    for m in TOKEN_RE.finditer(text):
+        kind = m.lastgroup
+        tokens.append(Token(kind, m.group(), glued=m.start() == end and bool(tokens)))
+        end = m.end()
+    return tokens
+
+
+class Parser:
+    """Recursive-descent parser producing nested tuples."""
+
+    def __init__(self, tokens: list[Token]):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self, offset: int = 0) -> Token | None:
+        i = self.pos + offset
+        return self.tokens[i] if i < len(self.tokens) else None
+
+    def peek_word(self, offset: int = 0) -> str | None:
+        tok = self.peek(offset)
+        return tok.text.lower() if tok and tok.kind == 'word' else None
+
+    def next(self) -> Token:
+        tok = self.tokens[self.pos]
+        self.pos += 1
+        return tok
+
+    def comparison_operator(self) -> str | None:
+        """Consume a symbolic or worded comparison operator if present."""
+        tok = self.peek()
+        if tok is None:
+            return None
+        if tok.kind == 'op' and tok.text in COMPARISONS | {'=>', '=<'}:
+            self.pos += 1
+            return {'=>': '>=', '=<': '<='}.get(tok.text, tok.text)
+        for words, op in WORD_OPERATORS:
+            if all(self.peek_word(i) == w for i, w in enumerate(words)):
+                self.pos += len(words)
+                return op
+        return None
+
+    def parse_or(self):
+        node = self.parse_and()
+        while self.peek_word() == 'or':
+            self.pos += 1
+            node = ('or', node, self.parse_and())
+        return node
+
+    def parse_and(self):
+        node = self.parse_comparison()
+        while self.peek_word() in ('and', 'but'):
+            self.pos += 1
+            node = ('and', node, self.parse_comparison())
+        return node
+
+    def parse_comparison(self):
+        op = self.comparison_operator()
+        if op is not None:
+            left = ('var', IMPLICIT)
+        else:
+            left = self.parse_sum(subject=True)
+            op = self.comparison_operator()
+            if op is None:
+                return ('truthy', left)
+        right = self.parse_sum(subject=False)
+        node = ('cmp', op, left, right)
+        # Range chains: "0.8 < x < 0.9" style or "x > 1 < 5" are treated pairwise
+        while True:
+            save = self.pos
+            op2 = self.comparison_operator()
+            if op2 is None:
+                break
+            try:
+                third = self.parse_sum(subject=False)
+            except ThresholdSyntaxError:
+                self.pos = save
+                break
+            node = ('and', node, ('cmp', op2, right, third))
+            right = third
+        return node
+
+    def parse_sum(self, subject: bool):
+        node = self.parse_product(subject)
+        while self.peek() and self.peek().kind == 'op' and self.peek().text in '+-' \
+                and self.peek(1) is not None and self.peek(1).kind in ('num', 'word', 'op'):
+            op = self.next().text
+            node = (op, node, self.parse_product(False))
+        return node
+
+    def parse_product(self, subject: bool):
+        node = self.parse_factor(subject)
+        while True:
+            tok = self.peek()
+            if tok and tok.kind == 'op' and tok.text in '*/':
+                self.pos += 1
+                node = (tok.text, node, self.parse_factor(False))
+            elif node[0] == 'num' and node[2] == 'ratio' and self.peek_word() == 'of':
+                # "20% of total_spend"
+                self.pos += 1
+                node = ('*', node, self.parse_factor(True))
+            elif node[0] == 'num' and node[2] == 'multiplier' and self.peek_word() \
+                    and self.peek_word() not in KEYWORDS:
+                # "2x actual usage"
+                node = ('*', node, self.parse_factor(True))
+            else:
+                return node
+
+    def parse_factor(self, subject: bool):
+        tok = self.peek()
+        if tok is None:
+            raise ThresholdSyntaxError("unexpected end of threshold")
+        if tok.kind == 'op' and tok.text == '(':
+            self.pos += 1
+            node = self.parse_or()
+            if self.peek() is None or self.peek().text != ')':
+                raise ThresholdSyntaxError("unbalanced parenthesis")
+            self.pos += 1
+            return node
+        if tok.kind == 'op' and tok.text == '-':
+            self.pos += 1
+            return ('neg', self.parse_factor(False))
+        if tok.kind == 'num':
+            return self.parse_quantity()
+        if tok.kind == 'word' and tok.text.lower() not in KEYWORDS:
+            words = [self.next().text]
+            while subject and self.peek_word() and self.peek_word() not in KEYWORDS \
+                    and not self._operator_ahead():
+                words.append(self.next().text)
+            return ('var', normalize_name('_'.join(words)))
+        raise ThresholdSyntaxError(f"unexpected {tok.text!r}")
+
+    def _operator_ahead(self) -> bool:
+        save = self.pos
+        found = self.comparison_operator() is not None
+        self.pos = save
+        return found
+
+    def parse_quantity(self):
+        """Parse a number with an optional unit, percent, multiplier or rate suffix."""
+        text = self.next().text.lstrip('$').replace(',', '')
+        value = float(text)
+        kind = 'plain'
+
+        tok = self.peek()
+        if tok is not None and tok.glued and tok.kind == 'op' and tok.text == '%':
+            self.pos += 1
+            value /= 100
+            kind = 'ratio'
+        elif tok is not None and tok.kind == 'word':
+            unit = tok.text
+            lower = unit.lower()
+            if tok.glued and unit in COUNTS:
+                value *= COUNTS[unit]
+                self.pos += 1
+            elif tok.glued and lower == 'x':
+                self.pos += 1
+                kind = 'multiplier'
+            elif lower in SECONDS and (tok.glued or len(lower) > 1):
+                value *= SECONDS[lower]
+                self.pos += 1
+            elif lower in BYTES and (tok.glued or len(lower) > 1):
+                value *= BYTES[lower]
+                self.pos += 1
+
+        # Rates: "10/day", "$50000/month"
+        tok, unit_tok = self.peek(), self.peek(1)
+        if tok is not None and tok.text == '/' and unit_tok is not None and unit_tok.kind == 'word':
+            per = unit_tok.text.lower()
+            if per not in RATE_UNITS:
+                per = per.rstrip('s')
+            if per in RATE_UNITS:
+                self.pos += 2
+                value /= RATE_UNITS[per]
+
+        return ('num', value, kind)
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a variable or column name for matching."""
+    return re.sub(r'[^a-z0-9_.]+', '_', name.strip().lower()).strip('_')
+
+
+@dataclass
+class Clause:
+    source: str
+    node: tuple
+    mode: str  # 'breach': finding when true; 'expect': finding when false
+    variables: set[str] = field(default_factory=set)
+    fn: Callable | None = None
+
+
+@dataclass
+class Threshold:
+    text: str
+    clauses: list[Clause]
+
+
+def collect_variables(node: tuple, out: set[str]):
+    if node[0] == 'var':
+        out.add(node[1])
+        return
+    for child in node[1:]:
+        if isinstance(child, tuple):
+            collect_variables(child, out)
+
+
+def render(node: tuple) -> str:
+    """Render a parsed clause back to canonical text."""
+    kind = node[0]
+    if kind == 'num':
+        return f"{node[1]:g}"
+    if kind == 'var':
+        return node[1]
+    if kind == 'neg':
+        return f"-{render(node[1])}"
+    if kind == 'truthy':
+        return render(node[1])
+    if kind == 'cmp':
+        return f"{render(node[2])} {node[1]} {render(node[3])}"
+    if kind in ('and', 'or'):
+        return f"({render(node[1])} {kind.upper()} {render(node[2])})"
+    return f"({render(node[1])} {kind} {render(node[2])})"
+
+
+def split_clauses(text: str) -> list[str]:
+    return [c.strip() for c in re.split(r'[;,](?=\s*(?:[<>=]|[A-Za-z_]+\s*:?\s*[<>=]))', text) if c.strip()]
+
+
+def compile_threshold(text: str, default_mode: str) -> Threshold:
+    """
+    Compile a threshold string into clauses.
+
+    Raises ThresholdSyntaxError if no clause compiles. `default_mode` is
+    'breach' for signal thresholds and 'expect' for checklist/query
+    thresholds; trailing prose such as "indicates waste" or a "warning"
+    label turns an expectation clause into a breach clause.
+    """
+    parts = split_clauses(str(text))
+    if sum(1 for p in parts if re.match(r'^[A-Za-z ]{1,20}:', p)) > 1:
+        raise ThresholdSyntaxError(f"rating scale, not a pass/fail threshold: {text!r}")
+
+    clauses = []
+    for part in parts:
+        # Drop leading labels such as "Elite:" or "Target"
+        part = re.sub(r'^(?:target|threshold|expected|goal)\b\s*:?\s*', '', part, flags=re.IGNORECASE)
+        part = re.sub(r'^[A-Za-z ]{1,20}:\s*(?=[<>=\d])', '', part)
+        parser = Parser(tokenize(part))
+        try:
+            node = parser.parse_or()
+        except ThresholdSyntaxError:
+            continue
+        if node[0] == 'truthy' or not _has_comparison(node):
+            continue
+        trailing = ' '.join(t.text for t in parser.tokens[parser.pos:])
+        mode = default_mode
+        if default_mode == 'expect' and BREACH_WORDS.search(trailing):
+            mode = 'breach'
+        clause = Clause(source=part, node=node, mode=mode)
+        collect_variables(node, clause.variables)
+        clause.fn = build_vector_fn(node)
+        clauses.append(clause)
+
+    if not clauses:
+        raise ThresholdSyntaxError(f"no comparison found in {text!r}")
+    # "< 0.8 normal, > 0.9 warning": the problem clauses alone decide findings
+    if any(c.mode == 'breach' for c in clauses):
+        clauses = [c for c in clauses if c.mode == 'breach']
+    return Threshold(text=str(text), clauses=clauses)
+
+
+def _has_comparison(node: tuple) -> bool:
+    if node[0] == 'cmp':
+        return True
+    return any(isinstance(c, tuple) and _has_comparison(c) for c in node[1:])
+
+
+# ---------------------------------------------------------------------------
+# Column-at-a-time evaluation. Every compiled node maps (columns, n) to a list
+# of n values; None marks a missing value and propagates (Kleene logic).
+# ---------------------------------------------------------------------------
+
+def _arith(op: str):
+    if op == '+':
+        return lambda a, b: a + b
+    if op == '-':
+        return lambda a, b: a - b
+    if op == '*':
+        return lambda a, b: a * b
+    return lambda a, b: a / b if b else None
+
+
+CMP_FUNCS = {
+    '>': lambda a, b: a > b, '>=': lambda a, b: a >= b,
+    '<': lambda a, b: a < b, '<=': lambda a, b: a <= b,
+    '=': lambda a, b: a == b, '==': lambda a, b: a == b, '!=': lambda a, b: a != b,
+}
+
+
+def build_vector_fn(node: tuple) -> Callable[[dict[str, list], int], list]:
+    """Compile a parsed clause into a function over whole columns."""
+    kind = node[0]
+
+    if kind == 'num':
+        value = node[1]
+        return lambda cols, n: [value] * n
+
+    if kind == 'var':
+        name = node[1]
+        return lambda cols, n: cols[name]
+
+    if kind == 'neg':
+        inner = build_vector_fn(node[1])
+        return lambda cols, n: [None if v is None else -v for v in inner(cols, n)]
+
+    if kind == 'truthy':
+        inner = build_vector_fn(node[1])
+        return lambda cols, n: [None if v is None else bool(v) for v in inner(cols, n)]
+
+    if kind == 'cmp':
+        func = CMP_FUNCS[node[1]]
+        left, right = build_vector_fn(node[2]), build_vector_fn(node[3])
+        return lambda cols, n: [None if a is None or b is None else func(a, b)
+                                for a, b in zip(left(cols, n), right(cols, n))]
+
+    if kind == 'and':
+        left, right = build_vector_fn(node[1]), build_vector_fn(node[2])
+        return lambda cols, n: [False if a is False or b is False else
+                                None if a is None or b is None else True
+                                for a, b in zip(left(cols, n), right(cols, n))]
+
+    if kind == 'or':
+        left, right = build_vector_fn(node[1]), build_vector_fn(node[2])
+        return lambda cols, n: [True if a is True or b is True else
+                                None if a is None or b is None else False
+                                for a, b in zip(left(cols, n), right(cols, n))]
+
+    func = _arith(kind)
+    left, right = build_vector_fn(node[1]), build_vector_fn(node[2])
+    return lambda cols, n: [None if a is None or b is None else func(a, b)
+                            for a, b in zip(left(cols, n), right(cols, n))]
+
+
+# ---------------------------------------------------------------------------
+# Metric tables
+# ---------------------------------------------------------------------------
+
+@dataclass
+class MetricTable:
+    name: str
+    columns: dict[str, list]
+    labels: dict[str, list]
+    size: int
+
+
+def _number(value: Any) -> float | None:
+    if isinstance(value, bool):
+        return float(value)
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        text = value.strip()
+        if not text:
+            return None
+        try:
+            return float(text.replace(',', ''))
+        except ValueError:
+            try:
+                node = Parser(tokenize(text)).parse_quantity()
+                return node[1]
+            except (ThresholdSyntaxError, ValueError, IndexError):
+                return None
+    return None
+
+
+def build_table(name: str, rows: list[dict[str, Any]]) -> MetricTable:
+    """Turn row dicts into numeric columns and string label columns."""
+    keys = []
+    for row in rows:
+        for key in row:
+            if key not in keys:
+                keys.append(key)
+
+    columns, labels = {}, {}
+    for key in keys:
+        raw = [row.get(key) for row in rows]
+        numbers = [_number(v) for v in raw]
+        col = normalize_name(str(key))
+        if any(n is not None for n in numbers) and all(
+                n is not None or v in (None, '') for n, v in zip(numbers, raw)):
+            columns[col] = numbers
+        else:
+            labels[col] = ['' if v is None else str(v) for v in raw]
+    return MetricTable(name=name, columns=columns, labels=labels, size=len(rows))
+
+
+def load_table_file(path: Path) -> list[dict[str, Any]]:
+    if path.suffix.lower() == '.csv':
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            return list(csv.DictReader(f))
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    rows = data.get('rows', []) if isinstance(data, dict) else data
+    return [r for r in rows if isinstance(r, dict)]
+
+
+def split_by_audit(name: str, rows: list[dict[str, Any]]) -> tuple[MetricTable | None, dict[str, MetricTable]]:
+    """Split rows into a table shared by all audits and per-audit tables."""
+    shared, per_audit = [], {}
+    for row in rows:
+        audit_id = row.get('audit_id')
+        if audit_id:
+            rest = {k: v for k, v in row.items() if k != 'audit_id'}
+            per_audit.setdefault(str(audit_id), []).append(rest)
+        else:
+            shared.append(row)
+    shared_table = build_table(name, shared) if shared else None
+    return shared_table, {a: build_table(name, r) for a, r in per_audit.items()}
+
+
+# ---------------------------------------------------------------------------
+# Catalog thresholds
+# ---------------------------------------------------------------------------
+
+@dataclass
+class ThresholdRef:
+    audit_id: str
+    source: str   # signal | closeout | metrics_query
+    ref_id: str
+    severity: str
+    text: str
+    mode: str
+
+
+def iter_catalog_thresholds(audit_id: str, data: dict[str, Any]):
+    """Yield every threshold declared by an audit."""
+    signals = data.get('signals') or {}
+    if isinstance(signals, dict):
+        for severity, entries in signals.items():
+            for entry in entries or []:
+                if isinstance(entry, dict) and entry.get('evidence_threshold'):
+                    yield ThresholdRef(audit_id, 'signal', str(entry.get('id', '')), str(severity),
+                                       str(entry['evidence_threshold']), 'breach')
+
+    for entry in data.get('closeout_checklist') or []:
+        if isinstance(entry, dict) and entry.get('threshold'):
+            yield ThresholdRef(audit_id, 'closeout', str(entry.get('id', '')),
+                               str(entry.get('level', '')).lower(), str(entry['threshold']), 'expect')
+
+
+def bind_columns(ref: ThresholdRef, clause: Clause, table: MetricTable) -> dict[str, list] | None:
+    """
+    Return the columns a clause needs, or None if the table lacks any.
+
+    The implicit subject binds to the column named after the signal or
+    checklist ID, falling back to `value`.
+    """
+    columns = table.columns
+    if IMPLICIT in clause.variables:
+        bound = columns.get(normalize_name(ref.ref_id), columns.get('value'))
+        if bound is None:
+            return None
+        columns = {**columns, IMPLICIT: bound}
+    if not clause.variables <= columns.keys():
+        return None
+    return columns
+
+
+def make_finding(ref: ThresholdRef, clauses: list[Clause], mode: str, table: MetricTable,
+                 columns: dict[str, list], row: int) -> dict[str, Any]:
+    variables = sorted({v for c in clauses for v in c.variables})
+    return {
+        "audit_id": ref.audit_id,
+        "source": ref.source,
+        "id": ref.ref_id,
+        "severity": ref.severity,
+        "threshold": ref.text,
+        "clause": ' OR '.join(render(c.node) for c in clauses),
+        "mode": mode,
+        "table": table.name,
+        "labels": {k: v[row] for k, v in table.labels.items() if v[row]},
+        "values": {('value' if v == IMPLICIT else v): columns[v][row] for v in variables},
+    }
+
+
+def evaluate_threshold(ref: ThresholdRef, threshold: Threshold,
+                       table: MetricTable) -> tuple[list[dict[str, Any]], bool]:
+    """
+    Evaluate a compiled threshold over a whole table.
+
+    Breach clauses raise a finding for every row where they are true.
+    Expectation clauses are alternatives: a row fails only when every
+    evaluable expectation is false. Returns (findings, evaluable).
+    """
+    findings = []
+    evaluable = False
+    n = table.size
+
+    if threshold.clauses[0].mode == 'breach':
+        for clause in threshold.clauses:
+            columns = bind_columns(ref, clause, table)
+            if columns is None:
+                continue
+            evaluable = True
+            for row, outcome in enumerate(clause.fn(columns, n)):
+                if outcome is True:
+                    findings.append(make_finding(ref, [clause], 'breach', table, columns, row))
+        return findings, evaluable
+
+    bound = [(c, cols) for c in threshold.clauses if (cols := bind_columns(ref, c, table)) is not None]
+    if not bound:
+        return [], False
+    outcomes = [clause.fn(cols, n) for clause, cols in bound]
+    merged = {k: v for _, cols in bound for k, v in cols.items()}
+    for row in range(n):
+        row_results = [o[row] for o in outcomes]
+        if row_results and all(r is False for r in row_results):
+            findings.append(make_finding(ref, [c for c, _ in bound], 'expect', table, merged, row))
+    return findings, True
+
+
+def evaluate(refs: list[ThresholdRef], shared: list[MetricTable],
+             per_audit: dict[str, list[MetricTable]]) -> tuple[list[dict], Counter]:
+    """Compile each distinct threshold once and evaluate it against every applicable table."""
+    stats = Counter()
+    findings = []
+    compiled: dict[tuple[str, str], Threshold | None] = {}
+
+    for ref in refs:
+        stats['thresholds'] += 1
+        key = (ref.text, ref.mode)
+        if key not in compiled:
+            try:
+                compiled[key] = compile_threshold(ref.text, ref.mode)
+            except ThresholdSyntaxError:
+                compiled[key] = None
+        threshold = compiled[key]
+        if threshold is None:
+            stats['not_compiled'] += 1
+            continue
+        stats['compiled'] += 1
+
+        evaluated = False
+        for table in shared + per_audit.get(ref.audit_id, []):
+            found, ok = evaluate_threshold(ref, threshold, table)
+            evaluated |= ok
+            findings.extend(found)
+        stats['evaluated' if evaluated else 'unbound'] += 1
+
+    return findings, stats
+
+
+def query_result_refs(results: dict[str, Any]) -> tuple[list[ThresholdRef], dict[str, list[MetricTable]]]:
+    """Turn metrics_queries.py output into threshold refs with one table per query."""
+    refs, tables = [], {}
+    for audit_id, entries in results.get('audits', {}).items():
+        for entry in entries:
+            if entry.get('status') != 'success' or not entry.get('threshold'):
+                continue
+            ref_id = f"metrics_queries[{entry['index']}]"
+            rows = [{**{k: str(v) for k, v in e.get('labels', {}).items()},
+                     normalize_name(ref_id): e['value']} for e in entry.get('values', [])]
+            if not rows:
+                continue
+            refs.append(ThresholdRef(audit_id, 'metrics_query', ref_id, '', entry['threshold'], 'expect'))
+            tables.setdefault(audit_id, []).append(build_table(entry['query'], rows))
+    return refs, tables
+
+
+def coverage_report(catalog: dict[str, dict[str, Any]]):
+    """Print how many catalog thresholds the expression language compiles."""
+    counts = Counter()
+    unparsed = []
+    for audit_id, data in catalog.items():
+        for ref in iter_catalog_thresholds(audit_id, data):
+            try:
+                compile_threshold(ref.text, ref.mode)
+                counts[ref.source, 'compiled'] += 1
+            except ThresholdSyntaxError:
+                counts[ref.source, 'not_compiled'] += 1
+                unparsed.append(ref)
+
+    for source in ('signal', 'closeout'):
+        ok, bad = counts[source, 'compiled'], counts[source, 'not_compiled']
+        total = ok + bad
+        pct = ok / total * 100 if total else 0
+        print(f"  {source}: {ok}/{total} thresholds compile ({pct:.1f}%)")
+    print("\nSample thresholds left for manual review:")
+    for ref in unparsed[:15]:
+        print(f"  {ref.audit_id} {ref.ref_id}: {ref.text}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate audit thresholds against metric tables.")
+    parser.add_argument('--table', action='append', default=[], help="Metric table (CSV or JSON), repeatable")
+    parser.add_argument('--query-results', action='append', default=[],
+                        help="metrics_queries.py results file, repeatable")
+    parser.add_argument('--profile', help="Only evaluate audits in this profile")
+    parser.add_argument('--audit', action='append', dest='audit_ids', help="Only evaluate this audit ID (repeatable)")
+    parser.add_argument('--audits-dir', default=str(AUDITS_DIR), help="Audit catalog directory")
+    parser.add_argument('--coverage', action='store_true', help="Report how many catalog thresholds compile and exit")
+    parser.add_argument('--output', help="Findings JSON file to write")
+    args = parser.parse_args()
+
+    audit_ids = set(args.audit_ids) if args.audit_ids else None
+    catalog = load_catalog(Path(args.audits_dir), profile=args.profile, audit_ids=audit_ids)
+
+    if args.coverage:
+        print(f"Threshold coverage for {len(catalog)} audits:")
+        coverage_report(catalog)
+        return
+
+    if not args.output:
+        print("Error: --output is required", file=sys.stderr)
+        sys.exit(1)
+
+    refs = [ref for audit_id, data in catalog.items() for ref in iter_catalog_thresholds(audit_id, data)]
+    shared, per_audit = [], {}
+    for table_path in args.table:
+        rows = load_table_file(Path(table_path))
+        table, by_audit = split_by_audit(Path(table_path).name, rows)
+        if table is not None:
+            shared.append(table)
+        for audit_id, t in by_audit.items():
+            per_audit.setdefault(audit_id, []).append(t)
+
+    findings, stats = evaluate(refs, shared, per_audit)
+
+    for results_path in args.query_results:
+        with open(results_path, 'r', encoding='utf-8') as f:
+            results = json.load(f)
+        q_refs, q_tables = query_result_refs(results)
+        q_refs = [r for r in q_refs if r.audit_id in catalog]
+        q_findings, q_stats = evaluate(q_refs, [], q_tables)
+        findings.extend(q_findings)
+        stats.update(q_stats)
+
+    findings.sort(key=lambda f: (f['audit_id'], f['source'], f['id']))
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({"stats": dict(stats), "findings": findings}, f, indent=1)
+
+    print(f"Evaluated thresholds for {len(catalog)} audits")
+    print(f"  Thresholds: {stats['thresholds']} ({stats['compiled']} compiled, "
+          f"{stats['not_compiled']} need manual review)")
+    print(f"  Evaluated against tables: {stats['evaluated']} ({stats['unbound']} missing metrics)")
+    print(f"  Findings: {len(findings)}")
+    print(f"  Results: {args.output}")
+
+
+if __name__ == "__main__":
+    main()